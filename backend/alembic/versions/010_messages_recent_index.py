@@ -0,0 +1,27 @@
+"""Composite index for newest-first message reads.
+
+Revision ID: 010_messages_recent_index
+Revises: 009_phase11_agents
+"""
+import sqlalchemy as sa
+
+from alembic import op
+
+revision = "010_messages_recent_index"
+down_revision = "009_phase11_agents"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Serves the keyset walk of the LLM context window:
+    # WHERE conversation_id = ? ORDER BY created_at DESC, id DESC
+    op.create_index(
+        "ix_messages_conversation_created",
+        "messages",
+        ["conversation_id", sa.text("created_at DESC")],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_messages_conversation_created", table_name="messages")
@@ -0,0 +1,39 @@
+"""Rolling conversation summary for the LLM context window.
+
+Revision ID: 011_conversation_summary
+Revises: 010_messages_recent_index
+"""
+import sqlalchemy as sa
+
+from alembic import op
+
+revision = "011_conversation_summary"
+down_revision = "010_messages_recent_index"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "conversations",
+        sa.Column(
+            "summary",
+            sa.Text(),
+            nullable=True,
+            comment="Rolling summary of turns older than the LLM context window",
+        ),
+    )
+    op.add_column(
+        "conversations",
+        sa.Column(
+            "summary_until",
+            sa.DateTime(timezone=True),
+            nullable=True,
+            comment="created_at of the newest message folded into the summary",
+        ),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("conversations", "summary_until")
+    op.drop_column("conversations", "summary")
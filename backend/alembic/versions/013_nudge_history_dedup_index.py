@@ -0,0 +1,25 @@
+"""Composite index for the scheduler's once-per-day nudge check.
+
+Revision ID: 013_nudge_history_dedup_index
+Revises: 012_episode_jobs
+"""
+from alembic import op
+
+revision = "013_nudge_history_dedup_index"
+down_revision = "012_episode_jobs"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Serves the anti-join of the set-based deadline/overdue pass:
+    # WHERE user_id = ? AND nudge_type = ? AND task_id = ? AND delivered_at >= today
+    op.create_index(
+        "ix_nudge_history_user_type_task_delivered",
+        "nudge_history",
+        ["user_id", "nudge_type", "task_id", "delivered_at"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_nudge_history_user_type_task_delivered", table_name="nudge_history")
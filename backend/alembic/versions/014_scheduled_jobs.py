@@ -0,0 +1,32 @@
+"""Next-due times per user and scheduler job type.
+
+Revision ID: 014_scheduled_jobs
+Revises: 013_nudge_history_dedup_index
+"""
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import UUID
+
+from alembic import op
+
+revision = "014_scheduled_jobs"
+down_revision = "013_nudge_history_dedup_index"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "scheduled_jobs",
+        sa.Column("id", UUID(as_uuid=True), primary_key=True),
+        sa.Column("user_id", UUID(as_uuid=True), sa.ForeignKey("users.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("job_type", sa.String(32), nullable=False),
+        sa.Column("next_due_at", sa.DateTime(timezone=True), nullable=True, index=True),
+        sa.Column("last_run_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.UniqueConstraint("user_id", "job_type", name="uq_scheduled_jobs_user_type"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("scheduled_jobs")
@@ -0,0 +1,35 @@
+"""German full-text search document for brain entries.
+
+Revision ID: 015_brain_fulltext_search
+Revises: 014_scheduled_jobs
+"""
+from alembic import op
+
+revision = "015_brain_fulltext_search"
+down_revision = "014_scheduled_jobs"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Generated (stored) so it never drifts from title/content
+    op.execute(
+        """
+        ALTER TABLE brain_entries ADD COLUMN search_vector tsvector
+        GENERATED ALWAYS AS (
+            setweight(to_tsvector('german'::regconfig, coalesce(title, '')), 'A') ||
+            setweight(to_tsvector('german'::regconfig, coalesce(content, '')), 'B')
+        ) STORED
+        """
+    )
+    op.create_index(
+        "ix_brain_entries_search_vector",
+        "brain_entries",
+        ["search_vector"],
+        postgresql_using="gin",
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_brain_entries_search_vector", table_name="brain_entries")
+    op.drop_column("brain_entries", "search_vector")
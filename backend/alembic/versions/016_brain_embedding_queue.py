@@ -0,0 +1,36 @@
+"""Embedding worker queue columns for brain entries.
+
+Revision ID: 016_brain_embedding_queue
+Revises: 015_brain_fulltext_search
+"""
+import sqlalchemy as sa
+
+from alembic import op
+
+revision = "016_brain_embedding_queue"
+down_revision = "015_brain_fulltext_search"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "brain_entries",
+        sa.Column(
+            "embedding_claimed_at",
+            sa.DateTime(timezone=True),
+            nullable=True,
+            comment="When the embedding worker claimed the entry (lease start)",
+        ),
+    )
+    op.create_index(
+        "ix_brain_entries_embedding_queue",
+        "brain_entries",
+        ["created_at"],
+        postgresql_where=sa.text("embedding_status IN ('pending', 'processing')"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_brain_entries_embedding_queue", table_name="brain_entries")
+    op.drop_column("brain_entries", "embedding_claimed_at")
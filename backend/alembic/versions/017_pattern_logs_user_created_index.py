@@ -0,0 +1,24 @@
+"""Covering (user_id, created_at) index for pattern log trend windows.
+
+Revision ID: 017_pattern_logs_user_created_index
+Revises: 016_brain_embedding_queue
+"""
+from alembic import op
+
+revision = "017_pattern_logs_user_created_index"
+down_revision = "016_brain_embedding_queue"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_pattern_logs_user_created",
+        "pattern_logs",
+        ["user_id", "created_at"],
+        postgresql_include=["mood_score", "energy_level", "focus_score"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_pattern_logs_user_created", table_name="pattern_logs")
@@ -0,0 +1,61 @@
+"""Daily rollup of pattern log scores per user.
+
+Revision ID: 018_pattern_log_daily
+Revises: 017_pattern_logs_user_created_index
+"""
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import UUID
+
+from alembic import op
+
+revision = "018_pattern_log_daily"
+down_revision = "017_pattern_logs_user_created_index"
+branch_labels = None
+depends_on = None
+
+METRICS = {"mood": "mood_score", "energy": "energy_level", "focus": "focus_score"}
+
+
+def upgrade() -> None:
+    metric_columns = []
+    for metric in METRICS:
+        metric_columns += [
+            sa.Column(f"{metric}_sum", sa.Float, nullable=False),
+            sa.Column(f"{metric}_count", sa.Integer, nullable=False),
+            sa.Column(f"{metric}_min", sa.Float, nullable=True),
+            sa.Column(f"{metric}_max", sa.Float, nullable=True),
+        ]
+    op.create_table(
+        "pattern_log_daily",
+        sa.Column("id", UUID(as_uuid=True), primary_key=True),
+        sa.Column("user_id", UUID(as_uuid=True), sa.ForeignKey("users.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("day", sa.Date, nullable=False),
+        sa.Column("log_count", sa.Integer, nullable=False),
+        *metric_columns,
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.UniqueConstraint("user_id", "day", name="uq_pattern_log_daily_user_day"),
+    )
+    op.create_index("ix_pattern_log_daily_id", "pattern_log_daily", ["id"])
+
+    # Backfill from the existing logs
+    aggregates = ", ".join(
+        f"coalesce(sum({col}), 0), count({col}), min({col}), max({col})"
+        for col in METRICS.values()
+    )
+    names = ", ".join(
+        f"{metric}_sum, {metric}_count, {metric}_min, {metric}_max" for metric in METRICS
+    )
+    op.execute(
+        f"""
+        INSERT INTO pattern_log_daily (id, user_id, day, log_count, {names})
+        SELECT gen_random_uuid(), user_id, (created_at AT TIME ZONE 'UTC')::date, count(*), {aggregates}
+        FROM pattern_logs
+        GROUP BY user_id, (created_at AT TIME ZONE 'UTC')::date
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_pattern_log_daily_id", table_name="pattern_log_daily")
+    op.drop_table("pattern_log_daily")
@@ -0,0 +1,25 @@
+"""Message id tie-breaker for the episode job watermark.
+
+Revision ID: 019_episode_job_keyset
+Revises: 018_pattern_log_daily
+"""
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import UUID
+
+from alembic import op
+
+revision = "019_episode_job_keyset"
+down_revision = "018_pattern_log_daily"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "episode_jobs",
+        sa.Column("processed_until_id", UUID(as_uuid=True), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("episode_jobs", "processed_until_id")
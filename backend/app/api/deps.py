@@ -11,6 +11,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.database import get_db
 from app.core.security import verify_token
 from app.core.exceptions import UnauthorizedError, AccountDisabledError
+from app.core.principal import Principal, principal_cache
 from app.models.user import User
 
 
@@ -18,6 +19,89 @@ from app.models.user import User
 security = HTTPBearer()
 
 
+def _user_id_from_token(token: str) -> UUID:
+    """
+    Verify an access token and extract the user ID.
+
+    Args:
+        token: Encoded JWT access token
+
+    Returns:
+        UUID: User ID from the token subject
+
+    Raises:
+        UnauthorizedError: If token is invalid or has no valid user ID
+    """
+    try:
+        payload = verify_token(token, token_type="access")
+    except Exception as e:
+        raise UnauthorizedError(detail=str(e))
+
+    user_id_str = payload.get("sub")
+    if user_id_str is None:
+        raise UnauthorizedError(detail="Token payload missing user ID")
+
+    try:
+        return UUID(user_id_str)
+    except ValueError:
+        raise UnauthorizedError(detail="Invalid user ID in token")
+
+
+def _check_active(principal: Principal) -> Principal:
+    """Raise AccountDisabledError for disabled accounts."""
+    if not principal.is_active:
+        raise AccountDisabledError()
+    return principal
+
+
+async def get_current_principal(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: AsyncSession = Depends(get_db),
+) -> Principal:
+    """
+    FastAPI dependency to get the authenticated principal from JWT token.
+
+    Use this for routes that only need the caller's ID. The account state
+    is served from a short TTL cache; on a miss only the id, is_active and
+    display_name columns are read instead of the full User row.
+
+    Args:
+        credentials: HTTP Bearer credentials from Authorization header
+        db: Database session (only used on cache miss)
+
+    Returns:
+        Principal: Authenticated principal
+
+    Raises:
+        UnauthorizedError: If token is invalid or user not found
+        AccountDisabledError: If user account is disabled
+
+    Example:
+        ```python
+        @router.get("/tasks")
+        async def list_tasks(current_user: Principal = Depends(get_current_principal)):
+            return {"user_id": current_user.id}
+        ```
+    """
+    user_id = _user_id_from_token(credentials.credentials)
+
+    principal = principal_cache.get(user_id)
+    if principal is not None:
+        return _check_active(principal)
+
+    result = await db.execute(
+        select(User.id, User.is_active, User.display_name).where(User.id == user_id)
+    )
+    row = result.one_or_none()
+
+    if row is None:
+        raise UnauthorizedError(detail="User not found")
+
+    principal = Principal(id=row.id, is_active=row.is_active, display_name=row.display_name)
+    principal_cache.set(principal)
+    return _check_active(principal)
+
+
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
     db: AsyncSession = Depends(get_db),
@@ -25,6 +109,9 @@ async def get_current_user(
     """
     FastAPI dependency to get authenticated user from JWT token.
 
+    Loads the full User row. Routes that only need the user ID should
+    depend on get_current_principal instead.
+
     Args:
         credentials: HTTP Bearer credentials from Authorization header
         db: Database session
@@ -43,23 +130,7 @@ async def get_current_user(
             return {"user_id": current_user.id}
         ```
     """
-    token = credentials.credentials
-
-    # Verify and decode token
-    try:
-        payload = verify_token(token, token_type="access")
-    except Exception as e:
-        raise UnauthorizedError(detail=str(e))
-
-    # Extract user ID from token
-    user_id_str = payload.get("sub")
-    if user_id_str is None:
-        raise UnauthorizedError(detail="Token payload missing user ID")
-
-    try:
-        user_id = UUID(user_id_str)
-    except ValueError:
-        raise UnauthorizedError(detail="Invalid user ID in token")
+    user_id = _user_id_from_token(credentials.credentials)
 
     # Fetch user from database
     result = await db.execute(
@@ -70,6 +141,10 @@ async def get_current_user(
     if user is None:
         raise UnauthorizedError(detail="User not found")
 
+    principal_cache.set(
+        Principal(id=user.id, is_active=user.is_active, display_name=user.display_name)
+    )
+
     if not user.is_active:
         raise AccountDisabledError()
 
@@ -7,8 +7,8 @@ import logging
 from fastapi import APIRouter, Depends, Request
 from sse_starlette.sse import EventSourceResponse
 
-from app.api.deps import get_current_user
-from app.models.user import User
+from app.api.deps import get_current_principal
+from app.core.principal import Principal
 
 logger = logging.getLogger(__name__)
 router = APIRouter(tags=["Agent Stream"])
@@ -35,7 +35,7 @@ async def publish_event(user_id: str, event_type: str, data: dict):
 @router.get("/activity/stream")
 async def agent_activity_stream(
     request: Request,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
 ):
     """SSE stream of agent activity for the authenticated user."""
     user_id = str(current_user.id)
@@ -6,10 +6,10 @@ from fastapi import APIRouter, Depends, status
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.deps import get_current_user
+from app.api.deps import get_current_principal
 from app.core.database import get_db
+from app.core.principal import Principal
 from app.models.approval_request import ApprovalRequest, ApprovalStatus
-from app.models.user import User
 from app.schemas.agent import (
     TrustOverview,
     TrustScoreResponse,
@@ -26,7 +26,7 @@ router = APIRouter(tags=["Agents"])
 
 @router.get("/trust", response_model=TrustOverview)
 async def get_trust_scores(
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db),
 ):
     """Get all trust scores for the current user."""
@@ -40,7 +40,7 @@ async def get_trust_scores(
 @router.put("/trust", status_code=status.HTTP_200_OK)
 async def set_trust_level(
     data: TrustUpdateRequest,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db),
 ):
     """Set trust level for an agent type (applies to all action types)."""
@@ -53,7 +53,7 @@ async def set_trust_level(
 
 @router.get("/approvals/pending", response_model=list[ApprovalRequestResponse])
 async def get_pending_approvals(
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db),
 ):
     """Get all pending approval requests for the current user."""
@@ -69,7 +69,7 @@ async def get_pending_approvals(
 async def approve_action(
     approval_id: UUID,
     decision: ApprovalDecision,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db),
 ):
     """Approve or reject a pending action."""
@@ -100,7 +100,7 @@ async def approve_action(
 @router.post("/email/config", response_model=EmailConfigResponse)
 async def save_email_config(
     data: EmailConfigCreate,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db),
 ):
     """Save email configuration (SMTP/IMAP)."""
@@ -123,7 +123,7 @@ async def save_email_config(
 
 @router.get("/email/config", response_model=EmailConfigResponse | None)
 async def get_email_config(
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db),
 ):
     """Get email configuration for the current user."""
@@ -3,9 +3,10 @@
 from fastapi import APIRouter, Depends, Request, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.deps import get_current_user
+from app.api.deps import get_current_principal, get_current_user
 from app.core.config import settings
 from app.core.database import get_db
+from app.core.principal import Principal
 from app.core.rate_limit import auth_rate_limit, standard_rate_limit
 from app.schemas.auth import LoginRequest, TokenResponse, TokenRefreshRequest
 from app.schemas.user import UserCreate, UserResponse
@@ -117,7 +118,7 @@ async def refresh(
     description="Revoke all refresh tokens for the authenticated user.",
 )
 async def logout(
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db),
 ):
     """
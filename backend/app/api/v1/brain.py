@@ -5,10 +5,10 @@ from uuid import UUID
 from fastapi import APIRouter, Depends, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.deps import get_current_user
+from app.api.deps import get_current_principal
 from app.core.database import get_db
 from app.core.rate_limit import standard_rate_limit
-from app.models.user import User
+from app.core.principal import Principal
 from app.schemas.brain import (
     BrainEntryCreate,
     BrainEntryUpdate,
@@ -30,7 +30,7 @@ router = APIRouter(tags=["Brain"])
 )
 async def create_entry(
     data: BrainEntryCreate,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db),
 ):
     """Create a new brain entry."""
@@ -51,7 +51,7 @@ async def list_entries(
     limit: int = Query(20, ge=1, le=100, description="Items per page"),
     entry_type: str | None = Query(None, description="Filter by entry type"),
     tags: list[str] | None = Query(None, description="Filter by tags"),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db),
 ):
     """Get paginated list of brain entries."""
@@ -81,7 +81,7 @@ async def list_entries(
 )
 async def get_entry(
     entry_id: UUID,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db),
 ):
     """Get a specific brain entry by ID."""
@@ -100,7 +100,7 @@ async def get_entry(
 async def update_entry(
     entry_id: UUID,
     data: BrainEntryUpdate,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db),
 ):
     """Update an existing brain entry."""
@@ -117,7 +117,7 @@ async def update_entry(
 )
 async def delete_entry(
     entry_id: UUID,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db),
 ):
     """Delete a brain entry."""
@@ -135,17 +135,28 @@ async def delete_entry(
 async def search_entries(
     q: str = Query(..., min_length=1, max_length=500, description="Search query"),
     limit: int = Query(10, ge=1, le=50, description="Max results"),
-    min_score: float = Query(0.5, ge=0.0, le=1.0, description="Minimum relevance score"),
-    current_user: User = Depends(get_current_user),
+    min_score: float = Query(
+        0.5,
+        ge=0.0,
+        le=1.0,
+        description="Minimum relevance score, relative to the best match (1.0) in every mode",
+    ),
+    mode: str = Query(
+        "fulltext",
+        pattern="^(fulltext|semantic|hybrid)$",
+        description="fulltext (keywords, German stemming), semantic (vector similarity) or hybrid (both fused)",
+    ),
+    current_user: Principal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db),
 ):
-    """Search brain entries by text content."""
+    """Search brain entries by keywords or meaning."""
     service = BrainService(db)
     results = await service.search(
         user_id=current_user.id,
         query=q,
         limit=limit,
         min_score=min_score,
+        mode=mode,
     )
     return {
         "results": results,
@@ -1,13 +1,14 @@
 """Morning Briefing API endpoints."""
 
 from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.deps import get_current_user
+from app.api.deps import get_current_principal
 from app.core.database import get_db
 from app.core.rate_limit import standard_rate_limit
-from app.models.user import User
-from app.models.user_settings import DEFAULT_SETTINGS
+from app.core.principal import Principal
+from app.models.user_settings import DEFAULT_SETTINGS, UserSettings
 from app.schemas.briefing import (
     BriefingResponse,
     BriefingHistoryResponse,
@@ -27,7 +28,7 @@ router = APIRouter(tags=["Briefing"])
     dependencies=[Depends(standard_rate_limit)],
 )
 async def get_today_briefing(
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db),
 ):
     """Get today's briefing if it exists. Returns null if not yet generated."""
@@ -42,7 +43,7 @@ async def get_today_briefing(
     dependencies=[Depends(standard_rate_limit)],
 )
 async def generate_briefing(
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db),
 ):
     """Generate a new Morning Briefing for today (or return existing one)."""
@@ -55,8 +56,11 @@ async def generate_briefing(
 
     # Get user settings for display_name and max_daily_tasks
     settings = {}
-    if current_user.user_settings:
-        settings = {**DEFAULT_SETTINGS, **current_user.user_settings.settings}
+    user_settings = await db.scalar(
+        select(UserSettings).where(UserSettings.user_id == current_user.id)
+    )
+    if user_settings:
+        settings = {**DEFAULT_SETTINGS, **user_settings.settings}
     display_name = settings.get("display_name")
     max_tasks = settings.get("max_daily_tasks", 3)
 
@@ -77,7 +81,7 @@ async def generate_briefing(
 )
 async def get_briefing_history(
     days: int = Query(default=7, ge=1, le=90),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db),
 ):
     """Get briefing history for the last N days."""
@@ -96,7 +100,7 @@ async def get_briefing_history(
 )
 async def mark_briefing_read(
     briefing_id: str,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db),
 ):
     """Mark a briefing as read."""
@@ -116,7 +120,7 @@ async def mark_briefing_read(
 )
 async def brain_dump(
     data: BrainDumpRequest,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db),
 ):
     """Parse free-text brain dump and create tasks automatically."""
@@ -3,9 +3,9 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.deps import get_current_user
+from app.api.deps import get_current_principal
 from app.core.database import get_db
-from app.models.user import User
+from app.core.principal import Principal
 from app.schemas.calendar import CalendarEventListResponse, CalendarEventResponse, CalendarStatusResponse
 from app.services.calendar import CalendarService
 
@@ -14,7 +14,7 @@ router = APIRouter(tags=["Calendar"])
 
 @router.get("/status", response_model=CalendarStatusResponse)
 async def get_calendar_status(
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db),
 ):
     service = CalendarService(db)
@@ -24,7 +24,7 @@ async def get_calendar_status(
 
 @router.get("/events", response_model=CalendarEventListResponse)
 async def get_today_events(
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db),
 ):
     service = CalendarService(db)
@@ -35,7 +35,7 @@ async def get_today_events(
 @router.get("/events/upcoming", response_model=CalendarEventListResponse)
 async def get_upcoming_events(
     hours: int = 24,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db),
 ):
     service = CalendarService(db)
@@ -45,7 +45,7 @@ async def get_upcoming_events(
 
 @router.post("/sync")
 async def sync_calendar(
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db),
 ):
     service = CalendarService(db)
@@ -56,7 +56,7 @@ async def sync_calendar(
 
 @router.delete("/disconnect")
 async def disconnect_calendar(
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db),
 ):
     service = CalendarService(db)
@@ -67,7 +67,7 @@ async def disconnect_calendar(
 
 @router.get("/auth/google")
 async def google_auth_start(
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
 ):
     from app.core.config import settings
     url = CalendarService.build_google_auth_url(settings.google_redirect_uri, str(current_user.id))
@@ -8,11 +8,11 @@ from fastapi import APIRouter, Depends, Query, status
 from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.deps import get_current_user
-from app.core.database import get_db
+from app.api.deps import get_current_principal
+from app.core.database import get_async_session, get_db
 from app.core.rate_limit import chat_rate_limit, standard_rate_limit
+from app.core.principal import Principal
 from app.models.message import MessageRole
-from app.models.user import User
 from app.schemas.chat import (
     MessageCreate,
     MessageResponse,
@@ -34,12 +34,15 @@ router = APIRouter(tags=["Chat"])
 )
 async def send_message(
     data: MessageCreate,
-    current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_principal),
 ):
     """
     Send a chat message and stream AI response.
 
+    The stream runs on its own session, split into short units of work
+    (conversation + user message, context loading, tool calls, assistant
+    message). No pooled DB connection is held while the LLM generates.
+
     - **content**: Message content (1-10000 characters)
     - **conversation_id**: Optional conversation ID (creates new if not provided)
 
@@ -60,96 +63,99 @@ async def send_message(
     data: {"message_id": "uuid", "total_tokens": 150}
     ```
     """
-    chat_service = ChatService(db)
+    user_id = current_user.id
 
     async def event_generator() -> AsyncGenerator[str, None]:
         """Generate SSE events for chat streaming."""
-        try:
-            # Create or get conversation
-            conversation = None
-            is_new = False
-
-            if data.conversation_id:
-                # Get existing conversation
-                conversation = await chat_service.get_conversation(
-                    conversation_id=data.conversation_id,
-                    user_id=current_user.id,
+        async with get_async_session() as db:
+            chat_service = ChatService(db)
+            try:
+                # Create or get conversation
+                conversation = None
+                is_new = False
+
+                if data.conversation_id:
+                    # Get existing conversation
+                    conversation = await chat_service.get_conversation(
+                        conversation_id=data.conversation_id,
+                        user_id=user_id,
+                    )
+                else:
+                    # Create new conversation
+                    conversation = await chat_service.create_conversation(
+                        user_id=user_id,
+                        title=None,  # Will be auto-generated later
+                    )
+                    is_new = True
+
+                # Send conversation info event
+                conversation_data = {
+                    "conversation_id": str(conversation.id),
+                    "is_new": is_new,
+                }
+                yield f"event: conversation\n"
+                yield f"data: {json.dumps(conversation_data)}\n\n"
+
+                # Save user message
+                user_message = await chat_service.save_message(
+                    conversation_id=conversation.id,
+                    role=MessageRole.USER,
+                    content=data.content,
                 )
-            else:
-                # Create new conversation
-                conversation = await chat_service.create_conversation(
-                    user_id=current_user.id,
-                    title=None,  # Will be auto-generated later
+
+                # Commit the user message
+                await db.commit()
+
+                # Stream AI response
+                full_response = ""
+                token_index = 0
+
+                async for token in chat_service.stream_ai_response(
+                    conversation_id=conversation.id,
+                    user_message=data.content,
+                    user_id=user_id,
+                ):
+                    full_response += token
+                    token_data = {
+                        "content": token,
+                        "index": token_index,
+                    }
+                    yield f"event: token\n"
+                    yield f"data: {json.dumps(token_data)}\n\n"
+                    token_index += 1
+
+                # Save assistant message
+                assistant_message = await chat_service.save_message(
+                    conversation_id=conversation.id,
+                    role=MessageRole.ASSISTANT,
+                    content=full_response,
+                    metadata={
+                        "model": "claude-3-5-sonnet-20241022",
+                        "total_tokens": len(full_response.split()),  # Simplified
+                    },
                 )
-                is_new = True
-
-            # Send conversation info event
-            conversation_data = {
-                "conversation_id": str(conversation.id),
-                "is_new": is_new,
-            }
-            yield f"event: conversation\n"
-            yield f"data: {json.dumps(conversation_data)}\n\n"
-
-            # Save user message
-            user_message = await chat_service.save_message(
-                conversation_id=conversation.id,
-                role=MessageRole.USER,
-                content=data.content,
-            )
-
-            # Commit the user message
-            await db.commit()
-
-            # Stream AI response
-            full_response = ""
-            token_index = 0
-
-            async for token in chat_service.stream_ai_response(
-                conversation_id=conversation.id,
-                user_message=data.content,
-                user_id=current_user.id,
-            ):
-                full_response += token
-                token_data = {
-                    "content": token,
-                    "index": token_index,
+
+                # Commit assistant message
+                await db.commit()
+
+                # Send done event
+                done_data = {
+                    "message_id": str(assistant_message.id),
+                    "conversation_id": str(conversation.id),
+                    "total_tokens": len(full_response.split()),
+                }
+                yield f"event: done\n"
+                yield f"data: {json.dumps(done_data)}\n\n"
+
+            except Exception as e:
+                # Discard the failed unit of work, then send error event
+                await db.rollback()
+                error_data = {
+                    "detail": str(e),
+                    "code": "STREAM_ERROR",
                 }
-                yield f"event: token\n"
-                yield f"data: {json.dumps(token_data)}\n\n"
-                token_index += 1
-
-            # Save assistant message
-            assistant_message = await chat_service.save_message(
-                conversation_id=conversation.id,
-                role=MessageRole.ASSISTANT,
-                content=full_response,
-                metadata={
-                    "model": "claude-3-5-sonnet-20241022",
-                    "total_tokens": len(full_response.split()),  # Simplified
-                },
-            )
-
-            # Commit assistant message
-            await db.commit()
-
-            # Send done event
-            done_data = {
-                "message_id": str(assistant_message.id),
-                "conversation_id": str(conversation.id),
-                "total_tokens": len(full_response.split()),
-            }
-            yield f"event: done\n"
-            yield f"data: {json.dumps(done_data)}\n\n"
-
-        except Exception as e:
-            # Send error event
-            error_data = {
-                "detail": str(e),
-                "code": "STREAM_ERROR",
-            }
-            yield f"event: error\n"
-            yield f"data: {json.dumps(error_data)}\n\n"
+                yield f"event: error\n"
+                yield f"data: {json.dumps(error_data)}\n\n"
 
     return StreamingResponse(
         event_generator(),
@@ -173,7 +179,7 @@ async def send_message(
 async def list_conversations(
     cursor: UUID | None = Query(None, description="Cursor for pagination"),
     limit: int = Query(20, ge=1, le=100, description="Number of items per page"),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db),
 ):
     """
@@ -218,7 +224,7 @@ async def get_conversation_messages(
     conversation_id: UUID,
     cursor: UUID | None = Query(None, description="Cursor for pagination"),
     limit: int = Query(50, ge=1, le=100, description="Number of messages per page"),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db),
 ):
     """
@@ -3,10 +3,10 @@
 from fastapi import APIRouter, Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.deps import get_current_user
+from app.api.deps import get_current_principal
 from app.core.database import get_db
 from app.core.rate_limit import standard_rate_limit
-from app.models.user import User
+from app.core.principal import Principal
 from app.schemas.dashboard import DashboardSummaryResponse
 from app.services.dashboard import DashboardService
 
@@ -21,7 +21,7 @@ router = APIRouter(tags=["Dashboard"])
     dependencies=[Depends(standard_rate_limit)],
 )
 async def get_dashboard_summary(
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db),
 ):
     """Get aggregated dashboard data: tasks, gamification, deadline, nudges, quote."""
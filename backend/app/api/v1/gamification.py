@@ -3,10 +3,10 @@
 from fastapi import APIRouter, Depends, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.deps import get_current_user
+from app.api.deps import get_current_principal
 from app.core.database import get_db
 from app.core.rate_limit import standard_rate_limit
-from app.models.user import User
+from app.core.principal import Principal
 from app.schemas.gamification import (
     AchievementListResponse,
     GamificationStatsResponse,
@@ -26,7 +26,7 @@ router = APIRouter(tags=["Gamification"])
     dependencies=[Depends(standard_rate_limit)],
 )
 async def get_stats(
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db),
 ):
     """Get current XP, level, streak, and progress for the authenticated user."""
@@ -42,7 +42,7 @@ async def get_stats(
 )
 async def get_history(
     days: int = Query(30, ge=1, le=365, description="Number of days back (max 365)"),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db),
 ):
     """Get XP history per day for charts and progress visualizations."""
@@ -58,7 +58,7 @@ async def get_history(
     dependencies=[Depends(standard_rate_limit)],
 )
 async def get_achievements(
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db),
 ):
     """Get all achievements with unlock status for the authenticated user."""
@@ -5,8 +5,13 @@ from sqlalchemy import text
 from redis.asyncio import Redis
 
 from app import __version__
-from app.core.database import engine
+from app.core.database import AsyncSessionLocal, engine, pool_metrics
 from app.core.config import settings
+from app.core.security import password_hasher
+from app.services.embedding_worker import worker_metrics as embedding_metrics
+from app.services.episode_queue import get_queue_stats
+from app.services.notification import receipt_tracker
+from app.services.scheduler import scheduler_metrics
 
 
 router = APIRouter(tags=["Health"])
@@ -23,7 +28,10 @@ async def health_check():
     Health check endpoint.
 
     Returns:
-        dict: Health status of the API and services
+        dict: Health status of the API and services, plus DB pool checkout
+            metrics, episode queue depth/lag, password hashing queue metrics
+            scheduler tick/stage timings, pending push receipts and embedding
+            worker counters
     """
     services = {
         "db": "unknown",
@@ -51,6 +59,13 @@ async def health_check():
     except Exception as e:
         services["redis"] = f"error: {str(e)}"
 
+    # Episode queue depth and lag
+    try:
+        async with AsyncSessionLocal() as db:
+            episode_queue = await get_queue_stats(db)
+    except Exception as e:
+        episode_queue = {"error": str(e)}
+
     # Determine overall status
     overall_status = "healthy" if all(
         status == "ok" for status in services.values()
@@ -60,4 +75,10 @@ async def health_check():
         "status": overall_status,
         "version": __version__,
         "services": services,
+        "db_pool": pool_metrics.snapshot(),
+        "episode_queue": episode_queue,
+        "password_hashing": password_hasher.snapshot(),
+        "scheduler": scheduler_metrics.snapshot(),
+        "push_receipts_pending": len(receipt_tracker),
+        "embedding_worker": embedding_metrics.snapshot(),
     }
@@ -3,9 +3,9 @@
 from fastapi import APIRouter, Depends, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.deps import get_current_user
+from app.api.deps import get_current_principal
 from app.core.database import get_db
-from app.models.user import User
+from app.core.principal import Principal
 from app.schemas.memory import (
     MemorySettingsUpdate,
     MemoryStatusResponse,
@@ -24,7 +24,7 @@ router = APIRouter(tags=["Memory"])
     description="Returns current memory/knowledge graph status including entity counts and last analysis timestamp.",
 )
 async def get_memory_status(
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db),
 ):
     """Get the memory system status for the authenticated user."""
@@ -41,7 +41,7 @@ async def get_memory_status(
     "Implements DSGVO Art. 15 (Right of Access).",
 )
 async def export_memory(
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db),
 ):
     """Export all memory data for DSGVO Art. 15 compliance."""
@@ -69,7 +69,7 @@ async def export_memory(
     "Implements DSGVO Art. 17 (Right to Erasure).",
 )
 async def delete_memory(
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db),
 ):
     """Delete all memory data for DSGVO Art. 17 compliance."""
@@ -87,7 +87,7 @@ async def delete_memory(
 )
 async def update_memory_settings(
     data: MemorySettingsUpdate,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db),
 ):
     """Update memory settings (enable/disable learning)."""
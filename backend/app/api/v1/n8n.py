@@ -5,9 +5,9 @@ from uuid import UUID
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.deps import get_current_user
+from app.api.deps import get_current_principal
 from app.core.database import get_db
-from app.models.user import User
+from app.core.principal import Principal
 from app.schemas.n8n import (
     N8nExecuteRequest, N8nExecuteResponse, N8nWorkflowCreate,
     N8nWorkflowListResponse, N8nWorkflowResponse, N8nWorkflowUpdate,
@@ -19,7 +19,7 @@ router = APIRouter(tags=["n8n"])
 
 @router.get("/workflows", response_model=N8nWorkflowListResponse)
 async def list_workflows(
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db),
 ):
     from app.models.n8n_workflow import N8nWorkflow
@@ -50,7 +50,7 @@ async def list_workflows(
 @router.post("/workflows", response_model=N8nWorkflowResponse, status_code=201)
 async def create_workflow(
     body: N8nWorkflowCreate,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db),
 ):
     service = N8nBridgeService(db)
@@ -77,7 +77,7 @@ async def create_workflow(
 @router.delete("/workflows/{workflow_id}")
 async def delete_workflow(
     workflow_id: UUID,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db),
 ):
     service = N8nBridgeService(db)
@@ -92,7 +92,7 @@ async def delete_workflow(
 async def execute_workflow(
     workflow_id: UUID,
     body: N8nExecuteRequest,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db),
 ):
     service = N8nBridgeService(db)
@@ -5,10 +5,10 @@ from uuid import UUID
 from fastapi import APIRouter, Depends, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.deps import get_current_user
+from app.api.deps import get_current_principal
 from app.core.database import get_db
 from app.core.rate_limit import standard_rate_limit
-from app.models.user import User
+from app.core.principal import Principal
 from app.schemas.nudge import (
     NudgeAcknowledgeResponse,
     NudgeHistoryResponse,
@@ -27,7 +27,7 @@ router = APIRouter(tags=["Nudges"])
     dependencies=[Depends(standard_rate_limit)],
 )
 async def get_active_nudges(
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db),
 ):
     """Get all active (unacknowledged) nudges for the authenticated user."""
@@ -43,7 +43,7 @@ async def get_active_nudges(
 )
 async def acknowledge_nudge(
     nudge_id: UUID,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db),
 ):
     """Acknowledge a nudge (mark as read)."""
@@ -60,7 +60,7 @@ async def acknowledge_nudge(
 async def get_nudge_history(
     cursor: UUID | None = Query(None, description="Cursor for pagination"),
     limit: int = Query(50, ge=1, le=100, description="Items per page"),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db),
 ):
     """Get paginated nudge history (including acknowledged nudges)."""
@@ -5,10 +5,10 @@ from uuid import UUID
 from fastapi import APIRouter, Depends, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.deps import get_current_user
+from app.api.deps import get_current_principal
 from app.core.database import get_db
 from app.core.rate_limit import standard_rate_limit
-from app.models.user import User
+from app.core.principal import Principal
 from app.schemas.personality import (
     PersonalityProfileCreate,
     PersonalityProfileUpdate,
@@ -30,7 +30,7 @@ router = APIRouter(tags=["Personality"])
 )
 async def create_profile(
     data: PersonalityProfileCreate,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db),
 ):
     """Create a new personality profile, optionally based on a template."""
@@ -47,7 +47,7 @@ async def create_profile(
     dependencies=[Depends(standard_rate_limit)],
 )
 async def list_profiles(
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db),
 ):
     """Get all personality profiles for the authenticated user."""
@@ -65,7 +65,7 @@ async def list_profiles(
 )
 async def get_profile(
     profile_id: UUID,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db),
 ):
     """Get a specific personality profile by ID."""
@@ -84,7 +84,7 @@ async def get_profile(
 async def update_profile(
     profile_id: UUID,
     data: PersonalityProfileUpdate,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db),
 ):
     """Update an existing personality profile."""
@@ -101,7 +101,7 @@ async def update_profile(
 )
 async def delete_profile(
     profile_id: UUID,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db),
 ):
     """Delete a personality profile. Active profiles cannot be deleted."""
@@ -118,7 +118,7 @@ async def delete_profile(
 )
 async def activate_profile(
     profile_id: UUID,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db),
 ):
     """Activate a personality profile. Deactivates the currently active one."""
@@ -135,7 +135,7 @@ async def activate_profile(
     dependencies=[Depends(standard_rate_limit)],
 )
 async def list_templates(
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db),
 ):
     """Get all available personality templates."""
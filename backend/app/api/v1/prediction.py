@@ -7,10 +7,10 @@ from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy import select, func
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.deps import get_current_user
+from app.api.deps import get_current_principal
 from app.core.database import get_db
+from app.core.principal import Principal
 from app.models.predicted_pattern import PredictedPattern, PredictionStatus
-from app.models.user import User
 from app.schemas.prediction import (
     PredictionListResponse,
     PredictionResolveRequest,
@@ -24,7 +24,7 @@ router = APIRouter(tags=["Predictions"])
 
 @router.get("/active", response_model=PredictionListResponse)
 async def get_active_predictions(
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db),
 ):
     """Get all active predictions for the current user."""
@@ -49,7 +49,7 @@ async def get_active_predictions(
 async def get_prediction_history(
     limit: int = 20,
     offset: int = 0,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db),
 ):
     """Get prediction history for the current user."""
@@ -80,7 +80,7 @@ async def get_prediction_history(
 async def resolve_prediction(
     prediction_id: UUID,
     body: PredictionResolveRequest,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db),
 ):
     """Resolve a prediction as confirmed or avoided."""
@@ -104,7 +104,7 @@ async def resolve_prediction(
 
 @router.post("/run")
 async def run_predictions(
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db),
 ):
     """Manually trigger prediction engine for the current user."""
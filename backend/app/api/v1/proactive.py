@@ -7,10 +7,10 @@ from fastapi import APIRouter, Depends, Query, status
 from pydantic import BaseModel, Field
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.deps import get_current_user
+from app.api.deps import get_current_principal
 from app.core.database import get_db
 from app.core.rate_limit import standard_rate_limit
-from app.models.user import User
+from app.core.principal import Principal
 from app.schemas.proactive import MentionedItemResponse, MentionedItemConvertRequest
 from app.services.proactive import ProactiveService
 
@@ -36,7 +36,7 @@ async def list_mentioned_items(
     limit: int = Query(20, ge=1, le=100, description="Items per page"),
     item_status: str | None = Query(None, alias="status", description="Filter by status"),
     item_type: str | None = Query(None, description="Filter by item type"),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db),
 ):
     """Get paginated list of mentioned items extracted from chat."""
@@ -67,7 +67,7 @@ async def list_mentioned_items(
 async def convert_mentioned_item(
     item_id: UUID,
     data: MentionedItemConvertRequest,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db),
 ):
     """Convert a mentioned item to a task or brain entry."""
@@ -85,7 +85,7 @@ async def convert_mentioned_item(
 )
 async def dismiss_mentioned_item(
     item_id: UUID,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db),
 ):
     """Dismiss a mentioned item."""
@@ -104,7 +104,7 @@ async def dismiss_mentioned_item(
 async def snooze_mentioned_item(
     item_id: UUID,
     data: SnoozeRequest,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db),
 ):
     """Snooze a mentioned item until a specified time."""
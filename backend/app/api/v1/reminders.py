@@ -7,21 +7,22 @@ from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy import select, func
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.deps import get_current_user
+from app.api.deps import get_current_principal
 from app.core.database import get_db
+from app.core.principal import Principal
 from app.models.reminder import Reminder, ReminderStatus
-from app.models.user import User
 from app.schemas.reminder import (
     ReminderCreate, ReminderListResponse, ReminderResponse,
     ReminderSnoozeRequest, ReminderUpdate,
 )
+from app.services.job_schedule import hint_job
 
 router = APIRouter(tags=["Reminders"])
 
 
 @router.get("", response_model=ReminderListResponse)
 async def list_reminders(
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db),
 ):
     count_stmt = select(func.count()).select_from(Reminder).where(Reminder.user_id == current_user.id)
@@ -55,7 +56,7 @@ async def list_reminders(
 
 @router.get("/upcoming", response_model=ReminderListResponse)
 async def list_upcoming_reminders(
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db),
 ):
     stmt = (
@@ -91,7 +92,7 @@ async def list_upcoming_reminders(
 @router.post("", response_model=ReminderResponse, status_code=201)
 async def create_reminder(
     body: ReminderCreate,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db),
 ):
     reminder = Reminder(
@@ -106,6 +107,7 @@ async def create_reminder(
         linked_event_id=UUID(body.linked_event_id) if body.linked_event_id else None,
     )
     db.add(reminder)
+    await hint_job(db, current_user.id, "reminders", reminder.remind_at)
     await db.commit()
     await db.refresh(reminder)
 
@@ -130,7 +132,7 @@ async def create_reminder(
 async def update_reminder(
     reminder_id: UUID,
     body: ReminderUpdate,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db),
 ):
     stmt = select(Reminder).where(Reminder.id == reminder_id, Reminder.user_id == current_user.id)
@@ -143,6 +145,8 @@ async def update_reminder(
     for key, value in update_data.items():
         setattr(reminder, key, value)
 
+    if update_data.get("remind_at"):
+        await hint_job(db, current_user.id, "reminders", reminder.remind_at)
     await db.commit()
     await db.refresh(reminder)
 
@@ -165,7 +169,7 @@ async def update_reminder(
 @router.delete("/{reminder_id}")
 async def delete_reminder(
     reminder_id: UUID,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db),
 ):
     stmt = select(Reminder).where(Reminder.id == reminder_id, Reminder.user_id == current_user.id)
@@ -183,7 +187,7 @@ async def delete_reminder(
 async def snooze_reminder(
     reminder_id: UUID,
     body: ReminderSnoozeRequest,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db),
 ):
     stmt = select(Reminder).where(Reminder.id == reminder_id, Reminder.user_id == current_user.id)
@@ -216,7 +220,7 @@ async def snooze_reminder(
 @router.post("/{reminder_id}/dismiss", response_model=ReminderResponse)
 async def dismiss_reminder(
     reminder_id: UUID,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db),
 ):
     stmt = select(Reminder).where(Reminder.id == reminder_id, Reminder.user_id == current_user.id)
@@ -5,10 +5,10 @@ from fastapi.responses import Response
 from pydantic import BaseModel, Field
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.deps import get_current_user
+from app.api.deps import get_current_principal
 from app.core.database import get_db
 from app.core.rate_limit import standard_rate_limit
-from app.models.user import User
+from app.core.principal import Principal
 from app.schemas.modules import ModulesResponse, ModulesUpdate, ModuleConfigUpdate, ModuleInfoResponse
 from app.schemas.settings import (
     ADHSSettingsResponse,
@@ -41,7 +41,7 @@ router = APIRouter(tags=["Settings"])
     dependencies=[Depends(standard_rate_limit)],
 )
 async def get_adhs_settings(
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db),
 ):
     """Get ADHS settings for the authenticated user (defaults if none exist)."""
@@ -57,7 +57,7 @@ async def get_adhs_settings(
 )
 async def update_adhs_settings(
     data: ADHSSettingsUpdate,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db),
 ):
     """Update ADHS settings (partial update: only provided fields are changed)."""
@@ -73,7 +73,7 @@ async def update_adhs_settings(
 )
 async def register_push_token(
     data: PushTokenRequest,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db),
 ):
     """Register or update the Expo push notification token for the authenticated user."""
@@ -90,7 +90,7 @@ async def register_push_token(
 )
 async def complete_onboarding(
     data: OnboardingRequest,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db),
 ):
     """
@@ -118,7 +118,7 @@ async def complete_onboarding(
     dependencies=[Depends(standard_rate_limit)],
 )
 async def get_api_keys(
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db),
 ):
     """
@@ -138,7 +138,7 @@ async def get_api_keys(
 )
 async def save_api_keys(
     data: ApiKeyUpdate,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db),
 ):
     """
@@ -158,7 +158,7 @@ async def save_api_keys(
     dependencies=[Depends(standard_rate_limit)],
 )
 async def get_voice_providers(
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db),
 ):
     """Get voice provider settings (STT and TTS) for the authenticated user."""
@@ -174,7 +174,7 @@ async def get_voice_providers(
 )
 async def update_voice_providers(
     data: VoiceProviderUpdate,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db),
 ):
     """
@@ -199,7 +199,7 @@ async def update_voice_providers(
     dependencies=[Depends(standard_rate_limit)],
 )
 async def get_ai_provider(
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db),
 ):
     """Get current AI provider setting (anthropic or custom)."""
@@ -215,7 +215,7 @@ async def get_ai_provider(
 )
 async def update_ai_provider(
     data: AIProviderUpdate,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db),
 ):
     """
@@ -240,7 +240,7 @@ async def update_ai_provider(
     dependencies=[Depends(standard_rate_limit)],
 )
 async def get_modules(
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db),
 ):
     """Get all available modules and their active/config state for the authenticated user."""
@@ -256,7 +256,7 @@ async def get_modules(
 )
 async def update_modules(
     data: ModulesUpdate,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db),
 ):
     """Update which modules are active for the authenticated user."""
@@ -273,7 +273,7 @@ async def update_modules(
 async def update_module_config(
     module_name: str,
     data: ModuleConfigUpdate,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db),
 ):
     """Update configuration for a single module."""
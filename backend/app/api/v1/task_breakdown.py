@@ -5,10 +5,10 @@ from uuid import UUID
 from fastapi import APIRouter, Depends, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.deps import get_current_user
+from app.api.deps import get_current_principal
 from app.core.database import get_db
 from app.core.rate_limit import RateLimiter, standard_rate_limit
-from app.models.user import User
+from app.core.principal import Principal
 from app.schemas.task_breakdown import (
     BreakdownConfirmRequest,
     BreakdownConfirmResponse,
@@ -20,7 +20,7 @@ from app.services.task_breakdown import TaskBreakdownService
 router = APIRouter(tags=["Task Breakdown"])
 
 # AI endpoint has stricter rate limit
-ai_rate_limit = RateLimiter(times=10, seconds=60)
+ai_rate_limit = RateLimiter(times=10, seconds=60, name="ai_breakdown")
 
 
 @router.post(
@@ -31,7 +31,7 @@ ai_rate_limit = RateLimiter(times=10, seconds=60)
 )
 async def generate_breakdown(
     task_id: UUID,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db),
 ):
     """Generate AI-powered sub-task suggestions for a task (3-7 steps)."""
@@ -49,7 +49,7 @@ async def generate_breakdown(
 async def confirm_breakdown(
     task_id: UUID,
     data: BreakdownConfirmRequest,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db),
 ):
     """Confirm and create sub-tasks from a breakdown suggestion."""
@@ -5,10 +5,10 @@ from uuid import UUID
 from fastapi import APIRouter, Depends, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.deps import get_current_user
+from app.api.deps import get_current_principal
 from app.core.database import get_db
 from app.core.rate_limit import standard_rate_limit
-from app.models.user import User
+from app.core.principal import Principal
 from app.schemas.task import TaskCreate, TaskUpdate, TaskResponse, TaskCompleteResponse
 from app.services.task import TaskService
 
@@ -25,7 +25,7 @@ router = APIRouter(tags=["Tasks"])
 )
 async def create_task(
     data: TaskCreate,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db),
 ):
     """Create a new task for the authenticated user."""
@@ -47,7 +47,7 @@ async def list_tasks(
     task_status: str | None = Query(None, alias="status", description="Filter by status"),
     priority: str | None = Query(None, description="Filter by priority"),
     tags: list[str] | None = Query(None, description="Filter by tags"),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db),
 ):
     """Get paginated list of tasks for the authenticated user."""
@@ -77,7 +77,7 @@ async def list_tasks(
     dependencies=[Depends(standard_rate_limit)],
 )
 async def get_today_tasks(
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db),
 ):
     """Get tasks due today or currently in progress for today."""
@@ -95,7 +95,7 @@ async def get_today_tasks(
 )
 async def get_task(
     task_id: UUID,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db),
 ):
     """Get a specific task by ID."""
@@ -114,7 +114,7 @@ async def get_task(
 async def update_task(
     task_id: UUID,
     data: TaskUpdate,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db),
 ):
     """Update an existing task."""
@@ -131,7 +131,7 @@ async def update_task(
 )
 async def delete_task(
     task_id: UUID,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db),
 ):
     """Delete a task."""
@@ -148,7 +148,7 @@ async def delete_task(
 )
 async def complete_task(
     task_id: UUID,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db),
 ):
     """Complete a task and earn XP."""
@@ -6,10 +6,10 @@ from fastapi.responses import Response
 from pydantic import BaseModel, Field
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.deps import get_current_user
+from app.api.deps import get_current_principal
 from app.core.database import get_db
 from app.core.rate_limit import standard_rate_limit
-from app.models.user import User
+from app.core.principal import Principal
 from app.services.voice.factory import get_stt_provider, get_tts_provider
 
 
@@ -38,7 +38,7 @@ class SynthesizeRequest(BaseModel):
 )
 async def transcribe_audio(
     file: UploadFile = File(..., description="Audio file (wav, mp3, webm, m4a)"),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db),
 ):
     """Transcribe uploaded audio file to text using the user's configured STT provider."""
@@ -90,7 +90,7 @@ async def transcribe_audio(
 )
 async def synthesize_speech(
     data: SynthesizeRequest,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db),
 ):
     """Synthesize text to audio using the user's configured TTS provider."""
@@ -5,9 +5,9 @@ from uuid import UUID
 from fastapi import APIRouter, Depends, HTTPException, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.deps import get_current_user
+from app.api.deps import get_current_principal
 from app.core.database import get_db
-from app.models.user import User
+from app.core.principal import Principal
 from app.schemas.webhook import (
     WebhookCreate, WebhookListResponse, WebhookLogListResponse,
     WebhookLogResponse, WebhookResponse, WebhookUpdate,
@@ -19,7 +19,7 @@ router = APIRouter(tags=["Webhooks"])
 
 @router.get("", response_model=WebhookListResponse)
 async def list_webhooks(
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db),
 ):
     from app.models.webhook import WebhookConfig
@@ -48,7 +48,7 @@ async def list_webhooks(
 @router.post("", response_model=WebhookResponse, status_code=201)
 async def create_webhook(
     body: WebhookCreate,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db),
 ):
     service = WebhookService(db)
@@ -72,7 +72,7 @@ async def create_webhook(
 @router.delete("/{webhook_id}")
 async def delete_webhook(
     webhook_id: UUID,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db),
 ):
     service = WebhookService(db)
@@ -87,7 +87,7 @@ async def delete_webhook(
 async def get_webhook_logs(
     webhook_id: UUID,
     limit: int = 50,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db),
 ):
     from app.models.webhook import WebhookLog
@@ -3,10 +3,10 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.deps import get_current_user
+from app.api.deps import get_current_principal
 from app.core.database import get_db
 from app.core.rate_limit import standard_rate_limit
-from app.models.user import User
+from app.core.principal import Principal
 from app.schemas.wellbeing import (
     InterventionAction,
     InterventionResponse,
@@ -25,7 +25,7 @@ router = APIRouter(tags=["Wellbeing"])
     dependencies=[Depends(standard_rate_limit)],
 )
 async def get_wellbeing_score(
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db),
 ):
     """Get the latest wellbeing score. Calculates a new one if none exists or if stale."""
@@ -45,7 +45,7 @@ async def get_wellbeing_score(
 )
 async def get_wellbeing_history(
     days: int = Query(default=7, ge=1, le=90),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db),
 ):
     """Get wellbeing score history for the last N days."""
@@ -66,7 +66,7 @@ async def get_wellbeing_history(
     dependencies=[Depends(standard_rate_limit)],
 )
 async def get_interventions(
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db),
 ):
     """Get all pending interventions for the current user."""
@@ -83,7 +83,7 @@ async def get_interventions(
 async def update_intervention(
     intervention_id: str,
     data: InterventionAction,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db),
 ):
     """Update intervention status: dismiss or act."""
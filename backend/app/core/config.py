@@ -29,27 +29,66 @@ class Settings(BaseSettings):
     postgres_user: str = Field(default="alice", alias="POSTGRES_USER")
     postgres_password: str = Field(default="alice_dev_123", alias="POSTGRES_PASSWORD")
     database_url: str | None = Field(default=None, alias="DATABASE_URL")
+    db_pool_slow_hold_seconds: float = Field(default=5.0, alias="DB_POOL_SLOW_HOLD_SECONDS")
 
     # Redis (points to FalkorDB, which is Redis-compatible)
     redis_host: str = Field(default="falkordb", alias="REDIS_HOST")
     redis_port: int = Field(default=6379, alias="REDIS_PORT")
     redis_url: str | None = Field(default=None, alias="REDIS_URL")
 
+    # Rate limiting (Redis sliding window, in-process fallback)
+    rate_limit_redis_enabled: bool = Field(default=True, alias="RATE_LIMIT_REDIS_ENABLED")
+    rate_limit_redis_timeout_seconds: float = Field(default=0.5, alias="RATE_LIMIT_REDIS_TIMEOUT_SECONDS")
+    rate_limit_local_max_keys: int = Field(default=10000, alias="RATE_LIMIT_LOCAL_MAX_KEYS")
+
     # FalkorDB / Graphiti
     falkordb_host: str = Field(default="falkordb", alias="FALKORDB_HOST")
     falkordb_port: int = Field(default=6379, alias="FALKORDB_PORT")
     graphiti_enabled: bool = Field(default=True, alias="GRAPHITI_ENABLED")
 
+    # Background scheduler
+    scheduler_concurrency: int = Field(default=10, alias="SCHEDULER_CONCURRENCY")
+    scheduler_stage_timeout_seconds: float = Field(default=120.0, alias="SCHEDULER_STAGE_TIMEOUT_SECONDS")
+    scheduler_rehydrate_seconds: float = Field(default=60.0, alias="SCHEDULER_REHYDRATE_SECONDS")
+    scheduler_job_lease_seconds: float = Field(default=600.0, alias="SCHEDULER_JOB_LEASE_SECONDS")
+    # Users are split into this many shards; each replica leads at most one
+    scheduler_shards: int = Field(default=1, alias="SCHEDULER_SHARDS")
+    scheduler_leader_retry_seconds: float = Field(default=15.0, alias="SCHEDULER_LEADER_RETRY_SECONDS")
+
+    # Expo push delivery receipts (Expo recommends checking ~15 minutes after sending)
+    push_receipt_delay_seconds: float = Field(default=900.0, alias="PUSH_RECEIPT_DELAY_SECONDS")
+    push_receipt_max_pending: int = Field(default=50000, alias="PUSH_RECEIPT_MAX_PENDING")
+
+    # Episode processing queue (Graphiti + NLP analysis after conversations)
+    episode_idle_seconds: float = Field(default=120.0, alias="EPISODE_IDLE_SECONDS")
+    episode_max_delay_seconds: float = Field(default=900.0, alias="EPISODE_MAX_DELAY_SECONDS")
+    episode_worker_concurrency: int = Field(default=4, alias="EPISODE_WORKER_CONCURRENCY")
+    episode_worker_poll_seconds: float = Field(default=5.0, alias="EPISODE_WORKER_POLL_SECONDS")
+
+    # Brain embeddings (vector search): "openai" or "local" (deterministic hashing)
+    embedding_provider: str = Field(default="openai", alias="EMBEDDING_PROVIDER")
+    embedding_model: str = Field(default="text-embedding-3-small", alias="EMBEDDING_MODEL")
+    embedding_batch_size: int = Field(default=64, alias="EMBEDDING_BATCH_SIZE")
+    embedding_worker_poll_seconds: float = Field(default=5.0, alias="EMBEDDING_WORKER_POLL_SECONDS")
+
     # JWT
     jwt_secret_key: str = Field(default="change-me-in-production", alias="JWT_SECRET_KEY")
     jwt_access_token_expire_minutes: int = Field(default=15, alias="JWT_ACCESS_TOKEN_EXPIRE_MINUTES")
     jwt_refresh_token_expire_days: int = Field(default=7, alias="JWT_REFRESH_TOKEN_EXPIRE_DAYS")
     jwt_algorithm: str = Field(default="HS256")
+    password_hash_workers: int = Field(default=2, alias="PASSWORD_HASH_WORKERS")
+    auth_principal_cache_ttl_seconds: float = Field(default=30.0, alias="AUTH_PRINCIPAL_CACHE_TTL_SECONDS")
+    auth_principal_cache_max_entries: int = Field(default=10000, alias="AUTH_PRINCIPAL_CACHE_MAX_ENTRIES")
 
     # AI
     anthropic_api_key: str = Field(default="", alias="ANTHROPIC_API_KEY")
     openai_api_key: str = Field(default="", alias="OPENAI_API_KEY")
 
+    # Chat system prompt assembly
+    prompt_context_cache_ttl_seconds: float = Field(default=120.0, alias="PROMPT_CONTEXT_CACHE_TTL_SECONDS")
+    prompt_context_cache_max_entries: int = Field(default=10000, alias="PROMPT_CONTEXT_CACHE_MAX_ENTRIES")
+    prompt_memory_budget_seconds: float = Field(default=0.8, alias="PROMPT_MEMORY_BUDGET_SECONDS")
+
     # Custom LLM (vLLM / OpenAI-compatible)
     custom_llm_base_url: str = Field(default="", alias="CUSTOM_LLM_BASE_URL")
     custom_llm_model: str = Field(default="Qwen/Qwen2.5-14B-Instruct-AWQ", alias="CUSTOM_LLM_MODEL")
@@ -63,6 +102,14 @@ class Settings(BaseSettings):
     # Tavily Research API
     tavily_api_key: str = Field(default="", alias="TAVILY_API_KEY")
 
+    # Outbound HTTP (shared connection pools)
+    http2_enabled: bool = Field(default=True, alias="HTTP2_ENABLED")
+    http_max_connections: int = Field(default=100, alias="HTTP_MAX_CONNECTIONS")
+    http_max_keepalive_connections: int = Field(default=20, alias="HTTP_MAX_KEEPALIVE_CONNECTIONS")
+    http_keepalive_expiry_seconds: float = Field(default=60.0, alias="HTTP_KEEPALIVE_EXPIRY_SECONDS")
+    http_timeout_seconds: float = Field(default=30.0, alias="HTTP_TIMEOUT_SECONDS")
+    http_connect_timeout_seconds: float = Field(default=10.0, alias="HTTP_CONNECT_TIMEOUT_SECONDS")
+
     # LangGraph Feature Flag
     use_langgraph: bool = Field(default=False, alias="USE_LANGGRAPH")
 
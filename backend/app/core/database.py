@@ -1,8 +1,11 @@
 """Database configuration and session management."""
 
+import logging
+import time
 from contextlib import asynccontextmanager
 from typing import AsyncGenerator
 import sqlalchemy as sa
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import (
     AsyncSession,
     create_async_engine,
@@ -12,6 +15,8 @@ from sqlalchemy.pool import NullPool
 
 from app.core.config import settings
 
+logger = logging.getLogger(__name__)
+
 
 # Create async engine
 engine = create_async_engine(
@@ -22,6 +27,65 @@ engine = create_async_engine(
     pool_pre_ping=True,
 )
 
+
+
+class PoolMetrics:
+    """
+    Connection pool checkout metrics.
+
+    Tracks how long pooled connections stay checked out. Long hold times
+    mean a session kept its transaction open across slow awaits (LLM, TTS,
+    HTTP) and starved other requests of connections.
+    """
+
+    def __init__(self, slow_hold_seconds: float):
+        """Initialize counters.
+
+        Args:
+            slow_hold_seconds: Hold time above which a checkout is logged
+        """
+        self.slow_hold_seconds = slow_hold_seconds
+        self.checkouts = 0
+        self.checked_out = 0
+        self.total_hold_seconds = 0.0
+        self.max_hold_seconds = 0.0
+        self.slow_checkouts = 0
+
+    def on_checkout(self, dbapi_connection, connection_record, connection_proxy) -> None:
+        """Record the checkout start time on the connection record."""
+        connection_record.info["checkout_at"] = time.monotonic()
+        self.checkouts += 1
+        self.checked_out += 1
+
+    def on_checkin(self, dbapi_connection, connection_record) -> None:
+        """Record how long the connection was held."""
+        started = connection_record.info.pop("checkout_at", None)
+        if started is None:
+            return
+        held = time.monotonic() - started
+        self.checked_out = max(self.checked_out - 1, 0)
+        self.total_hold_seconds += held
+        self.max_hold_seconds = max(self.max_hold_seconds, held)
+        if held >= self.slow_hold_seconds:
+            self.slow_checkouts += 1
+            logger.warning("DB connection held for %.2fs before checkin", held)
+
+    def snapshot(self) -> dict:
+        """Return the current metrics as a dict."""
+        avg = self.total_hold_seconds / self.checkouts if self.checkouts else 0.0
+        return {
+            "checkouts": self.checkouts,
+            "checked_out": self.checked_out,
+            "avg_hold_ms": round(avg * 1000, 1),
+            "max_hold_ms": round(self.max_hold_seconds * 1000, 1),
+            "slow_checkouts": self.slow_checkouts,
+        }
+
+
+pool_metrics = PoolMetrics(slow_hold_seconds=settings.db_pool_slow_hold_seconds)
+event.listen(engine.sync_engine, "checkout", pool_metrics.on_checkout)
+event.listen(engine.sync_engine, "checkin", pool_metrics.on_checkin)
+
 # Create async session factory
 AsyncSessionLocal = async_sessionmaker(
     engine,
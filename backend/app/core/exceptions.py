@@ -225,11 +225,12 @@ class MentionedItemAlreadyConvertedError(AliceException):
 class RateLimitExceededError(AliceException):
     """Rate limit exceeded."""
 
-    def __init__(self, detail: str = "Too many requests"):
+    def __init__(self, detail: str = "Too many requests", headers: dict[str, str] | None = None):
         super().__init__(
             detail=detail,
             code="RATE_LIMIT_EXCEEDED",
             status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            headers=headers,
         )
 
 
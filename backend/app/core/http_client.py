@@ -0,0 +1,96 @@
+"""Shared outbound HTTP clients with pooled keep-alive connections.
+
+All external API calls (Anthropic, Expo push, Google Calendar, STT/TTS
+providers, webhooks, n8n) go through long-lived ``httpx.AsyncClient``
+instances from this registry instead of creating a client per request.
+This reuses TCP+TLS connections across requests and tool-loop iterations.
+
+Each upstream gets its own named client so pool limits apply per host.
+Clients are created lazily and closed in the application lifespan.
+
+Example:
+    ```python
+    client = get_http_client("anthropic")
+    response = await client.post(url, json=payload, timeout=30.0)
+    ```
+"""
+
+import logging
+
+import httpx
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+try:
+    import h2  # noqa: F401
+
+    HTTP2_AVAILABLE = True
+except ImportError:  # pragma: no cover - h2 ships with httpx[http2]
+    HTTP2_AVAILABLE = False
+
+
+class HTTPClientRegistry:
+    """Process-wide registry of named, pooled httpx clients."""
+
+    def __init__(self):
+        """Initialize an empty registry."""
+        self._clients: dict[str, httpx.AsyncClient] = {}
+
+    def get(self, name: str = "default") -> httpx.AsyncClient:
+        """
+        Get the shared client for an upstream, creating it on first use.
+
+        Args:
+            name: Upstream name (e.g. "anthropic", "expo", "google")
+
+        Returns:
+            httpx.AsyncClient: Pooled client for this upstream
+        """
+        client = self._clients.get(name)
+        if client is None or client.is_closed:
+            client = self._create_client()
+            self._clients[name] = client
+            logger.debug("Created pooled HTTP client '%s'", name)
+        return client
+
+    @staticmethod
+    def _create_client() -> httpx.AsyncClient:
+        """Create a client with the configured pool limits and HTTP/2 support."""
+        return httpx.AsyncClient(
+            http2=settings.http2_enabled and HTTP2_AVAILABLE,
+            timeout=httpx.Timeout(
+                settings.http_timeout_seconds,
+                connect=settings.http_connect_timeout_seconds,
+            ),
+            limits=httpx.Limits(
+                max_connections=settings.http_max_connections,
+                max_keepalive_connections=settings.http_max_keepalive_connections,
+                keepalive_expiry=settings.http_keepalive_expiry_seconds,
+            ),
+        )
+
+    async def close(self) -> None:
+        """Close all clients and release their pooled connections."""
+        clients = list(self._clients.values())
+        self._clients.clear()
+        for client in clients:
+            try:
+                await client.aclose()
+            except Exception:
+                logger.warning("Failed to close pooled HTTP client", exc_info=True)
+
+
+# Global registry instance
+http_clients = HTTPClientRegistry()
+
+
+def get_http_client(name: str = "default") -> httpx.AsyncClient:
+    """Get the shared pooled client for an upstream."""
+    return http_clients.get(name)
+
+
+async def close_http_clients() -> None:
+    """Close all shared HTTP clients (called on application shutdown)."""
+    await http_clients.close()
@@ -0,0 +1,88 @@
+"""Authenticated principal and its short-lived cache.
+
+Most routes only need the caller's user ID, but still have to make sure
+the account exists and is active. Instead of loading the full ``User`` row
+on every request, the auth dependency resolves a lightweight ``Principal``
+from the verified JWT and caches the account state for a few seconds.
+
+The cache is per process. Call ``invalidate_principal`` whenever an
+account is disabled or logs out so the next request re-reads the user.
+
+Example:
+    ```python
+    @router.get("/tasks")
+    async def list_tasks(current_user: Principal = Depends(get_current_principal)):
+        return await service.get_tasks(current_user.id)
+    ```
+"""
+
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from uuid import UUID
+
+from app.core.config import settings
+
+
+@dataclass(frozen=True)
+class Principal:
+    """Authenticated caller resolved from an access token."""
+
+    id: UUID
+    is_active: bool
+    display_name: str
+
+
+class PrincipalCache:
+    """Bounded TTL cache of user_id -> Principal."""
+
+    def __init__(self, ttl_seconds: float, max_entries: int):
+        """Initialize an empty cache.
+
+        Args:
+            ttl_seconds: Seconds an entry stays valid
+            max_entries: Maximum number of cached users (oldest evicted first)
+        """
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: OrderedDict[UUID, tuple[float, Principal]] = OrderedDict()
+
+    def get(self, user_id: UUID) -> Principal | None:
+        """Return the cached principal, or None if missing or expired."""
+        entry = self._entries.get(user_id)
+        if entry is None:
+            return None
+        expires_at, principal = entry
+        if expires_at <= time.monotonic():
+            self._entries.pop(user_id, None)
+            return None
+        return principal
+
+    def set(self, principal: Principal) -> None:
+        """Cache a principal for the configured TTL."""
+        if self.ttl_seconds <= 0:
+            return
+        self._entries.pop(principal.id, None)
+        self._entries[principal.id] = (time.monotonic() + self.ttl_seconds, principal)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, user_id: UUID) -> None:
+        """Drop the cached principal of a user."""
+        self._entries.pop(user_id, None)
+
+    def clear(self) -> None:
+        """Drop all cached principals."""
+        self._entries.clear()
+
+
+# Global cache instance
+principal_cache = PrincipalCache(
+    ttl_seconds=settings.auth_principal_cache_ttl_seconds,
+    max_entries=settings.auth_principal_cache_max_entries,
+)
+
+
+def invalidate_principal(user_id: UUID) -> None:
+    """Invalidate a user's cached principal (on disable, logout, etc.)."""
+    principal_cache.invalidate(user_id)
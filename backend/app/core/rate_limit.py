@@ -1,33 +1,154 @@
-"""Simple in-memory rate limiting."""
+"""Sliding-window rate limiting backed by Redis.
 
+Each limiter keeps a sliding-window log per client in a Redis sorted set
+and checks/records a request in a single Lua script round trip, so limits
+hold across all uvicorn workers. Clients are identified by the user ID in
+their access token, falling back to the client IP for anonymous requests.
+
+If Redis is unreachable, limiters fall back to a bounded in-process LRU of
+per-client windows (per worker) and retry Redis after a short cool-down.
+
+Limit state is exposed as ``X-RateLimit-Limit``, ``X-RateLimit-Remaining``
+and ``X-RateLimit-Reset`` headers by ``RateLimitHeadersMiddleware``; 429
+responses additionally carry ``Retry-After``.
+"""
+
+import logging
+import math
 import time
-from collections import defaultdict
-from typing import Dict, Tuple
+import uuid
+from collections import OrderedDict, deque
+from dataclasses import dataclass
 
 from fastapi import Request
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
 
+from app.core.config import settings
 from app.core.exceptions import RateLimitExceededError
+from app.core.security import verify_token
+
+logger = logging.getLogger(__name__)
+
+# KEYS[1] = window key; ARGV = now_ms, window_ms, limit, member
+# Returns {allowed (0/1), remaining, reset_ms}
+SLIDING_WINDOW_SCRIPT = """
+local key = KEYS[1]
+local now = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local limit = tonumber(ARGV[3])
+
+redis.call('ZREMRANGEBYSCORE', key, '-inf', now - window)
+local count = redis.call('ZCARD', key)
+local allowed = 0
+if count < limit then
+    redis.call('ZADD', key, now, ARGV[4])
+    count = count + 1
+    allowed = 1
+end
+redis.call('PEXPIRE', key, window)
+
+local reset = window
+local oldest = redis.call('ZRANGE', key, 0, 0, 'WITHSCORES')
+if oldest[2] then
+    reset = tonumber(oldest[2]) + window - now
+end
+return {allowed, limit - count, reset}
+"""
+
+REDIS_RETRY_SECONDS = 30.0  # cool-down before trying Redis again after a failure
+
+
+@dataclass(frozen=True)
+class RateLimitResult:
+    """Outcome of a rate limit check."""
+
+    allowed: bool
+    limit: int
+    remaining: int
+    reset_seconds: float
+
+    def headers(self) -> dict[str, str]:
+        """X-RateLimit-* headers describing this result."""
+        return {
+            "X-RateLimit-Limit": str(self.limit),
+            "X-RateLimit-Remaining": str(max(0, self.remaining)),
+            "X-RateLimit-Reset": str(math.ceil(self.reset_seconds)),
+        }
+
+
+class _RedisBackend:
+    """Shared Redis connection with a cool-down after failures."""
+
+    def __init__(self):
+        """Initialize without connecting (connections are lazy)."""
+        self._client: Redis | None = None
+        self._script = None
+        self._unavailable_until = 0.0
+
+    @property
+    def available(self) -> bool:
+        """Whether Redis should be tried for this request."""
+        return settings.rate_limit_redis_enabled and time.monotonic() >= self._unavailable_until
+
+    async def hit(self, key: str, limit: int, window_seconds: int) -> RateLimitResult:
+        """Record a request in the key's window and return the outcome."""
+        if self._client is None:
+            self._client = Redis.from_url(
+                settings.redis_connection_url,
+                socket_connect_timeout=settings.rate_limit_redis_timeout_seconds,
+                socket_timeout=settings.rate_limit_redis_timeout_seconds,
+            )
+            self._script = self._client.register_script(SLIDING_WINDOW_SCRIPT)
+
+        now_ms = int(time.time() * 1000)
+        allowed, remaining, reset_ms = await self._script(
+            keys=[key],
+            args=[now_ms, window_seconds * 1000, limit, f"{now_ms}-{uuid.uuid4().hex[:8]}"],
+        )
+        return RateLimitResult(
+            allowed=bool(allowed),
+            limit=limit,
+            remaining=int(remaining),
+            reset_seconds=int(reset_ms) / 1000,
+        )
+
+    def mark_unavailable(self) -> None:
+        """Skip Redis for the cool-down period."""
+        self._unavailable_until = time.monotonic() + REDIS_RETRY_SECONDS
+
+    async def close(self) -> None:
+        """Close the Redis connection pool."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+            self._script = None
+
+
+redis_backend = _RedisBackend()
 
 
 class RateLimiter:
     """
-    Simple in-memory rate limiter.
+    Sliding-window rate limiter (Redis, with in-process fallback).
 
-    Note: This is a basic implementation for development.
-    In production, use Redis-based rate limiting for distributed systems.
+    Use as a route dependency: ``dependencies=[Depends(standard_rate_limit)]``.
     """
 
-    def __init__(self, times: int, seconds: int):
+    def __init__(self, times: int, seconds: int, name: str | None = None):
         """
         Initialize rate limiter.
 
         Args:
             times: Number of requests allowed
             seconds: Time window in seconds
+            name: Key prefix separating this limiter's windows from others
         """
         self.times = times
         self.seconds = seconds
-        self.requests: Dict[str, list[float]] = defaultdict(list)
+        self.name = name or f"{times}per{seconds}s"
+        # In-process fallback windows (LRU, bounded)
+        self.requests: OrderedDict[str, deque[float]] = OrderedDict()
 
     async def __call__(self, request: Request) -> None:
         """
@@ -39,38 +160,112 @@ class RateLimiter:
         Raises:
             RateLimitExceededError: If rate limit is exceeded
         """
-        # Use client IP as identifier
-        # In production, you might want to use authenticated user ID instead
-        identifier = request.client.host if request.client else "unknown"
-
-        current_time = time.time()
-        window_start = current_time - self.seconds
+        identifier = self._identify(request)
 
-        # Get request timestamps for this identifier
-        request_times = self.requests[identifier]
+        result = None
+        if redis_backend.available:
+            try:
+                result = await redis_backend.hit(
+                    f"ratelimit:{self.name}:{identifier}", self.times, self.seconds
+                )
+            except (RedisError, OSError) as e:
+                logger.warning(
+                    "Rate limit Redis unavailable (%s), using in-process limits for %.0fs",
+                    e, REDIS_RETRY_SECONDS,
+                )
+                redis_backend.mark_unavailable()
+        if result is None:
+            result = self._hit_local(identifier)
 
-        # Remove timestamps outside the window
-        request_times[:] = [t for t in request_times if t > window_start]
-
-        # Check if limit is exceeded
-        if len(request_times) >= self.times:
-            # Calculate reset time
-            oldest_request = request_times[0]
-            reset_time = oldest_request + self.seconds
+        request.state.rate_limit = result
 
+        if not result.allowed:
+            retry_after = math.ceil(result.reset_seconds)
             raise RateLimitExceededError(
-                detail=f"Rate limit exceeded. Try again in {int(reset_time - current_time)} seconds."
+                detail=f"Rate limit exceeded. Try again in {retry_after} seconds.",
+                headers={**result.headers(), "Retry-After": str(retry_after)},
             )
 
-        # Add current request
-        request_times.append(current_time)
+    @staticmethod
+    def _identify(request: Request) -> str:
+        """Authenticated user ID from the bearer token, else the client IP."""
+        authorization = request.headers.get("authorization", "")
+        scheme, _, token = authorization.partition(" ")
+        if scheme.lower() == "bearer" and token:
+            try:
+                user_id = verify_token(token).get("sub")
+                if user_id:
+                    return f"user:{user_id}"
+            except Exception:
+                pass
+        return f"ip:{request.client.host if request.client else 'unknown'}"
+
+    def _hit_local(self, identifier: str) -> RateLimitResult:
+        """Record a request in the in-process window of ``identifier``."""
+        now = time.time()
+        window_start = now - self.seconds
+
+        request_times = self.requests.get(identifier)
+        if request_times is None:
+            request_times = self.requests[identifier] = deque()
+            # Evict the least recently used clients beyond the bound
+            while len(self.requests) > settings.rate_limit_local_max_keys:
+                self.requests.popitem(last=False)
+        else:
+            self.requests.move_to_end(identifier)
+
+        # Drop timestamps outside the window (oldest first)
+        while request_times and request_times[0] <= window_start:
+            request_times.popleft()
+
+        allowed = len(request_times) < self.times
+        if allowed:
+            request_times.append(now)
+
+        reset = request_times[0] + self.seconds - now if request_times else self.seconds
+        return RateLimitResult(
+            allowed=allowed,
+            limit=self.times,
+            remaining=self.times - len(request_times),
+            reset_seconds=reset,
+        )
+
+
+class RateLimitHeadersMiddleware:
+    """ASGI middleware adding X-RateLimit-* headers to rate-limited routes."""
+
+    def __init__(self, app):
+        """Wrap an ASGI app."""
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        """Inject the limiter's result into the response start message."""
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        state = scope.setdefault("state", {})
+
+        async def send_with_headers(message):
+            result = state.get("rate_limit")
+            if message["type"] == "http.response.start" and result is not None:
+                headers = list(message.get("headers", []))
+                present = {name.lower() for name, _ in headers}
+                for name, value in result.headers().items():
+                    if name.lower().encode() not in present:
+                        headers.append((name.lower().encode(), value.encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
+
 
-        # Set rate limit headers (optional, but good practice)
-        # Note: These headers are informational and won't be set in FastAPI
-        # unless we use a custom middleware. For now, we skip this.
+async def close_rate_limit_backend() -> None:
+    """Close the shared Redis connection used by the limiters."""
+    await redis_backend.close()
 
 
 # Create rate limiter instances for different endpoints
-auth_rate_limit = RateLimiter(times=5, seconds=60)  # 5 requests per minute
-chat_rate_limit = RateLimiter(times=10, seconds=60)  # 10 requests per minute
-standard_rate_limit = RateLimiter(times=60, seconds=60)  # 60 requests per minute
+auth_rate_limit = RateLimiter(times=5, seconds=60, name="auth")  # 5 requests per minute
+chat_rate_limit = RateLimiter(times=10, seconds=60, name="chat")  # 10 requests per minute
+standard_rate_limit = RateLimiter(times=60, seconds=60, name="standard")  # 60 requests per minute
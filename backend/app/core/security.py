@@ -1,5 +1,8 @@
 """Security utilities for JWT and password hashing."""
 
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import Any, Dict
 from uuid import uuid4
@@ -45,6 +48,107 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
 
+def _timed_call(fn, *args):
+    """Run ``fn`` in a worker thread and report when it started."""
+    return time.monotonic(), fn(*args)
+
+
+class PasswordHashExecutor:
+    """
+    Dedicated thread pool for bcrypt.
+
+    A bcrypt round takes ~200 ms of CPU. Running it inline in an async
+    handler stalls every SSE stream and WebSocket on the worker. bcrypt
+    releases the GIL, so a small thread pool runs it in parallel with the
+    event loop; the pool size caps concurrent hashes and further calls
+    wait in the pool's queue.
+    """
+
+    def __init__(self, max_workers: int):
+        """
+        Initialize the executor (threads are started lazily).
+
+        Args:
+            max_workers: Maximum number of concurrent bcrypt operations
+        """
+        self.max_workers = max_workers
+        self._executor: ThreadPoolExecutor | None = None
+        self.in_flight = 0
+        self.completed = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    async def run(self, fn, *args):
+        """Run a blocking hashing function on the pool and await its result."""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="bcrypt"
+            )
+
+        submitted_at = time.monotonic()
+        self.in_flight += 1
+        try:
+            started_at, result = await asyncio.get_running_loop().run_in_executor(
+                self._executor, _timed_call, fn, *args
+            )
+        finally:
+            self.in_flight -= 1
+
+        wait = max(0.0, started_at - submitted_at)
+        self.completed += 1
+        self.total_wait += wait
+        self.max_wait = max(self.max_wait, wait)
+        return result
+
+    def snapshot(self) -> dict:
+        """Return queue metrics for health reporting."""
+        return {
+            "workers": self.max_workers,
+            "in_flight": self.in_flight,
+            "queued": max(0, self.in_flight - self.max_workers),
+            "completed": self.completed,
+            "avg_wait_ms": round(self.total_wait / self.completed * 1000, 1) if self.completed else 0.0,
+            "max_wait_ms": round(self.max_wait * 1000, 1),
+        }
+
+    def shutdown(self) -> None:
+        """Stop the worker threads."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+# Global executor for password hashing
+password_hasher = PasswordHashExecutor(max_workers=settings.password_hash_workers)
+
+
+async def hash_password_async(password: str) -> str:
+    """
+    Hash a password on the password hashing pool (non-blocking).
+
+    Args:
+        password: Plain text password
+
+    Returns:
+        str: Hashed password
+    """
+    return await password_hasher.run(hash_password, password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """
+    Verify a password on the password hashing pool (non-blocking).
+
+    Args:
+        plain_password: Plain text password
+        hashed_password: Hashed password
+
+    Returns:
+        bool: True if password matches, False otherwise
+    """
+    return await password_hasher.run(verify_password, plain_password, hashed_password)
+
+
 def create_access_token(data: Dict[str, Any]) -> str:
     """
     Create a JWT access token.
@@ -15,6 +15,7 @@ logging.basicConfig(
 from app import __version__
 from app.core.config import settings
 from app.core.database import init_db, close_db
+from app.core.rate_limit import RateLimitHeadersMiddleware
 from app.api.v1.router import router as v1_router
 
 
@@ -61,6 +62,20 @@ async def lifespan(app: FastAPI):
         scheduler_task = asyncio.create_task(run_scheduler())
         print("Background scheduler started")
 
+    # Start episode worker (memory processing queue)
+    episode_worker_task = None
+    if settings.app_env != "test":
+        from app.services.episode_queue import run_episode_worker
+        episode_worker_task = asyncio.create_task(run_episode_worker())
+        print("Episode worker started")
+
+    # Start embedding worker (brain vector search)
+    embedding_worker_task = None
+    if settings.app_env != "test":
+        from app.services.embedding_worker import run_embedding_worker
+        embedding_worker_task = asyncio.create_task(run_embedding_worker())
+        print("Embedding worker started")
+
     yield
 
     # Shutdown
@@ -74,6 +89,35 @@ async def lifespan(app: FastAPI):
             pass
         print("Background scheduler stopped")
 
+    if episode_worker_task is not None:
+        episode_worker_task.cancel()
+        try:
+            await episode_worker_task
+        except asyncio.CancelledError:
+            pass
+        print("Episode worker stopped")
+
+    if embedding_worker_task is not None:
+        embedding_worker_task.cancel()
+        try:
+            await embedding_worker_task
+        except asyncio.CancelledError:
+            pass
+        print("Embedding worker stopped")
+
+    # Stop the password hashing threads
+    from app.core.security import password_hasher
+    password_hasher.shutdown()
+
+    # Close the rate limiter's Redis connection
+    from app.core.rate_limit import close_rate_limit_backend
+    await close_rate_limit_backend()
+
+    # Close pooled outbound HTTP clients
+    from app.core.http_client import close_http_clients
+    await close_http_clients()
+    print("HTTP client pools closed")
+
     # Close Graphiti
     import app.services.graphiti_client as gc_module
     if gc_module.graphiti_client:
@@ -105,6 +149,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Expose X-RateLimit-* headers on rate-limited routes
+app.add_middleware(RateLimitHeadersMiddleware)
+
 # Include API v1 router
 app.include_router(
     v1_router,
@@ -6,14 +6,17 @@ from app.models.brain_embedding import BrainEmbedding
 from app.models.brain_entry import BrainEntry, BrainEntryType, EmbeddingStatus
 from app.models.briefing import Briefing, BriefingStatus
 from app.models.conversation import Conversation
+from app.models.episode_job import EpisodeJob
 from app.models.intervention import Intervention, InterventionStatus, InterventionType
 from app.models.mentioned_item import MentionedItem, MentionedItemStatus, MentionedItemType
 from app.models.message import Message, MessageRole
 from app.models.nudge_history import NudgeHistory, NudgeType
 from app.models.pattern_log import PatternLog
+from app.models.pattern_log_daily import PatternLogDaily
 from app.models.personality_profile import PersonalityProfile
 from app.models.personality_template import PersonalityTemplate
 from app.models.refresh_token import RefreshToken
+from app.models.scheduled_job import ScheduledJob
 from app.models.task import Task, TaskPriority, TaskSource, TaskStatus
 from app.models.user import User
 from app.models.user_settings import UserSettings
@@ -36,6 +39,8 @@ __all__ = [
     "User",
     "Conversation",
     "Message",
+    "EpisodeJob",
+    "ScheduledJob",
     "MessageRole",
     "RefreshToken",
     "Task",
@@ -57,6 +62,7 @@ __all__ = [
     "NudgeHistory",
     "NudgeType",
     "PatternLog",
+    "PatternLogDaily",
     "UserSettings",
     "UserStats",
     "WellbeingScore",
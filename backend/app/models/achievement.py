@@ -93,7 +93,8 @@ class Achievement(BaseModel):
     user_achievements: Mapped[list["UserAchievement"]] = relationship(
         back_populates="achievement",
         cascade="all, delete-orphan",
-        lazy="selectin",
+        passive_deletes=True,
+        lazy="raise",
     )
 
     def __repr__(self) -> str:
@@ -136,12 +137,12 @@ class UserAchievement(BaseModel):
     # Relationships
     user: Mapped["User"] = relationship(
         back_populates="user_achievements",
-        lazy="selectin",
+        lazy="raise",
     )
 
     achievement: Mapped["Achievement"] = relationship(
         back_populates="user_achievements",
-        lazy="selectin",
+        lazy="raise",
     )
 
     def __repr__(self) -> str:
@@ -34,4 +34,4 @@ class AgentActivity(BaseModel):
     duration_ms: Mapped[int | None] = mapped_column(Integer, nullable=True)
     error: Mapped[str | None] = mapped_column(Text, nullable=True)
 
-    user: Mapped["User"] = relationship(back_populates="agent_activities")
+    user: Mapped["User"] = relationship(back_populates="agent_activities", lazy="raise")
@@ -34,4 +34,4 @@ class ApprovalRequest(BaseModel):
     user_reason: Mapped[str | None] = mapped_column(Text, nullable=True)
     thread_id: Mapped[str | None] = mapped_column(String(100), nullable=True, comment="LangGraph thread_id for resume")
 
-    user: Mapped["User"] = relationship(back_populates="approval_requests")
+    user: Mapped["User"] = relationship(back_populates="approval_requests", lazy="raise")
@@ -90,11 +90,11 @@ class BrainEmbedding(Base):
     # Relationships
     entry: Mapped["BrainEntry"] = relationship(
         back_populates="embeddings",
-        lazy="selectin",
+        lazy="raise",
     )
 
     user: Mapped["User"] = relationship(
-        lazy="selectin",
+        lazy="raise",
     )
 
     def __repr__(self) -> str:
@@ -1,11 +1,12 @@
 """Brain entry model for Second Brain knowledge storage."""
 
 import enum
+from datetime import datetime
 from typing import TYPE_CHECKING, Any
 from uuid import UUID
 
-from sqlalchemy import ForeignKey, Index, String, Text
-from sqlalchemy.dialects.postgresql import ARRAY, JSONB, UUID as PG_UUID
+from sqlalchemy import Computed, DateTime, ForeignKey, Index, String, Text, text
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB, TSVECTOR, UUID as PG_UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.types import Enum as SQLEnum
 
@@ -26,6 +27,13 @@ class BrainEntryType(str, enum.Enum):
     VOICE_NOTE = "voice_note"
 
 
+# Weighted German full-text document: title (A) ranks above content (B)
+SEARCH_VECTOR_EXPRESSION = (
+    "setweight(to_tsvector('german'::regconfig, coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('german'::regconfig, coalesce(content, '')), 'B')"
+)
+
+
 class EmbeddingStatus(str, enum.Enum):
     """Embedding processing status enum."""
 
@@ -48,6 +56,13 @@ class BrainEntry(BaseModel):
             "created_at",
             postgresql_ops={"created_at": "DESC"},
         ),
+        Index("ix_brain_entries_search_vector", "search_vector", postgresql_using="gin"),
+        # Embedding worker queue: only entries still waiting for vectors
+        Index(
+            "ix_brain_entries_embedding_queue",
+            "created_at",
+            postgresql_where=text("embedding_status IN ('pending', 'processing')"),
+        ),
         {"comment": "Second Brain knowledge entries"},
     )
 
@@ -106,16 +121,31 @@ class BrainEntry(BaseModel):
         comment="Embedding processing status",
     )
 
+    embedding_claimed_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True),
+        nullable=True,
+        comment="When the embedding worker claimed the entry (lease start)",
+    )
+
+    search_vector: Mapped[Any] = mapped_column(
+        TSVECTOR,
+        Computed(SEARCH_VECTOR_EXPRESSION, persisted=True),
+        nullable=True,
+        deferred=True,
+        comment="Generated German full-text search document (title weighted A, content B)",
+    )
+
     # Relationships
     user: Mapped["User"] = relationship(
         back_populates="brain_entries",
-        lazy="selectin",
+        lazy="raise",
     )
 
     embeddings: Mapped[list["BrainEmbedding"]] = relationship(
         back_populates="entry",
         cascade="all, delete-orphan",
-        lazy="selectin",
+        passive_deletes=True,
+        lazy="raise",
     )
 
     def __repr__(self) -> str:
@@ -85,7 +85,7 @@ class Briefing(BaseModel):
     # Relationships
     user: Mapped["User"] = relationship(
         back_populates="briefings",
-        lazy="selectin",
+        lazy="raise",
     )
 
     def __repr__(self) -> str:
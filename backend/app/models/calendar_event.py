@@ -92,7 +92,7 @@ class CalendarEvent(BaseModel):
     # Relationships
     user: Mapped["User"] = relationship(
         back_populates="calendar_events",
-        lazy="selectin",
+        lazy="raise",
     )
 
     def __repr__(self) -> str:
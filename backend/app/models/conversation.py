@@ -1,9 +1,10 @@
 """Conversation model."""
 
+from datetime import datetime
 from typing import TYPE_CHECKING
 from uuid import UUID
 
-from sqlalchemy import ForeignKey, String
+from sqlalchemy import DateTime, ForeignKey, String, Text
 from sqlalchemy.dialects.postgresql import UUID as PG_UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -33,17 +34,29 @@ class Conversation(BaseModel):
         comment="Conversation title (auto-generated or manual)",
     )
 
+    summary: Mapped[str | None] = mapped_column(
+        Text,
+        nullable=True,
+        comment="Rolling summary of turns older than the LLM context window",
+    )
+
+    summary_until: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True),
+        nullable=True,
+        comment="created_at of the newest message folded into the summary",
+    )
+
     # Relationships
     user: Mapped["User"] = relationship(
         back_populates="conversations",
-        lazy="selectin",
+        lazy="raise",
     )
 
     messages: Mapped[list["Message"]] = relationship(
         back_populates="conversation",
         cascade="all, delete-orphan",
         order_by="Message.created_at.asc()",
-        lazy="selectin",
+        lazy="raise",
     )
 
     def __repr__(self) -> str:
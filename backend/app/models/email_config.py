@@ -26,4 +26,4 @@ class EmailConfig(BaseModel):
     imap_password_encrypted: Mapped[str] = mapped_column(String(500), nullable=False)
     is_active: Mapped[bool] = mapped_column(Boolean, nullable=False, default=True)
 
-    user: Mapped["User"] = relationship(back_populates="email_config")
+    user: Mapped["User"] = relationship(back_populates="email_config", lazy="raise")
@@ -0,0 +1,99 @@
+"""EpisodeJob model: durable, debounced memory processing per conversation."""
+
+from __future__ import annotations
+
+from datetime import datetime
+from uuid import UUID
+
+from sqlalchemy import DateTime, ForeignKey, Integer, Text
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import BaseModel
+
+
+class EpisodeJob(BaseModel):
+    """Pending episode processing for one conversation.
+
+    There is at most one row per conversation. Every chat turn pushes
+    ``due_at`` forward (debounce) up to a maximum delay after the first
+    unprocessed turn; the episode worker claims due rows and only sends
+    messages after the ``(processed_until, processed_until_id)`` keyset to
+    Graphiti and the NLP analyzer.
+    """
+
+    __tablename__ = "episode_jobs"
+
+    conversation_id: Mapped[UUID] = mapped_column(
+        PG_UUID(as_uuid=True),
+        ForeignKey("conversations.id", ondelete="CASCADE"),
+        nullable=False,
+        unique=True,
+        comment="Conversation whose new messages are pending",
+    )
+
+    user_id: Mapped[UUID] = mapped_column(
+        PG_UUID(as_uuid=True),
+        ForeignKey("users.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+        comment="Owner of the conversation",
+    )
+
+    due_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True),
+        nullable=True,
+        index=True,
+        comment="When the worker may process the job (NULL = nothing pending)",
+    )
+
+    enqueued_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True),
+        nullable=True,
+        comment="First enqueue since the last successful run (queue lag)",
+    )
+
+    last_enqueued_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True),
+        nullable=True,
+        comment="Most recent enqueue",
+    )
+
+    claimed_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True),
+        nullable=True,
+        comment="Set while a worker processes the job",
+    )
+
+    processed_until: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True),
+        nullable=True,
+        comment="created_at of the newest message already processed",
+    )
+
+    processed_until_id: Mapped[UUID | None] = mapped_column(
+        PG_UUID(as_uuid=True),
+        nullable=True,
+        comment="id of the newest message already processed (keyset tie-breaker)",
+    )
+
+    attempts: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        default=0,
+        server_default="0",
+        comment="Failed attempts since the last success",
+    )
+
+    last_error: Mapped[str | None] = mapped_column(
+        Text,
+        nullable=True,
+        comment="Error of the last failed attempt",
+    )
+
+    def __repr__(self) -> str:
+        """String representation of the episode job."""
+        return (
+            f"<EpisodeJob(conversation_id={self.conversation_id}, "
+            f"due_at={self.due_at}, attempts={self.attempts})>"
+        )
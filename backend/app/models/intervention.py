@@ -81,7 +81,7 @@ class Intervention(BaseModel):
     # Relationships
     user: Mapped["User"] = relationship(
         back_populates="interventions",
-        lazy="selectin",
+        lazy="raise",
     )
 
     def __repr__(self) -> str:
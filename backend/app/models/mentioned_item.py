@@ -126,12 +126,12 @@ class MentionedItem(Base):
     # Relationships
     user: Mapped["User"] = relationship(
         back_populates="mentioned_items",
-        lazy="selectin",
+        lazy="raise",
     )
 
     message: Mapped["Message"] = relationship(
         back_populates="mentioned_items",
-        lazy="selectin",
+        lazy="raise",
     )
 
     def __repr__(self) -> str:
@@ -4,7 +4,7 @@ import enum
 from typing import TYPE_CHECKING, Any
 from uuid import UUID
 
-from sqlalchemy import ForeignKey, Text
+from sqlalchemy import ForeignKey, Index, Text, text
 from sqlalchemy.dialects.postgresql import JSONB, UUID as PG_UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.types import Enum as SQLEnum
@@ -28,6 +28,10 @@ class Message(BaseModel):
     """Message model representing a single message in a conversation."""
 
     __tablename__ = "messages"
+    __table_args__ = (
+        # Newest-first context window reads (ChatService.get_recent_messages)
+        Index("ix_messages_conversation_created", "conversation_id", text("created_at DESC")),
+    )
 
     conversation_id: Mapped[UUID] = mapped_column(
         PG_UUID(as_uuid=True),
@@ -60,13 +64,14 @@ class Message(BaseModel):
     # Relationships
     conversation: Mapped["Conversation"] = relationship(
         back_populates="messages",
-        lazy="selectin",
+        lazy="raise",
     )
 
     mentioned_items: Mapped[list["MentionedItem"]] = relationship(
         back_populates="message",
         cascade="all, delete-orphan",
-        lazy="selectin",
+        passive_deletes=True,
+        lazy="raise",
     )
 
     def __repr__(self) -> str:
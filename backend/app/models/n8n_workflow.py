@@ -80,7 +80,7 @@ class N8nWorkflow(BaseModel):
     # Relationships
     user: Mapped["User"] = relationship(
         back_populates="n8n_workflows",
-        lazy="selectin",
+        lazy="raise",
     )
 
     def __repr__(self) -> str:
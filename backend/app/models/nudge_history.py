@@ -29,7 +29,13 @@ class NudgeHistory(BaseModel):
     """Nudge/reminder history for ADHS mode."""
 
     __tablename__ = "nudge_history"
-    __table_args__ = {"comment": "Nudge/reminder history for ADHS mode"}
+    __table_args__ = (
+        Index(
+            "ix_nudge_history_user_type_task_delivered",
+            "user_id", "nudge_type", "task_id", "delivered_at",
+        ),
+        {"comment": "Nudge/reminder history for ADHS mode"},
+    )
 
     user_id: Mapped[UUID] = mapped_column(
         PG_UUID(as_uuid=True),
@@ -86,11 +92,11 @@ class NudgeHistory(BaseModel):
     # Relationships
     user: Mapped["User"] = relationship(
         back_populates="nudges",
-        lazy="selectin",
+        lazy="raise",
     )
 
     task: Mapped["Task | None"] = relationship(
-        lazy="selectin",
+        lazy="raise",
     )
 
     def __repr__(self) -> str:
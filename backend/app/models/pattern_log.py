@@ -5,7 +5,7 @@ from __future__ import annotations
 from typing import TYPE_CHECKING
 from uuid import UUID
 
-from sqlalchemy import Float, ForeignKey, String
+from sqlalchemy import Float, ForeignKey, Index, String
 from sqlalchemy.dialects.postgresql import UUID as PG_UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -20,6 +20,15 @@ class PatternLog(BaseModel):
     """Stores NLP analysis scores per conversation for trend tracking."""
 
     __tablename__ = "pattern_logs"
+    __table_args__ = (
+        # Trend windows per user; covering, so the aggregates need no heap reads
+        Index(
+            "ix_pattern_logs_user_created",
+            "user_id",
+            "created_at",
+            postgresql_include=["mood_score", "energy_level", "focus_score"],
+        ),
+    )
 
     user_id: Mapped[UUID] = mapped_column(
         PG_UUID(as_uuid=True),
@@ -61,9 +70,9 @@ class PatternLog(BaseModel):
     )
 
     # Relationships
-    user: Mapped["User"] = relationship(lazy="selectin")
+    user: Mapped["User"] = relationship(lazy="raise")
 
-    conversation: Mapped["Conversation | None"] = relationship(lazy="selectin")
+    conversation: Mapped["Conversation | None"] = relationship(lazy="raise")
 
     def __repr__(self) -> str:
         """String representation of the pattern log."""
@@ -0,0 +1,60 @@
+"""PatternLogDaily model: per-user, per-day rollup of pattern log scores."""
+
+from __future__ import annotations
+
+from datetime import date
+from uuid import UUID
+
+from sqlalchemy import Date, Float, ForeignKey, Integer, UniqueConstraint
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import BaseModel
+
+
+class PatternLogDaily(BaseModel):
+    """Sum, count, min and max of mood/energy/focus per user and UTC day.
+
+    Maintained incrementally whenever a :class:`PatternLog` is stored, so
+    trend windows read at most one row per day instead of every log.
+    Per-metric counts are kept separately because scores are nullable.
+    """
+
+    __tablename__ = "pattern_log_daily"
+    __table_args__ = (
+        UniqueConstraint("user_id", "day", name="uq_pattern_log_daily_user_day"),
+    )
+
+    user_id: Mapped[UUID] = mapped_column(
+        PG_UUID(as_uuid=True),
+        ForeignKey("users.id", ondelete="CASCADE"),
+        nullable=False,
+        comment="User the rollup belongs to",
+    )
+
+    day: Mapped[date] = mapped_column(
+        Date,
+        nullable=False,
+        comment="UTC day of the aggregated logs",
+    )
+
+    log_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0, comment="Pattern logs that day")
+
+    mood_sum: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+    mood_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    mood_min: Mapped[float | None] = mapped_column(Float, nullable=True)
+    mood_max: Mapped[float | None] = mapped_column(Float, nullable=True)
+
+    energy_sum: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+    energy_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    energy_min: Mapped[float | None] = mapped_column(Float, nullable=True)
+    energy_max: Mapped[float | None] = mapped_column(Float, nullable=True)
+
+    focus_sum: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+    focus_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    focus_min: Mapped[float | None] = mapped_column(Float, nullable=True)
+    focus_max: Mapped[float | None] = mapped_column(Float, nullable=True)
+
+    def __repr__(self) -> str:
+        """String representation of the daily rollup."""
+        return f"<PatternLogDaily(user_id={self.user_id}, day={self.day}, logs={self.log_count})>"
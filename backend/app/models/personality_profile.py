@@ -87,12 +87,12 @@ class PersonalityProfile(BaseModel):
     # Relationships
     user: Mapped["User"] = relationship(
         back_populates="personality_profiles",
-        lazy="selectin",
+        lazy="raise",
     )
 
     template: Mapped["PersonalityTemplate | None"] = relationship(
         back_populates="profiles",
-        lazy="selectin",
+        lazy="raise",
     )
 
     def __repr__(self) -> str:
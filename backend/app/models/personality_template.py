@@ -83,7 +83,7 @@ class PersonalityTemplate(Base):
     # Relationships
     profiles: Mapped[list["PersonalityProfile"]] = relationship(
         back_populates="template",
-        lazy="selectin",
+        lazy="raise",
     )
 
     def __repr__(self) -> str:
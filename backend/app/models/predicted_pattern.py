@@ -97,7 +97,7 @@ class PredictedPattern(BaseModel):
     # Relationships
     user: Mapped["User"] = relationship(
         back_populates="predicted_patterns",
-        lazy="selectin",
+        lazy="raise",
     )
 
     def __repr__(self) -> str:
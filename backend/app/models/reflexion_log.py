@@ -31,4 +31,4 @@ class ReflexionLog(BaseModel):
     lesson: Mapped[str | None] = mapped_column(Text, nullable=True)
     context: Mapped[dict | None] = mapped_column(JSON, nullable=True)
 
-    user: Mapped["User"] = relationship(back_populates="reflexion_logs")
+    user: Mapped["User"] = relationship(back_populates="reflexion_logs", lazy="raise")
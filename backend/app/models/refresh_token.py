@@ -51,7 +51,7 @@ class RefreshToken(BaseModel):
     # Relationships
     user: Mapped["User"] = relationship(
         back_populates="refresh_tokens",
-        lazy="selectin",
+        lazy="raise",
     )
 
     def __repr__(self) -> str:
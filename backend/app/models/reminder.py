@@ -115,7 +115,7 @@ class Reminder(BaseModel):
     # Relationships
     user: Mapped["User"] = relationship(
         back_populates="reminders",
-        lazy="selectin",
+        lazy="raise",
     )
 
     def __repr__(self) -> str:
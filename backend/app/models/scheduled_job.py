@@ -0,0 +1,60 @@
+"""ScheduledJob model: when each background job is next due per user."""
+
+from __future__ import annotations
+
+from datetime import datetime
+from uuid import UUID
+
+from sqlalchemy import DateTime, ForeignKey, String, UniqueConstraint
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import BaseModel
+
+
+class ScheduledJob(BaseModel):
+    """Next due time of one scheduler job type for one user.
+
+    The background scheduler only wakes up for rows whose ``next_due_at``
+    has passed. After running a job it computes the next due time from
+    task due dates, reminders, briefing/reminder times and quiet hours.
+    API writes that create earlier events pull ``next_due_at`` forward.
+    """
+
+    __tablename__ = "scheduled_jobs"
+    __table_args__ = (
+        UniqueConstraint("user_id", "job_type", name="uq_scheduled_jobs_user_type"),
+    )
+
+    user_id: Mapped[UUID] = mapped_column(
+        PG_UUID(as_uuid=True),
+        ForeignKey("users.id", ondelete="CASCADE"),
+        nullable=False,
+        comment="User the job runs for",
+    )
+
+    job_type: Mapped[str] = mapped_column(
+        String(32),
+        nullable=False,
+        comment="Scheduler job (task_nudges, streak, wellbeing, briefing, ...)",
+    )
+
+    next_due_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True),
+        nullable=True,
+        index=True,
+        comment="When the job is next due (NULL = nothing scheduled)",
+    )
+
+    last_run_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True),
+        nullable=True,
+        comment="Last time the scheduler ran the job",
+    )
+
+    def __repr__(self) -> str:
+        """String representation of the scheduled job."""
+        return (
+            f"<ScheduledJob(user_id={self.user_id}, job_type={self.job_type}, "
+            f"next_due_at={self.next_due_at})>"
+        )
@@ -173,23 +173,24 @@ class Task(BaseModel):
     # Relationships
     user: Mapped["User"] = relationship(
         back_populates="tasks",
-        lazy="selectin",
+        lazy="raise",
     )
 
     parent: Mapped["Task | None"] = relationship(
         back_populates="subtasks",
         remote_side="Task.id",
-        lazy="selectin",
+        lazy="raise",
     )
 
     subtasks: Mapped[list["Task"]] = relationship(
         back_populates="parent",
         cascade="all, delete-orphan",
-        lazy="selectin",
+        passive_deletes=True,
+        lazy="raise",
     )
 
     source_message: Mapped["Message | None"] = relationship(
-        lazy="selectin",
+        lazy="raise",
     )
 
     def __repr__(self) -> str:
@@ -28,4 +28,4 @@ class TrustScore(BaseModel):
     last_escalation_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
     last_violation_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
 
-    user: Mapped["User"] = relationship(back_populates="trust_scores")
+    user: Mapped["User"] = relationship(back_populates="trust_scores", lazy="raise")
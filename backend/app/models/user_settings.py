@@ -64,7 +64,7 @@ class UserSettings(BaseModel):
     # Relationships
     user: Mapped["User"] = relationship(
         back_populates="user_settings",
-        lazy="selectin",
+        lazy="raise",
     )
 
     def __repr__(self) -> str:
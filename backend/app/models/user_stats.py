@@ -73,7 +73,7 @@ class UserStats(BaseModel):
     # Relationships
     user: Mapped["User"] = relationship(
         back_populates="user_stats",
-        lazy="selectin",
+        lazy="raise",
     )
 
     def __repr__(self) -> str:
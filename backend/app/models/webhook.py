@@ -78,13 +78,14 @@ class WebhookConfig(BaseModel):
     # Relationships
     user: Mapped["User"] = relationship(
         back_populates="webhook_configs",
-        lazy="selectin",
+        lazy="raise",
     )
 
     logs: Mapped[list["WebhookLog"]] = relationship(
         back_populates="webhook",
         cascade="all, delete-orphan",
-        lazy="selectin",
+        passive_deletes=True,
+        lazy="raise",
     )
 
     def __repr__(self) -> str:
@@ -156,7 +157,7 @@ class WebhookLog(BaseModel):
     # Relationships
     webhook: Mapped["WebhookConfig"] = relationship(
         back_populates="logs",
-        lazy="selectin",
+        lazy="raise",
     )
 
     def __repr__(self) -> str:
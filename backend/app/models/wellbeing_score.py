@@ -62,7 +62,7 @@ class WellbeingScore(BaseModel):
     # Relationships
     user: Mapped["User"] = relationship(
         back_populates="wellbeing_scores",
-        lazy="selectin",
+        lazy="raise",
     )
 
     def __repr__(self) -> str:
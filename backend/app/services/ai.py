@@ -1,5 +1,6 @@
 """AI service for interacting with Claude API with tool use."""
 
+import asyncio
 import json
 import logging
 from typing import AsyncGenerator
@@ -8,9 +9,14 @@ import httpx
 
 from app.core.config import settings
 from app.core.exceptions import AIServiceUnavailableError
+from app.core.http_client import get_http_client
 
 logger = logging.getLogger(__name__)
 
+# Default models: Sonnet for chat, Haiku for voice and background work
+CHAT_MODEL = "claude-sonnet-4-5-20250929"
+VOICE_MODEL = "claude-haiku-4-5-20251001"
+
 
 # Tool definitions for Claude
 ALICE_TOOLS = [
@@ -449,6 +455,37 @@ ALICE_TOOLS = [
     },
 ]
 
+# Same tools with a prompt-cache breakpoint on the last definition, so the
+# whole tool schema is cached by Anthropic and not re-processed on every
+# iteration of the tool loop.
+CACHED_ALICE_TOOLS = [
+    *ALICE_TOOLS[:-1],
+    {**ALICE_TOOLS[-1], "cache_control": {"type": "ephemeral"}},
+]
+
+# Tools that only read user data. They are safe to run concurrently within
+# one assistant turn; all other tools are executed one after another.
+READ_ONLY_TOOLS = frozenset({
+    "list_tasks",
+    "search_brain",
+    "get_stats",
+    "list_brain",
+    "get_today_tasks",
+    "get_achievements",
+    "get_dashboard",
+    "get_user_settings",
+    "search_observations",
+})
+
+
+def system_prompt_text(system_prompt: str | list[dict]) -> str:
+    """Flatten Anthropic system content blocks into a plain prompt string."""
+    if isinstance(system_prompt, str):
+        return system_prompt
+    return "\n\n".join(
+        block.get("text", "") for block in system_prompt if block.get("type") == "text"
+    )
+
 
 class AIService:
     """Service for AI interactions using Claude API with tool use."""
@@ -457,7 +494,7 @@ class AIService:
         """Initialize AI service."""
         self.api_key = settings.anthropic_api_key
         self.base_url = "https://api.anthropic.com/v1"
-        self.model = "claude-sonnet-4-5-20250929"
+        self.model = CHAT_MODEL
 
     async def get_response_voice(
         self,
@@ -469,41 +506,104 @@ class AIService:
             return "Hallo! Ich bin ALICE. (Mock-Modus)"
 
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.post(
-                    f"{self.base_url}/messages",
-                    headers={
-                        "x-api-key": self.api_key,
-                        "anthropic-version": "2023-06-01",
-                        "content-type": "application/json",
-                    },
-                    json={
-                        "model": "claude-haiku-4-5-20251001",
-                        "max_tokens": 300,
-                        "system": system_prompt,
-                        "messages": messages,
-                    },
-                )
+            client = get_http_client("anthropic")
+            response = await client.post(
+                f"{self.base_url}/messages",
+                headers={
+                    "x-api-key": self.api_key,
+                    "anthropic-version": "2023-06-01",
+                    "content-type": "application/json",
+                },
+                json={
+                    "model": VOICE_MODEL,
+                    "max_tokens": 300,
+                    "system": system_prompt,
+                    "messages": messages,
+                },
+                timeout=30.0,
+            )
 
-                if response.status_code != 200:
-                    logger.error("Voice AI error: %s", response.text[:200])
-                    return "Entschuldigung, ich konnte gerade nicht antworten."
+            if response.status_code != 200:
+                logger.error("Voice AI error: %s", response.text[:200])
+                return "Entschuldigung, ich konnte gerade nicht antworten."
 
-                result = response.json()
-                text_parts = []
-                for block in result.get("content", []):
-                    if block.get("type") == "text":
-                        text_parts.append(block["text"])
-                return "\n".join(text_parts) or "..."
+            result = response.json()
+            text_parts = []
+            for block in result.get("content", []):
+                if block.get("type") == "text":
+                    text_parts.append(block["text"])
+            return "\n".join(text_parts) or "..."
 
         except Exception as e:
             logger.error("Voice AI error: %s", e)
             return "Entschuldigung, es gab einen Fehler."
 
+    async def summarize_conversation(
+        self,
+        previous_summary: str | None,
+        transcript: str,
+    ) -> str | None:
+        """
+        Fold conversation turns into a rolling summary using Haiku.
+
+        Args:
+            previous_summary: Summary of the turns before ``transcript``, if any
+            transcript: New turns to fold in ("Rolle: Text" lines)
+
+        Returns:
+            str | None: Updated summary, or None if the API is unavailable
+        """
+        if not self.api_key:
+            return None
+
+        prompt = (
+            f"Bisherige Zusammenfassung:\n{previous_summary or '(keine)'}\n\n"
+            f"Neue Nachrichten:\n{transcript}\n\n"
+            "Aktualisiere die Zusammenfassung."
+        )
+
+        try:
+            client = get_http_client("anthropic")
+            response = await client.post(
+                f"{self.base_url}/messages",
+                headers={
+                    "x-api-key": self.api_key,
+                    "anthropic-version": "2023-06-01",
+                    "content-type": "application/json",
+                },
+                json={
+                    "model": VOICE_MODEL,
+                    "max_tokens": 400,
+                    "system": (
+                        "Du fasst ein Gespraech zwischen einem User und ALICE zusammen. "
+                        "Behalte Fakten, Entscheidungen, offene Fragen, erwaehnte Aufgaben "
+                        "und Vorlieben des Users. Schreibe kompakt auf Deutsch, "
+                        "hoechstens 150 Woerter, ohne Einleitung."
+                    ),
+                    "messages": [{"role": "user", "content": prompt}],
+                },
+                timeout=30.0,
+            )
+
+            if response.status_code != 200:
+                logger.error("Summary AI error: %s", response.text[:200])
+                return None
+
+            result = response.json()
+            self._log_usage(result.get("usage", {}), VOICE_MODEL)
+            text = "\n".join(
+                block["text"] for block in result.get("content", []) if block.get("type") == "text"
+            ).strip()
+            return text or None
+
+        except Exception as e:
+            logger.error("Summary AI error: %s", e)
+            return None
+
     async def get_response_with_tools(
         self,
         messages: list[dict],
-        system_prompt: str,
+        system_prompt: str | list[dict],
         tool_executor,
         model: str | None = None,
         max_tokens: int | None = None,
@@ -519,7 +619,8 @@ class AIService:
 
         Args:
             messages: List of message dicts with 'role' and 'content'
-            system_prompt: System prompt for the AI
+            system_prompt: System prompt for the AI, either a string or a list
+                           of Anthropic system content blocks (for prompt caching)
             tool_executor: Async callable (name: str, input: dict) -> str
                            that executes a tool and returns a JSON string result
 
@@ -540,116 +641,349 @@ class AIService:
         max_iterations = max_tool_iterations or 10  # prevent infinite tool loops
 
         try:
-            async with httpx.AsyncClient(timeout=120.0) as client:
-                for _ in range(max_iterations):
-                    response = await client.post(
-                        f"{self.base_url}/messages",
-                        headers={
-                            "x-api-key": self.api_key,
-                            "anthropic-version": "2023-06-01",
-                            "content-type": "application/json",
-                        },
-                        json={
-                            "model": model or self.model,
-                            "max_tokens": max_tokens or 4096,
-                            "system": system_prompt,
-                            "messages": current_messages,
-                            "tools": ALICE_TOOLS,
-                        },
+            client = get_http_client("anthropic")
+            for _ in range(max_iterations):
+                response = await client.post(
+                    f"{self.base_url}/messages",
+                    headers={
+                        "x-api-key": self.api_key,
+                        "anthropic-version": "2023-06-01",
+                        "content-type": "application/json",
+                    },
+                    json={
+                        "model": model or self.model,
+                        "max_tokens": max_tokens or 4096,
+                        "system": system_prompt,
+                        "messages": current_messages,
+                        "tools": CACHED_ALICE_TOOLS,
+                    },
+                    timeout=120.0,
+                )
+
+                if response.status_code != 200:
+                    raise AIServiceUnavailableError(
+                        detail=f"Claude API error: {response.status_code} - {response.text}"
                     )
 
-                    if response.status_code != 200:
-                        raise AIServiceUnavailableError(
-                            detail=f"Claude API error: {response.status_code} - {response.text}"
-                        )
+                result = response.json()
+                stop_reason = result.get("stop_reason")
+                content_blocks = result.get("content", [])
 
-                    result = response.json()
-                    stop_reason = result.get("stop_reason")
-                    content_blocks = result.get("content", [])
+                logger.info(
+                    "Claude API response: stop_reason=%s, blocks=%d",
+                    stop_reason,
+                    len(content_blocks),
+                )
+                self._log_usage(result.get("usage", {}), model or self.model)
+
+                # Handle text from this response
+                if stop_reason == "tool_use" and on_intermediate_text:
+                    # Tool call coming: send intermediate text immediately via callback
+                    intermediate = " ".join(
+                        b["text"] for b in content_blocks
+                        if b.get("type") == "text" and b["text"].strip()
+                    )
+                    if intermediate:
+                        logger.info("Intermediate text (pre-tool): '%s'", intermediate[:80])
+                        await on_intermediate_text(intermediate)
+                else:
+                    # Final response or no callback: collect text normally
+                    for block in content_blocks:
+                        if block.get("type") == "text" and block["text"].strip():
+                            all_text_parts.append(block["text"])
 
+                # If Claude finished without requesting tools, return all text
+                if stop_reason != "tool_use":
+                    final_text = " ".join(all_text_parts) or "..."
                     logger.info(
-                        "Claude API response: stop_reason=%s, blocks=%d",
+                        "Claude final response (%d chars, stop=%s)",
+                        len(final_text),
                         stop_reason,
-                        len(content_blocks),
                     )
+                    return final_text
 
-                    # Handle text from this response
-                    if stop_reason == "tool_use" and on_intermediate_text:
-                        # Tool call coming: send intermediate text immediately via callback
-                        intermediate = " ".join(
-                            b["text"] for b in content_blocks
-                            if b.get("type") == "text" and b["text"].strip()
-                        )
-                        if intermediate:
-                            logger.info("Intermediate text (pre-tool): '%s'", intermediate[:80])
-                            await on_intermediate_text(intermediate)
-                    else:
-                        # Final response or no callback: collect text normally
-                        for block in content_blocks:
-                            if block.get("type") == "text" and block["text"].strip():
-                                all_text_parts.append(block["text"])
-
-                    # If Claude finished without requesting tools, return all text
-                    if stop_reason != "tool_use":
-                        final_text = " ".join(all_text_parts) or "..."
-                        logger.info(
-                            "Claude final response (%d chars, stop=%s)",
-                            len(final_text),
-                            stop_reason,
-                        )
-                        return final_text
+                # Handle tool_use: add assistant message, execute tools, add results
+                current_messages.append({
+                    "role": "assistant",
+                    "content": content_blocks,
+                })
 
-                    # Handle tool_use: add assistant message, execute tools, add results
-                    current_messages.append({
-                        "role": "assistant",
-                        "content": content_blocks,
-                    })
+                tool_results = await self._execute_tool_calls(
+                    content_blocks, tool_executor
+                )
 
-                    tool_results = []
-                    for block in content_blocks:
-                        if block.get("type") == "tool_use":
-                            tool_name = block["name"]
-                            tool_input = block["input"]
-                            tool_use_id = block["id"]
-
-                            logger.info(
-                                "Executing tool: %s with input: %s",
-                                tool_name,
-                                json.dumps(tool_input, ensure_ascii=False)[:200],
-                            )
+                current_messages.append({
+                    "role": "user",
+                    "content": tool_results,
+                })
 
-                            try:
-                                result_str = await tool_executor(tool_name, tool_input)
-                                logger.info(
-                                    "Tool %s result: %s",
-                                    tool_name,
-                                    result_str[:200],
-                                )
-                                tool_results.append({
-                                    "type": "tool_result",
-                                    "tool_use_id": tool_use_id,
-                                    "content": result_str,
-                                })
-                            except Exception as e:
-                                logger.error(
-                                    "Tool %s failed: %s",
-                                    tool_name,
-                                    str(e),
+            # Max iterations reached
+            return "Entschuldigung, ich konnte die Anfrage nicht abschliessen."
+
+        except httpx.RequestError as e:
+            raise AIServiceUnavailableError(
+                detail=f"Failed to connect to Claude API: {str(e)}"
+            )
+        except AIServiceUnavailableError:
+            raise
+        except Exception as e:
+            raise AIServiceUnavailableError(
+                detail=f"Unexpected error: {str(e)}"
+            )
+
+    @staticmethod
+    def _log_usage(usage: dict, model: str) -> None:
+        """Log token usage including prompt-cache hits of one API call."""
+        if not usage:
+            return
+        input_tokens = usage.get("input_tokens", 0) or 0
+        cache_read = usage.get("cache_read_input_tokens", 0) or 0
+        cache_write = usage.get("cache_creation_input_tokens", 0) or 0
+        total_input = input_tokens + cache_read + cache_write
+        logger.info(
+            "Claude usage (%s): input=%d, cache_read=%d, cache_write=%d, "
+            "output=%d, cache_hit=%.0f%%",
+            model,
+            input_tokens,
+            cache_read,
+            cache_write,
+            usage.get("output_tokens", 0) or 0,
+            (cache_read / total_input * 100) if total_input else 0.0,
+        )
+
+    @staticmethod
+    async def _execute_tool_calls(
+        content_blocks: list[dict],
+        tool_executor,
+    ) -> list[dict]:
+        """
+        Execute all tool_use blocks of an assistant turn.
+
+        Consecutive read-only tools (see READ_ONLY_TOOLS) run concurrently;
+        write tools run one at a time in the order Claude requested them,
+        between those runs. No read starts before a write requested ahead of
+        it has finished, so reads see the writes of the same turn.
+
+        Args:
+            content_blocks: Content blocks of the assistant response
+            tool_executor: Async callable (name: str, input: dict) -> str
+
+        Returns:
+            list[dict]: tool_result blocks in the order of the tool_use blocks
+        """
+        tool_blocks = [b for b in content_blocks if b.get("type") == "tool_use"]
+
+        async def run_tool(block: dict) -> dict:
+            tool_name = block["name"]
+            tool_input = block["input"]
+            tool_use_id = block["id"]
+
+            logger.info(
+                "Executing tool: %s with input: %s",
+                tool_name,
+                json.dumps(tool_input, ensure_ascii=False)[:200],
+            )
+
+            try:
+                result_str = await tool_executor(tool_name, tool_input)
+                logger.info(
+                    "Tool %s result: %s",
+                    tool_name,
+                    result_str[:200],
+                )
+                return {
+                    "type": "tool_result",
+                    "tool_use_id": tool_use_id,
+                    "content": result_str,
+                }
+            except Exception as e:
+                logger.error(
+                    "Tool %s failed: %s",
+                    tool_name,
+                    str(e),
+                )
+                return {
+                    "type": "tool_result",
+                    "tool_use_id": tool_use_id,
+                    "content": f"Fehler: {str(e)}",
+                    "is_error": True,
+                }
+
+        results: list[dict] = []
+        read_run: list[dict] = []
+        for block in tool_blocks:
+            if block["name"] in READ_ONLY_TOOLS:
+                read_run.append(block)
+                continue
+            # A write waits for the reads requested before it, and reads
+            # requested after it only start once it has finished
+            if read_run:
+                results.extend(await asyncio.gather(*(run_tool(b) for b in read_run)))
+                read_run = []
+            results.append(await run_tool(block))
+        if read_run:
+            results.extend(await asyncio.gather(*(run_tool(b) for b in read_run)))
+
+        # Anthropic expects one tool_result per tool_use, in request order
+        return results
+
+    async def stream_response_with_tools(
+        self,
+        messages: list[dict],
+        system_prompt: str | list[dict],
+        tool_executor,
+        model: str | None = None,
+        max_tokens: int | None = None,
+        max_tool_iterations: int | None = None,
+    ) -> AsyncGenerator[str, None]:
+        """
+        Stream a response from Claude with tool use support.
+
+        Uses the Messages API in streaming mode: text deltas are yielded as
+        soon as Anthropic sends them. If a turn ends with stop_reason
+        "tool_use", the tools are executed and the next turn is streamed,
+        until Claude returns a final answer.
+
+        Args:
+            messages: List of message dicts with 'role' and 'content'
+            system_prompt: System prompt for the AI, either a string or a list
+                           of Anthropic system content blocks (for prompt caching)
+            tool_executor: Async callable (name: str, input: dict) -> str
+                           that executes a tool and returns a JSON string result
+            model: Optional model override
+            max_tokens: Optional max_tokens override
+            max_tool_iterations: Optional cap for tool loop iterations
+
+        Yields:
+            str: Text deltas as they arrive
+
+        Raises:
+            AIServiceUnavailableError: If API is unavailable or returns error
+        """
+        if not self.api_key:
+            yield (
+                "Hallo! Ich bin ALICE, deine KI-Assistentin. "
+                "(Mock-Modus — kein API-Key konfiguriert)"
+            )
+            return
+
+        current_messages = list(messages)
+        max_iterations = max_tool_iterations or 10  # prevent infinite tool loops
+        has_text = False  # Whether any text was yielded in a previous turn
+
+        try:
+            client = get_http_client("anthropic")
+            for _ in range(max_iterations):
+                content_blocks: list[dict] = []
+                stop_reason = None
+                turn_has_text = False
+                usage: dict = {}
+
+                async with client.stream(
+                    "POST",
+                    f"{self.base_url}/messages",
+                    headers={
+                        "x-api-key": self.api_key,
+                        "anthropic-version": "2023-06-01",
+                        "content-type": "application/json",
+                    },
+                    json={
+                        "model": model or self.model,
+                        "max_tokens": max_tokens or 4096,
+                        "system": system_prompt,
+                        "messages": current_messages,
+                        "tools": CACHED_ALICE_TOOLS,
+                        "stream": True,
+                    },
+                    timeout=120.0,
+                ) as response:
+                    if response.status_code != 200:
+                        body = (await response.aread()).decode("utf-8", "replace")
+                        raise AIServiceUnavailableError(
+                            detail=f"Claude API error: {response.status_code} - {body}"
+                        )
+
+                    async for event_type, data in self._iter_sse_events(response):
+                        if event_type == "message_start":
+                            usage.update(data.get("message", {}).get("usage", {}))
+
+                        elif event_type == "content_block_start":
+                            block = dict(data["content_block"])
+                            if block.get("type") == "tool_use":
+                                block["input"] = {}
+                                block["_partial_json"] = ""
+                            content_blocks.append(block)
+
+                        elif event_type == "content_block_delta":
+                            block = content_blocks[data["index"]]
+                            delta = data["delta"]
+                            if delta.get("type") == "text_delta":
+                                text = delta["text"]
+                                block["text"] = block.get("text", "") + text
+                                if not text:
+                                    continue
+                                if not turn_has_text and has_text:
+                                    # Separate text of consecutive turns
+                                    yield " "
+                                turn_has_text = True
+                                yield text
+                            elif delta.get("type") == "input_json_delta":
+                                block["_partial_json"] += delta.get("partial_json", "")
+
+                        elif event_type == "content_block_stop":
+                            block = content_blocks[data["index"]]
+                            if block.get("type") == "tool_use":
+                                partial = block.pop("_partial_json")
+                                block["input"] = json.loads(partial) if partial else {}
+
+                        elif event_type == "message_delta":
+                            stop_reason = data.get("delta", {}).get("stop_reason", stop_reason)
+                            usage.update(data.get("usage", {}))
+
+                        elif event_type == "error":
+                            error = data.get("error", {})
+                            raise AIServiceUnavailableError(
+                                detail=(
+                                    f"Claude API stream error: {error.get('type')} - "
+                                    f"{error.get('message')}"
                                 )
-                                tool_results.append({
-                                    "type": "tool_result",
-                                    "tool_use_id": tool_use_id,
-                                    "content": f"Fehler: {str(e)}",
-                                    "is_error": True,
-                                })
+                            )
+
+                has_text = has_text or turn_has_text
 
-                    current_messages.append({
-                        "role": "user",
-                        "content": tool_results,
-                    })
+                logger.info(
+                    "Claude API stream finished: stop_reason=%s, blocks=%d",
+                    stop_reason,
+                    len(content_blocks),
+                )
+                self._log_usage(usage, model or self.model)
+
+                if stop_reason != "tool_use":
+                    if not has_text:
+                        yield "..."
+                    return
+
+                # Drop empty text blocks — the API rejects them in follow-up turns
+                content_blocks = [
+                    b for b in content_blocks
+                    if b.get("type") != "text" or b.get("text", "").strip()
+                ]
+                current_messages.append({
+                    "role": "assistant",
+                    "content": content_blocks,
+                })
 
-                # Max iterations reached
-                return "Entschuldigung, ich konnte die Anfrage nicht abschliessen."
+                tool_results = await self._execute_tool_calls(
+                    content_blocks, tool_executor
+                )
+
+                current_messages.append({
+                    "role": "user",
+                    "content": tool_results,
+                })
+
+            # Max iterations reached
+            yield "Entschuldigung, ich konnte die Anfrage nicht abschliessen."
 
         except httpx.RequestError as e:
             raise AIServiceUnavailableError(
@@ -662,6 +996,39 @@ class AIService:
                 detail=f"Unexpected error: {str(e)}"
             )
 
+    @staticmethod
+    async def _iter_sse_events(
+        response: httpx.Response,
+    ) -> AsyncGenerator[tuple[str, dict], None]:
+        """
+        Parse a Server-Sent Events stream from the Anthropic API.
+
+        Args:
+            response: Streaming httpx response
+
+        Yields:
+            tuple[str, dict]: (event type, decoded JSON data)
+        """
+        event_type = None
+        data_lines: list[str] = []
+
+        async for line in response.aiter_lines():
+            if not line:
+                # Blank line terminates an event
+                if data_lines:
+                    data = json.loads("\n".join(data_lines))
+                    yield event_type or data.get("type", ""), data
+                event_type = None
+                data_lines = []
+            elif line.startswith("event:"):
+                event_type = line[6:].strip()
+            elif line.startswith("data:"):
+                data_lines.append(line[5:].strip())
+
+        if data_lines:
+            data = json.loads("\n".join(data_lines))
+            yield event_type or data.get("type", ""), data
+
     async def stream_response(
         self,
         messages: list[dict],
@@ -670,26 +1037,25 @@ class AIService:
         """
         Simple streaming without tools (legacy fallback).
 
-        Internally calls get_response_with_tools with a no-op executor,
-        then yields the response word by word to simulate streaming.
+        Streams the response via stream_response_with_tools with a no-op
+        executor, so chunks are yielded as Anthropic sends them.
 
         Args:
             messages: List of message dicts with 'role' and 'content'
             system_prompt: System prompt for the AI
 
         Yields:
-            str: Streamed text chunks (word by word)
+            str: Streamed text chunks
 
         Raises:
             AIServiceUnavailableError: If API is unavailable or returns error
         """
-        response_text = await self.get_response_with_tools(
+        async for chunk in self.stream_response_with_tools(
             messages=messages,
             system_prompt=system_prompt,
             tool_executor=self._noop_executor,
-        )
-        for word in response_text.split():
-            yield word + " "
+        ):
+            yield chunk
 
     @staticmethod
     async def _noop_executor(name: str, tool_input: dict) -> str:
@@ -699,7 +1065,7 @@ class AIService:
     async def get_response_custom_llm(
         self,
         messages: list[dict],
-        system_prompt: str,
+        system_prompt: str | list[dict],
         base_url: str | None = None,
         model: str | None = None,
         api_key: str | None = None,
@@ -734,7 +1100,7 @@ class AIService:
             )
 
         # Convert to OpenAI message format (system as first message)
-        openai_messages = [{"role": "system", "content": system_prompt}]
+        openai_messages = [{"role": "system", "content": system_prompt_text(system_prompt)}]
         for msg in messages:
             content = msg["content"]
             # Flatten Anthropic content blocks to plain text
@@ -776,93 +1142,95 @@ class AIService:
         all_text_parts = []
 
         try:
-            async with httpx.AsyncClient(timeout=120.0) as client:
-                for _ in range(max_iterations):
-                    response = await client.post(
-                        f"{url}/chat/completions",
-                        headers=headers,
-                        json=body,
-                    )
-
-                    # If server doesn't support tool calling, retry without tools
-                    if response.status_code == 400 and tools_enabled:
-                        error_text = response.text
-                        if "tool" in error_text.lower():
-                            logger.warning(
-                                "Custom LLM does not support tool calling, retrying without tools"
-                            )
-                            body.pop("tools", None)
-                            tools_enabled = False
-                            response = await client.post(
-                                f"{url}/chat/completions",
-                                headers=headers,
-                                json=body,
-                            )
+            client = get_http_client("custom_llm")
+            for _ in range(max_iterations):
+                response = await client.post(
+                    f"{url}/chat/completions",
+                    headers=headers,
+                    json=body,
+                    timeout=120.0,
+                )
 
-                    if response.status_code != 200:
-                        logger.error(
-                            "Custom LLM error (%s): %s",
-                            response.status_code,
-                            response.text[:300],
+                # If server doesn't support tool calling, retry without tools
+                if response.status_code == 400 and tools_enabled:
+                    error_text = response.text
+                    if "tool" in error_text.lower():
+                        logger.warning(
+                            "Custom LLM does not support tool calling, retrying without tools"
                         )
-                        raise AIServiceUnavailableError(
-                            detail=f"Custom LLM error: {response.status_code}"
+                        body.pop("tools", None)
+                        tools_enabled = False
+                        response = await client.post(
+                            f"{url}/chat/completions",
+                            headers=headers,
+                            json=body,
+                            timeout=120.0,
                         )
 
-                    result = response.json()
-                    choice = result["choices"][0]
-                    message = choice["message"]
-                    finish_reason = choice.get("finish_reason", "stop")
-
-                    logger.info(
-                        "Custom LLM response: model=%s, finish=%s",
-                        mdl, finish_reason,
+                if response.status_code != 200:
+                    logger.error(
+                        "Custom LLM error (%s): %s",
+                        response.status_code,
+                        response.text[:300],
+                    )
+                    raise AIServiceUnavailableError(
+                        detail=f"Custom LLM error: {response.status_code}"
                     )
 
-                    # Collect text content
-                    if message.get("content"):
-                        all_text_parts.append(message["content"])
-
-                    # Handle tool calls (OpenAI format)
-                    tool_calls = message.get("tool_calls")
-                    if tool_calls and tool_executor:
-                        # Add assistant message with tool calls
-                        openai_messages.append(message)
-
-                        for tc in tool_calls:
-                            func = tc["function"]
-                            tool_name = func["name"]
-                            try:
-                                tool_input = json.loads(func["arguments"])
-                            except json.JSONDecodeError:
-                                tool_input = {}
-
-                            logger.info(
-                                "Custom LLM tool call: %s(%s)",
-                                tool_name,
-                                json.dumps(tool_input, ensure_ascii=False)[:200],
-                            )
+                result = response.json()
+                choice = result["choices"][0]
+                message = choice["message"]
+                finish_reason = choice.get("finish_reason", "stop")
+
+                logger.info(
+                    "Custom LLM response: model=%s, finish=%s",
+                    mdl, finish_reason,
+                )
+
+                # Collect text content
+                if message.get("content"):
+                    all_text_parts.append(message["content"])
+
+                # Handle tool calls (OpenAI format)
+                tool_calls = message.get("tool_calls")
+                if tool_calls and tool_executor:
+                    # Add assistant message with tool calls
+                    openai_messages.append(message)
+
+                    for tc in tool_calls:
+                        func = tc["function"]
+                        tool_name = func["name"]
+                        try:
+                            tool_input = json.loads(func["arguments"])
+                        except json.JSONDecodeError:
+                            tool_input = {}
+
+                        logger.info(
+                            "Custom LLM tool call: %s(%s)",
+                            tool_name,
+                            json.dumps(tool_input, ensure_ascii=False)[:200],
+                        )
 
-                            try:
-                                result_str = await tool_executor(tool_name, tool_input)
-                            except Exception as e:
-                                result_str = json.dumps({"error": str(e)})
+                        try:
+                            result_str = await tool_executor(tool_name, tool_input)
+                        except Exception as e:
+                            result_str = json.dumps({"error": str(e)})
 
-                            # Add tool result
-                            openai_messages.append({
-                                "role": "tool",
-                                "tool_call_id": tc["id"],
-                                "content": result_str,
-                            })
+                        # Add tool result
+                        openai_messages.append({
+                            "role": "tool",
+                            "tool_call_id": tc["id"],
+                            "content": result_str,
+                        })
 
-                        # Update body with new messages for next iteration
-                        body["messages"] = openai_messages
-                        continue
+                    # Update body with new messages for next iteration
+                    body["messages"] = openai_messages
+                    continue
 
-                    # No tool calls → done
-                    return " ".join(all_text_parts) or "..."
+                # No tool calls → done
+                return " ".join(all_text_parts) or "..."
 
-                return "Entschuldigung, ich konnte die Anfrage nicht abschliessen."
+            return "Entschuldigung, ich konnte die Anfrage nicht abschliessen."
 
         except httpx.RequestError as e:
             raise AIServiceUnavailableError(
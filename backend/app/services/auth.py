@@ -8,8 +8,8 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
 from app.core.security import (
-    hash_password,
-    verify_password,
+    hash_password_async,
+    verify_password_async,
     create_access_token,
     create_refresh_token,
     verify_token,
@@ -20,6 +20,7 @@ from app.core.exceptions import (
     InvalidTokenError,
     AccountDisabledError,
 )
+from app.core.principal import invalidate_principal
 from app.models.user import User
 from app.models.refresh_token import RefreshToken
 from app.schemas.user import UserCreate
@@ -60,7 +61,7 @@ class AuthService:
             raise EmailAlreadyExistsError(email=data.email)
 
         # Hash password
-        password_hash = hash_password(data.password)
+        password_hash = await hash_password_async(data.password)
 
         # Create user
         user = User(
@@ -118,7 +119,7 @@ class AuthService:
             raise AuthenticationError()
 
         # Verify password
-        if not verify_password(password, user.password_hash):
+        if not await verify_password_async(password, user.password_hash):
             raise AuthenticationError()
 
         # Check if account is active
@@ -228,7 +229,8 @@ class AuthService:
 
         Note:
             In a production system with Redis, we would also add the access token
-            to a blacklist. For now, we only revoke refresh tokens.
+            to a blacklist. For now, we only revoke refresh tokens and drop the
+            cached principal so the next request re-reads the account.
         """
         # Revoke all refresh tokens for this user
         result = await self.db.execute(
@@ -243,3 +245,4 @@ class AuthService:
             token.is_revoked = True
 
         await self.db.commit()
+        invalidate_principal(user_id)
@@ -1,13 +1,35 @@
 """Brain service for managing Second Brain entries."""
 
+import logging
 from uuid import UUID
 
-from sqlalchemy import select, func, desc, or_, and_
+from sqlalchemy import select, func, case, desc, literal_column, or_, and_
+from sqlalchemy.dialects.postgresql import aggregate_order_by, array_agg
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.exceptions import BrainEntryNotFoundError, SearchUnavailableError
-from app.models.brain_entry import BrainEntry, BrainEntryType
+from app.models.brain_embedding import BrainEmbedding
+from app.models.brain_entry import BrainEntry, BrainEntryType, EmbeddingStatus
 from app.schemas.brain import BrainEntryCreate, BrainEntryUpdate, BrainEntryResponse, BrainSearchResult
+from app.services.embeddings import get_embedder
+
+logger = logging.getLogger(__name__)
+
+SEARCH_CONFIG = literal_column("'german'::regconfig")
+# ts_rank_cd weights for {D, C, B, A}: content (B) matches count 0.6 of a title (A) match
+SEARCH_RANK_WEIGHTS = literal_column("'{0.1, 0.2, 0.6, 1.0}'::float4[]")
+HEADLINE_DELIMITER = "\u241e"
+HEADLINE_OPTIONS = (
+    "StartSel=**, StopSel=**, MaxWords=25, MinWords=8, MaxFragments=3, "
+    f"FragmentDelimiter={HEADLINE_DELIMITER}"
+)
+# Nearest chunks fetched per requested entry (several chunks may share an entry)
+SEMANTIC_CHUNKS_PER_ENTRY = 4
+SEMANTIC_MATCHED_CHUNKS = 3
+# HNSW candidate list size per scan step; pgvector's default is 40
+HNSW_EF_SEARCH = 200
+# Reciprocal-rank fusion constant: 1 / (RRF_K + rank) per candidate list
+RRF_K = 60
 
 
 class BrainService:
@@ -116,6 +138,11 @@ class BrainService:
         for field, value in update_data.items():
             setattr(entry, field, value)
 
+        # Re-embed on text changes (also voids an embedding run in progress)
+        if "title" in update_data or "content" in update_data:
+            entry.embedding_status = EmbeddingStatus.PENDING
+            entry.embedding_claimed_at = None
+
         await self.db.flush()
         await self.db.refresh(entry)
 
@@ -127,56 +154,330 @@ class BrainService:
         await self.db.delete(entry)
         await self.db.flush()
 
-    async def search(
+    async def search_ranked(
         self,
         user_id: UUID,
         query: str,
         limit: int = 10,
-        min_score: float = 0.5,
-    ) -> list[BrainSearchResult]:
+        tags: list[str] | None = None,
+        headlines: bool = False,
+    ) -> list[tuple[BrainEntry, float, list[str]]]:
         """
-        Search brain entries using ILIKE text search (Phase 2 fallback).
+        Full-text search over the user's entries (German stemming).
 
-        Embedding-based vector search will be added later when
-        sentence-transformers is available.
+        Matches ``websearch_to_tsquery`` against the generated, GIN-indexed
+        ``search_vector`` and ranks with ``ts_rank_cd`` (title weighted above
+        content). Snippets are only built for the returned rows.
+
+        Args:
+            user_id: Owner of the entries
+            query: User search text (websearch syntax: "phrase", -exclude, or)
+            limit: Maximum number of entries
+            tags: Only entries carrying all of these tags
+            headlines: Whether to build ``ts_headline`` snippets
+
+        Returns:
+            list: (entry, score relative to the best match, snippets), best first
         """
+        ts_query = func.websearch_to_tsquery(SEARCH_CONFIG, query)
+        rank = func.ts_rank_cd(SEARCH_RANK_WEIGHTS, BrainEntry.search_vector, ts_query)
+
+        filters = [
+            BrainEntry.user_id == user_id,
+            BrainEntry.search_vector.op("@@")(ts_query),
+        ]
+        if tags:
+            filters.append(BrainEntry.tags.contains(tags))
+
+        ranked = (
+            select(BrainEntry.id, rank.label("rank"))
+            .where(*filters)
+            .order_by(desc("rank"), desc(BrainEntry.updated_at))
+            .limit(limit)
+            .subquery("ranked")
+        )
+        columns = [BrainEntry, ranked.c.rank]
+        if headlines:
+            columns.append(
+                func.ts_headline(SEARCH_CONFIG, BrainEntry.content, ts_query, HEADLINE_OPTIONS)
+            )
+
+        result = await self.db.execute(
+            select(*columns)
+            .join(ranked, BrainEntry.id == ranked.c.id)
+            .order_by(ranked.c.rank.desc(), desc(BrainEntry.updated_at))
+        )
+        rows = result.all()
+        if not rows:
+            return []
+
+        best = rows[0][1] or 1.0
+        return [
+            (
+                row[0],
+                round(row[1] / best, 4),
+                [
+                    chunk.strip()
+                    for chunk in row[2].split(HEADLINE_DELIMITER)
+                    if chunk.strip()
+                ] if headlines else [],
+            )
+            for row in rows
+        ]
+
+    async def _prepare_vector_scan(self, fetch: int) -> None:
+        """
+        Configure the HNSW scans of the current transaction.
+
+        The user and tag filters are applied to the index candidates, so on
+        a shared table a plain scan can return fewer than ``fetch`` rows (or
+        none). ``relaxed_order`` iterative scans (pgvector >= 0.8) keep
+        walking the graph until enough rows pass the filters; the callers
+        re-sort by distance. ``ef_search`` sets the candidate list size of
+        each step.
+        """
+        await self.db.execute(
+            select(
+                func.set_config("hnsw.iterative_scan", "relaxed_order", True),
+                func.set_config("hnsw.ef_search", str(max(HNSW_EF_SEARCH, fetch)), True),
+            )
+        )
+
+    async def search_semantic(
+        self,
+        user_id: UUID,
+        query: str,
+        limit: int = 10,
+    ) -> list[tuple[BrainEntry, float, list[str]]]:
+        """
+        Vector search over the user's embedded entries.
+
+        Runs an HNSW k-NN query (cosine distance) on the entry chunks, then
+        groups the chunks by entry. Entries without completed embeddings
+        are not found.
+
+        Args:
+            user_id: Owner of the entries
+            query: Search text
+            limit: Maximum number of entries
+
+        Returns:
+            list: (entry, cosine similarity, closest chunks), best first
+
+        Raises:
+            SearchUnavailableError: If no embedder is configured
+        """
+        embedder = get_embedder()
+        if embedder is None:
+            raise SearchUnavailableError(detail="Semantic search is not configured")
+        query_vector = (await embedder.embed([query]))[0]
+
+        fetch = limit * SEMANTIC_CHUNKS_PER_ENTRY
+        await self._prepare_vector_scan(fetch)
+
+        distance = BrainEmbedding.embedding.cosine_distance(query_vector)
+        nearest = (
+            select(
+                BrainEmbedding.entry_id,
+                BrainEmbedding.chunk_text,
+                distance.label("distance"),
+            )
+            .where(BrainEmbedding.user_id == user_id)
+            .order_by(distance)
+            .limit(fetch)
+            .subquery("nearest")
+        )
+        result = await self.db.execute(
+            select(BrainEntry, nearest.c.chunk_text, nearest.c.distance)
+            .join(nearest, BrainEntry.id == nearest.c.entry_id)
+            .order_by(nearest.c.distance)
+        )
+
+        ranked: dict[UUID, tuple[BrainEntry, float, list[str]]] = {}
+        for entry, chunk, dist in result.all():
+            if entry.id not in ranked:
+                if len(ranked) == limit:
+                    continue
+                ranked[entry.id] = (entry, round(max(0.0, 1.0 - dist), 4), [])
+            chunks = ranked[entry.id][2]
+            if len(chunks) < SEMANTIC_MATCHED_CHUNKS:
+                chunks.append(chunk)
+        return list(ranked.values())
+
+    async def search_hybrid(
+        self,
+        user_id: UUID,
+        query: str,
+        limit: int = 10,
+        tags: list[str] | None = None,
+        headlines: bool = False,
+    ) -> list[tuple[BrainEntry, float, list[str]]]:
+        """
+        Hybrid search fusing full-text and vector candidates.
+
+        Both candidate lists (``ts_rank_cd`` over the search vector, HNSW
+        k-NN over the entry chunks) are built as CTEs of one statement and
+        fused with reciprocal-rank fusion, so an entry found by both ranks
+        above one found by either alone. Tag filters apply to both lists in
+        SQL. Falls back to full-text search if no embedder is configured
+        or embedding the query fails.
+
+        Args:
+            user_id: Owner of the entries
+            query: Search text
+            limit: Maximum number of entries (top-k)
+            tags: Only entries carrying all of these tags
+            headlines: Whether to build ``ts_headline`` snippets for
+                full-text hits (vector-only hits get their closest chunk)
+
+        Returns:
+            list: (entry, fused score relative to the best match, snippets),
+            best first
+        """
+        embedder = get_embedder()
+        if embedder is None:
+            return await self.search_ranked(user_id, query, limit=limit, tags=tags, headlines=headlines)
         try:
-            search_pattern = f"%{query}%"
+            query_vector = (await embedder.embed([query]))[0]
+        except Exception as e:
+            logger.warning("Query embedding failed, using full-text search only: %s", e)
+            return await self.search_ranked(user_id, query, limit=limit, tags=tags, headlines=headlines)
 
-            result = await self.db.execute(
-                select(BrainEntry).where(
-                    BrainEntry.user_id == user_id,
-                    or_(
-                        BrainEntry.title.ilike(search_pattern),
-                        BrainEntry.content.ilike(search_pattern),
+        fetch = limit * SEMANTIC_CHUNKS_PER_ENTRY
+        await self._prepare_vector_scan(fetch)
+
+        ts_query = func.websearch_to_tsquery(SEARCH_CONFIG, query)
+        rank = func.ts_rank_cd(SEARCH_RANK_WEIGHTS, BrainEntry.search_vector, ts_query)
+        entry_filters = [BrainEntry.user_id == user_id]
+        if tags:
+            entry_filters.append(BrainEntry.tags.contains(tags))
+
+        lexical = (
+            select(
+                BrainEntry.id.label("entry_id"),
+                func.row_number()
+                .over(order_by=(rank.desc(), BrainEntry.updated_at.desc()))
+                .label("rank"),
+            )
+            .where(*entry_filters, BrainEntry.search_vector.op("@@")(ts_query))
+            .order_by(rank.desc(), BrainEntry.updated_at.desc())
+            .limit(fetch)
+            .cte("lexical")
+        )
+
+        distance = BrainEmbedding.embedding.cosine_distance(query_vector)
+        nearest_chunks = select(
+            BrainEmbedding.entry_id,
+            BrainEmbedding.chunk_text,
+            distance.label("distance"),
+        ).where(BrainEmbedding.user_id == user_id)
+        if tags:
+            nearest_chunks = nearest_chunks.join(
+                BrainEntry, BrainEntry.id == BrainEmbedding.entry_id
+            ).where(BrainEntry.tags.contains(tags))
+        nearest = nearest_chunks.order_by(distance).limit(fetch).cte("nearest")
+
+        best_distance = func.min(nearest.c.distance)
+        semantic = (
+            select(
+                nearest.c.entry_id,
+                func.row_number().over(order_by=best_distance).label("rank"),
+                array_agg(aggregate_order_by(nearest.c.chunk_text, nearest.c.distance))[1].label("chunk"),
+            )
+            .group_by(nearest.c.entry_id)
+            .cte("semantic")
+        )
+
+        fused_score = (
+            func.coalesce(1.0 / (RRF_K + lexical.c.rank), 0)
+            + func.coalesce(1.0 / (RRF_K + semantic.c.rank), 0)
+        )
+        fused = (
+            select(
+                func.coalesce(lexical.c.entry_id, semantic.c.entry_id).label("entry_id"),
+                fused_score.label("score"),
+                lexical.c.rank.label("lexical_rank"),
+                semantic.c.chunk,
+            )
+            .select_from(lexical.join(semantic, lexical.c.entry_id == semantic.c.entry_id, full=True))
+            .order_by(desc("score"))
+            .limit(limit)
+            .subquery("fused")
+        )
+
+        columns = [BrainEntry, fused.c.score, fused.c.chunk]
+        if headlines:
+            columns.append(
+                case(
+                    (
+                        fused.c.lexical_rank.is_not(None),
+                        func.ts_headline(SEARCH_CONFIG, BrainEntry.content, ts_query, HEADLINE_OPTIONS),
                     ),
-                ).order_by(desc(BrainEntry.updated_at)).limit(limit)
+                )
             )
-            entries = result.scalars().all()
-
-            results = []
-            for entry in entries:
-                # Simple relevance scoring based on match location
-                title_match = query.lower() in entry.title.lower()
-                score = 0.9 if title_match else 0.6
-
-                # Extract matching chunks
-                matched_chunks = []
-                content_lower = entry.content.lower()
-                query_lower = query.lower()
-                idx = content_lower.find(query_lower)
-                if idx != -1:
-                    start = max(0, idx - 50)
-                    end = min(len(entry.content), idx + len(query) + 50)
-                    matched_chunks.append(entry.content[start:end])
-
-                if score >= min_score:
-                    results.append(BrainSearchResult(
-                        entry=BrainEntryResponse.model_validate(entry),
-                        score=score,
-                        matched_chunks=matched_chunks,
-                    ))
-
-            return results
+        result = await self.db.execute(
+            select(*columns)
+            .join(fused, BrainEntry.id == fused.c.entry_id)
+            .order_by(fused.c.score.desc(), desc(BrainEntry.updated_at))
+        )
+        rows = result.all()
+        if not rows:
+            return []
+
+        best = float(rows[0][1]) or 1.0
+        ranked = []
+        for row in rows:
+            snippets = []
+            if headlines and row[3]:
+                snippets = [
+                    chunk.strip() for chunk in row[3].split(HEADLINE_DELIMITER) if chunk.strip()
+                ]
+            if not snippets and row[2]:
+                snippets = [row[2]]
+            ranked.append((row[0], round(float(row[1]) / best, 4), snippets))
+        return ranked
+
+    async def search(
+        self,
+        user_id: UUID,
+        query: str,
+        limit: int = 10,
+        min_score: float = 0.5,
+        mode: str = "fulltext",
+    ) -> list[BrainSearchResult]:
+        """
+        Search brain entries.
+
+        ``fulltext`` uses Postgres full-text search and ``matched_chunks``
+        holds ``ts_headline`` snippets with matches wrapped in ``**``.
+        ``semantic`` uses the vector index and ``matched_chunks`` holds the
+        closest entry chunks. ``hybrid`` fuses both rankings. In every mode
+        the scores are relative to the best match (1.0), so ``min_score``
+        means the same for all of them (raw cosine similarities depend on
+        the embedding model and rarely reach 0.5).
+        """
+        try:
+            if mode == "semantic":
+                ranked = await self.search_semantic(user_id, query, limit=limit)
+                if ranked:
+                    best = ranked[0][1] or 1.0
+                    ranked = [
+                        (entry, round(score / best, 4), chunks) for entry, score, chunks in ranked
+                    ]
+            elif mode == "hybrid":
+                ranked = await self.search_hybrid(user_id, query, limit=limit, headlines=True)
+            else:
+                ranked = await self.search_ranked(user_id, query, limit=limit, headlines=True)
+            return [
+                BrainSearchResult(
+                    entry=BrainEntryResponse.model_validate(entry),
+                    score=score,
+                    matched_chunks=chunks,
+                )
+                for entry, score, chunks in ranked
+                if score >= min_score
+            ]
+        except SearchUnavailableError:
+            raise
         except Exception as e:
             raise SearchUnavailableError(detail=f"Search failed: {str(e)}")
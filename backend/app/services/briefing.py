@@ -5,10 +5,10 @@ from datetime import date, datetime, timezone, timedelta
 from typing import Any
 from uuid import UUID
 
-import httpx
 from sqlalchemy import select, func
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.http_client import get_http_client
 from app.models.briefing import Briefing, BriefingStatus
 from app.models.task import Task, TaskStatus, TaskPriority
 from app.services.pattern_analyzer import PatternAnalyzer
@@ -232,29 +232,30 @@ Heutige Aufgaben:
             return self._generate_fallback(context)
 
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.post(
-                    "https://api.anthropic.com/v1/messages",
-                    headers={
-                        "x-api-key": api_key,
-                        "anthropic-version": "2023-06-01",
-                        "content-type": "application/json",
-                    },
-                    json={
-                        "model": "claude-sonnet-4-5-20250929",
-                        "max_tokens": 500,
-                        "system": BRIEFING_SYSTEM_PROMPT,
-                        "messages": [
-                            {
-                                "role": "user",
-                                "content": f"Erstelle ein Morning Briefing mit diesem Kontext:\n\n{context}",
-                            }
-                        ],
-                    },
-                )
-                response.raise_for_status()
-                data = response.json()
-                return data["content"][0]["text"]
+            client = get_http_client("anthropic")
+            response = await client.post(
+                "https://api.anthropic.com/v1/messages",
+                headers={
+                    "x-api-key": api_key,
+                    "anthropic-version": "2023-06-01",
+                    "content-type": "application/json",
+                },
+                json={
+                    "model": "claude-sonnet-4-5-20250929",
+                    "max_tokens": 500,
+                    "system": BRIEFING_SYSTEM_PROMPT,
+                    "messages": [
+                        {
+                            "role": "user",
+                            "content": f"Erstelle ein Morning Briefing mit diesem Kontext:\n\n{context}",
+                        }
+                    ],
+                },
+                timeout=30.0,
+            )
+            response.raise_for_status()
+            data = response.json()
+            return data["content"][0]["text"]
         except Exception:
             logger.exception("LLM briefing generation failed, using fallback")
             return self._generate_fallback(context)
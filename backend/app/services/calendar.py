@@ -6,7 +6,6 @@ from typing import Any
 from urllib.parse import urlencode
 from uuid import UUID
 
-import httpx
 from sqlalchemy import select, delete
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.dialects.postgresql import insert as pg_insert
@@ -14,6 +13,7 @@ from sqlalchemy.orm import attributes
 
 from app.core.config import settings
 from app.core.encryption import encrypt_value, decrypt_value
+from app.core.http_client import get_http_client
 from app.models.calendar_event import CalendarEvent
 from app.models.user_settings import UserSettings, DEFAULT_SETTINGS
 
@@ -47,22 +47,23 @@ class CalendarService:
 
     async def exchange_code(self, user_id: str, code: str, redirect_uri: str) -> bool:
         """Exchange authorization code for tokens and store them."""
-        async with httpx.AsyncClient(timeout=15.0) as client:
-            response = await client.post(
-                GOOGLE_TOKEN_URL,
-                data={
-                    "client_id": settings.google_client_id,
-                    "client_secret": settings.google_client_secret,
-                    "code": code,
-                    "grant_type": "authorization_code",
-                    "redirect_uri": redirect_uri,
-                },
-            )
-            if response.status_code != 200:
-                logger.error("Google token exchange failed: %s", response.text)
-                return False
+        client = get_http_client("google")
+        response = await client.post(
+            GOOGLE_TOKEN_URL,
+            data={
+                "client_id": settings.google_client_id,
+                "client_secret": settings.google_client_secret,
+                "code": code,
+                "grant_type": "authorization_code",
+                "redirect_uri": redirect_uri,
+            },
+            timeout=15.0,
+        )
+        if response.status_code != 200:
+            logger.error("Google token exchange failed: %s", response.text)
+            return False
 
-            tokens = response.json()
+        tokens = response.json()
 
         await self._store_credentials(
             user_id,
@@ -103,23 +104,24 @@ class CalendarService:
         time_min = now.isoformat()
         time_max = (now + timedelta(days=14)).isoformat()
 
-        async with httpx.AsyncClient(timeout=15.0) as client:
-            response = await client.get(
-                f"{GOOGLE_CALENDAR_API}/calendars/primary/events",
-                params={
-                    "timeMin": time_min,
-                    "timeMax": time_max,
-                    "singleEvents": "true",
-                    "orderBy": "startTime",
-                    "maxResults": "100",
-                },
-                headers={"Authorization": f"Bearer {access_token}"},
-            )
-            if response.status_code != 200:
-                logger.error("Google Calendar API error: %s", response.text)
-                return []
+        client = get_http_client("google")
+        response = await client.get(
+            f"{GOOGLE_CALENDAR_API}/calendars/primary/events",
+            params={
+                "timeMin": time_min,
+                "timeMax": time_max,
+                "singleEvents": "true",
+                "orderBy": "startTime",
+                "maxResults": "100",
+            },
+            headers={"Authorization": f"Bearer {access_token}"},
+            timeout=15.0,
+        )
+        if response.status_code != 200:
+            logger.error("Google Calendar API error: %s", response.text)
+            return []
 
-            data = response.json()
+        data = response.json()
 
         events = data.get("items", [])
         result_list = []
@@ -279,21 +281,22 @@ class CalendarService:
         if not refresh_token:
             return None
 
-        async with httpx.AsyncClient(timeout=15.0) as client:
-            response = await client.post(
-                GOOGLE_TOKEN_URL,
-                data={
-                    "client_id": settings.google_client_id,
-                    "client_secret": settings.google_client_secret,
-                    "refresh_token": refresh_token,
-                    "grant_type": "refresh_token",
-                },
-            )
-            if response.status_code != 200:
-                logger.error("Google token refresh failed: %s", response.text)
-                return None
+        client = get_http_client("google")
+        response = await client.post(
+            GOOGLE_TOKEN_URL,
+            data={
+                "client_id": settings.google_client_id,
+                "client_secret": settings.google_client_secret,
+                "refresh_token": refresh_token,
+                "grant_type": "refresh_token",
+            },
+            timeout=15.0,
+        )
+        if response.status_code != 200:
+            logger.error("Google token refresh failed: %s", response.text)
+            return None
 
-            tokens = response.json()
+        tokens = response.json()
 
         new_creds = {
             "access_token": encrypt_value(tokens["access_token"]),
@@ -8,17 +8,134 @@ from typing import AsyncGenerator, Callable, Coroutine
 from uuid import UUID
 from zoneinfo import ZoneInfo
 
-from sqlalchemy import select, func, desc, or_, and_
+from sqlalchemy import select, func, desc, or_, and_, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.config import settings as app_settings
+from app.core.database import get_async_session
 from app.core.exceptions import ConversationNotFoundError
 from app.models.conversation import Conversation
 from app.models.message import Message, MessageRole
-from app.services.ai import AIService
+from app.services.ai import (
+    ALICE_TOOLS,
+    CHAT_MODEL,
+    VOICE_MODEL,
+    AIService,
+    READ_ONLY_TOOLS,
+    system_prompt_text,
+)
+from app.services.episode_queue import enqueue_episode
+from app.services.prompt_context import (
+    PromptContext,
+    invalidate_prompt_context,
+    prompt_context_cache,
+)
 
 logger = logging.getLogger(__name__)
 
 
+# Static part of the chat system prompt. It is identical for all users and
+# requests, so it is sent first and marked as a prompt-cache breakpoint.
+STATIC_SYSTEM_PROMPT = "\n\n".join([
+    # ADHS Core Competency
+    (
+        "## ADHS-Kernkompetenz\n"
+        "Du verstehst ADHS-Herausforderungen: Prokrastination, Vergesslichkeit, "
+        "Reizueberflutung, Motivationsprobleme. Du feierst kleine Erfolge, "
+        "motivierst bei Rueckschlaegen und haeltst Antworten KURZ und strukturiert. "
+        "Nutze Aufzaehlungen und Emojis fuer bessere Lesbarkeit."
+    ),
+    # Tool Usage Rules
+    (
+        "## KRITISCH: Tool-Nutzung\n"
+        "Du MUSST die Tools IMMER tatsaechlich aufrufen! "
+        "Sag NIEMALS 'Ich habe die Aufgabe als erledigt markiert' oder "
+        "'Ich habe dir XP gegeben' ohne den entsprechenden Tool-Call "
+        "(complete_task, create_task, etc.) TATSAECHLICH auszufuehren. "
+        "Wenn du eine Aktion beschreibst, MUSS der Tool-Call vorher erfolgt sein.\n\n"
+        "### Pflicht-Tools bei Aktionen:\n"
+        "- User sagt Aufgabe erledigt → complete_task aufrufen\n"
+        "- User will neue Aufgabe → create_task aufrufen\n"
+        "- User will Info speichern → create_brain_entry aufrufen\n"
+        "- User fragt nach Fortschritt → get_stats aufrufen\n\n"
+        "### Ehrlichkeit bei Faehigkeiten:\n"
+        "Wenn der User etwas verlangt, das du mit keinem deiner Tools umsetzen kannst, "
+        "sage EHRLICH und SOFORT: 'Das kann ich leider noch nicht.' und erklaere kurz warum. "
+        "Sag NIEMALS 'Ja, das mache ich!' wenn du kein passendes Tool dafuer hast. "
+        "Beispiel: Der User fragt 'Sende eine E-Mail' → Du hast kein E-Mail-Tool → "
+        "'Das kann ich leider noch nicht. Ich habe aktuell keine E-Mail-Funktion.'\n\n"
+        "### Allgemeine Regeln:\n"
+        "1. IMMER zuerst list_tasks pruefen bevor neue Tasks erstellt werden\n"
+        "2. Proaktiv Brain nutzen — wichtige Infos automatisch speichern\n"
+        "3. Ueberfaellige Tasks? → Sanft nachfragen. Lange offen? → breakdown_task anbieten\n"
+        "4. Bei Fragen ZUERST search_brain nutzen\n"
+        "5. Demotivation erkennen → get_stats + get_achievements zeigen\n"
+        "6. VERHALTEN BEOBACHTEN und via save_observation speichern:\n"
+        "   - Prokrastination bei bestimmten Aufgabentypen\n"
+        "   - Produktive Tageszeiten\n"
+        "   - Emotionale Muster\n"
+        "   - Vermeidungsverhalten\n"
+        "7. Vor Ratschlaegen search_observations pruefen\n"
+        "8. Beilaeufig erwaehntes via create_mentioned_item speichern\n"
+        "9. User-Einstellungen (Nudge-Intensitaet, Ruhezeiten) respektieren"
+    ),
+    # Response Format
+    (
+        "## Antwort-Format\n"
+        "- Nutze **Markdown** fuer Formatierung\n"
+        "- Halte Antworten kurz (max 3-4 Absaetze)\n"
+        "- Bei Task-Aktionen: Bestaetigung was du getan hast\n"
+        "- Sprache: IMMER Deutsch\n"
+        "- Emojis fuer Lesbarkeit nutzen"
+    ),
+])
+
+# Default token budget for the conversation history sent to the LLM. The
+# newest messages are loaded first until the budget is used up.
+CONTEXT_TOKEN_BUDGET = 6000
+
+# Input token budget per model (system prompt + tools + history). Older
+# turns that don't fit are replaced by the rolling conversation summary.
+MODEL_CONTEXT_BUDGETS = {
+    CHAT_MODEL: 24000,
+    VOICE_MODEL: 6000,
+}
+
+# History never shrinks below this, even with a very long system prompt.
+MIN_HISTORY_TOKEN_BUDGET = 1000
+
+# Rows fetched per keyset page when filling the context window.
+CONTEXT_PAGE_SIZE = 20
+
+# Maximum transcript size folded into the summary per update. Larger
+# backlogs are caught up over the following turns.
+SUMMARY_INPUT_TOKEN_BUDGET = 8000
+
+# Brain search tools return only the best hits, each with a short excerpt
+# around the match instead of the entry's opening text.
+TOOL_SEARCH_TOP_K = 5
+TOOL_EXCERPT_CHARS = 200
+
+# Sessions a prompt context load may hold at once (plus one for memory),
+# so cache misses under load don't drain the connection pool.
+PROMPT_CONTEXT_SESSIONS = 2
+
+# Conversations with a summary update currently running (per process).
+_summaries_in_progress: set[UUID] = set()
+
+# Running summary update tasks; the event loop only keeps weak references.
+_summary_tasks: set[asyncio.Task] = set()
+
+
+def estimate_tokens(text: str) -> int:
+    """Roughly estimate the token count of a text (~4 characters per token)."""
+    return len(text) // 4 + 1
+
+
+# Tool definitions are sent with every tool-enabled request.
+TOOLS_TOKEN_ESTIMATE = estimate_tokens(json.dumps(ALICE_TOOLS))
+
+
 class ChatService:
     """Service for chat operations."""
 
@@ -214,6 +331,213 @@ class ChatService:
 
         return messages, next_cursor, has_more
 
+    async def get_recent_messages(
+        self,
+        conversation_id: UUID,
+        user_id: UUID,
+        token_budget: int = CONTEXT_TOKEN_BUDGET,
+    ) -> list[Message]:
+        """
+        Get the most recent messages of a conversation that fit a token budget.
+
+        Walks the conversation newest-first with a (created_at, id) keyset on
+        the (conversation_id, created_at DESC) index, so the cost per turn
+        does not grow with the conversation length. The newest message is
+        always included.
+
+        Args:
+            conversation_id: Conversation ID
+            user_id: User ID to verify conversation ownership
+            token_budget: Approximate token budget for the message contents
+
+        Returns:
+            list[Message]: Messages in chronological order
+
+        Raises:
+            ConversationNotFoundError: If conversation not found or doesn't belong to user
+        """
+        await self.get_conversation(conversation_id, user_id)
+        messages, _ = await self._fetch_recent_messages(conversation_id, token_budget)
+        return messages
+
+    async def _fetch_recent_messages(
+        self,
+        conversation_id: UUID,
+        token_budget: int,
+    ) -> tuple[list[Message], datetime | None]:
+        """
+        Keyset walk behind get_recent_messages (no ownership check).
+
+        Returns:
+            tuple: (messages in chronological order, created_at of the newest
+            message left out of the window or None if nothing was left out)
+        """
+        window: list[Message] = []
+        used_tokens = 0
+        keyset = None
+
+        while True:
+            query = select(Message).where(
+                Message.conversation_id == conversation_id
+            ).order_by(Message.created_at.desc(), Message.id.desc()).limit(CONTEXT_PAGE_SIZE)
+            if keyset is not None:
+                query = query.where(tuple_(Message.created_at, Message.id) < keyset)
+
+            result = await self.db.execute(query)
+            page = result.scalars().all()
+
+            for message in page:
+                cost = estimate_tokens(message.content)
+                if window and used_tokens + cost > token_budget:
+                    return window[::-1], message.created_at
+                window.append(message)
+                used_tokens += cost
+
+            if len(page) < CONTEXT_PAGE_SIZE:
+                return window[::-1], None
+            keyset = (page[-1].created_at, page[-1].id)
+
+    async def _prepare_context(
+        self,
+        conversation_id: UUID,
+        user_id: UUID,
+        system_prompt: str | list[dict],
+        model: str,
+    ) -> tuple[list[Message], str | list[dict]]:
+        """
+        Fit history, system prompt and tools into the model's context budget.
+
+        The stored conversation summary is added to the system prompt, then
+        the newest messages fill the remaining budget. If turns not yet in
+        the summary fell out of the window, a summary update is scheduled in
+        the background so this turn never waits for it.
+
+        Args:
+            conversation_id: Conversation ID
+            user_id: User ID to verify conversation ownership
+            system_prompt: System prompt (string or content blocks)
+            model: Model the request is sent to
+
+        Returns:
+            tuple: (history messages in chronological order, system prompt
+            including the conversation summary)
+
+        Raises:
+            ConversationNotFoundError: If conversation not found or doesn't belong to user
+        """
+        conversation = await self.get_conversation(conversation_id, user_id)
+
+        if conversation.summary:
+            system_prompt = self._with_summary(system_prompt, conversation.summary)
+
+        history_budget = max(
+            MODEL_CONTEXT_BUDGETS.get(model, MODEL_CONTEXT_BUDGETS[CHAT_MODEL])
+            - estimate_tokens(system_prompt_text(system_prompt))
+            - TOOLS_TOKEN_ESTIMATE,
+            MIN_HISTORY_TOKEN_BUDGET,
+        )
+        messages, dropped_at = await self._fetch_recent_messages(conversation_id, history_budget)
+
+        if dropped_at is not None and (
+            conversation.summary_until is None or dropped_at > conversation.summary_until
+        ):
+            task = asyncio.create_task(
+                self._update_summary_background(conversation_id, messages[0].created_at)
+            )
+            _summary_tasks.add(task)
+            task.add_done_callback(_summary_tasks.discard)
+
+        return messages, system_prompt
+
+    @staticmethod
+    def _with_summary(system_prompt: str | list[dict], summary: str) -> str | list[dict]:
+        """Append the conversation summary to the (uncached) end of the system prompt."""
+        section = f"## Bisheriger Gespraechsverlauf (Zusammenfassung)\n{summary}"
+        if isinstance(system_prompt, str):
+            return f"{system_prompt}\n\n{section}"
+        return [*system_prompt, {"type": "text", "text": section}]
+
+    @staticmethod
+    async def _update_summary_background(conversation_id: UUID, window_start: datetime) -> None:
+        """
+        Fold turns older than the context window into the conversation summary.
+
+        Runs with its own DB session. At most one update per conversation runs
+        at a time; each update folds up to SUMMARY_INPUT_TOKEN_BUDGET tokens.
+        """
+        if conversation_id in _summaries_in_progress:
+            return
+        _summaries_in_progress.add(conversation_id)
+        try:
+            # Short unit of work: load the turns to fold in
+            async with get_async_session() as db:
+                conversation = await db.get(Conversation, conversation_id)
+                if conversation is None:
+                    return
+                previous_summary = conversation.summary
+
+                query = select(Message).where(
+                    Message.conversation_id == conversation_id,
+                    Message.created_at < window_start,
+                ).order_by(Message.created_at.asc(), Message.id.asc()).limit(CONTEXT_PAGE_SIZE * 5)
+                if conversation.summary_until is not None:
+                    query = query.where(Message.created_at > conversation.summary_until)
+                result = await db.execute(query)
+
+                batch: list[Message] = []
+                used_tokens = 0
+                for message in result.scalars().all():
+                    cost = estimate_tokens(message.content)
+                    if batch and used_tokens + cost > SUMMARY_INPUT_TOKEN_BUDGET:
+                        break
+                    batch.append(message)
+                    used_tokens += cost
+
+            if not batch:
+                return
+
+            transcript = "\n".join(
+                f"{'User' if m.role == MessageRole.USER else 'ALICE'}: {m.content}"
+                for m in batch
+            )
+            summary = await AIService().summarize_conversation(previous_summary, transcript)
+            if not summary:
+                return
+
+            # Second unit of work: store the summary
+            async with get_async_session() as db:
+                conversation = await db.get(Conversation, conversation_id)
+                if conversation is None:
+                    return
+                conversation.summary = summary
+                conversation.summary_until = batch[-1].created_at
+
+            logger.info(
+                "Conversation %s: folded %d messages into summary",
+                conversation_id, len(batch),
+            )
+        except Exception:
+            logger.exception("Summary update failed for conversation %s", conversation_id)
+        finally:
+            _summaries_in_progress.discard(conversation_id)
+
+    @staticmethod
+    def _to_api_messages(messages: list[Message]) -> list[dict]:
+        """
+        Convert stored messages to Claude API messages.
+
+        A context window may start in the middle of the conversation, so
+        leading assistant messages are dropped (the API expects the first
+        message to come from the user).
+        """
+        api_messages = []
+        for msg in messages:
+            role = msg.role.value if msg.role != MessageRole.SYSTEM else "user"
+            if not api_messages and role != "user":
+                continue
+            api_messages.append({"role": role, "content": msg.content})
+        return api_messages
+
     async def save_message(
         self,
         conversation_id: UUID,
@@ -266,6 +590,10 @@ class ChatService:
 
         The returned callable receives a tool name and input dict, executes
         the corresponding backend operation, and returns a JSON string result.
+        Read-only tools run on their own short-lived session so the AI service
+        can execute them concurrently; write tools use the request session and
+        end their transaction right away, so no pooled connection is held
+        while the next LLM turn is generated.
 
         Args:
             user_id: The authenticated user's ID
@@ -276,70 +604,94 @@ class ChatService:
 
         async def execute_tool(name: str, tool_input: dict) -> str:
             """Execute a tool call from Claude and return JSON result."""
+            if name in READ_ONLY_TOOLS:
+                async with get_async_session() as db:
+                    return await ChatService(db)._dispatch_tool(user_id, name, tool_input)
 
-            if name == "create_task":
-                return await self._tool_create_task(user_id, tool_input)
+            try:
+                result = await self._dispatch_tool(user_id, name, tool_input)
+            except Exception:
+                await self.db.rollback()
+                raise
+            await self._release_connection()
+            # Tasks, observations or settings may have changed
+            invalidate_prompt_context(user_id)
+            return result
 
-            elif name == "list_tasks":
-                return await self._tool_list_tasks(user_id, tool_input)
+        return execute_tool
 
-            elif name == "complete_task":
-                return await self._tool_complete_task(user_id, tool_input)
+    async def _release_connection(self) -> None:
+        """
+        End the current transaction so its pooled connection goes back to the pool.
 
-            elif name == "create_brain_entry":
-                return await self._tool_create_brain_entry(user_id, tool_input)
+        Called before waiting on the LLM. Pending changes are committed; the
+        session stays usable and checks out a connection again on next use.
+        """
+        await self.db.commit()
 
-            elif name == "search_brain":
-                return await self._tool_search_brain(user_id, tool_input)
+    async def _dispatch_tool(self, user_id: UUID, name: str, tool_input: dict) -> str:
+        """Route a tool call to its implementation on this service's session."""
+        if name == "create_task":
+            return await self._tool_create_task(user_id, tool_input)
 
-            elif name == "get_stats":
-                return await self._tool_get_stats(user_id)
+        elif name == "list_tasks":
+            return await self._tool_list_tasks(user_id, tool_input)
 
-            elif name == "update_task":
-                return await self._tool_update_task(user_id, tool_input)
+        elif name == "complete_task":
+            return await self._tool_complete_task(user_id, tool_input)
 
-            elif name == "list_brain":
-                return await self._tool_list_brain(user_id, tool_input)
+        elif name == "create_brain_entry":
+            return await self._tool_create_brain_entry(user_id, tool_input)
 
-            elif name == "delete_task":
-                return await self._tool_delete_task(user_id, tool_input)
+        elif name == "search_brain":
+            return await self._tool_search_brain(user_id, tool_input)
 
-            elif name == "delete_all_tasks":
-                return await self._tool_delete_all_tasks(user_id, tool_input)
+        elif name == "get_stats":
+            return await self._tool_get_stats(user_id)
 
-            elif name == "breakdown_task":
-                return await self._tool_breakdown_task(user_id, tool_input)
+        elif name == "update_task":
+            return await self._tool_update_task(user_id, tool_input)
 
-            elif name == "get_today_tasks":
-                return await self._tool_get_today_tasks(user_id)
+        elif name == "list_brain":
+            return await self._tool_list_brain(user_id, tool_input)
 
-            elif name == "update_brain_entry":
-                return await self._tool_update_brain_entry(user_id, tool_input)
+        elif name == "delete_task":
+            return await self._tool_delete_task(user_id, tool_input)
 
-            elif name == "delete_brain_entry":
-                return await self._tool_delete_brain_entry(user_id, tool_input)
+        elif name == "delete_all_tasks":
+            return await self._tool_delete_all_tasks(user_id, tool_input)
 
-            elif name == "get_achievements":
-                return await self._tool_get_achievements(user_id)
+        elif name == "breakdown_task":
+            return await self._tool_breakdown_task(user_id, tool_input)
 
-            elif name == "get_dashboard":
-                return await self._tool_get_dashboard(user_id)
+        elif name == "get_today_tasks":
+            return await self._tool_get_today_tasks(user_id)
 
-            elif name == "create_mentioned_item":
-                return await self._tool_create_mentioned_item(user_id, tool_input)
+        elif name == "update_brain_entry":
+            return await self._tool_update_brain_entry(user_id, tool_input)
 
-            elif name == "get_user_settings":
-                return await self._tool_get_user_settings(user_id)
+        elif name == "delete_brain_entry":
+            return await self._tool_delete_brain_entry(user_id, tool_input)
 
-            elif name == "save_observation":
-                return await self._tool_save_observation(user_id, tool_input)
+        elif name == "get_achievements":
+            return await self._tool_get_achievements(user_id)
 
-            elif name == "search_observations":
-                return await self._tool_search_observations(user_id, tool_input)
+        elif name == "get_dashboard":
+            return await self._tool_get_dashboard(user_id)
 
-            return json.dumps({"error": f"Unknown tool: {name}"})
+        elif name == "create_mentioned_item":
+            return await self._tool_create_mentioned_item(user_id, tool_input)
 
-        return execute_tool
+        elif name == "get_user_settings":
+            return await self._tool_get_user_settings(user_id)
+
+        elif name == "save_observation":
+            return await self._tool_save_observation(user_id, tool_input)
+
+        elif name == "search_observations":
+            return await self._tool_search_observations(user_id, tool_input)
+
+        return json.dumps({"error": f"Unknown tool: {name}"})
 
     async def _tool_create_task(self, user_id: UUID, tool_input: dict) -> str:
         """Execute the create_task tool."""
@@ -468,33 +820,22 @@ class ChatService:
         })
 
     async def _tool_search_brain(self, user_id: UUID, tool_input: dict) -> str:
-        """Execute the search_brain tool using ILIKE text search."""
-        from app.models.brain_entry import BrainEntry
+        """Execute the search_brain tool using hybrid (full-text + vector) search."""
+        from app.services.brain import BrainService
 
         query_text = tool_input["query"]
-        search_pattern = f"%{query_text}%"
-
-        result = await self.db.execute(
-            select(BrainEntry).where(
-                BrainEntry.user_id == user_id,
-                or_(
-                    BrainEntry.title.ilike(search_pattern),
-                    BrainEntry.content.ilike(search_pattern),
-                ),
-            ).order_by(desc(BrainEntry.updated_at)).limit(10)
+        ranked = await BrainService(self.db).search_hybrid(
+            user_id, query_text, limit=TOOL_SEARCH_TOP_K, headlines=True,
         )
-        entries = result.scalars().all()
 
         entry_list = [
             {
                 "title": e.title,
-                "content": (
-                    e.content[:200] + "..." if len(e.content) > 200 else e.content
-                ),
+                "content": self._search_excerpt(e.content, snippets),
                 "tags": e.tags,
                 "created_at": e.created_at.isoformat(),
             }
-            for e in entries
+            for e, _, snippets in ranked
         ]
 
         logger.info(
@@ -682,8 +1023,11 @@ class ChatService:
             })
 
         count = len(tasks)
+        task_ids = {task.id for task in tasks}
         for task in tasks:
-            await self.db.delete(task)
+            # Subtasks of deleted parents are removed by ON DELETE CASCADE
+            if task.parent_id not in task_ids:
+                await self.db.delete(task)
         await self.db.commit()
 
         logger.info(
@@ -1045,40 +1389,28 @@ class ChatService:
 
     async def _tool_search_observations(self, user_id: UUID, tool_input: dict) -> str:
         """Execute the search_observations tool — searches Brain entries with alice:observation tag."""
-        from app.models.brain_entry import BrainEntry
+        from app.services.brain import BrainService
 
         query_text = tool_input["query"]
         category = tool_input.get("category")
-        search_pattern = f"%{query_text}%"
-
-        # Base filter: user + observation tag
-        filters = [
-            BrainEntry.user_id == user_id,
-            BrainEntry.tags.overlap(["alice:observation"]),
-            or_(
-                BrainEntry.title.ilike(search_pattern),
-                BrainEntry.content.ilike(search_pattern),
-            ),
-        ]
 
-        # Optional category filter
+        # Observation tag, plus the category tag if given
+        tags = ["alice:observation"]
         if category:
-            filters.append(BrainEntry.tags.overlap([f"alice:obs:{category}"]))
+            tags.append(f"alice:obs:{category}")
 
-        result = await self.db.execute(
-            select(BrainEntry).where(*filters)
-            .order_by(desc(BrainEntry.updated_at)).limit(10)
+        ranked = await BrainService(self.db).search_hybrid(
+            user_id, query_text, limit=TOOL_SEARCH_TOP_K, tags=tags, headlines=True,
         )
-        entries = result.scalars().all()
 
         observations = [
             {
                 "category": self._extract_observation_category(e.tags),
-                "observation": e.content[:200] + "..." if len(e.content) > 200 else e.content,
+                "observation": self._search_excerpt(e.content, snippets),
                 "confidence": self._extract_observation_confidence(e.tags),
                 "created_at": e.created_at.isoformat(),
             }
-            for e in entries
+            for e, _, snippets in ranked
         ]
 
         logger.info(
@@ -1088,6 +1420,14 @@ class ChatService:
 
         return json.dumps({"total": len(observations), "observations": observations})
 
+    @staticmethod
+    def _search_excerpt(content: str, snippets: list[str]) -> str:
+        """Shorten a search hit to its matched snippets (or opening text)."""
+        text = " … ".join(snippets) if snippets else content
+        if len(text) > TOOL_EXCERPT_CHARS:
+            return text[:TOOL_EXCERPT_CHARS] + "..."
+        return text
+
     @staticmethod
     def _extract_observation_category(tags: list[str]) -> str:
         """Extract observation category from tags like 'alice:obs:procrastination'."""
@@ -1104,26 +1444,71 @@ class ChatService:
                 return tag.split(":", 2)[2]
         return "medium"
 
-    async def _build_system_prompt(self, user_id: UUID, user_message: str = "") -> str:
-        """Build a dynamic system prompt with user context."""
-        from app.services.personality import PersonalityService
-        from app.services.settings import SettingsService
-        from app.services.gamification import GamificationService
-        from app.services.task import TaskService
-        from app.services.nudge import NudgeService
-        from app.models.brain_entry import BrainEntry
+    async def _build_system_prompt(
+        self, user_id: UUID, user_message: str = ""
+    ) -> list[dict]:
+        """
+        Build the system prompt as Anthropic system content blocks.
 
-        parts = []
+        The first block is the static STATIC_SYSTEM_PROMPT with a cache_control
+        breakpoint, so it is cached together with the tool definitions. The
+        second block holds the per-user context (personality, time, settings,
+        tasks, memory) that changes between requests.
 
-        # 1. Personality
-        try:
-            personality_service = PersonalityService(self.db)
-            personality_prompt = await personality_service.compose_system_prompt(user_id)
-            parts.append(personality_prompt)
-        except Exception:
-            parts.append("Du bist ALICE, eine hilfreiche KI-Assistentin fuer Menschen mit ADHS.")
+        The DB-backed sections come from the per-user prompt context cache;
+        on a miss they are loaded concurrently on up to PROMPT_CONTEXT_SESSIONS
+        short-lived sessions.
+        Memory enrichment runs alongside and is dropped if it does not
+        finish within PROMPT_MEMORY_BUDGET_SECONDS.
+
+        Args:
+            user_id: User ID
+            user_message: Current user message (used for memory enrichment)
+
+        Returns:
+            list[dict]: System content blocks (cacheable prefix, dynamic tail)
+        """
+        memory_task = None
+        if user_message:
+            memory_task = asyncio.create_task(
+                self._memory_prompt_section(user_id, user_message)
+            )
+
+        context = prompt_context_cache.get(user_id)
+        if context is None:
+            context = await self._load_prompt_context(user_id)
+            prompt_context_cache.set(user_id, context)
 
-        # 1b. Zeitbewusstsein
+        parts = [context.personality, self._time_prompt_section(), *context.sections]
+
+        # Enrich with memory context (Phase 5)
+        if memory_task is not None:
+            try:
+                memory_block = await asyncio.wait_for(
+                    memory_task, timeout=app_settings.prompt_memory_budget_seconds
+                )
+                if memory_block:
+                    parts.append(memory_block)
+            except asyncio.TimeoutError:
+                logger.warning(
+                    "Memory enrichment exceeded %.1fs budget, using base prompt",
+                    app_settings.prompt_memory_budget_seconds,
+                )
+            except Exception:
+                logger.warning("Memory enrichment failed, using base prompt")
+
+        return [
+            {
+                "type": "text",
+                "text": STATIC_SYSTEM_PROMPT,
+                "cache_control": {"type": "ephemeral"},
+            },
+            {"type": "text", "text": "\n\n".join(parts)},
+        ]
+
+    @staticmethod
+    def _time_prompt_section() -> str:
+        """Zeitbewusstsein: current date and time in Europe/Berlin."""
         _DAY_NAMES = ["Montag", "Dienstag", "Mittwoch", "Donnerstag", "Freitag", "Samstag", "Sonntag"]
         _MONTH_NAMES = [
             "", "Januar", "Februar", "Maerz", "April", "Mai", "Juni",
@@ -1133,180 +1518,178 @@ class ChatService:
         day_name = _DAY_NAMES[now_berlin.weekday()]
         month_name = _MONTH_NAMES[now_berlin.month]
         time_str = now_berlin.strftime("%H:%M")
-        parts.append(
+        return (
             f"## Aktuelles Datum & Uhrzeit\n"
             f"{day_name}, {now_berlin.day}. {month_name} {now_berlin.year}, "
             f"{time_str} Uhr (Europe/Berlin)"
         )
 
-        # 1c. User Profile
+    @classmethod
+    async def _load_prompt_context(cls, user_id: UUID) -> PromptContext:
+        """Load all DB-backed prompt sections concurrently.
+
+        Each section runs on its own short-lived session, at most
+        PROMPT_CONTEXT_SESSIONS at a time, so the sections cost a few round
+        trips of wall time instead of one per query without taking a pool
+        connection each.
+        """
+        semaphore = asyncio.Semaphore(PROMPT_CONTEXT_SESSIONS)
+
+        async def limited(section):
+            async with semaphore:
+                return await section
+
+        personality, user_sections, progress, tasks, observations, nudges = (
+            await asyncio.gather(
+                limited(cls._personality_prompt_section(user_id)),
+                limited(cls._settings_prompt_sections(user_id)),
+                limited(cls._progress_prompt_section(user_id)),
+                limited(cls._tasks_prompt_section(user_id)),
+                limited(cls._observations_prompt_section(user_id)),
+                limited(cls._nudges_prompt_section(user_id)),
+            )
+        )
+        sections = [*user_sections, progress, tasks, observations, nudges]
+        return PromptContext(
+            personality=personality,
+            sections=tuple(section for section in sections if section),
+        )
+
+    @staticmethod
+    async def _personality_prompt_section(user_id: UUID) -> str:
+        """1. Personality."""
+        from app.services.personality import PersonalityService
+
         try:
-            settings_service_temp = SettingsService(self.db)
-            user_settings = await settings_service_temp.get_settings(user_id)
-            display_name = user_settings.display_name or "unbekannt"
-            parts.append(
+            async with get_async_session() as db:
+                return await PersonalityService(db).compose_system_prompt(user_id)
+        except Exception:
+            return "Du bist ALICE, eine hilfreiche KI-Assistentin fuer Menschen mit ADHS."
+
+    @staticmethod
+    async def _settings_prompt_sections(user_id: UUID) -> list[str]:
+        """1c. User profile and 2. user settings (loaded once)."""
+        from app.services.settings import SettingsService
+
+        try:
+            async with get_async_session() as db:
+                settings = await SettingsService(db).get_settings(user_id)
+        except Exception:
+            return []
+
+        display_name = settings.display_name or "unbekannt"
+        return [
+            (
                 f"## User-Profil\n"
                 f"Name: {display_name}\n\n"
                 f"Du sollst den User mit Namen ansprechen wenn dieser bekannt ist! "
                 f"Das schafft eine persoenliche Verbindung und motiviert."
-            )
-        except Exception:
-            pass
-
-        # 2. ADHS Core Competency
-        parts.append(
-            "## ADHS-Kernkompetenz\n"
-            "Du verstehst ADHS-Herausforderungen: Prokrastination, Vergesslichkeit, "
-            "Reizueberflutung, Motivationsprobleme. Du feierst kleine Erfolge, "
-            "motivierst bei Rueckschlaegen und haeltst Antworten KURZ und strukturiert. "
-            "Nutze Aufzaehlungen und Emojis fuer bessere Lesbarkeit."
-        )
-
-        # 3. User Settings
-        try:
-            settings_service = SettingsService(self.db)
-            settings = await settings_service.get_settings(user_id)
-            settings_text = (
+            ),
+            (
                 f"## User-Einstellungen\n"
                 f"- ADHS-Modus: {'aktiv' if settings.adhs_mode else 'inaktiv'}\n"
                 f"- Nudge-Intensitaet: {settings.nudge_intensity}\n"
                 f"- Auto-Breakdown: {'ja' if settings.auto_breakdown else 'nein'}\n"
                 f"- Focus-Timer: {settings.focus_timer_minutes} Min\n"
                 f"- Ruhezeiten: {settings.quiet_hours_start or 'keine'} - {settings.quiet_hours_end or 'keine'}"
-            )
-            parts.append(settings_text)
-        except Exception:
-            pass
+            ),
+        ]
 
-        # 4. User Progress
-        try:
-            gam_service = GamificationService(self.db)
-            stats = await gam_service.get_stats(user_id)
-            progress_text = (
-                f"## User-Fortschritt\n"
-                f"- Level {stats.level} | {stats.total_xp} XP | "
-                f"Streak: {stats.current_streak} Tage | "
-                f"{stats.tasks_completed} Tasks erledigt | "
-                f"Fortschritt: {stats.progress_percent}%"
-            )
-            parts.append(progress_text)
-        except Exception:
-            pass
+    @staticmethod
+    async def _progress_prompt_section(user_id: UUID) -> str:
+        """3. User progress."""
+        from app.services.gamification import GamificationService
 
-        # 5. Today's Tasks (max 5)
         try:
-            task_service = TaskService(self.db)
-            today_tasks = await task_service.get_today_tasks(user_id)
-            if today_tasks:
-                task_lines = []
-                for t in today_tasks[:5]:
-                    due = f" (bis {t.due_date.strftime('%H:%M')})" if t.due_date else ""
-                    task_lines.append(f"- [{t.priority.value}] {t.title}{due}")
-                tasks_text = "## Heutige Tasks\n" + "\n".join(task_lines)
-                parts.append(tasks_text)
+            async with get_async_session() as db:
+                stats = await GamificationService(db).get_stats(user_id)
         except Exception:
-            pass
+            return ""
+
+        return (
+            f"## User-Fortschritt\n"
+            f"- Level {stats.level} | {stats.total_xp} XP | "
+            f"Streak: {stats.current_streak} Tage | "
+            f"{stats.tasks_completed} Tasks erledigt | "
+            f"Fortschritt: {stats.progress_percent}%"
+        )
+
+    @staticmethod
+    async def _tasks_prompt_section(user_id: UUID) -> str:
+        """4. Today's tasks (max 5)."""
+        from app.services.task import TaskService
 
-        # 6. Behavioral Observations (last 5)
         try:
-            obs_result = await self.db.execute(
-                select(BrainEntry).where(
-                    BrainEntry.user_id == user_id,
-                    BrainEntry.tags.overlap(["alice:observation"]),
-                ).order_by(desc(BrainEntry.updated_at)).limit(5)
-            )
-            observations = obs_result.scalars().all()
-            if observations:
-                obs_lines = []
-                for o in observations:
-                    cat = self._extract_observation_category(o.tags)
-                    content_short = o.content[:100] + "..." if len(o.content) > 100 else o.content
-                    obs_lines.append(f"- [{cat}] {content_short}")
-                obs_text = "## Bekannte Verhaltensmuster\n" + "\n".join(obs_lines)
-                parts.append(obs_text)
+            async with get_async_session() as db:
+                today_tasks = await TaskService(db).get_today_tasks(user_id)
         except Exception:
-            pass
+            return ""
+
+        if not today_tasks:
+            return ""
+        task_lines = []
+        for t in today_tasks[:5]:
+            due = f" (bis {t.due_date.strftime('%H:%M')})" if t.due_date else ""
+            task_lines.append(f"- [{t.priority.value}] {t.title}{due}")
+        return "## Heutige Tasks\n" + "\n".join(task_lines)
+
+    @classmethod
+    async def _observations_prompt_section(cls, user_id: UUID) -> str:
+        """5. Behavioral observations (last 5)."""
+        from app.models.brain_entry import BrainEntry
 
-        # 7. Active Nudges (max 3)
         try:
-            nudge_service = NudgeService(self.db)
-            nudge_list = await nudge_service.get_active_nudges(user_id)
-            if nudge_list.nudges:
-                nudge_lines = []
-                for n in nudge_list.nudges[:3]:
-                    nudge_lines.append(f"- [{n.nudge_level}] {n.message}")
-                nudge_text = "## Aktive Nudges\n" + "\n".join(nudge_lines)
-                parts.append(nudge_text)
+            async with get_async_session() as db:
+                obs_result = await db.execute(
+                    select(BrainEntry.tags, BrainEntry.content).where(
+                        BrainEntry.user_id == user_id,
+                        BrainEntry.tags.overlap(["alice:observation"]),
+                    ).order_by(desc(BrainEntry.updated_at)).limit(5)
+                )
+                observations = obs_result.all()
         except Exception:
-            pass
-
-        # 8. Tool Usage Rules
-        parts.append(
-            "## KRITISCH: Tool-Nutzung\n"
-            "Du MUSST die Tools IMMER tatsaechlich aufrufen! "
-            "Sag NIEMALS 'Ich habe die Aufgabe als erledigt markiert' oder "
-            "'Ich habe dir XP gegeben' ohne den entsprechenden Tool-Call "
-            "(complete_task, create_task, etc.) TATSAECHLICH auszufuehren. "
-            "Wenn du eine Aktion beschreibst, MUSS der Tool-Call vorher erfolgt sein.\n\n"
-            "### Pflicht-Tools bei Aktionen:\n"
-            "- User sagt Aufgabe erledigt → complete_task aufrufen\n"
-            "- User will neue Aufgabe → create_task aufrufen\n"
-            "- User will Info speichern → create_brain_entry aufrufen\n"
-            "- User fragt nach Fortschritt → get_stats aufrufen\n\n"
-            "### Ehrlichkeit bei Faehigkeiten:\n"
-            "Wenn der User etwas verlangt, das du mit keinem deiner Tools umsetzen kannst, "
-            "sage EHRLICH und SOFORT: 'Das kann ich leider noch nicht.' und erklaere kurz warum. "
-            "Sag NIEMALS 'Ja, das mache ich!' wenn du kein passendes Tool dafuer hast. "
-            "Beispiel: Der User fragt 'Sende eine E-Mail' → Du hast kein E-Mail-Tool → "
-            "'Das kann ich leider noch nicht. Ich habe aktuell keine E-Mail-Funktion.'\n\n"
-            "### Allgemeine Regeln:\n"
-            "1. IMMER zuerst list_tasks pruefen bevor neue Tasks erstellt werden\n"
-            "2. Proaktiv Brain nutzen — wichtige Infos automatisch speichern\n"
-            "3. Ueberfaellige Tasks? → Sanft nachfragen. Lange offen? → breakdown_task anbieten\n"
-            "4. Bei Fragen ZUERST search_brain nutzen\n"
-            "5. Demotivation erkennen → get_stats + get_achievements zeigen\n"
-            "6. VERHALTEN BEOBACHTEN und via save_observation speichern:\n"
-            "   - Prokrastination bei bestimmten Aufgabentypen\n"
-            "   - Produktive Tageszeiten\n"
-            "   - Emotionale Muster\n"
-            "   - Vermeidungsverhalten\n"
-            "7. Vor Ratschlaegen search_observations pruefen\n"
-            "8. Beilaeufig erwaehntes via create_mentioned_item speichern\n"
-            "9. User-Einstellungen (Nudge-Intensitaet, Ruhezeiten) respektieren"
-        )
+            return ""
 
-        # 9. Response Format
-        parts.append(
-            "## Antwort-Format\n"
-            "- Nutze **Markdown** fuer Formatierung\n"
-            "- Halte Antworten kurz (max 3-4 Absaetze)\n"
-            "- Bei Task-Aktionen: Bestaetigung was du getan hast\n"
-            "- Sprache: IMMER Deutsch\n"
-            "- Emojis fuer Lesbarkeit nutzen"
-        )
+        if not observations:
+            return ""
+        obs_lines = []
+        for o in observations:
+            cat = cls._extract_observation_category(o.tags)
+            content_short = o.content[:100] + "..." if len(o.content) > 100 else o.content
+            obs_lines.append(f"- [{cat}] {content_short}")
+        return "## Bekannte Verhaltensmuster\n" + "\n".join(obs_lines)
+
+    @staticmethod
+    async def _nudges_prompt_section(user_id: UUID) -> str:
+        """6. Active nudges (max 3)."""
+        from app.services.nudge import NudgeService
 
-        base_prompt = "\n\n".join(parts)
+        try:
+            async with get_async_session() as db:
+                nudge_list = await NudgeService(db).get_active_nudges(user_id)
+        except Exception:
+            return ""
 
-        # Enrich with memory context (Phase 5)
-        if user_message:
-            try:
-                from app.services.graphiti_client import get_graphiti_client
-                from app.services.memory import MemoryService
-                from app.services.context_builder import ContextBuilder
-
-                graphiti = get_graphiti_client()
-                if graphiti.enabled:
-                    memory_service = MemoryService(self.db, graphiti)
-                    builder = ContextBuilder(memory_service)
-                    base_prompt = await builder.enrich(
-                        base_prompt=base_prompt,
-                        user_id=str(user_id),
-                        user_message=user_message,
-                    )
-            except Exception:
-                logger.warning("Memory enrichment failed, using base prompt")
+        if not nudge_list.nudges:
+            return ""
+        nudge_lines = []
+        for n in nudge_list.nudges[:3]:
+            nudge_lines.append(f"- [{n.nudge_level}] {n.message}")
+        return "## Aktive Nudges\n" + "\n".join(nudge_lines)
 
-        return base_prompt
+    @staticmethod
+    async def _memory_prompt_section(user_id: UUID, user_message: str) -> str:
+        """Memory context from Graphiti and recent trends, or an empty string."""
+        from app.services.graphiti_client import get_graphiti_client
+        from app.services.memory import MemoryService
+        from app.services.context_builder import ContextBuilder
+
+        graphiti = get_graphiti_client()
+        if not graphiti.enabled:
+            return ""
+        async with get_async_session() as db:
+            builder = ContextBuilder(MemoryService(db, graphiti))
+            return await builder.build_memory_block(str(user_id), user_message)
 
     async def _get_recent_conversation_context(
         self,
@@ -1378,20 +1761,6 @@ class ChatService:
             content=content,
         )
 
-        # Get recent history (fewer messages for speed)
-        messages, _, _ = await self.get_messages(
-            conversation_id=conversation_id,
-            user_id=user_id,
-            limit=6,
-        )
-
-        api_messages = []
-        for msg in messages:
-            api_messages.append({
-                "role": msg.role.value if msg.role != MessageRole.SYSTEM else "user",
-                "content": msg.content,
-            })
-
         # Short voice-optimized system prompt
         try:
             from app.models.user import User
@@ -1429,11 +1798,18 @@ class ChatService:
         # Cross-session memory is handled by _get_recent_conversation_context() above.
         # Graphiti still STORES episodes after each voice message (see below).
 
+        # Fit recent history into the Haiku budget (older turns -> summary)
+        messages, voice_prompt = await self._prepare_context(
+            conversation_id, user_id, voice_prompt, VOICE_MODEL
+        )
+        api_messages = self._to_api_messages(messages)
+
         # Create tool executor for tool support
         tool_executor = await self._create_tool_executor(user_id)
 
         # Voice AI call — route to correct provider
         ai_provider = await self._get_ai_provider(user_id)
+        await self._release_connection()
         if ai_provider == "custom":
             response_text = await self.ai_service.get_response_custom_llm(
                 messages=api_messages,
@@ -1446,7 +1822,7 @@ class ChatService:
                 messages=api_messages,
                 system_prompt=voice_prompt,
                 tool_executor=tool_executor,
-                model="claude-haiku-4-5-20251001",
+                model=VOICE_MODEL,
                 max_tokens=300,
                 max_tool_iterations=2,
                 on_intermediate_text=on_intermediate_text,
@@ -1459,27 +1835,8 @@ class ChatService:
             content=response_text,
         )
 
-        # Process episode async for memory system (non-blocking)
-        try:
-            from app.services.graphiti_client import get_graphiti_client
-            from app.services.memory import MemoryService
-
-            graphiti = get_graphiti_client()
-            if graphiti.enabled:
-                messages_for_analysis = [
-                    {"role": m.role.value, "content": m.content}
-                    for m in messages
-                ] + [
-                    {"role": "user", "content": content},
-                    {"role": "assistant", "content": response_text},
-                ]
-                asyncio.create_task(
-                    self._process_episode_background(
-                        graphiti, str(user_id), str(conversation_id), messages_for_analysis
-                    )
-                )
-        except Exception:
-            logger.warning("Voice: Failed to schedule episode processing")
+        # Queue the conversation for debounced memory processing
+        await self._enqueue_episode(user_id, conversation_id)
 
         return response_text
 
@@ -1510,29 +1867,23 @@ class ChatService:
             content=content,
         )
 
-        # Get conversation history for context
-        messages, _, _ = await self.get_messages(
-            conversation_id=conversation_id,
-            user_id=user_id,
-            limit=10,  # Last 10 messages for context
-        )
-
-        # Build messages array for Claude API
-        api_messages = []
-        for msg in messages:
-            api_messages.append({
-                "role": msg.role.value if msg.role != MessageRole.SYSTEM else "user",
-                "content": msg.content,
-            })
-
         # Create tool executor bound to current user and DB session
         tool_executor = await self._create_tool_executor(user_id)
 
         # Build dynamic system prompt with user context
         system_prompt = await self._build_system_prompt(user_id, user_message=content)
 
+        # Fit the latest history into the Sonnet budget (older turns -> summary)
+        messages, system_prompt = await self._prepare_context(
+            conversation_id, user_id, system_prompt, CHAT_MODEL
+        )
+
+        # Build messages array for Claude API
+        api_messages = self._to_api_messages(messages)
+
         # Route to correct AI provider
         ai_provider = await self._get_ai_provider(user_id)
+        await self._release_connection()
         if ai_provider == "custom":
             response_text = await self.ai_service.get_response_custom_llm(
                 messages=api_messages,
@@ -1553,27 +1904,8 @@ class ChatService:
             content=response_text,
         )
 
-        # Process episode async for memory system (Phase 5)
-        try:
-            from app.services.graphiti_client import get_graphiti_client
-            from app.services.memory import MemoryService
-
-            graphiti = get_graphiti_client()
-            if graphiti.enabled:
-                messages_for_analysis = [
-                    {"role": m.role.value, "content": m.content}
-                    for m in messages
-                ] + [
-                    {"role": "user", "content": content},
-                    {"role": "assistant", "content": response_text},
-                ]
-                asyncio.create_task(
-                    self._process_episode_background(
-                        graphiti, str(user_id), str(conversation_id), messages_for_analysis
-                    )
-                )
-        except Exception:
-            logger.warning("Failed to schedule episode processing")
+        # Queue the conversation for debounced memory processing
+        await self._enqueue_episode(user_id, conversation_id)
 
         return response_text
 
@@ -1586,10 +1918,13 @@ class ChatService:
         """
         Get AI response for a user message with tool use support.
 
-        Internally calls Claude with tool definitions. Claude may execute
-        multiple tool calls (create tasks, search brain, etc.) before
-        producing a final text response. The final text is then yielded
-        word-by-word to maintain SSE streaming compatibility.
+        Streams Claude's answer token by token while it is generated. Claude
+        may execute multiple tool calls (create tasks, search brain, etc.)
+        between streamed turns; the tool loop runs inside the AI service.
+        Custom LLM responses are not streamed and are yielded word-by-word
+        to maintain SSE streaming compatibility. History and system prompt are
+        loaded first, then the transaction is ended so no pooled connection is
+        held while tokens are generated.
 
         Args:
             conversation_id: Conversation ID
@@ -1599,96 +1934,74 @@ class ChatService:
         Yields:
             str: Text chunks for the SSE stream
         """
-        # Get conversation history for context
-        messages, _, _ = await self.get_messages(
-            conversation_id=conversation_id,
-            user_id=user_id,
-            limit=10,  # Last 10 messages for context
-        )
-
-        # Build messages array for Claude API
-        api_messages = []
-        for msg in messages:
-            api_messages.append({
-                "role": msg.role.value if msg.role != MessageRole.SYSTEM else "user",
-                "content": msg.content,
-            })
-
-        # Add current user message
-        api_messages.append({
-            "role": "user",
-            "content": user_message,
-        })
-
         # Create tool executor bound to current user and DB session
         tool_executor = await self._create_tool_executor(user_id)
 
         # Build dynamic system prompt with user context
         system_prompt = await self._build_system_prompt(user_id, user_message=user_message)
 
+        # Fit the latest history into the Sonnet budget (older turns -> summary)
+        messages, system_prompt = await self._prepare_context(
+            conversation_id, user_id, system_prompt, CHAT_MODEL
+        )
+
+        # Build messages array for Claude API
+        api_messages = self._to_api_messages(messages)
+
+        # Add current user message (unless the caller already saved it)
+        latest = messages[-1] if messages else None
+        if not (latest and latest.role == MessageRole.USER and latest.content == user_message):
+            api_messages.append({
+                "role": "user",
+                "content": user_message,
+            })
+
         # Route to correct AI provider
         ai_provider = await self._get_ai_provider(user_id)
+        await self._release_connection()
         if ai_provider == "custom":
             response_text = await self.ai_service.get_response_custom_llm(
                 messages=api_messages,
                 system_prompt=system_prompt,
                 tool_executor=tool_executor,
             )
+
+            # Yield word-by-word for SSE streaming effect, preserving newlines
+            for line_idx, line in enumerate(response_text.split("\n")):
+                if line_idx > 0:
+                    yield "\n"
+                words = line.split(" ")
+                for i, word in enumerate(words):
+                    if word:
+                        yield word + (" " if i < len(words) - 1 else "")
         else:
-            response_text = await self.ai_service.get_response_with_tools(
+            async for chunk in self.ai_service.stream_response_with_tools(
                 messages=api_messages,
                 system_prompt=system_prompt,
                 tool_executor=tool_executor,
-            )
-
-        # Yield word-by-word for SSE streaming effect, preserving newlines
-        for line_idx, line in enumerate(response_text.split("\n")):
-            if line_idx > 0:
-                yield "\n"
-            words = line.split(" ")
-            for i, word in enumerate(words):
-                if word:
-                    yield word + (" " if i < len(words) - 1 else "")
+            ):
+                yield chunk
 
-        # Process episode async for memory system (Phase 5)
-        try:
-            from app.services.graphiti_client import get_graphiti_client
+        # Queue the conversation for debounced memory processing
+        await self._enqueue_episode(user_id, conversation_id)
 
-            graphiti = get_graphiti_client()
-            if graphiti.enabled:
-                messages_for_analysis = [
-                    {"role": m.role.value, "content": m.content}
-                    for m in messages
-                ] + [
-                    {"role": "user", "content": user_message},
-                    {"role": "assistant", "content": response_text},
-                ]
-                asyncio.create_task(
-                    self._process_episode_background(
-                        graphiti, str(user_id), str(conversation_id), messages_for_analysis
-                    )
-                )
-        except Exception:
-            logger.warning("Failed to schedule episode processing for streaming path")
+    async def _enqueue_episode(self, user_id: UUID, conversation_id: UUID) -> None:
+        """Mark the conversation for memory processing (debounced, durable).
 
-    @staticmethod
-    async def _process_episode_background(
-        graphiti, user_id: str, conversation_id: str, messages: list[dict]
-    ) -> None:
-        """Process conversation episode in background with its own DB session."""
+        Runs in a savepoint so a failing enqueue never breaks the chat turn.
+        """
         try:
-            from app.core.database import AsyncSessionLocal
-            from app.services.memory import MemoryService
+            from app.services.graphiti_client import get_graphiti_client
 
-            async with AsyncSessionLocal() as db:
-                memory_service = MemoryService(db, graphiti)
-                await memory_service.process_episode(user_id, conversation_id, messages)
-                await db.commit()
+            if not get_graphiti_client().enabled:
+                return
+            async with self.db.begin_nested():
+                await enqueue_episode(self.db, user_id, conversation_id)
         except Exception:
-            logger.exception("Background episode processing failed for conversation %s", conversation_id)
+            logger.warning("Failed to enqueue episode processing for conversation %s", conversation_id)
 
     async def get_ai_response_langgraph(
-        self, user_id: UUID, messages: list[dict], system_prompt: str
+        self, user_id: UUID, messages: list[dict], system_prompt: str | list[dict]
     ) -> str:
         """Get AI response via LangGraph supervisor (feature-flagged)."""
         from langchain_core.messages import HumanMessage, AIMessage, SystemMessage
@@ -1718,7 +2031,7 @@ class ChatService:
             "error": None,
             "memory_context": None,
             "user_preferences": {},
-            "system_prompt": system_prompt,
+            "system_prompt": system_prompt_text(system_prompt),
         }
 
         config = {"configurable": {"thread_id": f"user_{user_id}"}}
@@ -29,19 +29,26 @@ class ContextBuilder:
 
         Returns the base prompt unmodified if memory is unavailable.
         """
+        memory_block = await self.build_memory_block(user_id, user_message)
+
+        if not memory_block:
+            return base_prompt
+
+        return f"{base_prompt}\n\n{memory_block}"
+
+    async def build_memory_block(self, user_id: str, user_message: str) -> str:
+        """Build only the memory section, or an empty string on failure.
+
+        Lets callers fetch memory concurrently with the rest of the prompt.
+        """
         try:
             context = await self.memory_service.get_context(
                 user_id=user_id,
                 query=user_message,
             )
 
-            memory_block = self.memory_service.format_context_for_prompt(context)
-
-            if not memory_block:
-                return base_prompt
-
-            return f"{base_prompt}\n\n{memory_block}"
+            return self.memory_service.format_context_for_prompt(context)
 
         except Exception:
             logger.exception("Failed to enrich system prompt with memory")
-            return base_prompt
+            return ""
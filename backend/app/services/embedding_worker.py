@@ -0,0 +1,205 @@
+"""Background worker that embeds brain entries for vector search.
+
+New and edited entries have ``embedding_status = pending``. The worker
+claims a batch of them with ``FOR UPDATE SKIP LOCKED`` (status moves to
+``processing`` and ``embedding_claimed_at`` starts a lease), splits each
+entry into chunks, embeds all chunks of the batch in as few embedder calls
+as possible and replaces the entry's ``brain_embeddings`` rows in one
+transaction (status ``completed``).
+
+Transient embedder failures leave the claim in place; the entries are
+picked up again once the lease expires. An entry edited while it was being
+embedded is reset to ``pending`` by ``BrainService.update_entry``, so the
+stale vectors are discarded instead of stored.
+"""
+
+import asyncio
+import logging
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from uuid import UUID
+
+from sqlalchemy import and_, delete, func, insert, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.database import get_async_session
+from app.models.brain_embedding import BrainEmbedding
+from app.models.brain_entry import BrainEntry, EmbeddingStatus
+from app.services.embeddings import Embedder, chunk_text, get_embedder
+
+logger = logging.getLogger(__name__)
+
+EMBEDDING_CLAIM_LIMIT = 32  # entries per claim
+EMBEDDING_LEASE_SECONDS = 600  # claimed entries become claimable again after this
+
+
+@dataclass(frozen=True)
+class ClaimedEntry:
+    """Snapshot of an entry taken when the worker claimed it."""
+
+    id: UUID
+    user_id: UUID
+    title: str
+    content: str
+    claimed_at: datetime
+
+
+class EmbeddingWorkerMetrics:
+    """In-process counters of the embedding worker."""
+
+    def __init__(self):
+        """Initialize empty counters."""
+        self.embedded = 0
+        self.chunks = 0
+        self.failed = 0
+
+    def snapshot(self) -> dict:
+        """Return the current counters."""
+        return {"embedded": self.embedded, "chunks": self.chunks, "failed": self.failed}
+
+
+worker_metrics = EmbeddingWorkerMetrics()
+
+
+async def run_embedding_worker() -> None:
+    """Worker loop — embeds pending entries until the queue is empty, then polls."""
+    embedder = get_embedder()
+    if embedder is None:
+        logger.warning("Embedding worker not started — no embedder configured")
+        return
+    logger.info("Embedding worker started (%s)", type(embedder).__name__)
+
+    while True:
+        try:
+            entries = await _claim_entries(EMBEDDING_CLAIM_LIMIT)
+            if entries:
+                await embed_entries(embedder, entries)
+                # Drain the backlog without waiting
+                continue
+        except asyncio.CancelledError:
+            logger.info("Embedding worker cancelled — shutting down")
+            raise
+        except Exception:
+            logger.exception("Embedding worker batch failed")
+
+        await asyncio.sleep(settings.embedding_worker_poll_seconds)
+
+
+async def _claim_entries(limit: int) -> list[ClaimedEntry]:
+    """Claim up to ``limit`` pending (or abandoned) entries."""
+    lease_expired = func.now() - timedelta(seconds=EMBEDDING_LEASE_SECONDS)
+    claimable = (
+        select(BrainEntry.id)
+        .where(
+            or_(
+                BrainEntry.embedding_status == EmbeddingStatus.PENDING,
+                and_(
+                    BrainEntry.embedding_status == EmbeddingStatus.PROCESSING,
+                    BrainEntry.embedding_claimed_at < lease_expired,
+                ),
+            )
+        )
+        .order_by(BrainEntry.created_at)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    )
+    async with get_async_session() as db:
+        result = await db.execute(
+            update(BrainEntry)
+            .where(BrainEntry.id.in_(claimable))
+            .values(
+                embedding_status=EmbeddingStatus.PROCESSING,
+                embedding_claimed_at=func.now(),
+                # Background bookkeeping must not reorder "recently updated" lists
+                updated_at=BrainEntry.updated_at,
+            )
+            .returning(
+                BrainEntry.id,
+                BrainEntry.user_id,
+                BrainEntry.title,
+                BrainEntry.content,
+                BrainEntry.embedding_claimed_at,
+            )
+        )
+        return [ClaimedEntry(*row) for row in result.all()]
+
+
+async def embed_entries(embedder: Embedder, entries: list[ClaimedEntry]) -> int:
+    """Chunk, embed and store a claimed batch of entries.
+
+    Args:
+        embedder: Embedding provider
+        entries: Entries claimed by this worker
+
+    Returns:
+        int: Number of entries whose vectors were stored
+    """
+    chunks: list[tuple[ClaimedEntry, int, str]] = []
+    for entry in entries:
+        for index, chunk in enumerate(chunk_text(f"{entry.title}\n\n{entry.content}")):
+            chunks.append((entry, index, chunk))
+
+    vectors: list[list[float]] = []
+    batch_size = max(1, settings.embedding_batch_size)
+    for start in range(0, len(chunks), batch_size):
+        vectors.extend(
+            await embedder.embed([chunk for _, _, chunk in chunks[start:start + batch_size]])
+        )
+
+    invalid = len(vectors) != len(chunks) or any(len(v) != embedder.dimensions for v in vectors)
+    if invalid:
+        # Retrying would yield the same result — park the batch as failed
+        worker_metrics.failed += len(entries)
+        logger.error("Embedder returned malformed vectors for %d entries", len(entries))
+        async with get_async_session() as db:
+            await _finish(db, entries, EmbeddingStatus.FAILED)
+        return 0
+
+    async with get_async_session() as db:
+        stored = set(await _finish(db, entries, EmbeddingStatus.COMPLETED))
+        if stored:
+            await db.execute(delete(BrainEmbedding).where(BrainEmbedding.entry_id.in_(stored)))
+            rows = [
+                {
+                    "entry_id": entry.id,
+                    "user_id": entry.user_id,
+                    "chunk_text": chunk,
+                    "chunk_index": index,
+                    "embedding": vector,
+                }
+                for (entry, index, chunk), vector in zip(chunks, vectors, strict=True)
+                if entry.id in stored
+            ]
+            await db.execute(insert(BrainEmbedding), rows)
+
+    worker_metrics.embedded += len(stored)
+    worker_metrics.chunks += sum(1 for entry, _, _ in chunks if entry.id in stored)
+    skipped = len(entries) - len(stored)
+    logger.info(
+        "Embedded %d brain entries (%d chunks, %d changed meanwhile)",
+        len(stored), len(chunks), skipped,
+    )
+    return len(stored)
+
+
+async def _finish(db: AsyncSession, entries: list[ClaimedEntry], status: EmbeddingStatus) -> list[UUID]:
+    """Release the claim of entries still held by this worker.
+
+    A claimed batch shares one ``embedding_claimed_at``; entries whose claim
+    changed since (edited, or re-claimed after the lease expired) are left
+    alone.
+
+    Returns:
+        list[UUID]: IDs of the entries that were updated
+    """
+    result = await db.execute(
+        update(BrainEntry)
+        .where(
+            BrainEntry.id.in_([entry.id for entry in entries]),
+            BrainEntry.embedding_claimed_at == entries[0].claimed_at,
+        )
+        .values(embedding_status=status, embedding_claimed_at=None, updated_at=BrainEntry.updated_at)
+        .returning(BrainEntry.id)
+    )
+    return list(result.scalars().all())
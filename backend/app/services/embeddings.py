@@ -0,0 +1,193 @@
+"""Text embedders and chunking for the Second Brain vector search.
+
+Brain entries are split into overlapping chunks which are embedded into
+``EMBEDDING_DIMENSIONS``-dimensional vectors (the size of the
+``brain_embeddings.embedding`` column). The embedder is pluggable via
+``EMBEDDING_PROVIDER``:
+
+- ``openai``: OpenAI embeddings API, shortened to 384 dimensions
+- ``local``: deterministic feature-hashing embedder without any model or
+  network access (tests and offline development; lexical, not semantic)
+
+All embedders return L2-normalized vectors, so cosine distance is the
+natural metric (the HNSW index uses ``vector_cosine_ops``).
+"""
+
+import hashlib
+import logging
+import math
+import re
+from abc import ABC, abstractmethod
+
+from app.core.config import settings
+from app.core.http_client import get_http_client
+
+logger = logging.getLogger(__name__)
+
+EMBEDDING_DIMENSIONS = 384
+CHUNK_MAX_CHARS = 1200
+CHUNK_OVERLAP_CHARS = 200
+
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+_WORD = re.compile(r"\w+", re.UNICODE)
+
+
+class Embedder(ABC):
+    """Abstract base class for embedding providers."""
+
+    dimensions: int = EMBEDDING_DIMENSIONS
+
+    @abstractmethod
+    async def embed(self, texts: list[str]) -> list[list[float]]:
+        """Embed a batch of texts.
+
+        Args:
+            texts: Texts to embed
+
+        Returns:
+            One normalized vector per text, in input order
+        """
+        ...
+
+
+class HashingEmbedder(Embedder):
+    """Deterministic local embedder based on signed feature hashing.
+
+    Words and character trigrams are hashed into the vector dimensions, so
+    texts sharing vocabulary end up close to each other. Needs no model
+    download and yields the same vector for the same text on every run.
+    """
+
+    async def embed(self, texts: list[str]) -> list[list[float]]:
+        """Embed texts by hashing their words and character trigrams."""
+        return [self._embed_one(text) for text in texts]
+
+    def _embed_one(self, text: str) -> list[float]:
+        vector = [0.0] * self.dimensions
+        for word in _WORD.findall(text.lower()):
+            features = [word]
+            padded = f"#{word}#"
+            features.extend(padded[i:i + 3] for i in range(len(padded) - 2))
+            for index, feature in enumerate(features):
+                digest = hashlib.blake2b(feature.encode(), digest_size=8).digest()
+                value = int.from_bytes(digest, "little")
+                sign = 1.0 if value & 1 else -1.0
+                # The whole word (first feature) weighs more than its trigrams
+                vector[(value >> 1) % self.dimensions] += sign * (2.0 if index == 0 else 1.0)
+
+        norm = math.sqrt(sum(v * v for v in vector))
+        if norm == 0.0:
+            return vector
+        return [v / norm for v in vector]
+
+
+class OpenAIEmbedder(Embedder):
+    """OpenAI embeddings API provider."""
+
+    def __init__(self, api_key: str, model: str):
+        """Initialize OpenAI embedder.
+
+        Args:
+            api_key: OpenAI API key
+            model: Embedding model (must support the ``dimensions`` parameter)
+        """
+        self.api_key = api_key
+        self.model = model
+        self.base_url = "https://api.openai.com/v1"
+
+    async def embed(self, texts: list[str]) -> list[list[float]]:
+        """Embed texts with one API request.
+
+        Raises:
+            httpx.HTTPError: If the API call fails
+        """
+        client = get_http_client("openai")
+        response = await client.post(
+            f"{self.base_url}/embeddings",
+            headers={"Authorization": f"Bearer {self.api_key}"},
+            json={"model": self.model, "input": texts, "dimensions": self.dimensions},
+            timeout=30.0,
+        )
+        response.raise_for_status()
+        data = sorted(response.json()["data"], key=lambda item: item["index"])
+        return [item["embedding"] for item in data]
+
+
+_embedder: Embedder | None = None
+
+
+def get_embedder() -> Embedder | None:
+    """Return the configured embedder (created once per process).
+
+    Returns:
+        Embedder | None: None if the provider needs an API key that is
+        not configured (vector search is then unavailable)
+
+    Raises:
+        ValueError: If ``EMBEDDING_PROVIDER`` is unknown
+    """
+    global _embedder
+    if _embedder is not None:
+        return _embedder
+
+    provider = settings.embedding_provider
+    if provider == "local" or settings.app_env == "test":
+        _embedder = HashingEmbedder()
+    elif provider == "openai":
+        if not settings.openai_api_key:
+            logger.warning("No OpenAI API key configured — brain embeddings disabled")
+            return None
+        _embedder = OpenAIEmbedder(settings.openai_api_key, settings.embedding_model)
+    else:
+        raise ValueError(f"Unknown embedding provider: {provider}")
+    return _embedder
+
+
+def chunk_text(
+    text: str,
+    max_chars: int = CHUNK_MAX_CHARS,
+    overlap_chars: int = CHUNK_OVERLAP_CHARS,
+) -> list[str]:
+    """Split text into overlapping chunks along paragraph and sentence bounds.
+
+    Paragraphs are packed into chunks of up to ``max_chars``; longer
+    paragraphs are split by sentences, and sentences still too long are
+    cut hard. Each chunk starts with the tail of the previous one so
+    context spanning a boundary is found from both sides.
+
+    Args:
+        text: Text to split
+        max_chars: Maximum chunk length (excluding the overlap)
+        overlap_chars: Characters carried over from the previous chunk
+
+    Returns:
+        list[str]: Chunks in text order (empty for blank text)
+    """
+    pieces: list[str] = []
+    for paragraph in re.split(r"\n\s*\n", text):
+        paragraph = paragraph.strip()
+        if not paragraph:
+            continue
+        if len(paragraph) <= max_chars:
+            pieces.append(paragraph)
+            continue
+        for sentence in _SENTENCE_END.split(paragraph):
+            pieces.extend(
+                sentence[i:i + max_chars] for i in range(0, len(sentence), max_chars)
+            )
+
+    chunks: list[str] = []
+    current = ""
+    size = 0  # length of current without the carried-over overlap
+    for piece in pieces:
+        if size and size + len(piece) + 2 > max_chars:
+            chunks.append(current)
+            tail = current[-overlap_chars:] if overlap_chars else ""
+            # Start the overlap at a word boundary
+            current = tail[tail.find(" ") + 1:] if " " in tail else tail
+            size = 0
+        current = f"{current}\n\n{piece}" if current else piece
+        size += len(piece) + 2
+    if size:
+        chunks.append(current)
+    return chunks
@@ -0,0 +1,437 @@
+"""Durable, debounced queue for memory episode processing.
+
+Chat and voice turns do not analyze the conversation themselves. They only
+upsert one ``EpisodeJob`` row per conversation; every further turn pushes
+the job's ``due_at`` back (debounce) until the conversation has been idle
+for ``EPISODE_IDLE_SECONDS`` or ``EPISODE_MAX_DELAY_SECONDS`` have passed
+since the first pending turn. Voice sessions flush their job on hang-up.
+
+``run_episode_worker`` claims due jobs with ``FOR UPDATE SKIP LOCKED``, at
+most ``EPISODE_WORKER_CONCURRENCY`` at a time, and sends only the messages
+after the job's ``(processed_until, processed_until_id)`` keyset watermark
+to Graphiti and the NLP analyzer. Claimed jobs carry a lease in ``due_at``,
+so work interrupted by a restart is picked up again once the lease expires.
+
+``created_at`` is the inserting transaction's start time, so a message can
+become visible after newer ones. The worker therefore only processes
+messages older than the oldest transaction still in progress and retries
+later for the rest; otherwise the watermark could pass them for good.
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from uuid import UUID
+
+from sqlalchemy import (
+    DateTime,
+    Integer,
+    String,
+    and_,
+    case,
+    column,
+    func,
+    null,
+    select,
+    table,
+    tuple_,
+    update,
+)
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.database import get_async_session
+from app.models.episode_job import EpisodeJob
+from app.models.message import Message
+from app.services.graphiti_client import get_graphiti_client
+from app.services.memory import MemoryService
+
+logger = logging.getLogger(__name__)
+
+EPISODE_BATCH_SIZE = 50  # messages per episode
+EPISODE_LEASE_SECONDS = 600  # claimed jobs become due again after this
+EPISODE_MAX_ATTEMPTS = 5
+EPISODE_RETRY_BASE_SECONDS = 30
+
+pg_stat_activity = table(
+    "pg_stat_activity",
+    column("pid", Integer),
+    column("datname", String),
+    column("xact_start", DateTime(timezone=True)),
+)
+
+
+@dataclass(frozen=True)
+class ClaimedJob:
+    """Snapshot of a job row taken when the worker claimed it."""
+
+    id: UUID
+    user_id: UUID
+    conversation_id: UUID
+    processed_until: datetime | None
+    processed_until_id: UUID | None
+    enqueued_at: datetime | None
+    claimed_at: datetime
+    attempts: int
+
+
+@dataclass(frozen=True)
+class EpisodeProgress:
+    """Outcome of one processing run of a job."""
+
+    processed_until: datetime | None
+    processed_until_id: UUID | None
+    has_more: bool = False  # a full batch was processed, run again right away
+    held_back: bool = False  # newer messages may not be committed yet, retry later
+
+
+class EpisodeWorkerMetrics:
+    """In-process counters of the episode worker."""
+
+    def __init__(self):
+        """Initialize empty counters."""
+        self.running = 0
+        self.processed = 0
+        self.failed = 0
+        self.last_lag_seconds: float | None = None
+
+    def snapshot(self) -> dict:
+        """Return the current counters."""
+        return {
+            "running": self.running,
+            "processed": self.processed,
+            "failed": self.failed,
+            "last_lag_seconds": (
+                round(self.last_lag_seconds, 1) if self.last_lag_seconds is not None else None
+            ),
+        }
+
+
+worker_metrics = EpisodeWorkerMetrics()
+
+
+async def enqueue_episode(db: AsyncSession, user_id: UUID, conversation_id: UUID) -> None:
+    """Mark a conversation as having new messages to process.
+
+    Debounces per conversation: the job becomes due after the idle period,
+    but never later than the max delay after the first pending turn. A job
+    that is currently being processed keeps its lease; the worker
+    reschedules it when it finishes.
+
+    Args:
+        db: Database session (committed by the caller)
+        user_id: Owner of the conversation
+        conversation_id: Conversation that received a new turn
+    """
+    now = func.now()
+    idle = timedelta(seconds=settings.episode_idle_seconds)
+    max_delay = timedelta(seconds=settings.episode_max_delay_seconds)
+
+    stmt = pg_insert(EpisodeJob).values(
+        user_id=user_id,
+        conversation_id=conversation_id,
+        due_at=func.least(now + idle, now + max_delay),
+        enqueued_at=now,
+        last_enqueued_at=now,
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[EpisodeJob.conversation_id],
+        set_={
+            "due_at": case(
+                (EpisodeJob.claimed_at.is_not(None), EpisodeJob.due_at),
+                else_=func.least(
+                    now + idle,
+                    func.coalesce(EpisodeJob.enqueued_at, now) + max_delay,
+                ),
+            ),
+            "enqueued_at": func.coalesce(EpisodeJob.enqueued_at, now),
+            "last_enqueued_at": now,
+            "updated_at": now,
+        },
+    )
+    await db.execute(stmt)
+
+
+async def flush_episode(db: AsyncSession, conversation_id: UUID) -> None:
+    """Make a pending job due immediately (e.g. when a voice session ends).
+
+    Args:
+        db: Database session (committed by the caller)
+        conversation_id: Conversation to flush
+    """
+    await db.execute(
+        update(EpisodeJob)
+        .where(
+            EpisodeJob.conversation_id == conversation_id,
+            EpisodeJob.due_at.is_not(None),
+            EpisodeJob.claimed_at.is_(None),
+        )
+        .values(due_at=func.now())
+    )
+
+
+async def get_queue_stats(db: AsyncSession) -> dict:
+    """Return queue depth and lag for monitoring.
+
+    Args:
+        db: Database session
+
+    Returns:
+        dict: pending, due and in-flight job counts, the age of the oldest
+        pending job in seconds and the in-process worker counters
+    """
+    now = func.now()
+    pending = EpisodeJob.due_at.is_not(None)
+    row = (
+        await db.execute(
+            select(
+                func.count().filter(pending).label("depth"),
+                func.count().filter(EpisodeJob.due_at <= now).label("due"),
+                func.count()
+                .filter(and_(EpisodeJob.claimed_at.is_not(None), EpisodeJob.due_at > now))
+                .label("in_flight"),
+                func.extract("epoch", now - func.min(EpisodeJob.enqueued_at).filter(pending))
+                .label("oldest_lag_seconds"),
+            )
+        )
+    ).one()
+
+    return {
+        "depth": row.depth,
+        "due": row.due,
+        "in_flight": row.in_flight,
+        "oldest_lag_seconds": (
+            round(float(row.oldest_lag_seconds), 1)
+            if row.oldest_lag_seconds is not None else None
+        ),
+        "worker": worker_metrics.snapshot(),
+    }
+
+
+async def run_episode_worker() -> None:
+    """Worker loop — claims due jobs up to the concurrency limit."""
+    concurrency = max(1, settings.episode_worker_concurrency)
+    poll_seconds = settings.episode_worker_poll_seconds
+    running: set[asyncio.Task] = set()
+    logger.info(
+        "Episode worker started (concurrency: %d, idle: %.0fs)",
+        concurrency, settings.episode_idle_seconds,
+    )
+
+    try:
+        while True:
+            try:
+                # Backpressure: only claim as many jobs as there are free slots
+                free_slots = concurrency - len(running)
+                if free_slots > 0:
+                    for job in await _claim_due_jobs(free_slots):
+                        task = asyncio.create_task(_run_job(job))
+                        running.add(task)
+                        task.add_done_callback(running.discard)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Episode worker poll failed")
+
+            if running:
+                await asyncio.wait(
+                    running, timeout=poll_seconds, return_when=asyncio.FIRST_COMPLETED
+                )
+            else:
+                await asyncio.sleep(poll_seconds)
+    except asyncio.CancelledError:
+        logger.info("Episode worker cancelled — shutting down")
+        # Interrupted jobs keep their lease and are retried after it expires
+        for task in running:
+            task.cancel()
+        await asyncio.gather(*running, return_exceptions=True)
+        raise
+
+
+async def _claim_due_jobs(limit: int) -> list[ClaimedJob]:
+    """Claim up to ``limit`` due jobs and give them a lease."""
+    due_ids = (
+        select(EpisodeJob.id)
+        .where(EpisodeJob.due_at <= func.now())
+        .order_by(EpisodeJob.due_at)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    )
+    async with get_async_session() as db:
+        result = await db.execute(
+            update(EpisodeJob)
+            .where(EpisodeJob.id.in_(due_ids))
+            .values(
+                due_at=func.now() + timedelta(seconds=EPISODE_LEASE_SECONDS),
+                claimed_at=func.now(),
+                attempts=EpisodeJob.attempts + 1,
+            )
+            .returning(
+                EpisodeJob.id,
+                EpisodeJob.user_id,
+                EpisodeJob.conversation_id,
+                EpisodeJob.processed_until,
+                EpisodeJob.processed_until_id,
+                EpisodeJob.enqueued_at,
+                EpisodeJob.claimed_at,
+                EpisodeJob.attempts,
+            )
+        )
+        return [ClaimedJob(*row) for row in result.all()]
+
+
+async def _run_job(job: ClaimedJob) -> None:
+    """Process one claimed job and record the outcome."""
+    worker_metrics.running += 1
+    started = time.monotonic()
+    try:
+        progress = await _process_job(job)
+    except asyncio.CancelledError:
+        raise
+    except Exception as e:
+        worker_metrics.failed += 1
+        logger.exception(
+            "Episode processing failed for conversation %s (attempt %d)",
+            job.conversation_id, job.attempts,
+        )
+        try:
+            await _fail_job(job, e)
+        except Exception:
+            logger.exception("Failed to record episode failure for %s", job.conversation_id)
+        return
+    finally:
+        worker_metrics.running -= 1
+
+    try:
+        await _complete_job(job, progress)
+    except Exception:
+        # The lease expires and the job is retried from the old watermark
+        logger.exception("Failed to complete episode job for %s", job.conversation_id)
+        return
+    worker_metrics.processed += 1
+    if job.enqueued_at is not None:
+        worker_metrics.last_lag_seconds = (job.claimed_at - job.enqueued_at).total_seconds()
+    logger.info(
+        "Processed episode for conversation %s in %.1fs (queue lag %.0fs)",
+        job.conversation_id,
+        time.monotonic() - started,
+        worker_metrics.last_lag_seconds or 0.0,
+    )
+
+
+async def _process_job(job: ClaimedJob) -> EpisodeProgress:
+    """Analyze the messages added since the last run.
+
+    Messages are read in ``(created_at, id)`` order after the watermark, up
+    to the start of the oldest other open transaction: rows that such a
+    transaction inserts get its start time as ``created_at`` and would end
+    up behind the watermark once committed.
+
+    Returns:
+        EpisodeProgress: New watermark and whether to run again
+    """
+    horizon = (
+        select(func.min(pg_stat_activity.c.xact_start))
+        .where(
+            pg_stat_activity.c.datname == func.current_database(),
+            pg_stat_activity.c.pid != func.pg_backend_pid(),
+            # A session stuck in a transaction must not stall processing for good
+            pg_stat_activity.c.xact_start > func.now() - timedelta(seconds=EPISODE_LEASE_SECONDS),
+        )
+        .scalar_subquery()
+    )
+    stmt = select(
+        Message.id, Message.role, Message.content, Message.created_at, horizon.label("horizon")
+    ).where(Message.conversation_id == job.conversation_id)
+    if job.processed_until_id is not None:
+        stmt = stmt.where(
+            tuple_(Message.created_at, Message.id)
+            > tuple_(job.processed_until, job.processed_until_id)
+        )
+    elif job.processed_until is not None:
+        stmt = stmt.where(Message.created_at > job.processed_until)
+    async with get_async_session() as db:
+        rows = (
+            await db.execute(
+                stmt.order_by(Message.created_at, Message.id).limit(EPISODE_BATCH_SIZE)
+            )
+        ).all()
+
+    settled = [row for row in rows if row.horizon is None or row.created_at < row.horizon]
+    held_back = len(settled) < len(rows)
+    if not settled:
+        return EpisodeProgress(job.processed_until, job.processed_until_id, held_back=held_back)
+
+    graphiti = get_graphiti_client()
+    if graphiti.enabled:
+        messages = [{"role": row.role.value, "content": row.content} for row in settled]
+        # MemoryService only touches the DB after its Graphiti and NLP calls
+        async with get_async_session() as db:
+            await MemoryService(db, graphiti).process_episode(
+                str(job.user_id), str(job.conversation_id), messages
+            )
+
+    return EpisodeProgress(
+        settled[-1].created_at,
+        settled[-1].id,
+        has_more=len(rows) == EPISODE_BATCH_SIZE and not held_back,
+        held_back=held_back,
+    )
+
+
+async def _complete_job(job: ClaimedJob, progress: EpisodeProgress) -> None:
+    """Release the claim; reschedule if turns arrived while processing."""
+    if progress.has_more:
+        due_at = func.now()
+        enqueued_at = EpisodeJob.enqueued_at
+    elif progress.held_back:
+        due_at = func.now() + timedelta(seconds=settings.episode_idle_seconds)
+        enqueued_at = EpisodeJob.enqueued_at
+    else:
+        requeued = EpisodeJob.last_enqueued_at > EpisodeJob.claimed_at
+        due_at = case(
+            (requeued, EpisodeJob.last_enqueued_at + timedelta(seconds=settings.episode_idle_seconds)),
+            else_=null(),
+        )
+        enqueued_at = case((requeued, EpisodeJob.claimed_at), else_=null())
+
+    async with get_async_session() as db:
+        await db.execute(
+            update(EpisodeJob)
+            # Skip if the lease expired and another worker took the job over
+            .where(EpisodeJob.id == job.id, EpisodeJob.claimed_at == job.claimed_at)
+            .values(
+                processed_until=progress.processed_until,
+                processed_until_id=progress.processed_until_id,
+                due_at=due_at,
+                enqueued_at=enqueued_at,
+                claimed_at=None,
+                attempts=0,
+                last_error=None,
+            )
+        )
+
+
+async def _fail_job(job: ClaimedJob, error: Exception) -> None:
+    """Schedule a retry with exponential backoff, or give up."""
+    values: dict = {"claimed_at": None, "last_error": str(error)[:1000]}
+    if job.attempts >= EPISODE_MAX_ATTEMPTS:
+        logger.error(
+            "Giving up on episode for conversation %s after %d attempts",
+            job.conversation_id, job.attempts,
+        )
+        # Stays idle until the next turn enqueues it again
+        values.update(due_at=None, enqueued_at=None, attempts=0)
+    else:
+        delay = EPISODE_RETRY_BASE_SECONDS * 2 ** (job.attempts - 1)
+        values["due_at"] = func.now() + timedelta(seconds=delay)
+
+    async with get_async_session() as db:
+        await db.execute(
+            update(EpisodeJob)
+            .where(EpisodeJob.id == job.id, EpisodeJob.claimed_at == job.claimed_at)
+            .values(**values)
+        )
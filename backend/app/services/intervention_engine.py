@@ -11,10 +11,8 @@ from sqlalchemy import select, func
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.intervention import Intervention
-from app.models.pattern_log import PatternLog
-from app.models.task import Task, TaskStatus
-from app.models.user_stats import UserStats
 from app.services.pattern_analyzer import PatternAnalyzer
+from app.services.user_features import UserFeatureSnapshot, build_feature_snapshot
 
 logger = logging.getLogger(__name__)
 
@@ -38,19 +36,21 @@ class InterventionEngine:
         self.db = db
         self.pattern_analyzer = PatternAnalyzer(db)
 
-    async def evaluate(self, user_id: str) -> list[dict[str, Any]]:
+    async def evaluate(
+        self, user_id: str, snapshot: UserFeatureSnapshot | None = None
+    ) -> list[dict[str, Any]]:
         """Evaluate user patterns and create interventions for detected issues.
 
+        Args:
+            user_id: User to evaluate
+            snapshot: Features loaded for this user already (built if omitted)
+
         Returns a list of newly created intervention dicts.
         """
-        trends = await self.pattern_analyzer.get_recent_trends(user_id, days=7)
-        stats = await self._get_user_stats(user_id)
-        recent_logs = await self._get_recent_logs(user_id, days=3)
-
-        if trends.get("total_conversations", 0) == 0:
-            return []
+        if snapshot is None:
+            snapshot = await build_feature_snapshot(self.db, user_id)
 
-        detected = self._detect_patterns(trends, stats, recent_logs)
+        detected = self.detect(snapshot)
 
         created: list[dict[str, Any]] = []
         for pattern in detected:
@@ -86,6 +86,12 @@ class InterventionEngine:
 
         return created
 
+    def detect(self, snapshot: UserFeatureSnapshot) -> list[dict[str, Any]]:
+        """Detect patterns in a feature snapshot (pure, no DB access)."""
+        if not snapshot.has_conversations:
+            return []
+        return self._detect_patterns(snapshot.trends_7d, snapshot.stats, snapshot.recent_logs)
+
     def _detect_patterns(
         self,
         trends: dict[str, Any],
@@ -182,51 +188,3 @@ class InterventionEngine:
         )
         result = await self.db.execute(stmt)
         return (result.scalar() or 0) > 0
-
-    async def _get_user_stats(self, user_id: str) -> dict[str, Any]:
-        """Fetch user gamification stats and count of open tasks."""
-        stats_result = await self.db.execute(
-            select(UserStats).where(UserStats.user_id == user_id)
-        )
-        stats = stats_result.scalar_one_or_none()
-
-        open_count_result = await self.db.execute(
-            select(func.count())
-            .select_from(Task)
-            .where(
-                Task.user_id == user_id,
-                Task.status.in_([TaskStatus.OPEN, TaskStatus.IN_PROGRESS]),
-            )
-        )
-        open_tasks = open_count_result.scalar() or 0
-
-        if not stats:
-            return {"tasks_completed": 0, "current_streak": 0, "open_tasks": open_tasks}
-
-        return {
-            "tasks_completed": stats.tasks_completed,
-            "current_streak": stats.current_streak,
-            "open_tasks": open_tasks,
-        }
-
-    async def _get_recent_logs(self, user_id: str, days: int = 3) -> list[dict[str, Any]]:
-        """Fetch recent pattern logs ordered chronologically."""
-        cutoff = datetime.now(timezone.utc) - timedelta(days=days)
-        stmt = (
-            select(PatternLog)
-            .where(
-                PatternLog.user_id == user_id,
-                PatternLog.created_at >= cutoff,
-            )
-            .order_by(PatternLog.created_at.asc())
-        )
-        result = await self.db.execute(stmt)
-        logs = result.scalars().all()
-        return [
-            {
-                "mood_score": log.mood_score,
-                "energy_level": log.energy_level,
-                "focus_score": log.focus_score,
-            }
-            for log in logs
-        ]
@@ -0,0 +1,545 @@
+"""Next-due job schedule for the background scheduler.
+
+Instead of re-evaluating every user every five minutes, the scheduler
+keeps one ``scheduled_jobs`` row per (user, job type) holding the time
+the job is next due:
+
+- ``task_nudges``: one hour before the next task deadline, at the deadline
+  (overdue), or the next morning while tasks stay overdue
+- ``reminders``: the next pending ``Reminder.remind_at``
+- ``briefing`` / ``streak``: the next briefing / preferred reminder time
+- ``wellbeing`` / ``predictions`` / ``calendar``: fixed intervals
+
+Due times falling into the user's quiet hours are moved to their end.
+The process running the scheduler mirrors the near-term rows in an
+in-memory heap (``job_heap``), rehydrated from Postgres periodically, and
+sleeps until the earliest entry, then claims the due rows (``FOR UPDATE
+SKIP LOCKED``) before running them. API writes that create earlier events
+(``hint_job``, ``reschedule_user``) pull the row forward and wake the heap;
+in other processes they also send a ``NOTIFY`` on ``JOB_HINT_CHANNEL`` with
+the commit, which the scheduler leader receives on its lock connection
+(``apply_job_hint``), so near-term events don't wait for the next rehydrate.
+"""
+
+import asyncio
+import heapq
+import logging
+from collections.abc import Collection
+from datetime import UTC, datetime, time, timedelta
+from uuid import UUID
+from zoneinfo import ZoneInfo
+
+from sqlalchemy import BigInteger, Text, case, cast, func, literal, select, true, update
+from sqlalchemy.dialects.postgresql import array
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings as app_settings
+from app.models.reminder import Reminder, ReminderStatus
+from app.models.scheduled_job import ScheduledJob
+from app.models.task import Task, TaskStatus
+from app.models.user_settings import DEFAULT_SETTINGS, UserSettings
+
+logger = logging.getLogger(__name__)
+
+BERLIN_TZ = ZoneInfo("Europe/Berlin")
+
+JOB_TYPES = (
+    "task_nudges",
+    "streak",
+    "wellbeing",
+    "briefing",
+    "predictions",
+    "calendar",
+    "reminders",
+)
+
+# Jobs without an event time run at a fixed interval
+PERIODIC_JOB_SECONDS = {
+    "wellbeing": 300,
+    "predictions": 300,
+    "calendar": 1800,
+}
+
+DEADLINE_LEAD = timedelta(minutes=60)  # deadline nudge one hour before due
+CLAIM_BATCH_LIMIT = 1000  # jobs claimed per batch
+FAILED_JOB_RETRY = timedelta(minutes=5)  # backoff after a failed or timed-out run
+
+# NOTIFY channel carrying API job hints to the scheduler leader's process
+JOB_HINT_CHANNEL = "alice_job_hints"
+
+
+def as_utc(at: datetime) -> datetime:
+    """Treat a naive datetime as UTC, as Postgres does when storing it in a timestamptz."""
+    return at.replace(tzinfo=UTC) if at.tzinfo is None else at
+
+
+def shard_filter(user_id_column, shards: Collection[int] | None):
+    """SQL condition selecting the users of the given shards (None = all users)."""
+    if shards is None or app_settings.scheduler_shards <= 1:
+        return true()
+    user_hash = func.abs(cast(func.hashtext(cast(user_id_column, Text)), BigInteger))
+    return (user_hash % app_settings.scheduler_shards).in_(sorted(shards))
+
+
+# ---------------------------------------------------------------------------
+# Due time computation
+# ---------------------------------------------------------------------------
+
+
+def is_quiet_hours(now: datetime, start_str: str, end_str: str) -> bool:
+    """Check if current time falls within quiet hours (supports midnight spanning)."""
+    start = time(int(start_str[:2]), int(start_str[3:5]))
+    end = time(int(end_str[:2]), int(end_str[3:5]))
+    current = now.time()
+
+    if start <= end:
+        # Same day range (e.g. 08:00–17:00)
+        return start <= current <= end
+    else:
+        # Midnight spanning (e.g. 22:00–07:00)
+        return current >= start or current <= end
+
+
+def in_quiet_hours(now: datetime, settings: dict) -> bool:
+    """Check the user's configured quiet hours (if any)."""
+    quiet_start = settings.get("quiet_hours_start")
+    quiet_end = settings.get("quiet_hours_end")
+    return bool(quiet_start and quiet_end and is_quiet_hours(now, quiet_start, quiet_end))
+
+
+def next_clock_time(after: datetime, times: list[str]) -> datetime | None:
+    """Earliest Berlin wall-clock time from ``times`` ("HH:MM") strictly after ``after``."""
+    local = after.astimezone(BERLIN_TZ)
+    candidates = []
+    for t_str in times:
+        parts = t_str.split(":")
+        if len(parts) != 2:
+            continue
+        clock = time(int(parts[0]), int(parts[1]))
+        for day in (local.date(), local.date() + timedelta(days=1)):
+            at = datetime.combine(day, clock, tzinfo=BERLIN_TZ)
+            if at > local:
+                candidates.append(at)
+                break
+    return min(candidates).astimezone(UTC) if candidates else None
+
+
+def defer_past_quiet_hours(at: datetime, settings: dict) -> datetime:
+    """Move a due time that falls into quiet hours to just after their end."""
+    local = at.astimezone(BERLIN_TZ)
+    if not in_quiet_hours(local, settings):
+        return at
+    end = settings["quiet_hours_end"]
+    # Quiet hours include their end minute
+    resume = next_clock_time(local, [end])
+    return resume + timedelta(minutes=1)
+
+
+def compute_next_due(
+    job_type: str,
+    now: datetime,
+    settings: dict,
+    event_at: datetime | None = None,
+) -> datetime | None:
+    """
+    Compute when a job is next due for one user.
+
+    Args:
+        job_type: One of JOB_TYPES
+        now: Current time (UTC)
+        settings: Merged user settings
+        event_at: Next task/reminder event for ``task_nudges``/``reminders``
+
+    Returns:
+        datetime | None: Next due time (UTC), None if nothing is scheduled
+    """
+    if not settings.get("expo_push_token") or not settings.get("notifications_enabled", True):
+        return None
+
+    active_modules = settings.get("active_modules", ["core", "adhs"])
+
+    if job_type in ("task_nudges", "reminders"):
+        if job_type == "reminders" and "integrations" not in active_modules:
+            return None
+        at = event_at
+    elif job_type == "streak":
+        at = next_clock_time(now, settings.get("preferred_reminder_times") or [])
+    elif job_type == "briefing":
+        if "productivity" not in active_modules or not settings.get("morning_briefing", True):
+            return None
+        at = next_clock_time(now, [settings.get("briefing_time", "07:00")])
+    elif job_type in PERIODIC_JOB_SECONDS:
+        module = "integrations" if job_type == "calendar" else "wellness"
+        if module not in active_modules:
+            return None
+        at = now + timedelta(seconds=PERIODIC_JOB_SECONDS[job_type])
+    else:
+        raise ValueError(f"Unknown scheduler job type: {job_type}")
+
+    if at is None:
+        return None
+    return defer_past_quiet_hours(max(at, now), settings)
+
+
+async def _next_task_events(
+    db: AsyncSession, user_ids: list[UUID], now: datetime
+) -> dict[UUID, datetime]:
+    """Next deadline/overdue nudge time per user, in one grouped query."""
+    tomorrow = datetime.combine(
+        now.astimezone(BERLIN_TZ).date() + timedelta(days=1), time.min, tzinfo=BERLIN_TZ
+    )
+    event = case(
+        (Task.due_date - DEADLINE_LEAD > now, Task.due_date - DEADLINE_LEAD),
+        (Task.due_date > now, Task.due_date),
+        # Overdue: nudged once per day
+        else_=literal(tomorrow),
+    )
+    result = await db.execute(
+        select(Task.user_id, func.min(event))
+        .where(
+            Task.user_id.in_(user_ids),
+            Task.status.in_([TaskStatus.OPEN, TaskStatus.IN_PROGRESS]),
+            Task.due_date.isnot(None),
+        )
+        .group_by(Task.user_id)
+    )
+    return dict(result.all())
+
+
+async def _next_reminder_events(db: AsyncSession, user_ids: list[UUID]) -> dict[UUID, datetime]:
+    """Next pending reminder time per user, in one grouped query."""
+    result = await db.execute(
+        select(Reminder.user_id, func.min(Reminder.remind_at))
+        .where(
+            Reminder.user_id.in_(user_ids),
+            Reminder.status == ReminderStatus.PENDING,
+        )
+        .group_by(Reminder.user_id)
+    )
+    return dict(result.all())
+
+
+async def reschedule(
+    db: AsyncSession,
+    jobs: dict[UUID, tuple[dict, tuple[str, ...]]],
+    now: datetime | None = None,
+    ran: bool = False,
+    failed: set[tuple[UUID, str]] | None = None,
+) -> list[tuple[UUID, str, datetime | None]]:
+    """
+    Recompute and persist the next due time of jobs.
+
+    Args:
+        db: Database session (caller commits)
+        jobs: Merged settings and job types per user
+        now: Current time (defaults to now)
+        ran: Whether the jobs just ran (sets ``last_run_at``)
+        failed: (user_id, job_type) of jobs whose run failed; they are not
+            due again before ``FAILED_JOB_RETRY`` (their event may still be due)
+
+    Returns:
+        list: (user_id, job_type, next_due_at) per job, also applied to ``job_heap``
+    """
+    if not jobs:
+        return []
+    now = now or datetime.now(UTC)
+    user_ids = list(jobs)
+
+    task_events: dict[UUID, datetime] = {}
+    reminder_events: dict[UUID, datetime] = {}
+    if any("task_nudges" in types for _, types in jobs.values()):
+        task_events = await _next_task_events(db, user_ids, now)
+    if any("reminders" in types for _, types in jobs.values()):
+        reminder_events = await _next_reminder_events(db, user_ids)
+
+    rows = []
+    for user_id, (settings, job_types) in jobs.items():
+        for job_type in job_types:
+            event_at = {"task_nudges": task_events, "reminders": reminder_events}.get(
+                job_type, {}
+            ).get(user_id)
+            next_due_at = compute_next_due(job_type, now, settings, event_at)
+            if next_due_at is not None and failed and (user_id, job_type) in failed:
+                next_due_at = defer_past_quiet_hours(
+                    max(next_due_at, now + FAILED_JOB_RETRY), settings
+                )
+            rows.append({
+                "user_id": user_id,
+                "job_type": job_type,
+                "next_due_at": next_due_at,
+                **({"last_run_at": now} if ran else {}),
+            })
+
+    stmt = pg_insert(ScheduledJob).values(rows)
+    update = {"next_due_at": stmt.excluded.next_due_at, "updated_at": func.now()}
+    if ran:
+        update["last_run_at"] = stmt.excluded.last_run_at
+    await db.execute(
+        stmt.on_conflict_do_update(index_elements=["user_id", "job_type"], set_=update)
+    )
+
+    scheduled = [(row["user_id"], row["job_type"], row["next_due_at"]) for row in rows]
+    for user_id, job_type, next_due_at in scheduled:
+        job_heap.set(user_id, job_type, next_due_at)
+    return scheduled
+
+
+async def reschedule_user(db: AsyncSession, user_id: UUID, settings: dict) -> None:
+    """Recompute all jobs of a user after a settings change (caller commits)."""
+    scheduled = await reschedule(db, {user_id: ({**DEFAULT_SETTINGS, **settings}, JOB_TYPES)})
+    await _notify_job_hints(db, [job for job in scheduled if job[2] is not None])
+
+
+async def hint_job(db: AsyncSession, user_id: UUID, job_type: str, at: datetime) -> None:
+    """
+    Pull a job forward to ``at`` if that is earlier than its current due time.
+
+    Called by API writes that create new events (task deadlines,
+    reminders). The job itself re-checks what is actually due, so a hint
+    that turns out to be early only costs one no-op run. The scheduler
+    leader is notified when the caller commits, even if it runs in
+    another process.
+
+    Args:
+        db: Database session (caller commits)
+        user_id: User the event belongs to
+        job_type: Job that handles the event
+        at: When the event is due (naive = UTC)
+    """
+    at = as_utc(at)
+    stmt = pg_insert(ScheduledJob).values(user_id=user_id, job_type=job_type, next_due_at=at)
+    await db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=["user_id", "job_type"],
+            # LEAST ignores NULL: an idle job simply takes the hint
+            set_={
+                "next_due_at": func.least(ScheduledJob.next_due_at, stmt.excluded.next_due_at),
+                "updated_at": func.now(),
+            },
+        )
+    )
+    await _notify_job_hints(db, [(user_id, job_type, at)])
+    job_heap.hint(user_id, job_type, at)
+
+
+async def _notify_job_hints(
+    db: AsyncSession, hints: list[tuple[UUID, str, datetime]]
+) -> None:
+    """Send job hints to the scheduler leader; Postgres delivers them on commit."""
+    if not hints:
+        return
+    await db.execute(
+        select(*(
+            func.pg_notify(JOB_HINT_CHANNEL, f"{user_id} {job_type} {at.isoformat()}")
+            for user_id, job_type, at in hints
+        ))
+    )
+
+
+def apply_job_hint(payload: str) -> None:
+    """
+    Apply a job hint sent by another process to ``job_heap``.
+
+    Hints beyond the rehydrate horizon are left to the next rehydrate.
+    Hints for users of another shard only cause a claim that finds nothing.
+
+    Args:
+        payload: "<user_id> <job_type> <ISO due time>" (see ``_notify_job_hints``)
+    """
+    try:
+        raw_user_id, job_type, raw_at = payload.split(" ")
+        user_id = UUID(raw_user_id)
+        at = datetime.fromisoformat(raw_at)
+    except ValueError:
+        logger.warning("Ignoring malformed job hint: %r", payload)
+        return
+    if job_type not in JOB_TYPES or at.tzinfo is None:
+        logger.warning("Ignoring malformed job hint: %r", payload)
+        return
+    horizon = datetime.now(UTC) + timedelta(
+        seconds=2 * app_settings.scheduler_rehydrate_seconds
+    )
+    if at <= horizon:
+        job_heap.hint(user_id, job_type, at)
+
+
+async def load_due_jobs(
+    db: AsyncSession, until: datetime, shards: Collection[int] | None = None
+) -> int:
+    """
+    Rehydrate ``job_heap`` with all jobs due before ``until``.
+
+    Users with a push token but no scheduled jobs yet (e.g. before the
+    first run) get all job types due immediately.
+
+    Args:
+        db: Database session (caller commits)
+        until: End of the horizon to load
+        shards: Only load users of these shards (None = all users)
+
+    Returns:
+        int: Number of jobs loaded
+    """
+    job_types = (
+        select(func.unnest(array(list(JOB_TYPES))).label("job_type"))
+        .subquery("job_types")
+    )
+    missing = (
+        select(func.gen_random_uuid(), UserSettings.user_id, job_types.c.job_type, func.now())
+        .select_from(UserSettings)
+        .join(job_types, true())
+        .where(
+            UserSettings.settings["expo_push_token"].astext.isnot(None),
+            shard_filter(UserSettings.user_id, shards),
+            ~select(ScheduledJob.id)
+            .where(
+                ScheduledJob.user_id == UserSettings.user_id,
+                ScheduledJob.job_type == job_types.c.job_type,
+            )
+            .exists(),
+        )
+    )
+    await db.execute(
+        pg_insert(ScheduledJob)
+        .from_select(["id", "user_id", "job_type", "next_due_at"], missing)
+        .on_conflict_do_nothing(index_elements=["user_id", "job_type"])
+    )
+
+    result = await db.execute(
+        select(ScheduledJob.user_id, ScheduledJob.job_type, ScheduledJob.next_due_at)
+        .where(
+            ScheduledJob.next_due_at <= until,
+            shard_filter(ScheduledJob.user_id, shards),
+        )
+    )
+    rows = result.all()
+    for user_id, job_type, next_due_at in rows:
+        job_heap.set(user_id, job_type, next_due_at)
+    return len(rows)
+
+
+async def claim_due_jobs(
+    db: AsyncSession, until: datetime, shards: Collection[int] | None = None
+) -> list[tuple[UUID, str, datetime]]:
+    """
+    Claim all jobs due before ``until`` and give them a lease.
+
+    Rows are locked with ``FOR UPDATE SKIP LOCKED`` and pushed forward by
+    ``scheduler_job_lease_seconds``, so no other scheduler claims them
+    while they run; ``reschedule`` then sets the real next due time. If
+    the process dies mid-run, the jobs become due again after the lease.
+
+    Args:
+        db: Database session (caller commits)
+        until: Claim jobs due at or before this time
+        shards: Only claim users of these shards (None = all users)
+
+    Returns:
+        list: (user_id, job_type, due_at) of the claimed jobs
+    """
+    due = (
+        select(ScheduledJob.id, ScheduledJob.next_due_at)
+        .where(
+            ScheduledJob.next_due_at <= until,
+            shard_filter(ScheduledJob.user_id, shards),
+        )
+        .order_by(ScheduledJob.next_due_at)
+        .limit(CLAIM_BATCH_LIMIT)
+        .with_for_update(skip_locked=True)
+        .cte("due")
+    )
+    result = await db.execute(
+        update(ScheduledJob)
+        .where(ScheduledJob.id == due.c.id)
+        .values(
+            next_due_at=func.now() + timedelta(seconds=app_settings.scheduler_job_lease_seconds),
+            updated_at=func.now(),
+        )
+        .returning(ScheduledJob.user_id, ScheduledJob.job_type, due.c.next_due_at)
+    )
+    return [tuple(row) for row in result.all()]
+
+
+# ---------------------------------------------------------------------------
+# In-memory heap
+# ---------------------------------------------------------------------------
+
+
+class JobHeap:
+    """
+    Min-heap of (next_due_at, user_id, job_type) for the scheduler loop.
+
+    ``_due`` holds the current due time per job; heap entries that no
+    longer match it are stale and skipped lazily. The heap only tracks
+    jobs while the scheduler runs in this process (``active``).
+    """
+
+    def __init__(self):
+        """Initialize an empty heap."""
+        self._heap: list[tuple[datetime, UUID, str]] = []
+        self._due: dict[tuple[UUID, str], datetime] = {}
+        self._wakeup = asyncio.Event()
+        self.active = False
+
+    def __len__(self) -> int:
+        """Number of scheduled jobs."""
+        return len(self._due)
+
+    def set(self, user_id: UUID, job_type: str, at: datetime | None) -> None:
+        """Replace the due time of a job (None removes it, naive = UTC)."""
+        if not self.active:
+            return
+        key = (user_id, job_type)
+        if at is None:
+            self._due.pop(key, None)
+            return
+        at = as_utc(at)
+        if self._due.get(key) == at:
+            return
+        self._due[key] = at
+        heapq.heappush(self._heap, (at, user_id, job_type))
+        if self._heap[0][0] == at:
+            self._wakeup.set()
+
+    def hint(self, user_id: UUID, job_type: str, at: datetime) -> None:
+        """Move a job forward to ``at`` unless it is already due earlier (naive = UTC)."""
+        at = as_utc(at)
+        current = self._due.get((user_id, job_type))
+        if current is None or at < current:
+            self.set(user_id, job_type, at)
+
+    def next_due(self) -> datetime | None:
+        """Due time of the earliest job."""
+        while self._heap:
+            at, user_id, job_type = self._heap[0]
+            if self._due.get((user_id, job_type)) == at:
+                return at
+            heapq.heappop(self._heap)
+        return None
+
+    def pop_due(self, until: datetime) -> list[tuple[UUID, str, datetime]]:
+        """Remove and return all jobs due at or before ``until``."""
+        due = []
+        while (at := self.next_due()) is not None and at <= until:
+            _, user_id, job_type = heapq.heappop(self._heap)
+            del self._due[(user_id, job_type)]
+            due.append((user_id, job_type, at))
+        return due
+
+    async def wait(self, timeout: float) -> None:
+        """Sleep up to ``timeout`` seconds or until an earlier job arrives."""
+        self._wakeup.clear()
+        try:
+            await asyncio.wait_for(self._wakeup.wait(), timeout=max(0.0, timeout))
+        except TimeoutError:
+            pass
+
+    def clear(self) -> None:
+        """Drop all jobs."""
+        self._heap.clear()
+        self._due.clear()
+
+
+# Global heap of the scheduler running in this process
+job_heap = JobHeap()
@@ -16,6 +16,7 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.pattern_log import PatternLog
+from app.models.pattern_log_daily import PatternLogDaily
 from app.schemas.memory import ConversationAnalysis, PatternLogResponse
 from app.services.graphiti_client import GraphitiClient
 from app.services.nlp_analyzer import NLPAnalyzer
@@ -119,6 +120,15 @@ class MemoryService:
             )
             self.db.add(pattern_log)
             await self.db.flush()
+            # Roll up on the log's stored day, as rebuild_daily does
+            await self.db.refresh(pattern_log, ["created_at"])
+            await self.pattern_analyzer.record_daily(
+                user_id,
+                analysis.mood_score,
+                analysis.energy_level,
+                analysis.focus_score,
+                day=pattern_log.created_at.astimezone(timezone.utc).date(),
+            )
             logger.info(
                 "Stored PatternLog for user %s (conversation %s)",
                 user_id, conversation_id,
@@ -331,7 +341,7 @@ class MemoryService:
     async def delete_user_data(self, user_id: str) -> bool:
         """Delete all stored data for a user (DSGVO Art. 17).
 
-        Removes both knowledge graph data and pattern logs.
+        Removes knowledge graph data, pattern logs and their daily rollup.
 
         Returns:
             ``True`` if all deletions succeeded, ``False`` if any failed.
@@ -353,6 +363,9 @@ class MemoryService:
             from sqlalchemy import delete
             stmt = delete(PatternLog).where(PatternLog.user_id == str(user_id))
             result = await self.db.execute(stmt)
+            await self.db.execute(
+                delete(PatternLogDaily).where(PatternLogDaily.user_id == str(user_id))
+            )
             await self.db.flush()
             logger.info("Deleted %d pattern logs for user %s", result.rowcount, user_id)
         except Exception:
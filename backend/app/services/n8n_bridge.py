@@ -5,10 +5,10 @@ from datetime import datetime, timezone
 from typing import Any
 from uuid import UUID
 
-import httpx
 from sqlalchemy import select, func
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.http_client import get_http_client
 from app.models.n8n_workflow import N8nWorkflow
 
 logger = logging.getLogger(__name__)
@@ -56,12 +56,13 @@ class N8nBridgeService:
             return {"success": False, "error": "Workflow is inactive"}
 
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.post(
-                    workflow.webhook_url,
-                    json=input_data or {},
-                    headers={"Content-Type": "application/json"},
-                )
+            client = get_http_client("n8n")
+            response = await client.post(
+                workflow.webhook_url,
+                json=input_data or {},
+                headers={"Content-Type": "application/json"},
+                timeout=30.0,
+            )
 
             workflow.execution_count += 1
             workflow.last_executed_at = datetime.now(timezone.utc)
@@ -8,9 +8,8 @@ import json
 import logging
 import re
 
-import httpx
-
 from app.core.config import settings
+from app.core.http_client import get_http_client
 from app.schemas.memory import ConversationAnalysis
 
 logger = logging.getLogger(__name__)
@@ -100,23 +99,24 @@ class NLPAnalyzer:
         try:
             user_prompt = self._build_analysis_prompt(messages)
 
-            async with httpx.AsyncClient(timeout=60.0) as client:
-                response = await client.post(
-                    f"{self.base_url}/messages",
-                    headers={
-                        "x-api-key": self.api_key,
-                        "anthropic-version": "2023-06-01",
-                        "content-type": "application/json",
-                    },
-                    json={
-                        "model": self.model,
-                        "max_tokens": 1024,
-                        "system": SYSTEM_PROMPT,
-                        "messages": [
-                            {"role": "user", "content": user_prompt},
-                        ],
-                    },
-                )
+            client = get_http_client("anthropic")
+            response = await client.post(
+                f"{self.base_url}/messages",
+                headers={
+                    "x-api-key": self.api_key,
+                    "anthropic-version": "2023-06-01",
+                    "content-type": "application/json",
+                },
+                json={
+                    "model": self.model,
+                    "max_tokens": 1024,
+                    "system": SYSTEM_PROMPT,
+                    "messages": [
+                        {"role": "user", "content": user_prompt},
+                    ],
+                },
+                timeout=60.0,
+            )
 
             if response.status_code != 200:
                 logger.error(
@@ -1,14 +1,28 @@
 """Notification service for sending Expo push notifications."""
 
 import logging
+import time
+from collections import OrderedDict
 from dataclasses import dataclass, field
 
 import httpx
 
+from app.core.config import settings
+from app.core.http_client import get_http_client
+
 logger = logging.getLogger(__name__)
 
 EXPO_PUSH_URL = "https://exp.host/--/api/v2/push/send"
+EXPO_RECEIPTS_URL = "https://exp.host/--/api/v2/push/getReceipts"
 EXPO_BATCH_LIMIT = 100
+EXPO_RECEIPT_BATCH_LIMIT = 1000
+EXPO_RECEIPT_RETENTION_SECONDS = 24 * 3600  # Expo keeps receipts for a day
+DEVICE_NOT_REGISTERED = "DeviceNotRegistered"
+
+EXPO_HEADERS = {
+    "Accept": "application/json",
+    "Content-Type": "application/json",
+}
 
 
 @dataclass
@@ -22,6 +36,31 @@ class PushNotification:
     sound: str = "default"
     channel_id: str = "alice-notifications"
 
+    def to_payload(self) -> dict:
+        """Expo push message payload."""
+        return {
+            "to": self.to,
+            "title": self.title,
+            "body": self.body,
+            "data": self.data,
+            "sound": self.sound,
+            "channelId": self.channel_id,
+        }
+
+
+@dataclass
+class BulkPushResult:
+    """Outcome of a batched push send."""
+
+    sent: int = 0
+    tickets: dict[str, str] = field(default_factory=dict)  # ticket id -> token
+    dead_tokens: set[str] = field(default_factory=set)
+
+
+def _is_device_not_registered(item: dict) -> bool:
+    """Whether an Expo ticket or receipt reports an unregistered device."""
+    return (item.get("details") or {}).get("error") == DEVICE_NOT_REGISTERED
+
 
 class NotificationService:
     """Service for sending push notifications via the Expo Push API."""
@@ -29,40 +68,31 @@ class NotificationService:
     @staticmethod
     async def send_notification(notification: PushNotification) -> bool:
         """Send a single push notification. Returns True on success."""
-        payload = {
-            "to": notification.to,
-            "title": notification.title,
-            "body": notification.body,
-            "data": notification.data,
-            "sound": notification.sound,
-            "channelId": notification.channel_id,
-        }
-
         try:
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                response = await client.post(
-                    EXPO_PUSH_URL,
-                    json=payload,
-                    headers={
-                        "Accept": "application/json",
-                        "Content-Type": "application/json",
-                    },
-                )
-                response.raise_for_status()
+            client = get_http_client("expo")
+            response = await client.post(
+                EXPO_PUSH_URL,
+                json=notification.to_payload(),
+                headers=EXPO_HEADERS,
+                timeout=10.0,
+            )
+            response.raise_for_status()
 
-                result = response.json()
-                data = result.get("data", {})
+            result = response.json()
+            data = result.get("data", {})
 
-                if data.get("status") == "error":
-                    logger.warning(
-                        "Expo push error for token %s: %s",
-                        notification.to[:20],
-                        data.get("message", "unknown"),
-                    )
-                    return False
+            if data.get("status") == "error":
+                logger.warning(
+                    "Expo push error for token %s: %s",
+                    notification.to[:20],
+                    data.get("message", "unknown"),
+                )
+                return False
 
-                logger.debug("Push notification sent to %s", notification.to[:20])
-                return True
+            if data.get("id"):
+                receipt_tracker.track(data["id"], notification.to)
+            logger.debug("Push notification sent to %s", notification.to[:20])
+            return True
 
         except httpx.HTTPError as e:
             logger.error("HTTP error sending push notification: %s", e)
@@ -74,41 +104,51 @@ class NotificationService:
     @staticmethod
     async def send_bulk_notifications(notifications: list[PushNotification]) -> int:
         """Send multiple push notifications in batches. Returns count of successful sends."""
-        if not notifications:
-            return 0
+        result = await NotificationService.send_batched(notifications)
+        return result.sent
+
+    @staticmethod
+    async def send_batched(notifications: list[PushNotification]) -> BulkPushResult:
+        """
+        Send push notifications in batches of EXPO_BATCH_LIMIT over the pooled client.
 
-        success_count = 0
+        Tickets of accepted messages are registered with the receipt tracker;
+        tokens Expo rejects immediately as ``DeviceNotRegistered`` are returned
+        so the caller can prune them.
 
+        Args:
+            notifications: Messages to send (any number of users)
+
+        Returns:
+            BulkPushResult: Success count, ticket IDs and dead tokens
+        """
+        outcome = BulkPushResult()
+        if not notifications:
+            return outcome
+
+        client = get_http_client("expo")
         for i in range(0, len(notifications), EXPO_BATCH_LIMIT):
             batch = notifications[i : i + EXPO_BATCH_LIMIT]
-            payloads = [
-                {
-                    "to": n.to,
-                    "title": n.title,
-                    "body": n.body,
-                    "data": n.data,
-                    "sound": n.sound,
-                    "channelId": n.channel_id,
-                }
-                for n in batch
-            ]
 
             try:
-                async with httpx.AsyncClient(timeout=15.0) as client:
-                    response = await client.post(
-                        EXPO_PUSH_URL,
-                        json=payloads,
-                        headers={
-                            "Accept": "application/json",
-                            "Content-Type": "application/json",
-                        },
-                    )
-                    response.raise_for_status()
+                response = await client.post(
+                    EXPO_PUSH_URL,
+                    json=[n.to_payload() for n in batch],
+                    headers=EXPO_HEADERS,
+                    timeout=15.0,
+                )
+                response.raise_for_status()
 
-                    result = response.json()
-                    for item in result.get("data", []):
-                        if item.get("status") == "ok":
-                            success_count += 1
+                # Tickets are returned in the order of the messages (none if Expo rejects the request)
+                tickets = response.json().get("data", [])
+                for notification, item in zip(batch, tickets, strict=False):
+                    if item.get("status") == "ok":
+                        outcome.sent += 1
+                        if item.get("id"):
+                            outcome.tickets[item["id"]] = notification.to
+                            receipt_tracker.track(item["id"], notification.to)
+                    elif _is_device_not_registered(item):
+                        outcome.dead_tokens.add(notification.to)
 
             except httpx.HTTPError as e:
                 logger.error("HTTP error sending bulk push notifications: %s", e)
@@ -117,7 +157,122 @@ class NotificationService:
 
         logger.info(
             "Bulk push: %d/%d notifications sent successfully",
-            success_count,
+            outcome.sent,
             len(notifications),
         )
-        return success_count
+        return outcome
+
+
+class PushReceiptTracker:
+    """
+    Pending Expo push tickets whose delivery receipts are still to be checked.
+
+    Expo only reports some failures (e.g. an uninstalled app) in the receipt,
+    which becomes available some minutes after sending. Tickets are kept in
+    memory (bounded, oldest dropped first) and polled once they are older
+    than ``push_receipt_delay_seconds``.
+    """
+
+    def __init__(self):
+        """Initialize an empty tracker."""
+        self._pending: OrderedDict[str, tuple[str, float]] = OrderedDict()
+
+    def __len__(self) -> int:
+        """Number of tickets awaiting a receipt."""
+        return len(self._pending)
+
+    def track(self, ticket_id: str, token: str) -> None:
+        """Remember a ticket for a later receipt check."""
+        self._pending[ticket_id] = (token, time.time())
+        while len(self._pending) > settings.push_receipt_max_pending:
+            self._pending.popitem(last=False)
+
+    async def poll(self) -> set[str]:
+        """
+        Fetch the receipts of all due tickets.
+
+        Tickets without a receipt yet are retried on the next poll until
+        Expo's retention period is over.
+
+        Returns:
+            set[str]: Tokens whose receipt reported DeviceNotRegistered
+        """
+        now = time.time()
+        due = [
+            ticket_id
+            for ticket_id, (_, sent_at) in self._pending.items()
+            if now - sent_at >= settings.push_receipt_delay_seconds
+        ]
+        dead_tokens: set[str] = set()
+        if not due:
+            return dead_tokens
+
+        client = get_http_client("expo")
+        for i in range(0, len(due), EXPO_RECEIPT_BATCH_LIMIT):
+            ids = due[i : i + EXPO_RECEIPT_BATCH_LIMIT]
+            try:
+                response = await client.post(
+                    EXPO_RECEIPTS_URL,
+                    json={"ids": ids},
+                    headers=EXPO_HEADERS,
+                    timeout=15.0,
+                )
+                response.raise_for_status()
+                receipts = response.json().get("data", {})
+            except Exception as e:
+                logger.warning("Failed to fetch Expo push receipts: %s", e)
+                continue
+
+            for ticket_id in ids:
+                # track() may have evicted the ticket while the request ran
+                entry = self._pending.pop(ticket_id, None)
+                if entry is None:
+                    continue
+                token, sent_at = entry
+                receipt = receipts.get(ticket_id)
+                if receipt is None:
+                    if now - sent_at < EXPO_RECEIPT_RETENTION_SECONDS:
+                        # Retry next poll; keep it among the oldest for eviction
+                        self._pending[ticket_id] = entry
+                        self._pending.move_to_end(ticket_id, last=False)
+                    continue
+                if receipt.get("status") == "error":
+                    logger.warning(
+                        "Expo push receipt error for token %s: %s",
+                        token[:20],
+                        receipt.get("message", "unknown"),
+                    )
+                    if _is_device_not_registered(receipt):
+                        dead_tokens.add(token)
+
+        return dead_tokens
+
+
+# Global receipt tracker (per process)
+receipt_tracker = PushReceiptTracker()
+
+
+class PushOutbox:
+    """
+    Collects push notifications and sends them together.
+
+    The scheduler creates one outbox per tick so every push of every user
+    goes out in EXPO_BATCH_LIMIT-sized requests instead of one request each.
+    """
+
+    def __init__(self):
+        """Initialize an empty outbox."""
+        self.notifications: list[PushNotification] = []
+
+    def __len__(self) -> int:
+        """Number of queued notifications."""
+        return len(self.notifications)
+
+    def add(self, notification: PushNotification) -> None:
+        """Queue a notification for the next flush."""
+        self.notifications.append(notification)
+
+    async def flush(self) -> BulkPushResult:
+        """Send all queued notifications in batches and empty the outbox."""
+        notifications, self.notifications = self.notifications, []
+        return await NotificationService.send_batched(notifications)
@@ -16,6 +16,7 @@ from app.schemas.nudge import (
     NudgeHistoryItem,
     NudgeHistoryResponse,
 )
+from app.services.prompt_context import invalidate_prompt_context
 
 
 # Map integer nudge_level to human-readable strings
@@ -87,6 +88,7 @@ class NudgeService:
         nudge.acknowledged_at = now
 
         await self.db.flush()
+        invalidate_prompt_context(user_id, self.db)
 
         return NudgeAcknowledgeResponse(
             id=nudge.id,
@@ -182,4 +184,5 @@ class NudgeService:
         self.db.add(nudge)
         await self.db.flush()
         await self.db.refresh(nudge)
+        invalidate_prompt_context(user_id, self.db)
         return nudge
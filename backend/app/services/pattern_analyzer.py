@@ -1,15 +1,28 @@
-"""Trend analysis on pattern_logs for behavioral insights."""
+"""Trend analysis on pattern_logs for behavioral insights.
+
+Trends are read from the ``pattern_log_daily`` rollup (one row per user and
+UTC day), which :meth:`PatternAnalyzer.record_daily` updates whenever a
+pattern log is stored. Window boundaries are therefore whole days.
+"""
 
 from __future__ import annotations
 
-from datetime import datetime, timedelta, timezone
-from typing import Any
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Mapping, Sequence
 from uuid import UUID
 
-from sqlalchemy import func, select
+from sqlalchemy import Date, Select, and_, cast, delete, func, insert, literal, literal_column, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.pattern_log import PatternLog
+from app.models.pattern_log_daily import PatternLogDaily
+
+TREND_METRICS = {
+    "mood": PatternLog.mood_score,
+    "energy": PatternLog.energy_level,
+    "focus": PatternLog.focus_score,
+}
 
 
 class PatternAnalyzer:
@@ -22,102 +35,202 @@ class PatternAnalyzer:
         self, user_id: str | UUID, days: int = 7
     ) -> dict[str, Any]:
         """Get aggregated mood/energy/focus trends for the last N days."""
-        cutoff = datetime.now(timezone.utc) - timedelta(days=days)
-
-        stmt = select(
-            func.avg(PatternLog.mood_score).label("avg_mood"),
-            func.avg(PatternLog.energy_level).label("avg_energy"),
-            func.avg(PatternLog.focus_score).label("avg_focus"),
-            func.count(PatternLog.id).label("total"),
-            func.min(PatternLog.mood_score).label("min_mood"),
-            func.max(PatternLog.mood_score).label("max_mood"),
-        ).where(
-            PatternLog.user_id == str(user_id),
-            PatternLog.created_at >= cutoff,
-        )
-
-        result = (await self.db.execute(stmt)).one()
-
-        mood_trend = await self._calculate_trend(user_id, days, "mood_score")
-
+        trends = await self.get_multi_metric_trends(user_id, days)
         return {
-            "avg_mood": round(float(result.avg_mood or 0), 2),
-            "avg_energy": round(float(result.avg_energy or 0), 2),
-            "avg_focus": round(float(result.avg_focus or 0), 2),
-            "total_conversations": int(result.total or 0),
-            "min_mood": round(float(result.min_mood or 0), 2),
-            "max_mood": round(float(result.max_mood or 0), 2),
-            "mood_trend": mood_trend,
+            key: trends[key]
+            for key in (
+                "avg_mood", "avg_energy", "avg_focus", "total_conversations",
+                "min_mood", "max_mood", "mood_trend",
+            )
         }
 
     async def get_multi_metric_trends(
         self, user_id: str | UUID, days: int = 7
     ) -> dict[str, Any]:
         """Get trends for ALL three metrics (mood, energy, focus)."""
-        cutoff = datetime.now(timezone.utc) - timedelta(days=days)
-
-        stmt = select(
-            func.avg(PatternLog.mood_score).label("avg_mood"),
-            func.avg(PatternLog.energy_level).label("avg_energy"),
-            func.avg(PatternLog.focus_score).label("avg_focus"),
-            func.count(PatternLog.id).label("total"),
-            func.min(PatternLog.mood_score).label("min_mood"),
-            func.max(PatternLog.mood_score).label("max_mood"),
-            func.min(PatternLog.energy_level).label("min_energy"),
-            func.max(PatternLog.energy_level).label("max_energy"),
-            func.min(PatternLog.focus_score).label("min_focus"),
-            func.max(PatternLog.focus_score).label("max_focus"),
-        ).where(
-            PatternLog.user_id == str(user_id),
-            PatternLog.created_at >= cutoff,
-        )
+        return (await self.get_windowed_trends(user_id, (days,)))[days]
 
-        result = (await self.db.execute(stmt)).one()
+    async def get_windowed_trends(
+        self, user_id: str | UUID, windows: Sequence[int]
+    ) -> dict[int, dict[str, Any]]:
+        """Get multi-metric trends for several windows with one query.
 
-        mood_trend = await self._calculate_trend(user_id, days, "mood_score")
-        energy_trend = await self._calculate_trend(user_id, days, "energy_level")
-        focus_trend = await self._calculate_trend(user_id, days, "focus_score")
+        Args:
+            user_id: User to analyze
+            windows: Window lengths in days (e.g. ``(7, 30)``)
 
-        return {
-            "avg_mood": round(float(result.avg_mood or 0), 2),
-            "avg_energy": round(float(result.avg_energy or 0), 2),
-            "avg_focus": round(float(result.avg_focus or 0), 2),
-            "total_conversations": int(result.total or 0),
-            "min_mood": round(float(result.min_mood or 0), 2),
-            "max_mood": round(float(result.max_mood or 0), 2),
-            "min_energy": round(float(result.min_energy or 0), 2),
-            "max_energy": round(float(result.max_energy or 0), 2),
-            "min_focus": round(float(result.min_focus or 0), 2),
-            "max_focus": round(float(result.max_focus or 0), 2),
-            "mood_trend": mood_trend,
-            "energy_trend": energy_trend,
-            "focus_trend": focus_trend,
-        }
+        Returns:
+            dict: Window length -> trends dict as returned by
+            :meth:`get_multi_metric_trends`
+        """
+        stmt = self.windowed_trends_query(user_id, windows)
+        row = (await self.db.execute(stmt)).one()._mapping
+        return self.parse_windowed_trends(row, windows)
 
-    async def _calculate_trend(
-        self, user_id: str | UUID, days: int, column: str
-    ) -> str:
-        """Calculate if a metric is rising, declining, or stable."""
+    @classmethod
+    def windowed_trends_query(cls, user_id: str | UUID, windows: Sequence[int]) -> Select:
+        """Build the single-row query behind :meth:`get_windowed_trends`.
+
+        Callers may add further (scalar) columns to the statement.
+        """
         now = datetime.now(timezone.utc)
-        midpoint = now - timedelta(days=days / 2)
-        cutoff = now - timedelta(days=days)
+        daily = PatternLogDaily
+        return select(*cls.windowed_trend_columns(windows, now)).where(
+            daily.user_id == str(user_id),
+            daily.day >= (now - timedelta(days=max(windows))).date(),
+        )
+
+    @classmethod
+    def windowed_trend_columns(cls, windows: Sequence[int], now: datetime) -> list[Any]:
+        """Aggregate columns of the windowed trends over ``pattern_log_daily`` rows.
+
+        Every aggregate (count, avg/min/max and the first/second-half means
+        per metric) is computed for every window in a single pass over the
+        daily rollup rows of the largest window, using ``FILTER`` clauses.
+        Averages are weighted by the number of logs per day. The caller
+        restricts the rows to the largest window (and groups by user when
+        aggregating several users at once).
+        """
+        daily = PatternLogDaily
+        columns = []
+        for days in windows:
+            cutoff = (now - timedelta(days=days)).date()
+            midpoint = (now - timedelta(days=days / 2)).date()
+            in_window = daily.day >= cutoff
+            first_half = and_(in_window, daily.day < midpoint)
+            second_half = daily.day >= midpoint
+
+            columns.append(func.sum(daily.log_count).filter(in_window).label(f"total_{days}"))
+            for metric in TREND_METRICS:
+                columns.extend([
+                    cls._daily_mean(metric, in_window).label(f"avg_{metric}_{days}"),
+                    func.min(getattr(daily, f"{metric}_min")).filter(in_window).label(f"min_{metric}_{days}"),
+                    func.max(getattr(daily, f"{metric}_max")).filter(in_window).label(f"max_{metric}_{days}"),
+                    cls._daily_mean(metric, first_half).label(f"first_{metric}_{days}"),
+                    cls._daily_mean(metric, second_half).label(f"second_{metric}_{days}"),
+                ])
+        return columns
 
-        col = getattr(PatternLog, column)
+    @classmethod
+    def parse_windowed_trends(
+        cls, row: Mapping[str, Any], windows: Sequence[int]
+    ) -> dict[int, dict[str, Any]]:
+        """Turn a row of :meth:`windowed_trends_query` into trends dicts per window."""
 
-        stmt_first = select(func.avg(col)).where(
-            PatternLog.user_id == str(user_id),
-            PatternLog.created_at >= cutoff,
-            PatternLog.created_at < midpoint,
+        def value(key: str) -> float:
+            return round(float(row[key] or 0), 2)
+
+        trends: dict[int, dict[str, Any]] = {}
+        for days in windows:
+            window: dict[str, Any] = {"total_conversations": int(row[f"total_{days}"] or 0)}
+            for metric in TREND_METRICS:
+                window[f"avg_{metric}"] = value(f"avg_{metric}_{days}")
+                window[f"min_{metric}"] = value(f"min_{metric}_{days}")
+                window[f"max_{metric}"] = value(f"max_{metric}_{days}")
+                window[f"{metric}_trend"] = cls._trend_direction(
+                    row[f"first_{metric}_{days}"], row[f"second_{metric}_{days}"]
+                )
+            trends[days] = window
+        return trends
+
+    async def record_daily(
+        self,
+        user_id: str | UUID,
+        mood_score: float | None,
+        energy_level: float | None,
+        focus_score: float | None,
+        day: date | None = None,
+    ) -> None:
+        """Add one pattern log's scores to the user's daily rollup (upsert).
+
+        Args:
+            user_id: Owner of the log
+            mood_score: Mood of the log (None = not measured)
+            energy_level: Energy of the log
+            focus_score: Focus of the log
+            day: UTC day of the log's ``created_at`` (default: the UTC day
+                of the transaction start, i.e. the ``created_at`` of a log
+                inserted in the same transaction)
+        """
+        scores = {"mood": mood_score, "energy": energy_level, "focus": focus_score}
+        values: dict[str, Any] = {
+            "user_id": str(user_id),
+            "day": day or cast(func.timezone(literal_column("'UTC'"), func.now()), Date),
+            "log_count": 1,
+        }
+        for metric, score in scores.items():
+            values.update({
+                f"{metric}_sum": score or 0.0,
+                f"{metric}_count": 0 if score is None else 1,
+                f"{metric}_min": score,
+                f"{metric}_max": score,
+            })
+
+        stmt = pg_insert(PatternLogDaily).values(**values)
+        excluded = stmt.excluded
+        set_ = {
+            "log_count": PatternLogDaily.log_count + excluded.log_count,
+            "updated_at": func.now(),
+        }
+        for metric in scores:
+            for suffix in ("sum", "count"):
+                key = f"{metric}_{suffix}"
+                set_[key] = getattr(PatternLogDaily, key) + getattr(excluded, key)
+            # LEAST/GREATEST ignore NULLs
+            set_[f"{metric}_min"] = func.least(
+                getattr(PatternLogDaily, f"{metric}_min"), getattr(excluded, f"{metric}_min")
+            )
+            set_[f"{metric}_max"] = func.greatest(
+                getattr(PatternLogDaily, f"{metric}_max"), getattr(excluded, f"{metric}_max")
+            )
+
+        await self.db.execute(
+            stmt.on_conflict_do_update(constraint="uq_pattern_log_daily_user_day", set_=set_)
         )
-        first_avg = (await self.db.execute(stmt_first)).scalar() or 0
 
-        stmt_second = select(func.avg(col)).where(
-            PatternLog.user_id == str(user_id),
-            PatternLog.created_at >= midpoint,
+    async def rebuild_daily(self, user_id: str | UUID) -> None:
+        """Recompute the user's daily rollup from the raw pattern logs.
+
+        For backfills and logs written without :meth:`record_daily`.
+        """
+        day = cast(func.timezone(literal_column("'UTC'"), PatternLog.created_at), Date)
+        columns = {
+            "id": func.gen_random_uuid(),
+            "user_id": PatternLog.user_id,
+            "day": day,
+            "log_count": func.count(),
+        }
+        for metric, col in TREND_METRICS.items():
+            columns.update({
+                f"{metric}_sum": func.coalesce(func.sum(col), literal(0.0)),
+                f"{metric}_count": func.count(col),
+                f"{metric}_min": func.min(col),
+                f"{metric}_max": func.max(col),
+            })
+
+        await self.db.execute(
+            delete(PatternLogDaily).where(PatternLogDaily.user_id == str(user_id))
+        )
+        await self.db.execute(
+            insert(PatternLogDaily).from_select(
+                list(columns),
+                select(*columns.values())
+                .where(PatternLog.user_id == str(user_id))
+                .group_by(PatternLog.user_id, day),
+            )
         )
-        second_avg = (await self.db.execute(stmt_second)).scalar() or 0
 
-        diff = float(second_avg) - float(first_avg)
+    @staticmethod
+    def _daily_mean(metric: str, condition: Any) -> Any:
+        """Log-weighted mean of a metric over the rollup rows matching ``condition``."""
+        total = func.sum(getattr(PatternLogDaily, f"{metric}_sum")).filter(condition)
+        count = func.sum(getattr(PatternLogDaily, f"{metric}_count")).filter(condition)
+        return total / func.nullif(count, 0)
+
+    @staticmethod
+    def _trend_direction(first_avg: float | None, second_avg: float | None) -> str:
+        """Classify the change between the first and second half of a window."""
+        diff = float(second_avg or 0) - float(first_avg or 0)
         if diff > 0.1:
             return "rising"
         elif diff < -0.1:
@@ -12,6 +12,7 @@ from app.core.exceptions import (
 from app.models.personality_profile import PersonalityProfile
 from app.models.personality_template import PersonalityTemplate
 from app.schemas.personality import PersonalityProfileCreate, PersonalityProfileUpdate
+from app.services.prompt_context import invalidate_prompt_context
 
 
 class PersonalityService:
@@ -83,6 +84,7 @@ class PersonalityService:
 
         await self.db.flush()
         await self.db.refresh(profile)
+        invalidate_prompt_context(user_id, self.db)
 
         return profile
 
@@ -118,6 +120,7 @@ class PersonalityService:
 
         await self.db.flush()
         await self.db.refresh(profile)
+        invalidate_prompt_context(user_id, self.db)
 
         return profile
 
@@ -0,0 +1,308 @@
+"""The prediction rules, evaluated for many users at once.
+
+``PREDICTION_RULES`` defines the six rules of
+:class:`~app.services.prediction_engine.PredictionEngine` as weighted
+terms. :func:`evaluate_rules` evaluates every rule for all rows of a
+:class:`FeatureMatrix` as NumPy array expressions; trigger factors are
+only built for the rows that pass the confidence threshold.
+
+For the scheduler's prediction sweep, :func:`load_feature_matrix` loads
+the rule inputs of many users with one grouped query over the
+``pattern_log_daily`` rollup. A single user's snapshot goes through the
+same code as a one-row matrix (``PredictionEngine.candidates``).
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+from typing import Any
+from uuid import UUID
+
+import numpy as np
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.pattern_log_daily import PatternLogDaily
+from app.models.task import Task, TaskStatus
+from app.models.user_settings import UserSettings
+from app.models.user_stats import UserStats
+from app.services.pattern_analyzer import PatternAnalyzer
+from app.services.user_features import TREND_WINDOWS, UserFeatureSnapshot
+
+# Trend directions as small integers
+DECLINING, STABLE, RISING = -1, 0, 1
+TREND_CODES = {"declining": DECLINING, "stable": STABLE, "rising": RISING}
+
+Columns = dict[str, np.ndarray]
+Values = dict[str, list[Any]]  # the columns as Python lists (for trigger factors)
+
+# Rounded trend averages the rules read, per window
+AVERAGE_COLUMNS = (
+    "avg_mood_7", "avg_energy_7", "avg_focus_7",
+    "avg_mood_30", "avg_energy_30", "avg_focus_30",
+)
+TREND_COLUMNS = ("mood_trend_7", "energy_trend_7", "focus_trend_7")
+STAT_COLUMNS = ("tasks_completed", "open_tasks")
+
+
+@dataclass(frozen=True)
+class RuleTerm:
+    """One additive term of a prediction rule."""
+
+    weight: float
+    factor: str
+    condition: Callable[[Columns], np.ndarray]
+    value: Callable[[Values, int], Any]
+
+
+@dataclass(frozen=True)
+class PredictionRule:
+    """A prediction rule: the confidence is the sum of the matching terms' weights."""
+
+    pattern_type: str
+    horizon: timedelta
+    time_horizon: str
+    terms: tuple[RuleTerm, ...]
+
+
+def _col(name: str) -> Callable[[Values, int], Any]:
+    return lambda v, i: v[name][i]
+
+
+def _diff(left: str, right: str) -> Callable[[Values, int], Any]:
+    return lambda v, i: round(v[left][i] - v[right][i], 2)
+
+
+def _const(value: Any) -> Callable[[Values, int], Any]:
+    return lambda v, i: value
+
+
+PREDICTION_RULES: tuple[PredictionRule, ...] = (
+    PredictionRule("energy_crash", timedelta(hours=24), "24h", (
+        RuleTerm(0.35, "energy_trend_7d", lambda c: c["energy_trend_7"] == DECLINING, _const("declining")),
+        RuleTerm(0.25, "avg_energy_7d", lambda c: c["avg_energy_7"] < 0.4, _col("avg_energy_7")),
+        RuleTerm(0.15, "focus_trend_7d", lambda c: c["focus_trend_7"] == DECLINING, _const("declining")),
+        RuleTerm(
+            0.25, "energy_drop_vs_30d",
+            lambda c: c["avg_energy_30"] > c["avg_energy_7"] + 0.15, _diff("avg_energy_30", "avg_energy_7"),
+        ),
+    )),
+    PredictionRule("procrastination", timedelta(days=3), "3d", (
+        RuleTerm(0.25, "low_energy", lambda c: c["avg_energy_7"] < 0.35, _col("avg_energy_7")),
+        RuleTerm(0.2, "negative_mood", lambda c: c["avg_mood_7"] < -0.1, _col("avg_mood_7")),
+        RuleTerm(0.2, "low_task_completion", lambda c: c["tasks_completed"] < 3, _col("tasks_completed")),
+        RuleTerm(0.2, "mood_declining", lambda c: c["mood_trend_7"] == DECLINING, _const(True)),
+        RuleTerm(
+            0.15, "energy_below_baseline",
+            lambda c: c["avg_energy_30"] > c["avg_energy_7"] + 0.1, _const(True),
+        ),
+    )),
+    PredictionRule("hyperfocus", timedelta(hours=24), "24h", (
+        RuleTerm(0.35, "high_focus", lambda c: c["avg_focus_7"] > 0.85, _col("avg_focus_7")),
+        RuleTerm(0.25, "focus_rising", lambda c: c["focus_trend_7"] == RISING, _const(True)),
+        RuleTerm(0.2, "energy_depleting", lambda c: c["avg_energy_7"] < 0.4, _col("avg_energy_7")),
+        RuleTerm(
+            0.2, "focus_above_baseline",
+            lambda c: c["avg_focus_7"] > c["avg_focus_30"] + 0.15, _diff("avg_focus_7", "avg_focus_30"),
+        ),
+    )),
+    PredictionRule("decision_fatigue", timedelta(hours=24), "24h", (
+        RuleTerm(0.3, "many_open_tasks", lambda c: c["open_tasks"] >= 5, _col("open_tasks")),
+        RuleTerm(0.25, "low_focus", lambda c: c["avg_focus_7"] < 0.35, _col("avg_focus_7")),
+        RuleTerm(0.2, "focus_declining", lambda c: c["focus_trend_7"] == DECLINING, _const(True)),
+        RuleTerm(0.15, "task_overload", lambda c: c["open_tasks"] >= 8, _col("open_tasks")),
+        RuleTerm(0.1, "negative_mood", lambda c: c["avg_mood_7"] < 0, _col("avg_mood_7")),
+    )),
+    PredictionRule("sleep_disruption", timedelta(days=3), "3d", (
+        RuleTerm(0.3, "very_low_energy", lambda c: c["avg_energy_7"] < 0.3, _col("avg_energy_7")),
+        RuleTerm(0.2, "negative_mood", lambda c: c["avg_mood_7"] < -0.1, _col("avg_mood_7")),
+        RuleTerm(0.2, "energy_declining", lambda c: c["energy_trend_7"] == DECLINING, _const(True)),
+        RuleTerm(
+            0.2, "significant_energy_drop",
+            lambda c: c["avg_energy_30"] > c["avg_energy_7"] + 0.2, _diff("avg_energy_30", "avg_energy_7"),
+        ),
+        RuleTerm(0.1, "low_focus_too", lambda c: c["avg_focus_7"] < 0.3, _col("avg_focus_7")),
+    )),
+    PredictionRule("social_masking", timedelta(days=7), "7d", (
+        RuleTerm(0.3, "high_productivity", lambda c: c["tasks_completed"] >= 8, _col("tasks_completed")),
+        RuleTerm(0.25, "declining_mood", lambda c: c["avg_mood_7"] < -0.1, _col("avg_mood_7")),
+        RuleTerm(0.25, "mood_trend_declining", lambda c: c["mood_trend_7"] == DECLINING, _const(True)),
+        RuleTerm(0.1, "high_focus_masking", lambda c: c["avg_focus_7"] > 0.7, _col("avg_focus_7")),
+        RuleTerm(
+            0.1, "mood_below_baseline",
+            lambda c: c["avg_mood_30"] > c["avg_mood_7"] + 0.15, _const(True),
+        ),
+    )),
+)
+
+
+@dataclass(frozen=True)
+class FeatureMatrix:
+    """Rule inputs of many users, one NumPy array per feature (row i = ``user_ids[i]``)."""
+
+    user_ids: list[UUID]
+    columns: Columns
+
+    def __len__(self) -> int:
+        return len(self.user_ids)
+
+    @classmethod
+    def from_snapshots(cls, snapshots: Sequence[UserFeatureSnapshot]) -> FeatureMatrix:
+        """Stack per-user snapshots into a matrix (one row per snapshot)."""
+        columns: Columns = {}
+        for name in AVERAGE_COLUMNS:
+            metric, days = name.rsplit("_", 1)
+            key = f"trends_{days}d"
+            columns[name] = np.array(
+                [getattr(s, key)[metric] for s in snapshots], dtype=np.float64
+            )
+        for name in TREND_COLUMNS:
+            trend = name.rsplit("_", 1)[0]
+            columns[name] = np.array(
+                [TREND_CODES[s.trends_7d[trend]] for s in snapshots], dtype=np.int8
+            )
+        for name in STAT_COLUMNS:
+            columns[name] = np.array([getattr(s, name) for s in snapshots], dtype=np.int64)
+        return cls([UUID(s.user_id) for s in snapshots], columns)
+
+
+async def load_feature_matrix(
+    db: AsyncSession, user_ids: Sequence[UUID] | None = None
+) -> FeatureMatrix:
+    """Load the rule inputs of many users with one query.
+
+    Only users with pattern logs in the last 7 days are returned (the
+    rules need recent data).
+
+    Args:
+        db: Database session
+        user_ids: Users to load (None = every user with the wellness module)
+
+    Returns:
+        FeatureMatrix: Features in the same shape as the per-user trends
+    """
+    now = datetime.now(UTC)
+    daily = PatternLogDaily
+    trends = (
+        select(daily.user_id, *PatternAnalyzer.windowed_trend_columns(TREND_WINDOWS, now))
+        .where(daily.day >= (now - timedelta(days=max(TREND_WINDOWS))).date())
+        .group_by(daily.user_id)
+    )
+    if user_ids is not None:
+        trends = trends.where(daily.user_id.in_(list(user_ids)))
+    else:
+        trends = trends.where(
+            daily.user_id.in_(
+                select(UserSettings.user_id).where(
+                    UserSettings.settings["active_modules"].contains(["wellness"])
+                )
+            )
+        )
+    trends = trends.subquery("trends")
+
+    open_tasks = (
+        select(func.count())
+        .select_from(Task)
+        .where(
+            Task.user_id == trends.c.user_id,
+            Task.status.in_([TaskStatus.OPEN, TaskStatus.IN_PROGRESS]),
+        )
+        .scalar_subquery()
+    )
+    halves = [
+        trends.c[f"{half}_{metric}_7"]
+        for metric in ("mood", "energy", "focus")
+        for half in ("first", "second")
+    ]
+    stmt = (
+        select(
+            trends.c.user_id,
+            *(trends.c[name] for name in AVERAGE_COLUMNS),
+            *halves,
+            func.coalesce(UserStats.tasks_completed, 0),
+            open_tasks,
+        )
+        .select_from(trends)
+        .outerjoin(UserStats, UserStats.user_id == trends.c.user_id)
+        .where(trends.c.total_7 > 0)
+    )
+    rows = (await db.execute(stmt)).all()
+
+    width = len(AVERAGE_COLUMNS) + len(halves) + len(STAT_COLUMNS)
+    values = np.array([row[1:] for row in rows], dtype=np.float64).reshape(len(rows), width)
+    averages, halves_matrix, stats = np.split(
+        values, [len(AVERAGE_COLUMNS), len(AVERAGE_COLUMNS) + len(halves)], axis=1
+    )
+    # Python's round (not np.round, which differs at .xx5), like
+    # PatternAnalyzer.parse_windowed_trends
+    averages = np.nan_to_num(averages)
+    columns: Columns = {
+        name: np.array([round(v, 2) for v in averages[:, i].tolist()], dtype=np.float64)
+        for i, name in enumerate(AVERAGE_COLUMNS)
+    }
+    halves_matrix = np.nan_to_num(halves_matrix)
+    for i, name in enumerate(TREND_COLUMNS):
+        columns[name] = _trend_codes(halves_matrix[:, 2 * i], halves_matrix[:, 2 * i + 1])
+    for i, name in enumerate(STAT_COLUMNS):
+        columns[name] = stats[:, i].astype(np.int64)
+    return FeatureMatrix([row[0] for row in rows], columns)
+
+
+def _trend_codes(first: np.ndarray, second: np.ndarray) -> np.ndarray:
+    """Vectorized ``PatternAnalyzer._trend_direction``."""
+    diff = second - first
+    return np.select([diff > 0.1, diff < -0.1], [RISING, DECLINING], STABLE).astype(np.int8)
+
+
+def evaluate_rules(
+    features: FeatureMatrix, threshold: float, now: datetime | None = None
+) -> list[dict[str, Any]]:
+    """Evaluate every rule for every user of the matrix.
+
+    Args:
+        features: Rule inputs
+        threshold: Minimum confidence of a candidate
+        now: Reference time for ``predicted_for`` (default: now)
+
+    Returns:
+        list: Candidates at or above ``threshold`` (``user_id``,
+        ``pattern_type``, ``confidence``, ``predicted_for``,
+        ``time_horizon``, ``trigger_factors``); ordered by user, then rule
+    """
+    now = now or datetime.now(UTC)
+    columns = features.columns
+    values = {name: column.tolist() for name, column in columns.items()}
+    hits: list[tuple[int, int, dict[str, Any]]] = []
+
+    for rule_index, rule in enumerate(PREDICTION_RULES):
+        confidence = np.zeros(len(features))
+        masks = []
+        for term in rule.terms:
+            mask = term.condition(columns)
+            confidence += np.where(mask, term.weight, 0.0)
+            masks.append(mask)
+
+        selected = np.flatnonzero(confidence >= threshold)
+        if not len(selected):
+            continue
+        confidences = np.minimum(confidence[selected], 1.0).tolist()
+        term_masks = [mask[selected].tolist() for mask in masks]
+        predicted_for = now + rule.horizon
+        for row, i in enumerate(selected.tolist()):
+            hits.append((i, rule_index, {
+                "user_id": features.user_ids[i],
+                "pattern_type": rule.pattern_type,
+                "confidence": confidences[row],
+                "predicted_for": predicted_for,
+                "time_horizon": rule.time_horizon,
+                "trigger_factors": {
+                    term.factor: term.value(values, i)
+                    for term, mask in zip(rule.terms, term_masks, strict=True)
+                    if mask[row]
+                },
+            }))
+
+    hits.sort(key=lambda hit: hit[:2])
+    return [candidate for _, _, candidate in hits]
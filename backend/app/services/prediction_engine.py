@@ -2,24 +2,27 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
 from datetime import datetime, timedelta, timezone
-from typing import Any
+from typing import Any, Sequence
 from uuid import UUID
 
-from sqlalchemy import select, func
+from sqlalchemy import String, bindparam, column, insert, select, func, update
+from sqlalchemy.dialects.postgresql import ARRAY, UUID as PG_UUID
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.predicted_pattern import PredictedPattern, PredictionStatus
-from app.models.pattern_log import PatternLog
-from app.models.task import Task, TaskStatus
-from app.models.user_stats import UserStats
 from app.services.pattern_analyzer import PatternAnalyzer
+from app.services.prediction_batch import FeatureMatrix, evaluate_rules, load_feature_matrix
+from app.services.user_features import UserFeatureSnapshot, build_feature_snapshot
 
 logger = logging.getLogger(__name__)
 
 PREDICTION_COOLDOWN_HOURS = 24
 CONFIDENCE_THRESHOLD = 0.6
+PREDICTION_INSERT_BATCH = 1000  # rows per multi-VALUES insert
+GRAPHITI_ENRICH_CONCURRENCY = 10
 
 
 class PredictionEngine:
@@ -30,30 +33,19 @@ class PredictionEngine:
         self.analyzer = PatternAnalyzer(db)
         self.graphiti = graphiti_client
 
-    async def predict(self, user_id: str) -> list[dict[str, Any]]:
-        """Run all prediction rules and store results."""
-        trends_7d = await self.analyzer.get_multi_metric_trends(user_id, days=7)
-        trends_30d = await self.analyzer.get_multi_metric_trends(user_id, days=30)
+    async def predict(
+        self, user_id: str, snapshot: UserFeatureSnapshot | None = None
+    ) -> list[dict[str, Any]]:
+        """Run all prediction rules and store results.
 
-        if trends_7d["total_conversations"] == 0:
-            return []
-
-        stats = await self._get_user_stats(user_id)
-        recent_logs = await self._get_recent_logs(user_id, days=3)
+        Args:
+            user_id: User to predict for
+            snapshot: Features loaded for this user already (built if omitted)
+        """
+        if snapshot is None:
+            snapshot = await build_feature_snapshot(self.db, user_id)
 
-        candidates: list[dict[str, Any]] = []
-
-        for rule in [
-            self._predict_energy_crash,
-            self._predict_procrastination,
-            self._predict_hyperfocus,
-            self._predict_decision_fatigue,
-            self._predict_sleep_disruption,
-            self._predict_social_masking,
-        ]:
-            result = rule(trends_7d, trends_30d, stats, recent_logs)
-            if result and result["confidence"] >= CONFIDENCE_THRESHOLD:
-                candidates.append(result)
+        candidates = self.candidates(snapshot)
 
         created: list[dict[str, Any]] = []
         for candidate in candidates:
@@ -100,6 +92,24 @@ class PredictionEngine:
 
         return created
 
+    def candidates(self, snapshot: UserFeatureSnapshot) -> list[dict[str, Any]]:
+        """Evaluate all prediction rules on a feature snapshot (pure, no DB access).
+
+        The rules are the vectorized ``PREDICTION_RULES`` that
+        :meth:`predict_batch` uses, evaluated for this one user.
+
+        Returns:
+            list: Predictions at or above CONFIDENCE_THRESHOLD
+        """
+        if not snapshot.has_conversations:
+            return []
+
+        features = FeatureMatrix.from_snapshots([snapshot])
+        return [
+            {key: value for key, value in candidate.items() if key != "user_id"}
+            for candidate in evaluate_rules(features, CONFIDENCE_THRESHOLD)
+        ]
+
     async def expire_old_predictions(self, user_id: str) -> int:
         """Expire active predictions whose predicted_for is in the past."""
         now = datetime.now(timezone.utc)
@@ -121,203 +131,98 @@ class PredictionEngine:
         await self.db.commit()
         return len(expired)
 
-    # ------------------------------------------------------------------
-    # Prediction Rules
-    # ------------------------------------------------------------------
+    async def predict_batch(self, user_ids: Sequence[UUID] | None = None) -> list[dict[str, Any]]:
+        """Run all prediction rules for many users at once and store results.
+
+        The rule inputs of all users are loaded with one grouped query and
+        evaluated as NumPy array expressions (see
+        :mod:`app.services.prediction_batch`). Candidates still in their
+        cooldown are dropped with one anti-join against
+        ``predicted_patterns``; the rest is bulk-inserted.
+
+        Args:
+            user_ids: Users to predict for (None = every user with the
+                wellness module)
+
+        Returns:
+            list: Created predictions as returned by :meth:`predict`, plus
+            ``user_id``
+        """
+        features = await load_feature_matrix(self.db, user_ids)
+        candidates = evaluate_rules(features, CONFIDENCE_THRESHOLD)
+        if not candidates:
+            return []
+
+        fresh = await self._without_recent_predictions(candidates)
+        if self.graphiti and getattr(self.graphiti, "enabled", False):
+            semaphore = asyncio.Semaphore(GRAPHITI_ENRICH_CONCURRENCY)
+
+            async def enrich(candidate: dict[str, Any]) -> None:
+                async with semaphore:
+                    candidate["graphiti_context"] = await self._enrich_with_graphiti(
+                        str(candidate["user_id"]), candidate["pattern_type"]
+                    )
+
+            await asyncio.gather(*(enrich(candidate) for candidate in fresh))
 
-    def _predict_energy_crash(
-        self, t7: dict, t30: dict, stats: dict, logs: list
-    ) -> dict[str, Any] | None:
-        confidence = 0.0
-        factors = {}
-
-        if t7["energy_trend"] == "declining":
-            confidence += 0.35
-            factors["energy_trend_7d"] = "declining"
-        if t7["avg_energy"] < 0.4:
-            confidence += 0.25
-            factors["avg_energy_7d"] = t7["avg_energy"]
-        if t7["focus_trend"] == "declining":
-            confidence += 0.15
-            factors["focus_trend_7d"] = "declining"
-        if t30["avg_energy"] > t7["avg_energy"] + 0.15:
-            confidence += 0.25
-            factors["energy_drop_vs_30d"] = round(t30["avg_energy"] - t7["avg_energy"], 2)
-
-        if confidence < CONFIDENCE_THRESHOLD:
-            return None
-
-        return {
-            "pattern_type": "energy_crash",
-            "confidence": min(confidence, 1.0),
-            "predicted_for": datetime.now(timezone.utc) + timedelta(hours=24),
-            "time_horizon": "24h",
-            "trigger_factors": factors,
-        }
-
-    def _predict_procrastination(
-        self, t7: dict, t30: dict, stats: dict, logs: list
-    ) -> dict[str, Any] | None:
-        confidence = 0.0
-        factors = {}
-
-        if t7["avg_energy"] < 0.35:
-            confidence += 0.25
-            factors["low_energy"] = t7["avg_energy"]
-        if t7["avg_mood"] < -0.1:
-            confidence += 0.2
-            factors["negative_mood"] = t7["avg_mood"]
-        if stats.get("tasks_completed", 0) < 3:
-            confidence += 0.2
-            factors["low_task_completion"] = stats.get("tasks_completed", 0)
-        if t7["mood_trend"] == "declining":
-            confidence += 0.2
-            factors["mood_declining"] = True
-        if t30["avg_energy"] > t7["avg_energy"] + 0.1:
-            confidence += 0.15
-            factors["energy_below_baseline"] = True
-
-        if confidence < CONFIDENCE_THRESHOLD:
-            return None
-
-        return {
-            "pattern_type": "procrastination",
-            "confidence": min(confidence, 1.0),
-            "predicted_for": datetime.now(timezone.utc) + timedelta(days=3),
-            "time_horizon": "3d",
-            "trigger_factors": factors,
-        }
-
-    def _predict_hyperfocus(
-        self, t7: dict, t30: dict, stats: dict, logs: list
-    ) -> dict[str, Any] | None:
-        confidence = 0.0
-        factors = {}
-
-        if t7["avg_focus"] > 0.85:
-            confidence += 0.35
-            factors["high_focus"] = t7["avg_focus"]
-        if t7["focus_trend"] == "rising":
-            confidence += 0.25
-            factors["focus_rising"] = True
-        if t7["avg_energy"] < 0.4:
-            confidence += 0.2
-            factors["energy_depleting"] = t7["avg_energy"]
-        if t7["avg_focus"] > t30["avg_focus"] + 0.15:
-            confidence += 0.2
-            factors["focus_above_baseline"] = round(t7["avg_focus"] - t30["avg_focus"], 2)
-
-        if confidence < CONFIDENCE_THRESHOLD:
-            return None
-
-        return {
-            "pattern_type": "hyperfocus",
-            "confidence": min(confidence, 1.0),
-            "predicted_for": datetime.now(timezone.utc) + timedelta(hours=24),
-            "time_horizon": "24h",
-            "trigger_factors": factors,
-        }
-
-    def _predict_decision_fatigue(
-        self, t7: dict, t30: dict, stats: dict, logs: list
-    ) -> dict[str, Any] | None:
-        confidence = 0.0
-        factors = {}
-
-        open_tasks = stats.get("open_tasks", 0)
-        if open_tasks >= 5:
-            confidence += 0.3
-            factors["many_open_tasks"] = open_tasks
-        if t7["avg_focus"] < 0.35:
-            confidence += 0.25
-            factors["low_focus"] = t7["avg_focus"]
-        if t7["focus_trend"] == "declining":
-            confidence += 0.2
-            factors["focus_declining"] = True
-        if open_tasks >= 8:
-            confidence += 0.15
-            factors["task_overload"] = open_tasks
-        if t7["avg_mood"] < 0:
-            confidence += 0.1
-            factors["negative_mood"] = t7["avg_mood"]
-
-        if confidence < CONFIDENCE_THRESHOLD:
-            return None
-
-        return {
-            "pattern_type": "decision_fatigue",
-            "confidence": min(confidence, 1.0),
-            "predicted_for": datetime.now(timezone.utc) + timedelta(hours=24),
-            "time_horizon": "24h",
-            "trigger_factors": factors,
-        }
-
-    def _predict_sleep_disruption(
-        self, t7: dict, t30: dict, stats: dict, logs: list
-    ) -> dict[str, Any] | None:
-        confidence = 0.0
-        factors = {}
-
-        if t7["avg_energy"] < 0.3:
-            confidence += 0.3
-            factors["very_low_energy"] = t7["avg_energy"]
-        if t7["avg_mood"] < -0.1:
-            confidence += 0.2
-            factors["negative_mood"] = t7["avg_mood"]
-        if t7["energy_trend"] == "declining":
-            confidence += 0.2
-            factors["energy_declining"] = True
-        if t30["avg_energy"] > t7["avg_energy"] + 0.2:
-            confidence += 0.2
-            factors["significant_energy_drop"] = round(t30["avg_energy"] - t7["avg_energy"], 2)
-        if t7["avg_focus"] < 0.3:
-            confidence += 0.1
-            factors["low_focus_too"] = t7["avg_focus"]
-
-        if confidence < CONFIDENCE_THRESHOLD:
-            return None
-
-        return {
-            "pattern_type": "sleep_disruption",
-            "confidence": min(confidence, 1.0),
-            "predicted_for": datetime.now(timezone.utc) + timedelta(days=3),
-            "time_horizon": "3d",
-            "trigger_factors": factors,
-        }
-
-    def _predict_social_masking(
-        self, t7: dict, t30: dict, stats: dict, logs: list
-    ) -> dict[str, Any] | None:
-        confidence = 0.0
-        factors = {}
-
-        tasks_completed = stats.get("tasks_completed", 0)
-        if tasks_completed >= 8:
-            confidence += 0.3
-            factors["high_productivity"] = tasks_completed
-        if t7["avg_mood"] < -0.1:
-            confidence += 0.25
-            factors["declining_mood"] = t7["avg_mood"]
-        if t7["mood_trend"] == "declining":
-            confidence += 0.25
-            factors["mood_trend_declining"] = True
-        if t7["avg_focus"] > 0.7:
-            confidence += 0.1
-            factors["high_focus_masking"] = t7["avg_focus"]
-        if t30["avg_mood"] > t7["avg_mood"] + 0.15:
-            confidence += 0.1
-            factors["mood_below_baseline"] = True
-
-        if confidence < CONFIDENCE_THRESHOLD:
-            return None
-
-        return {
-            "pattern_type": "social_masking",
-            "confidence": min(confidence, 1.0),
-            "predicted_for": datetime.now(timezone.utc) + timedelta(days=7),
-            "time_horizon": "7d",
-            "trigger_factors": factors,
-        }
+        rows = [
+            {**candidate, "graphiti_context": candidate.get("graphiti_context", {}),
+             "status": PredictionStatus.ACTIVE}
+            for candidate in fresh
+        ]
+        created: list[dict[str, Any]] = []
+        for i in range(0, len(rows), PREDICTION_INSERT_BATCH):
+            inserted = await self.db.execute(
+                insert(PredictedPattern)
+                .values(rows[i:i + PREDICTION_INSERT_BATCH])
+                .returning(
+                    PredictedPattern.id,
+                    PredictedPattern.user_id,
+                    PredictedPattern.pattern_type,
+                    PredictedPattern.confidence,
+                    PredictedPattern.predicted_for,
+                    PredictedPattern.time_horizon,
+                    PredictedPattern.trigger_factors,
+                    PredictedPattern.graphiti_context,
+                    PredictedPattern.status,
+                )
+            )
+            created.extend(
+                {
+                    "id": str(row.id),
+                    "user_id": row.user_id,
+                    "pattern_type": row.pattern_type,
+                    "confidence": row.confidence,
+                    "predicted_for": row.predicted_for.isoformat(),
+                    "time_horizon": row.time_horizon,
+                    "trigger_factors": row.trigger_factors,
+                    "graphiti_context": row.graphiti_context,
+                    "status": row.status,
+                }
+                for row in inserted.all()
+            )
+
+        if created:
+            await self.db.commit()
+        logger.info(
+            "Batch prediction: %d users evaluated, %d candidates, %d created",
+            len(features), len(candidates), len(created),
+        )
+        return created
+
+    async def expire_old_predictions_batch(self, user_ids: Sequence[UUID]) -> int:
+        """Expire the past-due active predictions of many users with one UPDATE."""
+        now = datetime.now(timezone.utc)
+        result = await self.db.execute(
+            update(PredictedPattern)
+            .where(
+                PredictedPattern.user_id.in_(list(user_ids)),
+                PredictedPattern.status == PredictionStatus.ACTIVE,
+                PredictedPattern.predicted_for < now,
+            )
+            .values(status=PredictionStatus.EXPIRED, resolved_at=now)
+        )
+        return result.rowcount
 
     # ------------------------------------------------------------------
     # Helpers
@@ -339,6 +244,49 @@ class PredictionEngine:
             logger.warning("Graphiti enrichment failed for %s: %s", pattern_type, exc)
             return {}
 
+    async def _without_recent_predictions(
+        self, candidates: list[dict[str, Any]]
+    ) -> list[dict[str, Any]]:
+        """Drop candidates with an active prediction of their type within cooldown.
+
+        One anti-join of all (user, pattern type) pairs, passed as two
+        arrays, against ``predicted_patterns``.
+        """
+        cutoff = datetime.now(timezone.utc) - timedelta(hours=PREDICTION_COOLDOWN_HOURS)
+        pairs = func.unnest(
+            bindparam(
+                "candidate_users",
+                [candidate["user_id"] for candidate in candidates],
+                type_=ARRAY(PG_UUID(as_uuid=True)),
+            ),
+            bindparam(
+                "candidate_types",
+                [candidate["pattern_type"] for candidate in candidates],
+                type_=ARRAY(String),
+            ),
+        ).table_valued(
+            column("user_id", PG_UUID(as_uuid=True)),
+            column("pattern_type", String),
+        ).render_derived(name="candidates")
+        recent = (
+            select(PredictedPattern.id)
+            .where(
+                PredictedPattern.user_id == pairs.c.user_id,
+                PredictedPattern.pattern_type == pairs.c.pattern_type,
+                PredictedPattern.status == PredictionStatus.ACTIVE,
+                PredictedPattern.created_at >= cutoff,
+            )
+            .exists()
+        )
+        result = await self.db.execute(
+            select(pairs.c.user_id, pairs.c.pattern_type).where(~recent)
+        )
+        fresh = {(user_id, pattern_type) for user_id, pattern_type in result.all()}
+        return [
+            candidate for candidate in candidates
+            if (candidate["user_id"], candidate["pattern_type"]) in fresh
+        ]
+
     async def _has_recent_prediction(self, user_id: str, pattern_type: str) -> bool:
         """Check if an active prediction of this type exists within cooldown."""
         cutoff = datetime.now(timezone.utc) - timedelta(hours=PREDICTION_COOLDOWN_HOURS)
@@ -354,48 +302,3 @@ class PredictionEngine:
         )
         result = await self.db.execute(stmt)
         return (result.scalar() or 0) > 0
-
-    async def _get_user_stats(self, user_id: str) -> dict[str, Any]:
-        stats_result = await self.db.execute(
-            select(UserStats).where(UserStats.user_id == user_id)
-        )
-        stats = stats_result.scalar_one_or_none()
-
-        open_count_result = await self.db.execute(
-            select(func.count())
-            .select_from(Task)
-            .where(
-                Task.user_id == user_id,
-                Task.status.in_([TaskStatus.OPEN, TaskStatus.IN_PROGRESS]),
-            )
-        )
-        open_tasks = open_count_result.scalar() or 0
-
-        if not stats:
-            return {"tasks_completed": 0, "current_streak": 0, "open_tasks": open_tasks}
-
-        return {
-            "tasks_completed": stats.tasks_completed,
-            "current_streak": stats.current_streak,
-            "open_tasks": open_tasks,
-        }
-
-    async def _get_recent_logs(self, user_id: str, days: int = 3) -> list[dict[str, Any]]:
-        cutoff = datetime.now(timezone.utc) - timedelta(days=days)
-        stmt = (
-            select(PatternLog)
-            .where(
-                PatternLog.user_id == user_id,
-                PatternLog.created_at >= cutoff,
-            )
-            .order_by(PatternLog.created_at.asc())
-        )
-        result = await self.db.execute(stmt)
-        return [
-            {
-                "mood_score": log.mood_score,
-                "energy_level": log.energy_level,
-                "focus_score": log.focus_score,
-            }
-            for log in result.scalars().all()
-        ]
@@ -0,0 +1,106 @@
+"""Per-user snapshot cache of the chat system prompt's DB sections.
+
+``ChatService._build_system_prompt`` combines personality, settings,
+progress, today's tasks, observations and active nudges. These change far
+less often than users send messages, so the rendered sections are cached
+per user for a short TTL and dropped whenever one of their sources is
+written (tasks, settings, nudges, personality, chat tool writes).
+
+The cache is per process. Writers call ``invalidate_prompt_context``; the
+TTL bounds staleness for writes made by other processes. Writes that are
+not committed yet are invalidated when their session commits, so a request
+running in between cannot cache the old rows for the whole TTL.
+"""
+
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from uuid import UUID
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+
+# Session.info key of the users to invalidate when the session commits
+PENDING_INVALIDATIONS_KEY = "prompt_context_invalidations"
+
+
+@dataclass(frozen=True)
+class PromptContext:
+    """Rendered system prompt sections of one user."""
+
+    personality: str
+    sections: tuple[str, ...]
+
+
+class PromptContextCache:
+    """Bounded TTL cache of user_id -> PromptContext."""
+
+    def __init__(self, ttl_seconds: float, max_entries: int):
+        """Initialize an empty cache.
+
+        Args:
+            ttl_seconds: Seconds an entry stays valid (<= 0 disables caching)
+            max_entries: Maximum number of cached users (oldest evicted first)
+        """
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: OrderedDict[UUID, tuple[float, PromptContext]] = OrderedDict()
+
+    def get(self, user_id: UUID) -> PromptContext | None:
+        """Return the cached context, or None if missing or expired."""
+        entry = self._entries.get(user_id)
+        if entry is None:
+            return None
+        expires_at, context = entry
+        if expires_at <= time.monotonic():
+            self._entries.pop(user_id, None)
+            return None
+        return context
+
+    def set(self, user_id: UUID, context: PromptContext) -> None:
+        """Cache a user's context for the configured TTL."""
+        if self.ttl_seconds <= 0:
+            return
+        self._entries.pop(user_id, None)
+        self._entries[user_id] = (time.monotonic() + self.ttl_seconds, context)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, user_id: UUID) -> None:
+        """Drop the cached context of a user."""
+        self._entries.pop(user_id, None)
+
+    def clear(self) -> None:
+        """Drop all cached contexts."""
+        self._entries.clear()
+
+
+# Global cache instance
+prompt_context_cache = PromptContextCache(
+    ttl_seconds=settings.prompt_context_cache_ttl_seconds,
+    max_entries=settings.prompt_context_cache_max_entries,
+)
+
+
+def invalidate_prompt_context(user_id: UUID, db: AsyncSession | None = None) -> None:
+    """Invalidate a user's cached prompt sections after a relevant write.
+
+    Args:
+        user_id: User whose sections changed
+        db: Session holding the uncommitted write; the entry is dropped
+            once it commits (None = the write is committed, drop it now)
+    """
+    if db is None:
+        prompt_context_cache.invalidate(user_id)
+        return
+    db.info.setdefault(PENDING_INVALIDATIONS_KEY, set()).add(user_id)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_after_commit(session: Session) -> None:
+    """Drop the cached sections of the users written in the committed transaction."""
+    for user_id in session.info.pop(PENDING_INVALIDATIONS_KEY, ()):
+        prompt_context_cache.invalidate(user_id)
@@ -2,211 +2,607 @@
 
 import asyncio
 import logging
-from datetime import datetime, date, timedelta, time
+from collections.abc import Collection
+from contextvars import ContextVar
+from datetime import datetime, date, timedelta, time, timezone
+from time import monotonic
 from uuid import UUID
 from zoneinfo import ZoneInfo
 
-from sqlalchemy import select, and_, func
+from sqlalchemy import select, and_, case, func, insert, literal
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.config import settings as app_settings
 from app.core.database import AsyncSessionLocal
 from app.models.nudge_history import NudgeHistory, NudgeType
 from app.models.task import Task, TaskStatus
 from app.models.user_settings import UserSettings, DEFAULT_SETTINGS
 from app.models.user_stats import UserStats
-from app.services.notification import NotificationService, PushNotification
+from app.services.notification import (
+    NotificationService,
+    PushNotification,
+    PushOutbox,
+    receipt_tracker,
+)
 from app.services.nudge import NudgeService
 from app.services.wellbeing import WellbeingService
 from app.services.intervention_engine import InterventionEngine
+from app.services.job_schedule import (
+    CLAIM_BATCH_LIMIT,
+    JOB_HINT_CHANNEL,
+    JOB_TYPES,
+    apply_job_hint,
+    claim_due_jobs,
+    in_quiet_hours,
+    job_heap,
+    load_due_jobs,
+    reschedule,
+)
 from app.services.briefing import BriefingService
 from app.services.prediction_engine import PredictionEngine
+from app.services.prompt_context import invalidate_prompt_context
+from app.services.scheduler_leadership import SchedulerLeadership
+from app.services.settings import SettingsService
+from app.services.user_features import build_feature_snapshot
 
 logger = logging.getLogger(__name__)
 
-SCHEDULER_INTERVAL_SECONDS = 300  # 5 minutes
+SCHEDULER_BATCH_WINDOW_SECONDS = 1.0  # jobs due this close together run as one batch
 BERLIN_TZ = ZoneInfo("Europe/Berlin")
+NUDGE_INSERT_BATCH = 1000  # rows per multi-VALUES insert
+
+PREDICTION_LABELS = {
+    "energy_crash": "Energie-Einbruch",
+    "procrastination": "Prokrastinations-Spirale",
+    "hyperfocus": "Hyperfokus-Falle",
+    "decision_fatigue": "Entscheidungsmuedigkeit",
+    "sleep_disruption": "Schlafproblem",
+    "social_masking": "Social Masking",
+}
+
+# Push outbox of the running batch (stages queue pushes instead of sending them)
+_tick_outbox: ContextVar[PushOutbox | None] = ContextVar("scheduler_tick_outbox", default=None)
+
+
+class SchedulerMetrics:
+    """Tick duration, lag and per-stage timings of the background scheduler."""
+
+    def __init__(self):
+        """Initialize empty metrics."""
+        self.ticks = 0
+        self.last_tick_users = 0
+        self.last_tick_duration = 0.0
+        self.max_tick_duration = 0.0
+        self.last_tick_lag = 0.0
+        self.max_tick_lag = 0.0
+        self.stages: dict[str, dict] = {}
+        self.leader_shards: list[int] = []
+
+    def record_tick(self, duration: float, lag: float, users: int) -> None:
+        """Record a finished tick."""
+        self.ticks += 1
+        self.last_tick_users = users
+        self.last_tick_duration = duration
+        self.max_tick_duration = max(self.max_tick_duration, duration)
+        self.last_tick_lag = lag
+        self.max_tick_lag = max(self.max_tick_lag, lag)
+
+    def record_stage(self, stage: str, duration: float, outcome: str) -> None:
+        """Record one stage run for one user (outcome: ok, error, timeout)."""
+        entry = self.stages.setdefault(
+            stage,
+            {"runs": 0, "errors": 0, "timeouts": 0, "total_seconds": 0.0, "max_seconds": 0.0},
+        )
+        entry["runs"] += 1
+        entry["total_seconds"] += duration
+        entry["max_seconds"] = max(entry["max_seconds"], duration)
+        if outcome == "error":
+            entry["errors"] += 1
+        elif outcome == "timeout":
+            entry["timeouts"] += 1
+
+    def snapshot(self) -> dict:
+        """Return the metrics for health reporting."""
+        return {
+            "leader_shards": self.leader_shards,
+            "ticks": self.ticks,
+            "last_tick_users": self.last_tick_users,
+            "last_tick_duration_ms": round(self.last_tick_duration * 1000, 1),
+            "max_tick_duration_ms": round(self.max_tick_duration * 1000, 1),
+            "last_tick_lag_ms": round(self.last_tick_lag * 1000, 1),
+            "max_tick_lag_ms": round(self.max_tick_lag * 1000, 1),
+            "stages": {
+                stage: {
+                    "runs": entry["runs"],
+                    "errors": entry["errors"],
+                    "timeouts": entry["timeouts"],
+                    "avg_ms": round(entry["total_seconds"] / entry["runs"] * 1000, 1),
+                    "max_ms": round(entry["max_seconds"] * 1000, 1),
+                }
+                for stage, entry in self.stages.items()
+            },
+        }
+
+
+# Global scheduler metrics
+scheduler_metrics = SchedulerMetrics()
 
 
 async def run_scheduler() -> None:
-    """Main scheduler loop — runs every 5 minutes."""
-    logger.info("Background scheduler started (interval: %ds)", SCHEDULER_INTERVAL_SECONDS)
+    """Main scheduler loop — leads shards (or waits on standby) and runs their due jobs.
+
+    Every API process runs this loop, but only the holder of a shard's
+    advisory lock processes that shard's users; see scheduler_leadership.
+    """
+    leadership = SchedulerLeadership(app_settings.scheduler_shards)
+    logger.info(
+        "Background scheduler started (shards: %d, rehydrate: %.0fs, concurrency: %d)",
+        leadership.shards, app_settings.scheduler_rehydrate_seconds,
+        app_settings.scheduler_concurrency,
+    )
 
-    while True:
-        try:
-            await _scheduler_tick()
-        except asyncio.CancelledError:
-            logger.info("Background scheduler cancelled — shutting down")
-            raise
-        except Exception:
-            logger.exception("Scheduler tick failed")
+    try:
+        while True:
+            try:
+                shard = await leadership.acquire()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Scheduler leader election failed")
+                shard = None
+
+            if shard is None:
+                # Standby: another process leads every shard
+                await asyncio.sleep(app_settings.scheduler_leader_retry_seconds)
+                continue
 
-        await asyncio.sleep(SCHEDULER_INTERVAL_SECONDS)
+            logger.info("Scheduler leading shard %d/%d", shard, leadership.shards)
+            scheduler_metrics.leader_shards = [shard]
+            try:
+                await _lead(leadership)
+            finally:
+                scheduler_metrics.leader_shards = []
+            logger.warning("Scheduler lost leadership of its shards")
+    finally:
+        await leadership.close()
+
+
+async def _lead(leadership: SchedulerLeadership) -> None:
+    """Run the owned shards' jobs as they become due, until leadership is lost.
+
+    From the second rehydrate on, shards no process holds are adopted;
+    replicas starting together have had time to take their own by then.
+    """
+    # The owned set grows as shards are adopted
+    shards = leadership.owned if leadership.shards > 1 else None
+    adopt = False
+    job_heap.active = True
+    try:
+        # Job hints of API writes in other processes
+        await leadership.listen(JOB_HINT_CHANNEL, apply_job_hint)
+    except Exception:
+        logger.warning(
+            "Scheduler could not listen for job hints; other processes' hints "
+            "wait for the next rehydrate", exc_info=True,
+        )
+    next_rehydrate = monotonic()
+    more_due = False
+    try:
+        while True:
+            try:
+                if monotonic() >= next_rehydrate:
+                    next_rehydrate = monotonic() + app_settings.scheduler_rehydrate_seconds
+                    if not await leadership.check():
+                        return
+                    if adopt:
+                        await _adopt_free_shards(leadership)
+                    adopt = leadership.shards > 1
+                    await _rehydrate(shards)
+                    # Receipts of earlier pushes, off the delivery path
+                    await _run_stage("push_receipts", _check_push_receipts())
+
+                until = datetime.now(timezone.utc) + timedelta(
+                    seconds=SCHEDULER_BATCH_WINDOW_SECONDS
+                )
+                if job_heap.pop_due(until) or more_due:
+                    claimed = await _claim_due(until, shards)
+                    more_due = len(claimed) >= CLAIM_BATCH_LIMIT
+                    if claimed:
+                        started = monotonic()
+                        now = datetime.now(timezone.utc)
+                        lag = max(0.0, (now - min(at for _, _, at in claimed)).total_seconds())
+                        users = await _run_due_jobs(claimed)
+                        scheduler_metrics.record_tick(monotonic() - started, lag, users)
+                        continue
+            except asyncio.CancelledError:
+                logger.info("Background scheduler cancelled — shutting down")
+                raise
+            except Exception:
+                logger.exception("Scheduler tick failed")
+
+            timeout = next_rehydrate - monotonic()
+            try:
+                next_due = job_heap.next_due()
+                if next_due is not None:
+                    timeout = min(timeout, (next_due - datetime.now(timezone.utc)).total_seconds())
+            except Exception:
+                # A bad heap entry must not end the loop; rehydrate rebuilds the heap
+                logger.exception("Scheduler could not compute the next due job")
+                job_heap.clear()
+                next_rehydrate = monotonic()
+                timeout = app_settings.scheduler_leader_retry_seconds
+            await job_heap.wait(timeout)
+    finally:
+        job_heap.active = False
+        job_heap.clear()
+
+
+async def _adopt_free_shards(leadership: SchedulerLeadership) -> None:
+    """Take over shards without a leader, so their users are not left unscheduled."""
+    try:
+        adopted = await leadership.adopt_free_shards()
+    except Exception:
+        logger.warning("Scheduler could not adopt free shards", exc_info=True)
+        return
+    if adopted:
+        logger.warning(
+            "Scheduler shards %s had no leader and are now led by this process (shards: %s)",
+            adopted, sorted(leadership.owned),
+        )
+        scheduler_metrics.leader_shards = sorted(leadership.owned)
 
 
-async def _scheduler_tick() -> None:
-    """Single scheduler tick — checks all users with push tokens."""
+async def _rehydrate(shards: Collection[int] | None = None) -> None:
+    """Reload jobs due within the next two rehydrate intervals from Postgres."""
+    horizon = datetime.now(timezone.utc) + timedelta(
+        seconds=2 * app_settings.scheduler_rehydrate_seconds
+    )
     async with AsyncSessionLocal() as db:
-        result = await db.execute(select(UserSettings))
-        all_settings = result.scalars().all()
+        loaded = await load_due_jobs(db, horizon, shards)
+        await db.commit()
+    logger.debug("Scheduler rehydrated %d due jobs (%d in memory)", loaded, len(job_heap))
 
-    eligible = []
-    for us in all_settings:
-        merged = {**DEFAULT_SETTINGS, **us.settings}
-        token = merged.get("expo_push_token")
-        enabled = merged.get("notifications_enabled", True)
-        if token and enabled:
-            eligible.append((us.user_id, token, merged))
-
-    if not eligible:
-        return
 
-    logger.debug("Scheduler tick: %d eligible users", len(eligible))
+async def _claim_due(
+    until: datetime, shards: Collection[int] | None = None
+) -> list[tuple[UUID, str, datetime]]:
+    """Claim the owned shards' due jobs (FOR UPDATE SKIP LOCKED) for this process."""
+    async with AsyncSessionLocal() as db:
+        claimed = await claim_due_jobs(db, until, shards)
+        await db.commit()
+    return claimed
+
+
+async def _run_due_jobs(due: list[tuple[UUID, str, datetime]]) -> int:
+    """Run a batch of due jobs and schedule their next run.
 
-    for user_id, token, settings in eligible:
-        try:
-            await _process_user(user_id, token, settings)
-        except Exception:
-            logger.exception("Scheduler error for user %s", user_id)
+    Users are processed concurrently, at most SCHEDULER_CONCURRENCY at a
+    time, each running only its due stages. Pushes are collected in an
+    outbox and sent in batches once all users are done.
 
+    Args:
+        due: (user_id, job_type, due_at) of the jobs to run
 
-async def _process_user(user_id: UUID, token: str, settings: dict) -> None:
-    """Process deadline/overdue/streak checks for one user."""
+    Returns:
+        int: Number of users whose jobs ran
+    """
+    jobs_by_user: dict[UUID, set[str]] = {}
+    for user_id, job_type, _ in due:
+        jobs_by_user.setdefault(user_id, set()).add(job_type)
+
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(
+            select(UserSettings).where(UserSettings.user_id.in_(list(jobs_by_user)))
+        )
+        settings_by_user = {
+            us.user_id: {**DEFAULT_SETTINGS, **us.settings} for us in result.scalars().all()
+        }
+
+    # Users without token or in quiet hours only get their jobs rescheduled
     now_berlin = datetime.now(BERLIN_TZ)
+    eligible = []
+    for user_id, settings in settings_by_user.items():
+        token = settings.get("expo_push_token")
+        enabled = settings.get("notifications_enabled", True)
+        if token and enabled and not in_quiet_hours(now_berlin, settings):
+            eligible.append((user_id, token, settings, jobs_by_user[user_id]))
+
+    logger.debug("Scheduler: %d due jobs for %d eligible users", len(due), len(eligible))
+
+    # Jobs whose stage failed or timed out are retried after a backoff
+    failed: set[tuple[UUID, str]] = set()
+    outbox = PushOutbox()
+    outbox_token = _tick_outbox.set(outbox)
+    try:
+        # Deadline and overdue nudges for all due users in one set-based pass
+        nudge_tokens = {
+            user_id: token
+            for user_id, token, _, job_types in eligible
+            if "task_nudges" in job_types
+        }
+        if nudge_tokens:
+            if await _run_stage("task_nudges", _process_task_nudges(nudge_tokens)) != "ok":
+                failed.update((user_id, "task_nudges") for user_id in nudge_tokens)
+
+        # Predictions for all due wellness users in one vectorized pass
+        prediction_tokens = {
+            user_id: token
+            for user_id, token, settings, job_types in eligible
+            if "predictions" in job_types
+            and "wellness" in settings.get("active_modules", ["core", "adhs"])
+        }
+        if prediction_tokens:
+            if await _run_stage("predictions", _process_predictions(prediction_tokens)) != "ok":
+                failed.update((user_id, "predictions") for user_id in prediction_tokens)
+
+        semaphore = asyncio.Semaphore(max(1, app_settings.scheduler_concurrency))
+
+        async def process(user_id: UUID, token: str, settings: dict, job_types: set[str]) -> None:
+            async with semaphore:
+                try:
+                    failed_types = await _process_user(user_id, token, settings, job_types)
+                except Exception:
+                    logger.exception("Scheduler error for user %s", user_id)
+                    failed_types = job_types
+                failed.update((user_id, job_type) for job_type in failed_types)
+
+        await asyncio.gather(*(process(*user) for user in eligible))
+    finally:
+        _tick_outbox.reset(outbox_token)
+
+    # Every push of this batch goes out in EXPO_BATCH_LIMIT-sized requests
+    await _run_stage("push", _flush_outbox(outbox))
+
+    async with AsyncSessionLocal() as db:
+        await reschedule(
+            db,
+            {
+                user_id: (settings_by_user.get(user_id, {}), tuple(job_types))
+                for user_id, job_types in jobs_by_user.items()
+            },
+            ran=True,
+            failed=failed,
+        )
+        await db.commit()
 
-    # Respect quiet hours
-    quiet_start = settings.get("quiet_hours_start")
-    quiet_end = settings.get("quiet_hours_end")
-    if quiet_start and quiet_end and _is_quiet_hours(now_berlin, quiet_start, quiet_end):
+    return len(eligible)
+
+
+async def _push(notification: PushNotification) -> None:
+    """Queue a push in the tick's outbox (or send it directly outside a tick)."""
+    outbox = _tick_outbox.get()
+    if outbox is not None:
+        outbox.add(notification)
+    else:
+        await NotificationService.send_notification(notification)
+
+
+async def _flush_outbox(outbox: PushOutbox) -> None:
+    """Send the tick's pushes and prune tokens Expo rejected as unregistered."""
+    if not len(outbox):
         return
+    result = await outbox.flush()
+    await _prune_push_tokens(result.dead_tokens)
 
+
+async def _check_push_receipts() -> None:
+    """Fetch due Expo push receipts and prune tokens of uninstalled apps."""
+    await _prune_push_tokens(await receipt_tracker.poll())
+
+
+async def _prune_push_tokens(tokens: set[str]) -> None:
+    """Remove DeviceNotRegistered tokens from UserSettings."""
+    if not tokens:
+        return
     async with AsyncSessionLocal() as db:
-        # 1. Deadline approaching (within 60 minutes)
-        now_utc = datetime.now(BERLIN_TZ).astimezone(ZoneInfo("UTC"))
-        deadline_cutoff = now_utc + timedelta(minutes=60)
+        removed = await SettingsService(db).remove_push_tokens(tokens)
+        await db.commit()
+    logger.info("Removed %d unregistered push tokens", removed)
 
-        result = await db.execute(
-            select(Task).where(
-                Task.user_id == user_id,
-                Task.status.in_([TaskStatus.OPEN, TaskStatus.IN_PROGRESS]),
-                Task.due_date.isnot(None),
-                Task.due_date > now_utc,
-                Task.due_date <= deadline_cutoff,
-            )
+
+async def _run_stage(stage: str, coro, user_id: UUID | None = None) -> str:
+    """Run one stage (per user, or tick-wide) with a timeout and record its timing.
+
+    Returns:
+        str: Outcome of the stage (ok, error, timeout)
+    """
+    started = monotonic()
+    outcome = "ok"
+    try:
+        await asyncio.wait_for(coro, timeout=app_settings.scheduler_stage_timeout_seconds)
+    except asyncio.TimeoutError:
+        outcome = "timeout"
+        logger.warning(
+            "Scheduler stage %s timed out after %.0fs for user %s",
+            stage, app_settings.scheduler_stage_timeout_seconds, user_id or "(all)",
         )
-        approaching_tasks = result.scalars().all()
+    except Exception:
+        outcome = "error"
+        logger.exception("Scheduler stage %s error for user %s", stage, user_id or "(all)")
+    finally:
+        scheduler_metrics.record_stage(stage, monotonic() - started, outcome)
+    return outcome
 
-        for task in approaching_tasks:
-            if await _already_notified_today(db, user_id, task.id, NudgeType.DEADLINE):
-                continue
 
-            minutes_left = max(0, int((task.due_date - now_utc).total_seconds() / 60))
-            level = 3 if minutes_left <= 30 else 2
-            message = f"⏰ '{task.title}' ist in {minutes_left} Minuten faellig!"
+async def _process_user(
+    user_id: UUID,
+    token: str,
+    settings: dict,
+    job_types: set[str] | tuple[str, ...] = JOB_TYPES,
+) -> set[str]:
+    """Run the due per-user scheduler stages (quiet hours are filtered by the caller).
+
+    Task nudges and predictions run set-based for the whole batch instead
+    (see ``_run_due_jobs``).
+
+    Returns:
+        set[str]: Job types whose stage failed or timed out
+    """
+    outcomes = {}
+    # 3. Streak reminder
+    if "streak" in job_types:
+        outcomes["streak"] = await _run_stage(
+            "streak", _process_streak_reminder(user_id, token, settings), user_id
+        )
 
-            nudge_service = NudgeService(db)
-            await nudge_service.create_nudge(user_id, task.id, level, NudgeType.DEADLINE, message)
-            await db.commit()
+    # 4. Wellbeing check (if wellness module active)
+    if "wellbeing" in job_types:
+        outcomes["wellbeing"] = await _run_stage(
+            "wellbeing", _process_wellbeing_check(user_id, settings), user_id
+        )
 
-            await NotificationService.send_notification(
-                PushNotification(
-                    to=token,
-                    title="Deadline naht!",
-                    body=message,
-                    data={"type": "deadline", "task_id": str(task.id)},
-                )
-            )
+    # 5. Morning Briefing (if productivity module active)
+    if "briefing" in job_types:
+        outcomes["briefing"] = await _run_stage(
+            "briefing", _process_morning_briefing(user_id, settings), user_id
+        )
+
+    # 7. Calendar sync (if integrations module active)
+    if "calendar" in job_types:
+        outcomes["calendar"] = await _run_stage(
+            "calendar", _process_calendar_sync(user_id, settings), user_id
+        )
+
+    # 8. Reminder processing (if integrations module active)
+    if "reminders" in job_types:
+        outcomes["reminders"] = await _run_stage(
+            "reminders", _process_reminders(user_id, settings), user_id
+        )
 
-        # 2. Overdue tasks
+    return {job_type for job_type, outcome in outcomes.items() if outcome != "ok"}
+
+
+async def _process_task_nudges(tokens: dict[UUID, str]) -> None:
+    """Send deadline and overdue nudges for all given users at once.
+
+    A single statement finds every open task of these users that is due
+    within 60 minutes or overdue and has no nudge of the matching type
+    today (anti-join on nudge_history). The nudges are bulk-inserted with
+    RETURNING, then pushed.
+
+    Args:
+        tokens: Expo push token per user ID
+    """
+    if not tokens:
+        return
+
+    now_utc = datetime.now(timezone.utc)
+    today_start = datetime.combine(datetime.now(BERLIN_TZ).date(), time.min, tzinfo=BERLIN_TZ)
+    nudge_type_col = NudgeHistory.nudge_type.type
+
+    # 1. Deadline approaching (within 60 minutes), 2. overdue
+    nudge_type = case(
+        (Task.due_date > now_utc, literal(NudgeType.DEADLINE, nudge_type_col)),
+        else_=literal(NudgeType.MOTIVATIONAL, nudge_type_col),
+    )
+    already_notified = (
+        select(NudgeHistory.id)
+        .where(
+            NudgeHistory.user_id == Task.user_id,
+            NudgeHistory.nudge_type == nudge_type,
+            NudgeHistory.task_id == Task.id,
+            NudgeHistory.delivered_at >= today_start,
+        )
+        .exists()
+    )
+
+    async with AsyncSessionLocal() as db:
         result = await db.execute(
-            select(Task).where(
-                Task.user_id == user_id,
+            select(Task.user_id, Task.id, Task.title, Task.due_date, nudge_type.label("nudge_type"))
+            .where(
+                Task.user_id.in_(list(tokens)),
                 Task.status.in_([TaskStatus.OPEN, TaskStatus.IN_PROGRESS]),
                 Task.due_date.isnot(None),
-                Task.due_date < now_utc,
+                Task.due_date <= now_utc + timedelta(minutes=60),
+                ~already_notified,
             )
         )
-        overdue_tasks = result.scalars().all()
-
-        for task in overdue_tasks:
-            if await _already_notified_today(db, user_id, task.id, NudgeType.MOTIVATIONAL):
-                continue
-
-            message = f"📋 '{task.title}' ist ueberfaellig — magst du sie erledigen oder verschieben?"
-
-            nudge_service = NudgeService(db)
-            await nudge_service.create_nudge(user_id, task.id, 2, NudgeType.MOTIVATIONAL, message)
-            await db.commit()
+        due = result.all()
+        if not due:
+            return
 
-            await NotificationService.send_notification(
-                PushNotification(
-                    to=token,
-                    title="Aufgabe ueberfaellig",
-                    body=message,
-                    data={"type": "overdue", "task_id": str(task.id)},
-                )
+        pushes: dict[tuple[UUID, UUID, NudgeType], PushNotification] = {}
+        rows = []
+        for user_id, task_id, title, due_date, kind in due:
+            if kind == NudgeType.DEADLINE:
+                minutes_left = max(0, int((due_date - now_utc).total_seconds() / 60))
+                level = 3 if minutes_left <= 30 else 2
+                message = f"⏰ '{title}' ist in {minutes_left} Minuten faellig!"
+                push_title, push_type = "Deadline naht!", "deadline"
+            else:
+                level = 2
+                message = f"📋 '{title}' ist ueberfaellig — magst du sie erledigen oder verschieben?"
+                push_title, push_type = "Aufgabe ueberfaellig", "overdue"
+
+            rows.append({
+                "user_id": user_id,
+                "task_id": task_id,
+                "nudge_level": level,
+                "nudge_type": kind,
+                "message": message,
+            })
+            pushes[(user_id, task_id, kind)] = PushNotification(
+                to=tokens[user_id],
+                title=push_title,
+                body=message,
+                data={"type": push_type, "task_id": str(task_id)},
             )
 
-        # 3. Streak reminder
-        preferred_times = settings.get("preferred_reminder_times", [])
-        if preferred_times and _is_near_reminder_time(now_berlin, preferred_times):
-            stats_result = await db.execute(
-                select(UserStats).where(UserStats.user_id == user_id)
+        created = []
+        for i in range(0, len(rows), NUDGE_INSERT_BATCH):
+            inserted = await db.execute(
+                insert(NudgeHistory)
+                .values(rows[i:i + NUDGE_INSERT_BATCH])
+                .returning(NudgeHistory.user_id, NudgeHistory.task_id, NudgeHistory.nudge_type)
             )
-            stats = stats_result.scalar_one_or_none()
-
-            if stats and stats.current_streak > 0:
-                today = date.today()
-                if stats.last_active_date != today:
-                    if not await _already_notified_today(db, user_id, None, NudgeType.STREAK_REMINDER):
-                        message = (
-                            f"🔥 Dein Streak: {stats.current_streak} Tage! "
-                            f"Erledige eine Aufgabe um ihn zu halten."
-                        )
+            created.extend(inserted.all())
+        await db.commit()
 
-                        nudge_service = NudgeService(db)
-                        await nudge_service.create_nudge(
-                            user_id, None, 1, NudgeType.STREAK_REMINDER, message
-                        )
-                        await db.commit()
-
-                        await NotificationService.send_notification(
-                            PushNotification(
-                                to=token,
-                                title="Streak halten!",
-                                body=message,
-                                data={"type": "streak"},
-                            )
-                        )
+    logger.info("Scheduler: %d deadline/overdue nudges for %d users", len(created), len(tokens))
+    for user_id in {row.user_id for row in created}:
+        invalidate_prompt_context(user_id)
 
-    # 4. Wellbeing check (if wellness module active)
-    try:
-        await _process_wellbeing_check(user_id, settings)
-    except Exception:
-        logger.exception("Wellbeing check error for user %s", user_id)
+    for row in created:
+        await _push(pushes[(row.user_id, row.task_id, row.nudge_type)])
 
-    # 5. Morning Briefing (if productivity module active)
-    try:
-        await _process_morning_briefing(user_id, settings)
-    except Exception:
-        logger.exception("Morning briefing error for user %s", user_id)
 
-    # 6. Prediction engine (if wellness module active)
-    try:
-        await _process_predictions(user_id, settings)
-    except Exception:
-        logger.exception("Prediction engine error for user %s", user_id)
+async def _process_streak_reminder(user_id: UUID, token: str, settings: dict) -> None:
+    """Send the streak reminder near the user's preferred reminder times."""
+    now_berlin = datetime.now(BERLIN_TZ)
 
-    # 7. Calendar sync (if integrations module active)
-    try:
-        await _process_calendar_sync(user_id, settings)
-    except Exception:
-        logger.exception("Calendar sync error for user %s", user_id)
+    preferred_times = settings.get("preferred_reminder_times", [])
+    if not (preferred_times and _is_near_reminder_time(now_berlin, preferred_times)):
+        return
 
-    # 8. Reminder processing (if integrations module active)
-    try:
-        await _process_reminders(user_id, settings)
-    except Exception:
-        logger.exception("Reminder processing error for user %s", user_id)
+    async with AsyncSessionLocal() as db:
+        stats_result = await db.execute(
+            select(UserStats).where(UserStats.user_id == user_id)
+        )
+        stats = stats_result.scalar_one_or_none()
+
+        if stats and stats.current_streak > 0:
+            today = date.today()
+            if stats.last_active_date != today:
+                if not await _already_notified_today(db, user_id, None, NudgeType.STREAK_REMINDER):
+                    message = (
+                        f"🔥 Dein Streak: {stats.current_streak} Tage! "
+                        f"Erledige eine Aufgabe um ihn zu halten."
+                    )
+
+                    nudge_service = NudgeService(db)
+                    await nudge_service.create_nudge(
+                        user_id, None, 1, NudgeType.STREAK_REMINDER, message
+                    )
+                    await db.commit()
+
+                    await _push(
+                        PushNotification(
+                            to=token,
+                            title="Streak halten!",
+                            body=message,
+                            data={"type": "streak"},
+                        )
+                    )
 
 
 async def _process_wellbeing_check(user_id: UUID, settings: dict) -> None:
@@ -216,11 +612,13 @@ async def _process_wellbeing_check(user_id: UUID, settings: dict) -> None:
         return
 
     async with AsyncSessionLocal() as db:
+        # Wellbeing score and interventions read the same features
+        snapshot = await build_feature_snapshot(db, user_id)
         ws = WellbeingService(db)
-        result = await ws.calculate_and_store(str(user_id))
+        result = await ws.calculate_and_store(str(user_id), snapshot)
 
         ie = InterventionEngine(db)
-        interventions = await ie.evaluate(str(user_id))
+        interventions = await ie.evaluate(str(user_id), snapshot)
 
         await db.commit()
 
@@ -229,7 +627,7 @@ async def _process_wellbeing_check(user_id: UUID, settings: dict) -> None:
             token = settings.get("expo_push_token")
             if token:
                 if result["zone"] == "red":
-                    await NotificationService.send_notification(
+                    await _push(
                         PushNotification(
                             to=token,
                             title="Wellbeing Check",
@@ -238,7 +636,7 @@ async def _process_wellbeing_check(user_id: UUID, settings: dict) -> None:
                         )
                     )
                 for intervention in interventions:
-                    await NotificationService.send_notification(
+                    await _push(
                         PushNotification(
                             to=token,
                             title="Alice Guardian Angel",
@@ -282,7 +680,7 @@ async def _process_morning_briefing(user_id: UUID, settings: dict) -> None:
         # Send push notification
         token = settings.get("expo_push_token")
         if token:
-            await NotificationService.send_notification(
+            await _push(
                 PushNotification(
                     to=token,
                     title="Dein Morning Briefing",
@@ -292,43 +690,39 @@ async def _process_morning_briefing(user_id: UUID, settings: dict) -> None:
             )
 
 
-async def _process_predictions(user_id: UUID, settings: dict) -> None:
-    """Run prediction engine if wellness module is active."""
-    active_modules = settings.get("active_modules", ["core", "adhs"])
-    if "wellness" not in active_modules:
+async def _process_predictions(tokens: dict[UUID, str]) -> None:
+    """Run the prediction engine for all given users at once.
+
+    The rules are evaluated vectorized over all users, candidates in their
+    cooldown are dropped with one anti-join and the rest is bulk-inserted
+    (``PredictionEngine.predict_batch``). High-confidence predictions are
+    pushed.
+
+    Args:
+        tokens: Expo push token per user ID (users with the wellness module)
+    """
+    if not tokens:
         return
 
-    async with AsyncSessionLocal() as db:
-        from app.services.graphiti_client import get_graphiti_client
-        graphiti = get_graphiti_client()
-        engine = PredictionEngine(db, graphiti_client=graphiti)
+    from app.services.graphiti_client import get_graphiti_client
 
-        await engine.expire_old_predictions(str(user_id))
-        predictions = await engine.predict(str(user_id))
+    async with AsyncSessionLocal() as db:
+        engine = PredictionEngine(db, graphiti_client=get_graphiti_client())
+        await engine.expire_old_predictions_batch(list(tokens))
+        predictions = await engine.predict_batch(list(tokens))
         await db.commit()
 
-        # Push notification for high-confidence predictions
-        token = settings.get("expo_push_token")
-        if token and predictions:
-            for pred in predictions:
-                if pred["confidence"] >= 0.75:
-                    PATTERN_LABELS = {
-                        "energy_crash": "Energie-Einbruch",
-                        "procrastination": "Prokrastinations-Spirale",
-                        "hyperfocus": "Hyperfokus-Falle",
-                        "decision_fatigue": "Entscheidungsmuedigkeit",
-                        "sleep_disruption": "Schlafproblem",
-                        "social_masking": "Social Masking",
-                    }
-                    label = PATTERN_LABELS.get(pred["pattern_type"], pred["pattern_type"])
-                    await NotificationService.send_notification(
-                        PushNotification(
-                            to=token,
-                            title="Pattern-Vorhersage",
-                            body=f"Alice sieht einen moeglichen {label} in den naechsten {pred['time_horizon']}.",
-                            data={"type": "prediction", "id": pred["id"]},
-                        )
-                    )
+    for pred in predictions:
+        if pred["confidence"] >= 0.75:
+            label = PREDICTION_LABELS.get(pred["pattern_type"], pred["pattern_type"])
+            await _push(
+                PushNotification(
+                    to=tokens[pred["user_id"]],
+                    title="Pattern-Vorhersage",
+                    body=f"Alice sieht einen moeglichen {label} in den naechsten {pred['time_horizon']}.",
+                    data={"type": "prediction", "id": pred["id"]},
+                )
+            )
 
 
 async def _process_calendar_sync(user_id: UUID, settings: dict) -> None:
@@ -337,14 +731,6 @@ async def _process_calendar_sync(user_id: UUID, settings: dict) -> None:
     if "integrations" not in active_modules:
         return
 
-    # Only sync every 30 minutes (6 ticks)
-    if not hasattr(_process_calendar_sync, "_tick_count"):
-        _process_calendar_sync._tick_count = {}
-    count = _process_calendar_sync._tick_count.get(str(user_id), 0)
-    _process_calendar_sync._tick_count[str(user_id)] = count + 1
-    if count % 6 != 0:
-        return
-
     async with AsyncSessionLocal() as db:
         from app.services.calendar import CalendarService
         service = CalendarService(db)
@@ -380,7 +766,7 @@ async def _process_reminders(user_id: UUID, settings: dict) -> None:
 
         for reminder in due_reminders:
             if token:
-                await NotificationService.send_notification(
+                await _push(
                     PushNotification(
                         to=token,
                         title="Erinnerung",
@@ -422,20 +808,6 @@ def _calculate_next_occurrence(current: datetime, recurrence: str) -> datetime:
     return current + timedelta(days=1)
 
 
-def _is_quiet_hours(now: datetime, start_str: str, end_str: str) -> bool:
-    """Check if current time falls within quiet hours (supports midnight spanning)."""
-    start = time(int(start_str[:2]), int(start_str[3:5]))
-    end = time(int(end_str[:2]), int(end_str[3:5]))
-    current = now.time()
-
-    if start <= end:
-        # Same day range (e.g. 08:00–17:00)
-        return start <= current <= end
-    else:
-        # Midnight spanning (e.g. 22:00–07:00)
-        return current >= start or current <= end
-
-
 def _is_near_reminder_time(now: datetime, reminder_times: list[str], window_minutes: int = 5) -> bool:
     """Check if current time is within a window of any preferred reminder time."""
     current_minutes = now.hour * 60 + now.minute
@@ -0,0 +1,163 @@
+"""Leader election for the background scheduler via Postgres advisory locks.
+
+Every API process starts ``run_scheduler()``, but only the process holding
+a shard's advisory lock runs that shard; the others stay on standby and
+retry periodically, taking over when the holder's connection goes away
+(session-level advisory locks are released by Postgres on disconnect).
+
+With ``SCHEDULER_SHARDS`` > 1, users are split by a hash of their ID and
+each replica takes one shard, so background work scales out with the
+replicas instead of being repeated by each of them. Leaders periodically
+adopt shards nobody holds (more shards than replicas, or a replica that
+died), so no shard stays unscheduled.
+
+The lock is held on a dedicated connection outside the request pool (it
+stays open for as long as the process leads). The leader also ``LISTEN``s
+on it for job hints from other processes.
+"""
+
+import logging
+import random
+from collections.abc import Callable
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Advisory lock keys: SCHEDULER_LOCK_BASE + shard index
+SCHEDULER_LOCK_BASE = 0x414C_4943_0000  # "ALIC"
+
+
+class SchedulerLeadership:
+    """Holds the advisory locks of the scheduler shards this process leads."""
+
+    def __init__(self, shards: int = 1):
+        """
+        Initialize without connecting.
+
+        Args:
+            shards: Number of user shards (1 = a single leader for all users)
+        """
+        self.shards = max(1, shards)
+        self.owned: set[int] = set()
+        self._engine: AsyncEngine | None = None
+        self._conn: AsyncConnection | None = None
+
+    @property
+    def is_leader(self) -> bool:
+        """Whether this process currently owns a shard."""
+        return bool(self.owned)
+
+    async def acquire(self) -> int | None:
+        """
+        Try to take the lock of a free shard.
+
+        Shards are tried starting at a random offset so replicas starting
+        together spread over the shards.
+
+        Returns:
+            int | None: Owned shard index, None if all shards are taken
+        """
+        if self.owned:
+            return min(self.owned)
+
+        if self._engine is None:
+            self._engine = create_async_engine(settings.async_database_url, poolclass=NullPool)
+        conn = await self._engine.connect()
+        try:
+            conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+            offset = random.randrange(self.shards)
+            for i in range(self.shards):
+                shard = (offset + i) % self.shards
+                if await self._try_lock(conn, shard):
+                    self._conn = conn
+                    self.owned.add(shard)
+                    return shard
+        finally:
+            if self._conn is not conn:
+                await conn.close()
+        return None
+
+    async def adopt_free_shards(self) -> list[int]:
+        """
+        Take the locks of all shards no process holds.
+
+        Called by a leader, so shards without a replica of their own (or
+        whose replica died) are still scheduled. The locks are held on the
+        same connection as the owned shards.
+
+        Returns:
+            list[int]: Newly owned shard indices
+        """
+        if self._conn is None:
+            return []
+        adopted = []
+        for shard in range(self.shards):
+            if shard not in self.owned and await self._try_lock(self._conn, shard):
+                self.owned.add(shard)
+                adopted.append(shard)
+        return adopted
+
+    @staticmethod
+    async def _try_lock(conn: AsyncConnection, shard: int) -> bool:
+        """Take a shard's session-level advisory lock without waiting."""
+        result = await conn.execute(
+            text("SELECT pg_try_advisory_lock(:key)"),
+            {"key": SCHEDULER_LOCK_BASE + shard},
+        )
+        return bool(result.scalar())
+
+    async def listen(self, channel: str, callback: Callable[[str], None]) -> None:
+        """
+        Deliver ``NOTIFY`` payloads on ``channel`` to ``callback`` while leading.
+
+        Listens on the lock connection, so notifications stop together
+        with the leadership.
+
+        Args:
+            channel: Postgres notification channel
+            callback: Called with each payload (in the event loop)
+        """
+        if self._conn is None:
+            return
+        raw = await self._conn.get_raw_connection()
+        await raw.driver_connection.add_listener(
+            channel, lambda _conn, _pid, _channel, payload: callback(payload)
+        )
+
+    async def check(self) -> bool:
+        """
+        Verify the lock is still held (its connection is alive).
+
+        Returns:
+            bool: False if leadership was lost
+        """
+        if self._conn is None:
+            return False
+        try:
+            await self._conn.execute(text("SELECT 1"))
+            return True
+        except Exception:
+            logger.warning("Scheduler leadership connection lost (shards %s)", sorted(self.owned))
+            await self.release()
+            return False
+
+    async def release(self) -> None:
+        """Give up all shards (closing the connection releases the locks)."""
+        conn, self._conn, self.owned = self._conn, None, set()
+        if conn is not None:
+            try:
+                await conn.close()
+            except Exception:
+                logger.debug("Closing scheduler leadership connection failed", exc_info=True)
+
+    async def close(self) -> None:
+        """Release the shards and dispose the dedicated engine."""
+        await self.release()
+        if self._engine is not None:
+            await self._engine.dispose()
+            self._engine = None
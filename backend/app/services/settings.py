@@ -3,7 +3,8 @@
 from uuid import UUID
 
 from cryptography.fernet import InvalidToken
-from sqlalchemy import select
+from sqlalchemy import literal, select, update
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import attributes
 
@@ -21,6 +22,8 @@ from app.schemas.settings import (
     VoiceProviderUpdate,
     VoiceProviderResponse,
 )
+from app.services.job_schedule import reschedule_user
+from app.services.prompt_context import invalidate_prompt_context
 
 
 class SettingsService:
@@ -77,6 +80,31 @@ class SettingsService:
         current["expo_push_token"] = token
         user_settings.settings = current
         await self.db.flush()
+        await reschedule_user(self.db, user_id, current)
+
+    async def remove_push_tokens(self, tokens: set[str]) -> int:
+        """
+        Clear Expo push tokens that Expo reported as no longer registered.
+
+        Args:
+            tokens: Dead push tokens (any number of users)
+
+        Returns:
+            int: Number of settings rows updated
+        """
+        if not tokens:
+            return 0
+        result = await self.db.execute(
+            update(UserSettings)
+            .where(UserSettings.settings["expo_push_token"].astext.in_(list(tokens)))
+            .values(
+                settings=UserSettings.settings.op("||")(
+                    literal({"expo_push_token": None}, JSONB)
+                )
+            )
+        )
+        await self.db.flush()
+        return result.rowcount
 
     async def update_settings(self, user_id: UUID, data: ADHSSettingsUpdate) -> ADHSSettingsResponse:
         """Partial update of ADHS settings."""
@@ -94,6 +122,8 @@ class SettingsService:
 
         await self.db.flush()
         await self.db.refresh(user_settings)
+        invalidate_prompt_context(user_id, self.db)
+        await reschedule_user(self.db, user_id, current_settings)
 
         return ADHSSettingsResponse(
             adhs_mode=current_settings["adhs_mode"],
@@ -125,6 +155,8 @@ class SettingsService:
 
         user_settings.settings = current_settings
         await self.db.flush()
+        invalidate_prompt_context(user_id, self.db)
+        await reschedule_user(self.db, user_id, current_settings)
 
     async def save_api_keys(self, user_id: UUID, data: ApiKeyUpdate) -> ApiKeyResponse:
         """
@@ -343,6 +375,7 @@ class SettingsService:
         user_settings.settings = current
         attributes.flag_modified(user_settings, "settings")
         await self.db.flush()
+        await reschedule_user(self.db, user_id, current)
 
         return await self.get_modules(user_id)
 
@@ -10,6 +10,8 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.exceptions import TaskNotFoundError, TaskAlreadyCompletedError
 from app.models.task import Task, TaskPriority, TaskStatus
 from app.schemas.task import TaskCreate, TaskUpdate
+from app.services.job_schedule import DEADLINE_LEAD, hint_job
+from app.services.prompt_context import invalidate_prompt_context
 
 
 class TaskService:
@@ -50,6 +52,9 @@ class TaskService:
         self.db.add(task)
         await self.db.flush()
         await self.db.refresh(task)
+        invalidate_prompt_context(user_id, self.db)
+        if task.due_date:
+            await hint_job(self.db, user_id, "task_nudges", task.due_date - DEADLINE_LEAD)
 
         return task
 
@@ -181,6 +186,9 @@ class TaskService:
 
         await self.db.flush()
         await self.db.refresh(task)
+        invalidate_prompt_context(user_id, self.db)
+        if update_data.get("due_date"):
+            await hint_job(self.db, user_id, "task_nudges", task.due_date - DEADLINE_LEAD)
 
         return task
 
@@ -189,6 +197,7 @@ class TaskService:
         task = await self.get_task(task_id, user_id)
         await self.db.delete(task)
         await self.db.flush()
+        invalidate_prompt_context(user_id, self.db)
 
     @staticmethod
     def _calculate_level(total_xp: int) -> int:
@@ -234,6 +243,7 @@ class TaskService:
 
         await self.db.flush()
         await self.db.refresh(task)
+        invalidate_prompt_context(user_id, self.db)
 
         # Update gamification stats (streak + XP)
         from app.services.gamification import GamificationService
@@ -0,0 +1,113 @@
+"""Per-user feature snapshot shared by the wellbeing, intervention and prediction engines.
+
+The three engines look at the same inputs: the 7- and 30-day trends from
+the ``pattern_log_daily`` rollup, the gamification stats, the number of
+open tasks and the pattern logs of the last days. :func:`build_feature_snapshot`
+loads all of them with a single statement (the windowed trend aggregates
+plus scalar subqueries), and the engines evaluate their rules as plain
+functions over the resulting :class:`UserFeatureSnapshot`.
+
+The scheduler builds one snapshot per user and tick and hands it to every
+engine that runs for the user in that tick.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from datetime import UTC, datetime, timedelta
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy import JSON, func, literal_column, select
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.pattern_log import PatternLog
+from app.models.task import Task, TaskStatus
+from app.models.user_stats import UserStats
+from app.services.pattern_analyzer import PatternAnalyzer
+
+TREND_WINDOWS = (7, 30)  # days
+RECENT_LOG_DAYS = 3
+
+
+@dataclass(frozen=True)
+class UserFeatureSnapshot:
+    """Inputs of the wellbeing, intervention and prediction rules for one user."""
+
+    user_id: str
+    trends_7d: dict[str, Any]
+    trends_30d: dict[str, Any]
+    tasks_completed: int = 0
+    current_streak: int = 0
+    open_tasks: int = 0
+    recent_logs: list[dict[str, Any]] = field(default_factory=list)
+
+    @property
+    def stats(self) -> dict[str, Any]:
+        """Gamification stats and open-task count in the engines' dict shape."""
+        return {
+            "tasks_completed": self.tasks_completed,
+            "current_streak": self.current_streak,
+            "open_tasks": self.open_tasks,
+        }
+
+    @property
+    def has_conversations(self) -> bool:
+        """Whether the user has pattern logs in the last 7 days."""
+        return self.trends_7d.get("total_conversations", 0) > 0
+
+
+async def build_feature_snapshot(db: AsyncSession, user_id: str | UUID) -> UserFeatureSnapshot:
+    """Load a user's feature snapshot with one query.
+
+    Args:
+        db: Database session
+        user_id: User to load
+
+    Returns:
+        UserFeatureSnapshot: Trends, stats, open tasks and recent logs
+    """
+    result = await db.execute(feature_snapshot_query(user_id))
+    row = result.one()._mapping
+    trends = PatternAnalyzer.parse_windowed_trends(row, TREND_WINDOWS)
+    return UserFeatureSnapshot(
+        user_id=str(user_id),
+        trends_7d=trends[7],
+        trends_30d=trends[30],
+        tasks_completed=row["tasks_completed"] or 0,
+        current_streak=row["current_streak"] or 0,
+        open_tasks=row["open_tasks"] or 0,
+        recent_logs=list(row["recent_logs"] or []),
+    )
+
+
+def feature_snapshot_query(user_id: str | UUID):
+    """Build the single-row statement behind :func:`build_feature_snapshot`."""
+    user_id = str(user_id)
+    log_cutoff = datetime.now(UTC) - timedelta(days=RECENT_LOG_DAYS)
+
+    tasks_completed = select(UserStats.tasks_completed).where(UserStats.user_id == user_id)
+    current_streak = select(UserStats.current_streak).where(UserStats.user_id == user_id)
+    open_tasks = select(func.count()).select_from(Task).where(
+        Task.user_id == user_id,
+        Task.status.in_([TaskStatus.OPEN, TaskStatus.IN_PROGRESS]),
+    )
+    log_object = func.json_build_object(
+        literal_column("'mood_score'"), PatternLog.mood_score,
+        literal_column("'energy_level'"), PatternLog.energy_level,
+        literal_column("'focus_score'"), PatternLog.focus_score,
+    )
+    recent_logs = select(
+        func.json_agg(aggregate_order_by(log_object, PatternLog.created_at.asc()), type_=JSON)
+    ).where(
+        PatternLog.user_id == user_id,
+        PatternLog.created_at >= log_cutoff,
+    )
+
+    return PatternAnalyzer.windowed_trends_query(user_id, TREND_WINDOWS).add_columns(
+        tasks_completed.scalar_subquery().label("tasks_completed"),
+        current_streak.scalar_subquery().label("current_streak"),
+        open_tasks.scalar_subquery().label("open_tasks"),
+        recent_logs.scalar_subquery().label("recent_logs"),
+    )
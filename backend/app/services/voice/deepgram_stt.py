@@ -3,6 +3,7 @@ import logging
 
 import httpx
 
+from app.core.http_client import get_http_client
 from app.services.voice.stt_base import STTProvider
 
 
@@ -37,34 +38,35 @@ class DeepgramSTT(STTProvider):
         if not self.api_key:
             raise ValueError("Deepgram API key is required")
 
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            try:
-                response = await client.post(
-                    f"{self.base_url}/listen",
-                    headers={
-                        "Authorization": f"Token {self.api_key}",
-                        "Content-Type": mime_type,
-                    },
-                    params={
-                        "model": "nova-2",
-                        "language": "de",
-                        "smart_format": "true",
-                    },
-                    content=audio_data,
-                )
-                response.raise_for_status()
-                data = response.json()
+        client = get_http_client("deepgram")
+        try:
+            response = await client.post(
+                f"{self.base_url}/listen",
+                headers={
+                    "Authorization": f"Token {self.api_key}",
+                    "Content-Type": mime_type,
+                },
+                params={
+                    "model": "nova-2",
+                    "language": "de",
+                    "smart_format": "true",
+                },
+                content=audio_data,
+                timeout=30.0,
+            )
+            response.raise_for_status()
+            data = response.json()
 
-                # Extract transcript from response
-                transcript = data["results"]["channels"][0]["alternatives"][0]["transcript"]
-                return transcript.strip()
+            # Extract transcript from response
+            transcript = data["results"]["channels"][0]["alternatives"][0]["transcript"]
+            return transcript.strip()
 
-            except httpx.HTTPStatusError as e:
-                logger.error("Deepgram API HTTP error: %s - %s", e.response.status_code, e.response.text)
-                raise ValueError(f"Deepgram API error: {e.response.status_code}") from e
-            except (KeyError, IndexError) as e:
-                logger.error("Deepgram API response parsing error: %s", e)
-                raise ValueError("Unexpected Deepgram API response format") from e
-            except Exception as e:
-                logger.error("Deepgram API request failed: %s", e)
-                raise ValueError("Deepgram API request failed") from e
+        except httpx.HTTPStatusError as e:
+            logger.error("Deepgram API HTTP error: %s - %s", e.response.status_code, e.response.text)
+            raise ValueError(f"Deepgram API error: {e.response.status_code}") from e
+        except (KeyError, IndexError) as e:
+            logger.error("Deepgram API response parsing error: %s", e)
+            raise ValueError("Unexpected Deepgram API response format") from e
+        except Exception as e:
+            logger.error("Deepgram API request failed: %s", e)
+            raise ValueError("Deepgram API request failed") from e
@@ -3,6 +3,7 @@ import logging
 
 import httpx
 
+from app.core.http_client import get_http_client
 from app.services.voice.tts_base import TTSProvider
 
 
@@ -42,31 +43,32 @@ class ElevenLabsTTS(TTSProvider):
 
         voice = voice_id or self.DEFAULT_VOICE_ID
 
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            try:
-                response = await client.post(
-                    f"{self.base_url}/text-to-speech/{voice}",
-                    params={
-                        "output_format": "mp3_22050_32",
-                        "optimize_streaming_latency": "4",
-                    },
-                    headers={
-                        "xi-api-key": self.api_key,
-                        "Content-Type": "application/json",
-                    },
-                    json={
-                        "text": text,
-                        "model_id": "eleven_flash_v2_5",
-                    },
-                )
-                response.raise_for_status()
-
-                # Return raw audio bytes
-                return response.content
-
-            except httpx.HTTPStatusError as e:
-                logger.error("ElevenLabs API HTTP error: %s - %s", e.response.status_code, e.response.text)
-                raise ValueError(f"ElevenLabs API error: {e.response.status_code}") from e
-            except Exception as e:
-                logger.error("ElevenLabs API request failed: %s", e)
-                raise ValueError("ElevenLabs API request failed") from e
+        client = get_http_client("elevenlabs")
+        try:
+            response = await client.post(
+                f"{self.base_url}/text-to-speech/{voice}",
+                params={
+                    "output_format": "mp3_22050_32",
+                    "optimize_streaming_latency": "4",
+                },
+                headers={
+                    "xi-api-key": self.api_key,
+                    "Content-Type": "application/json",
+                },
+                json={
+                    "text": text,
+                    "model_id": "eleven_flash_v2_5",
+                },
+                timeout=30.0,
+            )
+            response.raise_for_status()
+
+            # Return raw audio bytes
+            return response.content
+
+        except httpx.HTTPStatusError as e:
+            logger.error("ElevenLabs API HTTP error: %s - %s", e.response.status_code, e.response.text)
+            raise ValueError(f"ElevenLabs API error: {e.response.status_code}") from e
+        except Exception as e:
+            logger.error("ElevenLabs API request failed: %s", e)
+            raise ValueError("ElevenLabs API request failed") from e
@@ -3,6 +3,7 @@ import logging
 
 import httpx
 
+from app.core.http_client import get_http_client
 from app.services.voice.tts_base import TTSProvider
 
 
@@ -36,31 +37,32 @@ class OpenAITTS(TTSProvider):
         if not self.api_key:
             raise ValueError("OpenAI API key is required")
 
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            try:
-                response = await client.post(
-                    f"{self.base_url}/audio/speech",
-                    headers={
-                        "Authorization": f"Bearer {self.api_key}",
-                        "Content-Type": "application/json",
-                    },
-                    json={
-                        "model": "tts-1",
-                        "input": text,
-                        "voice": voice,
-                    },
-                )
-                response.raise_for_status()
-
-                audio_data = response.content
-                if not audio_data:
-                    raise ValueError("OpenAI TTS returned empty audio data")
-
-                return audio_data
-
-            except httpx.HTTPStatusError as e:
-                logger.error("OpenAI TTS API error: %s - %s", e.response.status_code, e.response.text)
-                raise ValueError(f"OpenAI TTS API error: {e.response.status_code}") from e
-            except Exception as e:
-                logger.error("OpenAI TTS request failed: %s", e)
-                raise ValueError("OpenAI TTS request failed") from e
+        client = get_http_client("openai")
+        try:
+            response = await client.post(
+                f"{self.base_url}/audio/speech",
+                headers={
+                    "Authorization": f"Bearer {self.api_key}",
+                    "Content-Type": "application/json",
+                },
+                json={
+                    "model": "tts-1",
+                    "input": text,
+                    "voice": voice,
+                },
+                timeout=30.0,
+            )
+            response.raise_for_status()
+
+            audio_data = response.content
+            if not audio_data:
+                raise ValueError("OpenAI TTS returned empty audio data")
+
+            return audio_data
+
+        except httpx.HTTPStatusError as e:
+            logger.error("OpenAI TTS API error: %s - %s", e.response.status_code, e.response.text)
+            raise ValueError(f"OpenAI TTS API error: {e.response.status_code}") from e
+        except Exception as e:
+            logger.error("OpenAI TTS request failed: %s", e)
+            raise ValueError("OpenAI TTS request failed") from e
@@ -3,6 +3,7 @@ import logging
 
 import httpx
 
+from app.core.http_client import get_http_client
 from app.services.voice.stt_base import STTProvider
 
 
@@ -50,34 +51,35 @@ class WhisperSTT(STTProvider):
         }
         extension = extension_map.get(mime_type, "wav")
 
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            try:
-                files = {
-                    "file": (f"audio.{extension}", audio_data, mime_type),
-                    "model": (None, "whisper-1"),
-                    "language": (None, "de"),
-                }
-
-                response = await client.post(
-                    f"{self.base_url}/audio/transcriptions",
-                    headers={
-                        "Authorization": f"Bearer {self.api_key}",
-                    },
-                    files=files,
-                )
-                response.raise_for_status()
-                data = response.json()
-
-                # Extract transcript
-                transcript = data["text"]
-                return transcript.strip()
-
-            except httpx.HTTPStatusError as e:
-                logger.error("Whisper API HTTP error: %s - %s", e.response.status_code, e.response.text)
-                raise ValueError(f"Whisper API error: {e.response.status_code}") from e
-            except KeyError as e:
-                logger.error("Whisper API response parsing error: %s", e)
-                raise ValueError("Unexpected Whisper API response format") from e
-            except Exception as e:
-                logger.error("Whisper API request failed: %s", e)
-                raise ValueError("Whisper API request failed") from e
+        client = get_http_client("openai")
+        try:
+            files = {
+                "file": (f"audio.{extension}", audio_data, mime_type),
+                "model": (None, "whisper-1"),
+                "language": (None, "de"),
+            }
+
+            response = await client.post(
+                f"{self.base_url}/audio/transcriptions",
+                headers={
+                    "Authorization": f"Bearer {self.api_key}",
+                },
+                files=files,
+                timeout=30.0,
+            )
+            response.raise_for_status()
+            data = response.json()
+
+            # Extract transcript
+            transcript = data["text"]
+            return transcript.strip()
+
+        except httpx.HTTPStatusError as e:
+            logger.error("Whisper API HTTP error: %s - %s", e.response.status_code, e.response.text)
+            raise ValueError(f"Whisper API error: {e.response.status_code}") from e
+        except KeyError as e:
+            logger.error("Whisper API response parsing error: %s", e)
+            raise ValueError("Unexpected Whisper API response format") from e
+        except Exception as e:
+            logger.error("Whisper API request failed: %s", e)
+            raise ValueError("Whisper API request failed") from e
@@ -9,11 +9,11 @@ from datetime import datetime, timezone
 from typing import Any
 from uuid import UUID
 
-import httpx
 from sqlalchemy import select, func
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.encryption import encrypt_value, decrypt_value
+from app.core.http_client import get_http_client
 from app.models.webhook import WebhookConfig, WebhookLog
 
 logger = logging.getLogger(__name__)
@@ -136,15 +136,16 @@ class WebhookService:
 
             for attempt in range(1, MAX_RETRY_ATTEMPTS + 1):
                 try:
-                    async with httpx.AsyncClient(timeout=10.0) as client:
-                        response = await client.post(
-                            webhook.url,
-                            content=payload_bytes,
-                            headers={
-                                "Content-Type": "application/json",
-                                "X-Webhook-Signature": signature,
-                            },
-                        )
+                    client = get_http_client("webhooks")
+                    response = await client.post(
+                        webhook.url,
+                        content=payload_bytes,
+                        headers={
+                            "Content-Type": "application/json",
+                            "X-Webhook-Signature": signature,
+                        },
+                        timeout=10.0,
+                    )
 
                     log = WebhookLog(
                         webhook_id=webhook.id, direction="outgoing",
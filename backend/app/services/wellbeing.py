@@ -12,9 +12,9 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.intervention import Intervention
 from app.models.pattern_log import PatternLog
-from app.models.user_stats import UserStats
 from app.models.wellbeing_score import WellbeingScore
 from app.services.pattern_analyzer import PatternAnalyzer
+from app.services.user_features import UserFeatureSnapshot, build_feature_snapshot
 
 logger = logging.getLogger(__name__)
 
@@ -36,12 +36,18 @@ class WellbeingService:
         self.db = db
         self.pattern_analyzer = PatternAnalyzer(db)
 
-    async def calculate_and_store(self, user_id: str) -> dict[str, Any]:
-        """Calculate wellbeing score from recent data and persist it."""
-        trends = await self.pattern_analyzer.get_recent_trends(user_id, days=7)
-        stats = await self._get_user_stats(user_id)
-        score, components = self._compute_score(trends, stats)
-        zone = self._zone_for_score(score)
+    async def calculate_and_store(
+        self, user_id: str, snapshot: UserFeatureSnapshot | None = None
+    ) -> dict[str, Any]:
+        """Calculate wellbeing score from recent data and persist it.
+
+        Args:
+            user_id: User to score
+            snapshot: Features loaded for this user already (built if omitted)
+        """
+        if snapshot is None:
+            snapshot = await build_feature_snapshot(self.db, user_id)
+        score, zone, components = self.score(snapshot)
 
         wellbeing = WellbeingScore(
             user_id=user_id,
@@ -61,6 +67,15 @@ class WellbeingService:
             "calculated_at": wellbeing.created_at,
         }
 
+    def score(self, snapshot: UserFeatureSnapshot) -> tuple[float, str, dict[str, Any]]:
+        """Score a feature snapshot (pure, no DB access).
+
+        Returns:
+            tuple: (score 0-100, zone, normalized components)
+        """
+        score, components = self._compute_score(snapshot.trends_7d, snapshot.stats)
+        return score, self._zone_for_score(score), components
+
     def _compute_score(
         self, trends: dict[str, Any], stats: dict[str, Any]
     ) -> tuple[float, dict[str, Any]]:
@@ -191,11 +206,3 @@ class WellbeingService:
         result = await self.db.execute(stmt)
         await self.db.flush()
         return result.rowcount > 0
-
-    async def _get_user_stats(self, user_id: str) -> dict[str, Any]:
-        stmt = select(UserStats).where(UserStats.user_id == user_id)
-        result = await self.db.execute(stmt)
-        stats = result.scalar_one_or_none()
-        if not stats:
-            return {"tasks_completed": 0, "current_streak": 0}
-        return {"tasks_completed": stats.tasks_completed, "current_streak": stats.current_streak}
@@ -0,0 +1,103 @@
+"""Benchmark: chat stream latency during a login burst.
+
+Simulates SSE chat streams (one token every 20 ms) on the event loop while
+a burst of logins verifies bcrypt passwords, once inline on the event loop
+(the old behaviour) and once on the password hashing pool. Reports p50/p99
+of the delay between consecutive stream tokens.
+
+Usage:
+    cd backend && python scripts/bench_password_hashing.py [--logins 20] [--streams 10]
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.core.security import (  # noqa: E402
+    PasswordHashExecutor,
+    hash_password,
+    verify_password,
+)
+
+TOKEN_INTERVAL = 0.02  # 50 tokens/s per stream
+
+
+async def _stream(stop: asyncio.Event, gaps: list[float]) -> None:
+    """Emit tokens at a fixed rate and record the gap between them."""
+    last = time.perf_counter()
+    while not stop.is_set():
+        await asyncio.sleep(TOKEN_INTERVAL)
+        now = time.perf_counter()
+        gaps.append(now - last)
+        last = now
+
+
+async def _login_burst(mode: str, logins: int, hashed: str, executor: PasswordHashExecutor) -> None:
+    """Verify ``logins`` passwords concurrently, inline or on the pool."""
+
+    async def login() -> None:
+        if mode == "inline":
+            verify_password("correct horse battery", hashed)
+        else:
+            await executor.run(verify_password, "correct horse battery", hashed)
+
+    await asyncio.gather(*(login() for _ in range(logins)))
+
+
+async def run(mode: str, logins: int, streams: int, workers: int) -> dict:
+    """Run one scenario and return token gap percentiles in milliseconds."""
+    hashed = hash_password("correct horse battery")
+    executor = PasswordHashExecutor(max_workers=workers)
+    stop = asyncio.Event()
+    gaps: list[float] = []
+
+    stream_tasks = [asyncio.create_task(_stream(stop, gaps)) for _ in range(streams)]
+    await asyncio.sleep(0.2)  # warm up
+
+    started = time.perf_counter()
+    await _login_burst(mode, logins, hashed, executor)
+    burst_seconds = time.perf_counter() - started
+
+    await asyncio.sleep(0.2)
+    stop.set()
+    await asyncio.gather(*stream_tasks)
+    executor.shutdown()
+
+    ordered = sorted(gaps)
+    return {
+        "mode": mode,
+        "burst_s": burst_seconds,
+        "p50_ms": statistics.median(ordered) * 1000,
+        "p99_ms": ordered[int(len(ordered) * 0.99) - 1] * 1000,
+        "max_ms": ordered[-1] * 1000,
+    }
+
+
+def main() -> None:
+    """Run both scenarios and print a comparison."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--logins", type=int, default=20, help="logins in the burst")
+    parser.add_argument("--streams", type=int, default=10, help="concurrent chat streams")
+    parser.add_argument("--workers", type=int, default=2, help="password hashing threads")
+    args = parser.parse_args()
+
+    print(
+        f"{args.logins} logins, {args.streams} streams, "
+        f"{args.workers} hashing threads, token every {TOKEN_INTERVAL * 1000:.0f} ms"
+    )
+    print(f"{'mode':<10}{'burst':>10}{'p50 gap':>12}{'p99 gap':>12}{'max gap':>12}")
+    for mode in ("inline", "executor"):
+        r = asyncio.run(run(mode, args.logins, args.streams, args.workers))
+        print(
+            f"{r['mode']:<10}{r['burst_s']:>9.2f}s{r['p50_ms']:>10.1f}ms"
+            f"{r['p99_ms']:>10.1f}ms{r['max_ms']:>10.1f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
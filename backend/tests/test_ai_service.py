@@ -0,0 +1,369 @@
+"""Tests for AIService streaming and tool loop.
+
+These tests do NOT require a database -- all DB fixtures from conftest.py
+are overridden with no-op versions. The Anthropic API is replaced by an
+httpx.MockTransport that replays recorded SSE event sequences.
+"""
+
+import asyncio
+import json
+from collections.abc import Generator
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from app.core.exceptions import AIServiceUnavailableError
+from app.services.ai import VOICE_MODEL, AIService, system_prompt_text
+
+# ---------------------------------------------------------------------------
+# Override DB fixtures from conftest.py
+# ---------------------------------------------------------------------------
+
+
+@pytest.fixture(scope="session")
+def event_loop() -> Generator:
+    """Override session-scoped event loop for this test module."""
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+@pytest.fixture(autouse=True)
+def clean_tables():
+    """No-op override: AIService tests don't need database cleanup."""
+    yield
+
+
+@pytest.fixture(scope="session")
+def setup_db():
+    """No-op override: AIService tests don't need database setup."""
+    yield
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+
+def _sse(events: list[dict]) -> bytes:
+    """Encode a list of Anthropic stream events as an SSE body."""
+    return "".join(
+        f"event: {e['type']}\ndata: {json.dumps(e)}\n\n" for e in events
+    ).encode()
+
+
+def _text_turn(*chunks: str, stop_reason: str = "end_turn") -> list[dict]:
+    """Build the SSE events of a turn that only contains text."""
+    events = [
+        {"type": "message_start", "message": {"id": "msg_1", "content": []}},
+        {"type": "content_block_start", "index": 0, "content_block": {"type": "text", "text": ""}},
+    ]
+    events += [
+        {"type": "content_block_delta", "index": 0, "delta": {"type": "text_delta", "text": c}}
+        for c in chunks
+    ]
+    events += [
+        {"type": "content_block_stop", "index": 0},
+        {"type": "message_delta", "delta": {"stop_reason": stop_reason}},
+        {"type": "message_stop"},
+    ]
+    return events
+
+
+def _tool_turn(text: str, tool_name: str, tool_input: dict) -> list[dict]:
+    """Build the SSE events of a turn with a text block and one tool_use block."""
+    raw = json.dumps(tool_input)
+    return [
+        {"type": "message_start", "message": {"id": "msg_0", "content": []}},
+        {"type": "content_block_start", "index": 0, "content_block": {"type": "text", "text": ""}},
+        {"type": "content_block_delta", "index": 0, "delta": {"type": "text_delta", "text": text}},
+        {"type": "content_block_stop", "index": 0},
+        {
+            "type": "content_block_start",
+            "index": 1,
+            "content_block": {"type": "tool_use", "id": "toolu_1", "name": tool_name, "input": {}},
+        },
+        {
+            "type": "content_block_delta",
+            "index": 1,
+            "delta": {"type": "input_json_delta", "partial_json": raw[:5]},
+        },
+        {
+            "type": "content_block_delta",
+            "index": 1,
+            "delta": {"type": "input_json_delta", "partial_json": raw[5:]},
+        },
+        {"type": "content_block_stop", "index": 1},
+        {"type": "message_delta", "delta": {"stop_reason": "tool_use"}},
+        {"type": "message_stop"},
+    ]
+
+
+def _mock_anthropic(turns: list[bytes], requests: list[dict], status_code: int = 200):
+    """Patch the shared HTTP client so each POST replays the next recorded turn."""
+    responses = iter(turns)
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(json.loads(request.content))
+        return httpx.Response(status_code, content=next(responses))
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return patch("app.services.ai.get_http_client", return_value=client)
+
+
+async def _collect(gen) -> list[str]:
+    return [chunk async for chunk in gen]
+
+
+# ===========================================================================
+# Tests
+# ===========================================================================
+
+
+class TestStreamResponseWithTools:
+    """Tests for AIService.stream_response_with_tools."""
+
+    async def test_yields_text_deltas_in_order(self):
+        """Text deltas should be forwarded as they arrive."""
+        service = AIService()
+        service.api_key = "test-key"
+        requests: list[dict] = []
+
+        with _mock_anthropic([_sse(_text_turn("Hal", "lo ", "Welt"))], requests):
+            chunks = await _collect(service.stream_response_with_tools(
+                messages=[{"role": "user", "content": "Hi"}],
+                system_prompt="system",
+                tool_executor=AIService._noop_executor,
+            ))
+
+        assert chunks == ["Hal", "lo ", "Welt"]
+        assert requests[0]["stream"] is True
+
+    async def test_runs_tool_loop_between_streamed_turns(self):
+        """A tool_use turn should execute the tool and stream the next turn."""
+        service = AIService()
+        service.api_key = "test-key"
+        requests: list[dict] = []
+        executed: list[tuple[str, dict]] = []
+
+        async def executor(name: str, tool_input: dict) -> str:
+            executed.append((name, tool_input))
+            return json.dumps({"total": 0, "tasks": []})
+
+        turns = [
+            _sse(_tool_turn("Moment!", "list_tasks", {"status": "open"})),
+            _sse(_text_turn("Keine offenen Aufgaben.")),
+        ]
+        with _mock_anthropic(turns, requests):
+            chunks = await _collect(service.stream_response_with_tools(
+                messages=[{"role": "user", "content": "Was steht an?"}],
+                system_prompt="system",
+                tool_executor=executor,
+            ))
+
+        assert "".join(chunks) == "Moment! Keine offenen Aufgaben."
+        assert executed == [("list_tasks", {"status": "open"})]
+
+        # Second request carries the assistant tool_use turn and the tool result
+        follow_up = requests[1]["messages"]
+        assert follow_up[-2]["role"] == "assistant"
+        tool_use = [b for b in follow_up[-2]["content"] if b["type"] == "tool_use"][0]
+        assert tool_use["input"] == {"status": "open"}
+        assert "_partial_json" not in tool_use
+        assert follow_up[-1]["content"][0]["tool_use_id"] == "toolu_1"
+
+    async def test_sends_cache_breakpoints(self):
+        """Tools and structured system blocks should carry cache_control breakpoints."""
+        service = AIService()
+        service.api_key = "test-key"
+        requests: list[dict] = []
+        system = [
+            {"type": "text", "text": "static", "cache_control": {"type": "ephemeral"}},
+            {"type": "text", "text": "dynamic"},
+        ]
+
+        with _mock_anthropic([_sse(_text_turn("Hi"))], requests):
+            await _collect(service.stream_response_with_tools(
+                messages=[{"role": "user", "content": "Hi"}],
+                system_prompt=system,
+                tool_executor=AIService._noop_executor,
+            ))
+
+        body = requests[0]
+        assert body["system"] == system
+        assert body["tools"][-1]["cache_control"] == {"type": "ephemeral"}
+        assert all("cache_control" not in t for t in body["tools"][:-1])
+
+    async def test_api_error_raises(self):
+        """Non-200 responses should raise AIServiceUnavailableError."""
+        service = AIService()
+        service.api_key = "test-key"
+
+        with _mock_anthropic([b'{"error": "overloaded"}'], [], status_code=529):
+            with pytest.raises(AIServiceUnavailableError):
+                await _collect(service.stream_response_with_tools(
+                    messages=[{"role": "user", "content": "Hi"}],
+                    system_prompt="system",
+                    tool_executor=AIService._noop_executor,
+                ))
+
+    async def test_mock_mode_without_api_key(self):
+        """Without an API key a single mock chunk should be yielded."""
+        service = AIService()
+        service.api_key = ""
+
+        chunks = await _collect(service.stream_response_with_tools(
+            messages=[{"role": "user", "content": "Hi"}],
+            system_prompt="system",
+            tool_executor=AIService._noop_executor,
+        ))
+
+        assert len(chunks) == 1
+        assert "Mock-Modus" in chunks[0]
+
+
+class TestExecuteToolCalls:
+    """Tests for AIService._execute_tool_calls."""
+
+    @staticmethod
+    def _tool_use(tool_id: str, name: str) -> dict:
+        return {"type": "tool_use", "id": tool_id, "name": name, "input": {}}
+
+    async def test_read_only_tools_run_concurrently(self):
+        """Independent read-only tools should overlap instead of running in sequence."""
+        running = 0
+        max_running = 0
+
+        async def executor(name: str, tool_input: dict) -> str:
+            nonlocal running, max_running
+            running += 1
+            max_running = max(max_running, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            return json.dumps({"tool": name})
+
+        blocks = [
+            self._tool_use("t1", "list_tasks"),
+            self._tool_use("t2", "get_stats"),
+            self._tool_use("t3", "search_brain"),
+        ]
+        results = await AIService._execute_tool_calls(blocks, executor)
+
+        assert max_running == 3
+        assert [r["tool_use_id"] for r in results] == ["t1", "t2", "t3"]
+
+    async def test_write_tools_are_serialized_and_results_keep_order(self):
+        """Write tools run one at a time; results follow the tool_use order."""
+        write_order: list[str] = []
+        writing = False
+
+        async def executor(name: str, tool_input: dict) -> str:
+            nonlocal writing
+            if name == "create_task":
+                assert not writing
+                writing = True
+                await asyncio.sleep(0.01)
+                write_order.append(tool_input.get("title", ""))
+                writing = False
+            return json.dumps({"tool": name})
+
+        blocks = [
+            {"type": "text", "text": "Moment!"},
+            {**self._tool_use("t1", "create_task"), "input": {"title": "A"}},
+            self._tool_use("t2", "list_tasks"),
+            {**self._tool_use("t3", "create_task"), "input": {"title": "B"}},
+        ]
+        results = await AIService._execute_tool_calls(blocks, executor)
+
+        assert write_order == ["A", "B"]
+        assert [r["tool_use_id"] for r in results] == ["t1", "t2", "t3"]
+
+    async def test_read_after_write_sees_the_write(self):
+        """A read requested after a write starts only once the write is done."""
+        tasks: list[str] = []
+
+        async def executor(name: str, tool_input: dict) -> str:
+            if name == "create_task":
+                await asyncio.sleep(0.01)
+                tasks.append(tool_input["title"])
+            return json.dumps({"tool": name, "tasks": list(tasks)})
+
+        blocks = [
+            self._tool_use("t1", "list_tasks"),
+            {**self._tool_use("t2", "create_task"), "input": {"title": "A"}},
+            self._tool_use("t3", "list_tasks"),
+            self._tool_use("t4", "get_stats"),
+        ]
+        results = await AIService._execute_tool_calls(blocks, executor)
+
+        assert [json.loads(r["content"])["tasks"] for r in results] == [[], ["A"], ["A"], ["A"]]
+
+    async def test_failing_tool_returns_error_result(self):
+        """A failing tool should produce an is_error tool_result, not abort the turn."""
+
+        async def executor(name: str, tool_input: dict) -> str:
+            if name == "get_stats":
+                raise RuntimeError("boom")
+            return "{}"
+
+        blocks = [self._tool_use("t1", "get_stats"), self._tool_use("t2", "list_tasks")]
+        results = await AIService._execute_tool_calls(blocks, executor)
+
+        assert results[0]["is_error"] is True
+        assert "boom" in results[0]["content"]
+        assert "is_error" not in results[1]
+
+
+class TestSummarizeConversation:
+    """Tests for AIService.summarize_conversation."""
+
+    async def test_returns_summary_from_haiku(self):
+        """The previous summary and new turns are sent to Haiku; its text is returned."""
+        service = AIService()
+        service.api_key = "test-key"
+        requests: list[dict] = []
+        body = json.dumps({
+            "content": [{"type": "text", "text": "User plant Umzug am Samstag."}],
+            "usage": {"input_tokens": 120, "output_tokens": 12},
+        }).encode()
+
+        with _mock_anthropic([body], requests):
+            summary = await service.summarize_conversation(
+                "User heisst Anna.", "User: Ich ziehe Samstag um.\nALICE: Viel Erfolg!"
+            )
+
+        assert summary == "User plant Umzug am Samstag."
+        assert requests[0]["model"] == VOICE_MODEL
+        prompt = requests[0]["messages"][0]["content"]
+        assert "User heisst Anna." in prompt
+        assert "Ich ziehe Samstag um." in prompt
+
+    async def test_api_error_returns_none(self):
+        """A failing API call leaves the summary unchanged (None)."""
+        service = AIService()
+        service.api_key = "test-key"
+
+        with _mock_anthropic([b'{"error": "overloaded"}'], [], status_code=529):
+            assert await service.summarize_conversation(None, "User: Hallo") is None
+
+    async def test_mock_mode_returns_none(self):
+        """Without an API key no summary is produced."""
+        service = AIService()
+        service.api_key = ""
+
+        assert await service.summarize_conversation(None, "User: Hallo") is None
+
+
+class TestSystemPromptText:
+    """Tests for system_prompt_text."""
+
+    def test_plain_string_is_unchanged(self):
+        assert system_prompt_text("Du bist ALICE.") == "Du bist ALICE."
+
+    def test_blocks_are_joined(self):
+        blocks = [
+            {"type": "text", "text": "static", "cache_control": {"type": "ephemeral"}},
+            {"type": "text", "text": "dynamic"},
+        ]
+        assert system_prompt_text(blocks) == "static\n\ndynamic"
@@ -0,0 +1,269 @@
+"""Tests for the Second Brain full-text and hybrid search.
+
+These tests do NOT require a database -- all DB fixtures from conftest.py
+are overridden with no-op versions and the SQL is checked by compiling it.
+"""
+
+import asyncio
+import json
+from collections.abc import Generator
+from datetime import UTC, datetime
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import httpx
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.models.brain_entry import BrainEntry
+from app.services import brain
+from app.services.brain import HEADLINE_DELIMITER, HNSW_EF_SEARCH, BrainService
+from app.services.chat import TOOL_SEARCH_TOP_K, ChatService
+from app.services.embeddings import HashingEmbedder
+
+# ---------------------------------------------------------------------------
+# Override DB fixtures from conftest.py
+# ---------------------------------------------------------------------------
+
+
+@pytest.fixture(scope="session")
+def event_loop() -> Generator:
+    """Override session-scoped event loop for this test module."""
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+@pytest.fixture(autouse=True)
+def clean_tables():
+    """No-op override: brain search tests don't need database cleanup."""
+    yield
+
+
+@pytest.fixture(scope="session")
+def setup_db():
+    """No-op override: brain search tests don't need database setup."""
+    yield
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+
+def _entry(title: str, content: str, tags: list[str] | None = None) -> BrainEntry:
+    now = datetime.now(UTC)
+    return BrainEntry(
+        id=uuid4(),
+        user_id=uuid4(),
+        title=title,
+        content=content,
+        entry_type="manual",
+        tags=tags or [],
+        metadata_={},
+        embedding_status="completed",
+        created_at=now,
+        updated_at=now,
+    )
+
+
+def _db(rows: list[tuple]) -> AsyncMock:
+    result = MagicMock()
+    result.all.return_value = rows
+    db = AsyncMock()
+    db.execute = AsyncMock(return_value=result)
+    return db
+
+
+def _sql(db: AsyncMock) -> str:
+    stmt = db.execute.await_args.args[0]
+    return str(stmt.compile(
+        dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True},
+    ))
+
+
+# ---------------------------------------------------------------------------
+# Tests
+# ---------------------------------------------------------------------------
+
+
+class TestSearchRanked:
+    """Tests for BrainService.search_ranked."""
+
+    @pytest.mark.asyncio
+    async def test_uses_german_tsquery_and_rank(self):
+        """The query is matched and ranked against the generated tsvector."""
+        db = _db([])
+
+        await BrainService(db).search_ranked(uuid4(), "Arzttermine verschieben")
+
+        sql = _sql(db)
+        assert "websearch_to_tsquery('german'::regconfig, 'Arzttermine verschieben')" in sql
+        assert "brain_entries.search_vector @@" in sql
+        assert "ts_rank_cd(" in sql
+        assert "ILIKE" not in sql.upper()
+        assert "ts_headline" not in sql
+
+    @pytest.mark.asyncio
+    async def test_tag_filter_uses_containment(self):
+        """Tag filters require all given tags."""
+        db = _db([])
+
+        await BrainService(db).search_ranked(
+            uuid4(), "Fokus", tags=["alice:observation", "alice:obs:focus"],
+        )
+
+        assert "brain_entries.tags @> ARRAY['alice:observation', 'alice:obs:focus']" in _sql(db)
+
+    @pytest.mark.asyncio
+    async def test_scores_relative_to_best_match(self):
+        """Scores are normalized so the best match scores 1.0."""
+        a, b = _entry("A", "x"), _entry("B", "y")
+        db = _db([(a, 0.8), (b, 0.2)])
+
+        ranked = await BrainService(db).search_ranked(uuid4(), "x")
+
+        assert [(e, s) for e, s, _ in ranked] == [(a, 1.0), (b, 0.25)]
+
+    @pytest.mark.asyncio
+    async def test_headlines_split_into_chunks(self):
+        """ts_headline fragments become separate matched chunks."""
+        entry = _entry("Notiz", "...")
+        headline = f"der **Termin** am Montag{HEADLINE_DELIMITER} neuer **Termin** "
+        db = _db([(entry, 0.5, headline)])
+
+        ranked = await BrainService(db).search_ranked(uuid4(), "Termin", headlines=True)
+
+        assert "ts_headline('german'::regconfig" in _sql(db)
+        assert ranked[0][2] == ["der **Termin** am Montag", "neuer **Termin**"]
+
+
+class TestSearch:
+    """Tests for BrainService.search."""
+
+    @pytest.mark.asyncio
+    async def test_min_score_filters_weak_matches(self):
+        """Matches below min_score (relative to the best) are dropped."""
+        strong, weak = _entry("Python", "Python Tipps"), _entry("Notiz", "python")
+        db = _db([(strong, 0.9, "**Python** Tipps"), (weak, 0.3, "**python**")])
+
+        results = await BrainService(db).search(uuid4(), "python", min_score=0.5)
+
+        assert [r.entry.title for r in results] == ["Python"]
+        assert results[0].score == 1.0
+        assert results[0].matched_chunks == ["**Python** Tipps"]
+
+    @pytest.mark.asyncio
+    async def test_semantic_scores_relative_to_best_match(self):
+        """Raw cosine similarities are rescaled so min_score works as in the other modes."""
+        close, far = _entry("Arzt", "Arzttermin"), _entry("Einkauf", "Milch")
+        # (entry, chunk, cosine distance): similarities 0.6 and 0.25
+        db = _db([(close, "Arzttermin am Montag", 0.4), (far, "Milch kaufen", 0.75)])
+
+        with patch.object(brain, "get_embedder", return_value=HashingEmbedder()):
+            results = await BrainService(db).search(uuid4(), "Termin", mode="semantic", min_score=0.5)
+
+        assert [(r.entry.title, r.score) for r in results] == [("Arzt", 1.0)]
+        assert results[0].matched_chunks == ["Arzttermin am Montag"]
+
+
+class TestSearchHybrid:
+    """Tests for BrainService.search_hybrid."""
+
+    @pytest.mark.asyncio
+    async def test_fuses_both_candidate_lists_in_one_statement(self):
+        """Full-text and vector candidates are fused by RRF in a single query."""
+        db = _db([])
+
+        with patch.object(brain, "get_embedder", return_value=HashingEmbedder()):
+            await BrainService(db).search_hybrid(uuid4(), "Steuer", limit=5, tags=["alice:observation"])
+
+        scan_settings, search = (call.args[0] for call in db.execute.await_args_list)
+        settings_sql = str(scan_settings.compile(
+            dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True},
+        ))
+        assert "set_config('hnsw.iterative_scan', 'relaxed_order', true)" in settings_sql
+        assert f"set_config('hnsw.ef_search', '{HNSW_EF_SEARCH}', true)" in settings_sql
+        sql = _sql(db)
+        assert "WITH lexical AS" in sql and "nearest AS" in sql and "semantic AS" in sql
+        assert "brain_embeddings.embedding <=>" in sql
+        assert "lexical FULL OUTER JOIN semantic" in sql
+        # Tag filter applies to both candidate generators
+        assert sql.count("brain_entries.tags @> ARRAY['alice:observation']") == 2
+
+    @pytest.mark.asyncio
+    async def test_snippets_prefer_headline_then_chunk(self):
+        """Full-text hits get headlines, vector-only hits their closest chunk."""
+        lexical, vector_only = _entry("A", "a"), _entry("B", "b")
+        db = _db([
+            (lexical, 0.032, "nächster Arzttermin", "der **Arzttermin** am Montag"),
+            (vector_only, 0.016, "Praxis anrufen", None),
+        ])
+
+        with patch.object(brain, "get_embedder", return_value=HashingEmbedder()):
+            ranked = await BrainService(db).search_hybrid(uuid4(), "Arzttermin", headlines=True)
+
+        assert ranked == [
+            (lexical, 1.0, ["der **Arzttermin** am Montag"]),
+            (vector_only, 0.5, ["Praxis anrufen"]),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_falls_back_to_fulltext_without_embedder(self):
+        """Without an embedder only the full-text ranking is used."""
+        db = _db([])
+
+        with patch.object(brain, "get_embedder", return_value=None):
+            await BrainService(db).search_hybrid(uuid4(), "Steuer")
+
+        assert "brain_embeddings" not in _sql(db)
+
+    @pytest.mark.asyncio
+    async def test_falls_back_to_fulltext_when_embedding_fails(self):
+        """An embedding API error degrades to full-text search instead of failing."""
+        entry = _entry("Steuer", "Steuererklärung abgeben")
+        db = _db([(entry, 0.4, "**Steuer**erklärung")])
+        embedder = MagicMock()
+        embedder.embed = AsyncMock(side_effect=httpx.ReadTimeout("timeout"))
+
+        with patch.object(brain, "get_embedder", return_value=embedder):
+            ranked = await BrainService(db).search_hybrid(uuid4(), "Steuer", headlines=True)
+
+        assert ranked == [(entry, 1.0, ["**Steuer**erklärung"])]
+        assert "brain_embeddings" not in _sql(db)
+
+
+class TestChatSearchTools:
+    """Tests for the chat tools built on the hybrid search."""
+
+    @pytest.mark.asyncio
+    async def test_search_observations_filters_category_tag(self):
+        """The observation tool restricts to observation + category tags."""
+        entry = _entry("Beobachtung", "Schiebt Anrufe auf", ["alice:observation", "alice:obs:procrastination"])
+        db = _db([(entry, 0.4, None, "Schiebt **Anrufe** auf")])
+        service = ChatService.__new__(ChatService)
+        service.db = db
+
+        with patch.object(brain, "get_embedder", return_value=HashingEmbedder()):
+            output = json.loads(await service._tool_search_observations(
+                uuid4(), {"query": "Anrufe", "category": "procrastination"},
+            ))
+
+        assert "ARRAY['alice:observation', 'alice:obs:procrastination']" in _sql(db)
+        assert f"LIMIT {TOOL_SEARCH_TOP_K}" in _sql(db)
+        assert output["total"] == 1
+        assert output["observations"][0]["category"] == "procrastination"
+        assert output["observations"][0]["observation"] == "Schiebt **Anrufe** auf"
+
+    @pytest.mark.asyncio
+    async def test_search_brain_returns_compact_excerpts(self):
+        """Long entries are reduced to their matched snippets."""
+        entry = _entry("Notiz", "Einleitung " * 100 + "Steuer")
+        db = _db([(entry, 0.03, None, "bis Juli die **Steuer**")])
+        service = ChatService.__new__(ChatService)
+        service.db = db
+
+        with patch.object(brain, "get_embedder", return_value=HashingEmbedder()):
+            output = json.loads(await service._tool_search_brain(uuid4(), {"query": "Steuer"}))
+
+        assert output["entries"][0]["content"] == "bis Juli die **Steuer**"
@@ -330,3 +330,130 @@ class TestGetMessages:
         )
 
         assert response.status_code == 403  # HTTPBearer returns 403
+
+
+class TestGetRecentMessages:
+    """Tests for ChatService.get_recent_messages (LLM context window)."""
+
+    async def _create_conversation(self, test_db: AsyncSession, user_id: str, contents: list[str]):
+        chat_service = ChatService(test_db)
+        conv = await chat_service.create_conversation(user_id=user_id, title="Kontext")
+        await test_db.commit()
+        for i, content in enumerate(contents):
+            await chat_service.save_message(
+                conversation_id=conv.id,
+                role=MessageRole.USER if i % 2 == 0 else MessageRole.ASSISTANT,
+                content=content,
+            )
+            # Separate transactions so created_at differs per message
+            await test_db.commit()
+        return chat_service, conv
+
+    async def test_returns_newest_messages_within_budget(
+        self,
+        test_user: tuple[dict, str, str],
+        test_db: AsyncSession,
+    ):
+        """Only the newest messages that fit the budget are returned, oldest first."""
+        user_dict, _, _ = test_user
+        contents = [f"Nachricht {i} " + "x" * 400 for i in range(6)]
+        chat_service, conv = await self._create_conversation(test_db, user_dict["id"], contents)
+
+        messages = await chat_service.get_recent_messages(
+            conversation_id=conv.id,
+            user_id=user_dict["id"],
+            token_budget=250,
+        )
+
+        assert [m.content for m in messages] == contents[-2:]
+
+    async def test_newest_message_is_always_included(
+        self,
+        test_user: tuple[dict, str, str],
+        test_db: AsyncSession,
+    ):
+        """A single message larger than the budget is still returned."""
+        user_dict, _, _ = test_user
+        contents = ["Hallo", "x" * 4000]
+        chat_service, conv = await self._create_conversation(test_db, user_dict["id"], contents)
+
+        messages = await chat_service.get_recent_messages(
+            conversation_id=conv.id,
+            user_id=user_dict["id"],
+            token_budget=10,
+        )
+
+        assert [m.content for m in messages] == contents[-1:]
+
+    def test_to_api_messages_drops_leading_assistant_turns(self):
+        """The API window must start with a user message."""
+        from app.models.message import Message
+
+        messages = [
+            Message(role=MessageRole.ASSISTANT, content="Hi!"),
+            Message(role=MessageRole.USER, content="Was steht an?"),
+            Message(role=MessageRole.ASSISTANT, content="Nichts."),
+        ]
+
+        assert ChatService._to_api_messages(messages) == [
+            {"role": "user", "content": "Was steht an?"},
+            {"role": "assistant", "content": "Nichts."},
+        ]
+
+
+class TestPrepareContext:
+    """Tests for ChatService._prepare_context (token-budgeted context)."""
+
+    async def test_older_turns_are_replaced_by_summary(
+        self,
+        test_user: tuple[dict, str, str],
+        test_db: AsyncSession,
+    ):
+        """Turns outside the budget are dropped; the stored summary is added to the prompt."""
+        from unittest.mock import AsyncMock, patch
+
+        from app.services import chat as chat_module
+
+        user_dict, _, _ = test_user
+        contents = [f"Nachricht {i} " + "x" * 400 for i in range(6)]
+        chat_service, conv = await TestGetRecentMessages()._create_conversation(
+            test_db, user_dict["id"], contents
+        )
+        conv.summary = "User plant einen Umzug."
+        await test_db.commit()
+
+        with patch.dict(chat_module.MODEL_CONTEXT_BUDGETS, {"test-model": 0}), \
+                patch.object(chat_module, "MIN_HISTORY_TOKEN_BUDGET", 250), \
+                patch.object(ChatService, "_update_summary_background", new_callable=AsyncMock) as update:
+            messages, system_prompt = await chat_service._prepare_context(
+                conv.id, user_dict["id"], "Du bist ALICE.", "test-model"
+            )
+
+        assert [m.content for m in messages] == contents[-2:]
+        assert system_prompt.startswith("Du bist ALICE.")
+        assert "User plant einen Umzug." in system_prompt
+        update.assert_called_once_with(conv.id, messages[0].created_at)
+        # The running update is referenced until it finishes
+        assert len(chat_module._summary_tasks) == 1
+
+    async def test_no_summary_update_when_everything_fits(
+        self,
+        test_user: tuple[dict, str, str],
+        test_db: AsyncSession,
+    ):
+        """Short conversations are sent completely without scheduling a summary."""
+        from unittest.mock import AsyncMock, patch
+
+        user_dict, _, _ = test_user
+        chat_service, conv = await TestGetRecentMessages()._create_conversation(
+            test_db, user_dict["id"], ["Hallo", "Hi!"]
+        )
+
+        with patch.object(ChatService, "_update_summary_background", new_callable=AsyncMock) as update:
+            messages, system_prompt = await chat_service._prepare_context(
+                conv.id, user_dict["id"], [{"type": "text", "text": "static"}], "claude-sonnet-4-5-20250929"
+            )
+
+        assert [m.content for m in messages] == ["Hallo", "Hi!"]
+        assert system_prompt == [{"type": "text", "text": "static"}]
+        update.assert_not_called()
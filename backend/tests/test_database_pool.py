@@ -0,0 +1,84 @@
+"""Tests for database connection pool checkout metrics.
+
+These tests do NOT require a database -- all DB fixtures from conftest.py
+are overridden with no-op versions.
+"""
+
+import asyncio
+from collections.abc import Generator
+from unittest.mock import patch
+
+import pytest
+
+from app.core.database import PoolMetrics
+
+# ---------------------------------------------------------------------------
+# Override DB fixtures from conftest.py
+# ---------------------------------------------------------------------------
+
+
+@pytest.fixture(scope="session")
+def event_loop() -> Generator:
+    """Override session-scoped event loop for this test module."""
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+@pytest.fixture(autouse=True)
+def clean_tables():
+    """No-op override: pool metric tests don't need database cleanup."""
+    yield
+
+
+@pytest.fixture(scope="session")
+def setup_db():
+    """No-op override: pool metric tests don't need database setup."""
+    yield
+
+
+class _Record:
+    """Minimal stand-in for SQLAlchemy's _ConnectionRecord."""
+
+    def __init__(self):
+        self.info: dict = {}
+
+
+class TestPoolMetrics:
+    """Tests for PoolMetrics."""
+
+    def test_tracks_hold_time(self):
+        """Checkout/checkin pairs should update counters and hold times."""
+        metrics = PoolMetrics(slow_hold_seconds=5.0)
+        record = _Record()
+
+        with patch("app.core.database.time.monotonic", side_effect=[10.0, 10.25]):
+            metrics.on_checkout(None, record, None)
+            assert metrics.snapshot()["checked_out"] == 1
+            metrics.on_checkin(None, record)
+
+        snapshot = metrics.snapshot()
+        assert snapshot["checkouts"] == 1
+        assert snapshot["checked_out"] == 0
+        assert snapshot["avg_hold_ms"] == 250.0
+        assert snapshot["max_hold_ms"] == 250.0
+        assert snapshot["slow_checkouts"] == 0
+
+    def test_counts_slow_checkouts(self):
+        """Connections held past the threshold should be counted as slow."""
+        metrics = PoolMetrics(slow_hold_seconds=1.0)
+        record = _Record()
+
+        with patch("app.core.database.time.monotonic", side_effect=[0.0, 3.0]):
+            metrics.on_checkout(None, record, None)
+            metrics.on_checkin(None, record)
+
+        assert metrics.snapshot()["slow_checkouts"] == 1
+
+    def test_checkin_without_checkout_is_ignored(self):
+        """A checkin for a connection checked out before listeners existed is skipped."""
+        metrics = PoolMetrics(slow_hold_seconds=1.0)
+        metrics.on_checkin(None, _Record())
+
+        assert metrics.snapshot()["checkouts"] == 0
+        assert metrics.snapshot()["checked_out"] == 0
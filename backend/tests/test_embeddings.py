@@ -0,0 +1,277 @@
+"""Tests for brain embeddings: chunking, embedders, worker and vector search.
+
+These tests do NOT require a database -- all DB fixtures from conftest.py
+are overridden with no-op versions and sessions are mocked.
+"""
+
+import asyncio
+import math
+from collections.abc import Generator
+from contextlib import asynccontextmanager
+from datetime import UTC, datetime
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.models.brain_entry import BrainEntry, EmbeddingStatus
+from app.schemas.brain import BrainEntryUpdate
+from app.services import embedding_worker
+from app.services.brain import HNSW_EF_SEARCH, BrainService
+from app.services.embedding_worker import ClaimedEntry, EmbeddingWorkerMetrics, embed_entries
+from app.services.embeddings import EMBEDDING_DIMENSIONS, HashingEmbedder, chunk_text
+
+# ---------------------------------------------------------------------------
+# Override DB fixtures from conftest.py
+# ---------------------------------------------------------------------------
+
+
+@pytest.fixture(scope="session")
+def event_loop() -> Generator:
+    """Override session-scoped event loop for this test module."""
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+@pytest.fixture(autouse=True)
+def clean_tables():
+    """No-op override: embedding tests don't need database cleanup."""
+    yield
+
+
+@pytest.fixture(scope="session")
+def setup_db():
+    """No-op override: embedding tests don't need database setup."""
+    yield
+
+
+@pytest.fixture(autouse=True)
+def fresh_metrics():
+    """Give each test its own worker counters."""
+    with patch.object(embedding_worker, "worker_metrics", EmbeddingWorkerMetrics()) as metrics:
+        yield metrics
+
+
+def _claimed(content: str = "Inhalt") -> ClaimedEntry:
+    return ClaimedEntry(
+        id=uuid4(),
+        user_id=uuid4(),
+        title="Titel",
+        content=content,
+        claimed_at=datetime.now(UTC),
+    )
+
+
+def _mock_session(db: AsyncMock):
+    @asynccontextmanager
+    async def session():
+        yield db
+
+    return session
+
+
+def _sql(stmt) -> str:
+    return str(stmt.compile(dialect=postgresql.dialect()))
+
+
+# ===========================================================================
+# Chunking and embedders
+# ===========================================================================
+
+
+class TestChunkText:
+    """Tests for chunk_text."""
+
+    def test_short_text_is_one_chunk(self):
+        """Text below the limit is not split."""
+        assert chunk_text("Kurzer Absatz.\n\nNoch einer.") == ["Kurzer Absatz.\n\nNoch einer."]
+
+    def test_blank_text_has_no_chunks(self):
+        """Whitespace-only text yields no chunks."""
+        assert chunk_text("  \n\n ") == []
+
+    def test_long_text_is_split_with_overlap(self):
+        """Paragraphs are packed up to the limit and chunks overlap."""
+        paragraphs = [f"Absatz {i} " + "wort " * 30 for i in range(10)]
+
+        chunks = chunk_text("\n\n".join(paragraphs), max_chars=400, overlap_chars=50)
+
+        assert len(chunks) > 1
+        assert all(len(chunk) <= 400 + 50 + 2 for chunk in chunks)
+        # Every paragraph ends up in some chunk
+        assert all(any(p.strip() in chunk for chunk in chunks) for p in paragraphs)
+        # The next chunk starts with the tail of the previous one
+        assert chunks[0].endswith(chunks[1].split("\n\n")[0])
+
+    def test_overlong_sentence_is_cut(self):
+        """A single sentence longer than the limit is cut hard."""
+        chunks = chunk_text("x" * 1000, max_chars=300, overlap_chars=0)
+
+        assert [len(chunk) for chunk in chunks] == [300, 300, 300, 100]
+
+
+class TestHashingEmbedder:
+    """Tests for the deterministic local embedder."""
+
+    @pytest.mark.asyncio
+    async def test_deterministic_and_normalized(self):
+        """Same text gives the same unit vector of the column's size."""
+        embedder = HashingEmbedder()
+
+        first, second = await embedder.embed(["Arzttermin am Montag", "Arzttermin am Montag"])
+
+        assert first == second
+        assert len(first) == EMBEDDING_DIMENSIONS
+        assert math.isclose(sum(v * v for v in first), 1.0)
+
+    @pytest.mark.asyncio
+    async def test_word_weighs_double_its_trigrams(self):
+        """"ab" hashes to the word (weight 2) and the trigrams "#ab", "ab#" (weight 1)."""
+        (vector,) = await HashingEmbedder().embed(["ab"])
+
+        weights = sorted(abs(v) for v in vector if v)
+        assert weights == pytest.approx([1 / math.sqrt(6), 1 / math.sqrt(6), 2 / math.sqrt(6)])
+
+    @pytest.mark.asyncio
+    async def test_shared_vocabulary_is_closer(self):
+        """Texts sharing words are more similar than unrelated texts."""
+        query, related, unrelated = await HashingEmbedder().embed([
+            "Steuererklärung abgeben",
+            "Die Steuererklärung muss bis Juli abgegeben werden",
+            "Rezept für Pfannkuchen mit Apfelmus",
+        ])
+
+        def cosine(a, b):
+            return sum(x * y for x, y in zip(a, b, strict=True))
+
+        assert cosine(query, related) > cosine(query, unrelated)
+
+
+# ===========================================================================
+# Worker
+# ===========================================================================
+
+
+class TestEmbedEntries:
+    """Tests for storing a claimed batch."""
+
+    @pytest.mark.asyncio
+    async def test_stores_vectors_for_entries_still_claimed(self, fresh_metrics):
+        """Only entries whose claim is unchanged get their vectors replaced."""
+        kept, edited = _claimed("Erster Eintrag"), _claimed("Zweiter Eintrag")
+        finished = MagicMock()
+        finished.scalars.return_value.all.return_value = [kept.id]
+        db = AsyncMock()
+        db.execute = AsyncMock(side_effect=[finished, MagicMock(), MagicMock()])
+
+        with patch.object(embedding_worker, "get_async_session", _mock_session(db)):
+            stored = await embed_entries(HashingEmbedder(), [kept, edited])
+
+        assert stored == 1
+        finish_sql, delete_sql, insert_sql = (_sql(c.args[0]) for c in db.execute.await_args_list)
+        assert "embedding_status=%(embedding_status)s" in finish_sql
+        assert "embedding_claimed_at = %(embedding_claimed_at_1)s" in finish_sql
+        assert delete_sql.startswith("DELETE FROM brain_embeddings")
+        assert insert_sql.startswith("INSERT INTO brain_embeddings")
+        rows = db.execute.await_args_list[2].args[1]
+        assert [row["entry_id"] for row in rows] == [kept.id]
+        assert rows[0]["chunk_text"] == "Titel\n\nErster Eintrag"
+        assert len(rows[0]["embedding"]) == EMBEDDING_DIMENSIONS
+        assert fresh_metrics.embedded == 1
+
+    @pytest.mark.asyncio
+    async def test_batches_embedder_calls(self):
+        """All chunks of a claim are embedded in batches of the configured size."""
+        embedder = HashingEmbedder()
+        embedder.embed = AsyncMock(side_effect=lambda texts: [[0.0] * EMBEDDING_DIMENSIONS] * len(texts))
+        finished = MagicMock()
+        finished.scalars.return_value.all.return_value = []
+        db = AsyncMock()
+        db.execute = AsyncMock(return_value=finished)
+
+        with patch.object(embedding_worker, "get_async_session", _mock_session(db)), patch.object(
+            embedding_worker.settings, "embedding_batch_size", 2
+        ):
+            await embed_entries(embedder, [_claimed() for _ in range(5)])
+
+        assert [len(c.args[0]) for c in embedder.embed.await_args_list] == [2, 2, 1]
+
+    @pytest.mark.asyncio
+    async def test_malformed_vectors_mark_failed(self, fresh_metrics):
+        """Vectors of the wrong size park the batch as failed."""
+        embedder = HashingEmbedder()
+        embedder.embed = AsyncMock(return_value=[[0.1, 0.2]])
+        db = AsyncMock()
+        db.execute = AsyncMock(return_value=MagicMock())
+
+        with patch.object(embedding_worker, "get_async_session", _mock_session(db)):
+            stored = await embed_entries(embedder, [_claimed()])
+
+        assert stored == 0
+        assert db.execute.await_count == 1
+        stmt = db.execute.await_args.args[0]
+        assert stmt.compile().params["embedding_status"] == EmbeddingStatus.FAILED
+        assert fresh_metrics.failed == 1
+
+
+# ===========================================================================
+# BrainService
+# ===========================================================================
+
+
+class TestBrainServiceEmbeddings:
+    """Tests for re-embedding and semantic search."""
+
+    @pytest.mark.asyncio
+    async def test_text_update_requeues_embedding(self):
+        """Changing title or content resets the entry to pending."""
+        entry = BrainEntry(
+            title="Alt", content="Alt", embedding_status=EmbeddingStatus.PROCESSING,
+            embedding_claimed_at=datetime.now(UTC),
+        )
+        service = BrainService(AsyncMock())
+        service.get_entry = AsyncMock(return_value=entry)
+
+        await service.update_entry(uuid4(), uuid4(), BrainEntryUpdate(content="Neu"))
+
+        assert entry.embedding_status == EmbeddingStatus.PENDING
+        assert entry.embedding_claimed_at is None
+
+    @pytest.mark.asyncio
+    async def test_tag_update_keeps_embedding(self):
+        """Tag-only edits do not trigger re-embedding."""
+        entry = BrainEntry(title="T", content="C", embedding_status=EmbeddingStatus.COMPLETED)
+        service = BrainService(AsyncMock())
+        service.get_entry = AsyncMock(return_value=entry)
+
+        await service.update_entry(uuid4(), uuid4(), BrainEntryUpdate(tags=["x"]))
+
+        assert entry.embedding_status == EmbeddingStatus.COMPLETED
+
+    @pytest.mark.asyncio
+    async def test_semantic_search_groups_chunks_by_entry(self):
+        """k-NN chunks are grouped per entry, best distance first."""
+        user_id = uuid4()
+        a = BrainEntry(id=uuid4(), title="A", content="a")
+        b = BrainEntry(id=uuid4(), title="B", content="b")
+        result = MagicMock()
+        result.all.return_value = [(a, "a1", 0.1), (b, "b1", 0.3), (a, "a2", 0.4)]
+        db = AsyncMock()
+        db.execute = AsyncMock(side_effect=[MagicMock(), result])
+
+        ranked = await BrainService(db).search_semantic(user_id, "Frage", limit=5)
+
+        assert [(e.title, score, chunks) for e, score, chunks in ranked] == [
+            ("A", 0.9, ["a1", "a2"]),
+            ("B", 0.7, ["b1"]),
+        ]
+        set_sql = str(db.execute.await_args_list[0].args[0].compile(
+            dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True},
+        ))
+        assert "set_config('hnsw.iterative_scan', 'relaxed_order', true)" in set_sql
+        assert f"set_config('hnsw.ef_search', '{HNSW_EF_SEARCH}', true)" in set_sql
+        search_sql = _sql(db.execute.await_args_list[1].args[0])
+        assert "brain_embeddings.embedding <=> %(embedding_1)s" in search_sql
+        assert "brain_embeddings.user_id = %(user_id_1)s" in search_sql
@@ -0,0 +1,242 @@
+"""Tests for the debounced episode processing queue.
+
+These tests do NOT require a database -- all DB fixtures from conftest.py
+are overridden with no-op versions and the queue's DB helpers are mocked.
+"""
+
+import asyncio
+from collections.abc import Generator
+from datetime import UTC, datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.services import episode_queue
+from app.services.episode_queue import (
+    ClaimedJob,
+    EpisodeProgress,
+    EpisodeWorkerMetrics,
+    enqueue_episode,
+    run_episode_worker,
+)
+
+# ---------------------------------------------------------------------------
+# Override DB fixtures from conftest.py
+# ---------------------------------------------------------------------------
+
+
+@pytest.fixture(scope="session")
+def event_loop() -> Generator:
+    """Override session-scoped event loop for this test module."""
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+@pytest.fixture(autouse=True)
+def clean_tables():
+    """No-op override: queue tests don't need database cleanup."""
+    yield
+
+
+@pytest.fixture(scope="session")
+def setup_db():
+    """No-op override: queue tests don't need database setup."""
+    yield
+
+
+@pytest.fixture(autouse=True)
+def fresh_metrics():
+    """Give each test its own worker counters."""
+    with patch.object(episode_queue, "worker_metrics", EpisodeWorkerMetrics()) as metrics:
+        yield metrics
+
+
+def _job(attempts: int = 1, processed_until=None, processed_until_id=None) -> ClaimedJob:
+    now = datetime.now(UTC)
+    return ClaimedJob(
+        id=uuid4(),
+        user_id=uuid4(),
+        conversation_id=uuid4(),
+        processed_until=processed_until,
+        processed_until_id=processed_until_id,
+        enqueued_at=now - timedelta(seconds=130),
+        claimed_at=now,
+        attempts=attempts,
+    )
+
+
+# ===========================================================================
+# Enqueue
+# ===========================================================================
+
+
+class TestEnqueueEpisode:
+    """Tests for the per-conversation upsert."""
+
+    @pytest.mark.asyncio
+    async def test_upserts_one_row_per_conversation(self):
+        """Enqueue is a single upsert that debounces instead of adding rows."""
+        db = MagicMock()
+        db.execute = AsyncMock()
+
+        await enqueue_episode(db, uuid4(), uuid4())
+
+        db.execute.assert_awaited_once()
+        sql = str(db.execute.call_args.args[0].compile(dialect=postgresql.dialect()))
+        assert "INSERT INTO episode_jobs" in sql
+        assert "ON CONFLICT (conversation_id) DO UPDATE" in sql
+        # Debounce is capped by the max delay since the first pending turn
+        assert "least(" in sql
+        assert "coalesce(episode_jobs.enqueued_at, now())" in sql
+
+
+# ===========================================================================
+# Job execution
+# ===========================================================================
+
+
+class TestRunJob:
+    """Tests for processing a single claimed job."""
+
+    @pytest.mark.asyncio
+    async def test_success_completes_job(self, fresh_metrics):
+        """A processed job advances its watermark and records the queue lag."""
+        job = _job()
+        progress = EpisodeProgress(datetime.now(UTC), uuid4())
+        with patch.object(
+            episode_queue, "_process_job", AsyncMock(return_value=progress)
+        ), patch.object(episode_queue, "_complete_job", AsyncMock()) as complete, patch.object(
+            episode_queue, "_fail_job", AsyncMock()
+        ) as fail:
+            await episode_queue._run_job(job)
+
+        complete.assert_awaited_once_with(job, progress)
+        fail.assert_not_awaited()
+        snapshot = fresh_metrics.snapshot()
+        assert snapshot["processed"] == 1
+        assert snapshot["running"] == 0
+        assert snapshot["last_lag_seconds"] == pytest.approx(130, abs=1)
+
+    @pytest.mark.asyncio
+    async def test_failure_schedules_retry(self, fresh_metrics):
+        """A failing job is handed to the retry logic instead of completed."""
+        job = _job()
+        error = RuntimeError("graph down")
+        with patch.object(
+            episode_queue, "_process_job", AsyncMock(side_effect=error)
+        ), patch.object(episode_queue, "_complete_job", AsyncMock()) as complete, patch.object(
+            episode_queue, "_fail_job", AsyncMock()
+        ) as fail:
+            await episode_queue._run_job(job)
+
+        fail.assert_awaited_once_with(job, error)
+        complete.assert_not_awaited()
+        assert fresh_metrics.snapshot()["failed"] == 1
+        assert fresh_metrics.snapshot()["running"] == 0
+
+
+def _message(created_at: datetime, horizon: datetime | None) -> MagicMock:
+    row = MagicMock(id=uuid4(), content="Hallo", created_at=created_at, horizon=horizon)
+    row.role.value = "user"
+    return row
+
+
+def _session(rows: list) -> tuple[MagicMock, AsyncMock]:
+    result = MagicMock()
+    result.all.return_value = rows
+    db = AsyncMock()
+    db.execute = AsyncMock(return_value=result)
+    session = MagicMock()
+    session.return_value.__aenter__ = AsyncMock(return_value=db)
+    session.return_value.__aexit__ = AsyncMock(return_value=False)
+    return session, db
+
+
+class TestProcessJob:
+    """Tests for reading the messages after the watermark."""
+
+    @pytest.mark.asyncio
+    async def test_reads_after_created_at_id_keyset(self):
+        """Messages sharing the watermark's created_at are not skipped."""
+        now = datetime.now(UTC)
+        job = _job(processed_until=now - timedelta(minutes=5), processed_until_id=uuid4())
+        rows = [_message(now - timedelta(minutes=m), None) for m in (2, 1)]
+        session, db = _session(rows)
+        graphiti = MagicMock(enabled=False)
+
+        with patch.object(episode_queue, "get_async_session", session), patch.object(
+            episode_queue, "get_graphiti_client", return_value=graphiti
+        ):
+            progress = await episode_queue._process_job(job)
+
+        assert progress == EpisodeProgress(rows[-1].created_at, rows[-1].id)
+        sql = str(db.execute.await_args.args[0].compile(dialect=postgresql.dialect()))
+        assert "(messages.created_at, messages.id) > (" in sql
+        assert "ORDER BY messages.created_at, messages.id" in sql
+        assert "FROM pg_stat_activity" in sql
+
+    @pytest.mark.asyncio
+    async def test_holds_back_messages_of_open_transactions(self):
+        """Messages at or after the oldest open transaction's start wait for a retry."""
+        now = datetime.now(UTC)
+        horizon = now - timedelta(seconds=30)
+        settled = _message(now - timedelta(minutes=1), horizon)
+        rows = [settled, _message(horizon, horizon), _message(now, horizon)]
+        session, _ = _session(rows)
+        graphiti = MagicMock(enabled=True)
+        memory = MagicMock()
+        memory.return_value.process_episode = AsyncMock()
+
+        with patch.object(episode_queue, "get_async_session", session), patch.object(
+            episode_queue, "get_graphiti_client", return_value=graphiti
+        ), patch.object(episode_queue, "MemoryService", memory):
+            progress = await episode_queue._process_job(_job())
+
+        assert progress == EpisodeProgress(settled.created_at, settled.id, held_back=True)
+        messages = memory.return_value.process_episode.await_args.args[2]
+        assert messages == [{"role": "user", "content": "Hallo"}]
+
+
+# ===========================================================================
+# Worker loop
+# ===========================================================================
+
+
+class TestEpisodeWorker:
+    """Tests for the bounded worker loop."""
+
+    @pytest.mark.asyncio
+    async def test_claims_only_free_slots(self):
+        """The worker never claims more jobs than it has free slots."""
+        release = asyncio.Event()
+        limits: list[int] = []
+
+        async def claim(limit: int) -> list[ClaimedJob]:
+            limits.append(limit)
+            return [_job() for _ in range(limit)]
+
+        async def blocked_job(job: ClaimedJob) -> None:
+            await release.wait()
+
+        with patch.object(episode_queue, "_claim_due_jobs", side_effect=claim), patch.object(
+            episode_queue, "_run_job", side_effect=blocked_job
+        ), patch.object(episode_queue.settings, "episode_worker_concurrency", 2), patch.object(
+            episode_queue.settings, "episode_worker_poll_seconds", 0.01
+        ):
+            worker = asyncio.create_task(run_episode_worker())
+            await asyncio.sleep(0.05)
+            # Both slots busy: no further claims while the jobs run
+            assert limits == [2]
+
+            release.set()
+            await asyncio.sleep(0.05)
+            worker.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await worker
+
+        assert limits[0] == 2
+        assert all(limit <= 2 for limit in limits)
+        assert len(limits) > 1
@@ -0,0 +1,75 @@
+"""Tests for the shared outbound HTTP client registry.
+
+These tests do NOT require a database -- all DB fixtures from conftest.py
+are overridden with no-op versions.
+"""
+
+import asyncio
+from collections.abc import Generator
+
+import pytest
+
+from app.core.http_client import HTTPClientRegistry
+
+# ---------------------------------------------------------------------------
+# Override DB fixtures from conftest.py
+# ---------------------------------------------------------------------------
+
+
+@pytest.fixture(scope="session")
+def event_loop() -> Generator:
+    """Override session-scoped event loop for this test module."""
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+@pytest.fixture(autouse=True)
+def clean_tables():
+    """No-op override: HTTP client tests don't need database cleanup."""
+    yield
+
+
+@pytest.fixture(scope="session")
+def setup_db():
+    """No-op override: HTTP client tests don't need database setup."""
+    yield
+
+
+# ===========================================================================
+# Tests
+# ===========================================================================
+
+
+class TestHTTPClientRegistry:
+    """Tests for HTTPClientRegistry."""
+
+    async def test_same_name_returns_shared_client(self):
+        """Repeated lookups should reuse one pooled client per upstream."""
+        registry = HTTPClientRegistry()
+
+        first = registry.get("anthropic")
+        second = registry.get("anthropic")
+
+        assert first is second
+        await registry.close()
+
+    async def test_different_names_get_separate_pools(self):
+        """Each upstream should get its own client and connection pool."""
+        registry = HTTPClientRegistry()
+
+        assert registry.get("anthropic") is not registry.get("expo")
+        await registry.close()
+
+    async def test_close_releases_clients_and_recreates_on_demand(self):
+        """After close, clients are closed and a fresh one is created on next use."""
+        registry = HTTPClientRegistry()
+        client = registry.get("expo")
+
+        await registry.close()
+
+        assert client.is_closed
+        new_client = registry.get("expo")
+        assert new_client is not client
+        assert not new_client.is_closed
+        await registry.close()
@@ -5,6 +5,7 @@ from unittest.mock import AsyncMock, MagicMock, patch
 from uuid import uuid4
 
 from app.services.intervention_engine import InterventionEngine, MESSAGES
+from app.services.user_features import UserFeatureSnapshot
 
 
 # Override DB fixtures from conftest.py — these are pure unit tests.
@@ -20,6 +21,11 @@ def clean_tables():
     yield
 
 
+def _snapshot(user_id: str, trends: dict, **features) -> UserFeatureSnapshot:
+    """Build a feature snapshot with the given 7-day trends."""
+    return UserFeatureSnapshot(user_id=user_id, trends_7d=trends, trends_30d=trends, **features)
+
+
 class TestPatternDetection:
     """Tests for _detect_patterns — pure logic, no DB required."""
 
@@ -223,15 +229,12 @@ class TestCreateInterventions:
             {"type": "hyperfocus", "trigger": "Focus > 0.9", "message": "Pause!"}
         ])
         engine._has_recent_intervention = AsyncMock(return_value=False)
-        engine.pattern_analyzer = AsyncMock()
-        engine.pattern_analyzer.get_recent_trends = AsyncMock(return_value={
+        snapshot = _snapshot(user_id, {
             "avg_focus": 0.95, "avg_energy": 0.5, "avg_mood": 0.3,
             "total_conversations": 5,
         })
-        engine._get_user_stats = AsyncMock(return_value={})
-        engine._get_recent_logs = AsyncMock(return_value=[])
 
-        interventions = await engine.evaluate(user_id)
+        interventions = await engine.evaluate(user_id, snapshot)
         assert len(interventions) == 1
         assert interventions[0]["type"] == "hyperfocus"
         assert interventions[0]["status"] == "pending"
@@ -242,14 +245,9 @@ class TestCreateInterventions:
         engine = InterventionEngine(db)
         user_id = str(uuid4())
 
-        engine.pattern_analyzer = AsyncMock()
-        engine.pattern_analyzer.get_recent_trends = AsyncMock(return_value={
-            "total_conversations": 0,
-        })
-        engine._get_user_stats = AsyncMock(return_value={})
-        engine._get_recent_logs = AsyncMock(return_value=[])
+        snapshot = _snapshot(user_id, {"total_conversations": 0})
 
-        interventions = await engine.evaluate(user_id)
+        interventions = await engine.evaluate(user_id, snapshot)
         assert interventions == []
 
     @pytest.mark.asyncio
@@ -263,15 +261,12 @@ class TestCreateInterventions:
             {"type": "hyperfocus", "trigger": "Focus > 0.9", "message": "Pause!"}
         ])
         engine._has_recent_intervention = AsyncMock(return_value=True)
-        engine.pattern_analyzer = AsyncMock()
-        engine.pattern_analyzer.get_recent_trends = AsyncMock(return_value={
+        snapshot = _snapshot(user_id, {
             "avg_focus": 0.95, "avg_energy": 0.5, "avg_mood": 0.3,
             "total_conversations": 5,
         })
-        engine._get_user_stats = AsyncMock(return_value={})
-        engine._get_recent_logs = AsyncMock(return_value=[])
 
-        interventions = await engine.evaluate(user_id)
+        interventions = await engine.evaluate(user_id, snapshot)
         assert interventions == []
 
     @pytest.mark.asyncio
@@ -285,14 +280,9 @@ class TestCreateInterventions:
             {"type": "sleep_disruption", "trigger": "test2", "message": "msg2"},
         ])
         engine._has_recent_intervention = AsyncMock(return_value=False)
-        engine.pattern_analyzer = AsyncMock()
-        engine.pattern_analyzer.get_recent_trends = AsyncMock(return_value={
-            "total_conversations": 5,
-        })
-        engine._get_user_stats = AsyncMock(return_value={})
-        engine._get_recent_logs = AsyncMock(return_value=[])
+        snapshot = _snapshot(user_id, {"total_conversations": 5})
 
-        interventions = await engine.evaluate(user_id)
+        interventions = await engine.evaluate(user_id, snapshot)
         assert len(interventions) == 2
         types = [i["type"] for i in interventions]
         assert "procrastination" in types
@@ -0,0 +1,245 @@
+"""Tests for the next-due job schedule.
+
+These tests do NOT require a database -- all DB fixtures from conftest.py
+are overridden with no-op versions.
+"""
+
+import asyncio
+from collections.abc import Generator
+from datetime import UTC, datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+from zoneinfo import ZoneInfo
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.services import job_schedule
+from app.services.job_schedule import (
+    FAILED_JOB_RETRY,
+    JOB_HINT_CHANNEL,
+    JobHeap,
+    apply_job_hint,
+    compute_next_due,
+    hint_job,
+    next_clock_time,
+    reschedule,
+)
+
+# ---------------------------------------------------------------------------
+# Override DB fixtures from conftest.py
+# ---------------------------------------------------------------------------
+
+
+@pytest.fixture(scope="session")
+def event_loop() -> Generator:
+    """Override session-scoped event loop for this test module."""
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+@pytest.fixture(autouse=True)
+def clean_tables():
+    """No-op override: job schedule tests don't need database cleanup."""
+    yield
+
+
+@pytest.fixture(scope="session")
+def setup_db():
+    """No-op override: job schedule tests don't need database setup."""
+    yield
+
+
+@pytest.fixture
+def heap() -> JobHeap:
+    """Active, empty job heap."""
+    fresh = JobHeap()
+    fresh.active = True
+    return fresh
+
+
+BERLIN = ZoneInfo("Europe/Berlin")
+# Tuesday 10:00 in Berlin
+NOW = datetime(2026, 3, 10, 10, 0, tzinfo=BERLIN).astimezone(UTC)
+
+SETTINGS = {
+    "expo_push_token": "ExponentPushToken[x]",
+    "quiet_hours_start": "22:00",
+    "quiet_hours_end": "07:00",
+    "preferred_reminder_times": ["09:00", "14:00", "18:00"],
+    "active_modules": ["core", "adhs", "wellness", "productivity", "integrations"],
+}
+
+
+def _berlin(at: datetime) -> datetime:
+    return at.astimezone(BERLIN).replace(tzinfo=None)
+
+
+class TestComputeNextDue:
+    """Tests for next due time computation."""
+
+    def test_streak_uses_next_preferred_time(self):
+        at = compute_next_due("streak", NOW, SETTINGS)
+        assert _berlin(at) == datetime(2026, 3, 10, 14, 0)
+
+    def test_briefing_rolls_over_to_tomorrow(self):
+        at = compute_next_due("briefing", NOW, {**SETTINGS, "briefing_time": "08:00"})
+        assert _berlin(at) == datetime(2026, 3, 11, 8, 0)
+
+    def test_periodic_job(self):
+        assert compute_next_due("calendar", NOW, SETTINGS) == NOW + timedelta(minutes=30)
+
+    def test_event_in_quiet_hours_is_deferred(self):
+        late = datetime(2026, 3, 10, 23, 30, tzinfo=BERLIN)
+        at = compute_next_due("reminders", NOW, SETTINGS, event_at=late)
+        assert _berlin(at) == datetime(2026, 3, 11, 7, 1)
+
+    def test_past_event_is_due_now(self):
+        at = compute_next_due("task_nudges", NOW, SETTINGS, event_at=NOW - timedelta(hours=1))
+        assert at == NOW
+
+    def test_inactive_module_or_missing_token_unschedules(self):
+        assert compute_next_due("wellbeing", NOW, {**SETTINGS, "active_modules": ["core"]}) is None
+        assert compute_next_due("streak", NOW, {**SETTINGS, "expo_push_token": None}) is None
+        assert compute_next_due("task_nudges", NOW, SETTINGS, event_at=None) is None
+
+    def test_next_clock_time_is_strictly_after(self):
+        at = next_clock_time(datetime(2026, 3, 10, 9, 0, tzinfo=BERLIN), ["09:00"])
+        assert _berlin(at) == datetime(2026, 3, 11, 9, 0)
+
+
+class TestReschedule:
+    """Tests for persisting the next due times after a run."""
+
+    @staticmethod
+    def _db(reminder_events: list[tuple]) -> AsyncMock:
+        result = MagicMock()
+        result.all.return_value = reminder_events
+        db = AsyncMock()
+        db.execute = AsyncMock(return_value=result)
+        return db
+
+    @pytest.mark.asyncio
+    async def test_failed_job_backs_off_instead_of_rerunning_at_once(self):
+        """A pending reminder that failed to process is retried after FAILED_JOB_RETRY."""
+        failing, ok = uuid4(), uuid4()
+        past = NOW - timedelta(minutes=1)
+        db = self._db([(failing, past), (ok, past)])
+        jobs = {user_id: (SETTINGS, ("reminders",)) for user_id in (failing, ok)}
+
+        scheduled = await reschedule(
+            db, jobs, now=NOW, ran=True, failed={(failing, "reminders")},
+        )
+
+        assert {u: at for u, _, at in scheduled} == {
+            failing: NOW + FAILED_JOB_RETRY,
+            ok: NOW,
+        }
+
+
+class TestJobHeap:
+    """Tests for the in-memory heap of the scheduler loop."""
+
+    def test_pop_due_in_order(self, heap):
+        first, second = uuid4(), uuid4()
+        heap.set(second, "streak", NOW + timedelta(minutes=2))
+        heap.set(first, "reminders", NOW + timedelta(minutes=1))
+        heap.set(first, "briefing", NOW + timedelta(hours=1))
+
+        due = heap.pop_due(NOW + timedelta(minutes=5))
+
+        assert [(u, j) for u, j, _ in due] == [(first, "reminders"), (second, "streak")]
+        assert len(heap) == 1
+
+    def test_rescheduled_entry_replaces_stale_one(self, heap):
+        user_id = uuid4()
+        heap.set(user_id, "wellbeing", NOW)
+        heap.set(user_id, "wellbeing", NOW + timedelta(minutes=5))
+
+        assert heap.pop_due(NOW) == []
+        assert heap.next_due() == NOW + timedelta(minutes=5)
+
+    def test_hint_only_moves_jobs_forward(self, heap):
+        user_id = uuid4()
+        heap.set(user_id, "reminders", NOW + timedelta(minutes=10))
+        heap.hint(user_id, "reminders", NOW + timedelta(minutes=20))
+        assert heap.next_due() == NOW + timedelta(minutes=10)
+
+        heap.hint(user_id, "reminders", NOW + timedelta(minutes=1))
+        assert heap.next_due() == NOW + timedelta(minutes=1)
+
+    def test_naive_hint_is_taken_as_utc(self, heap):
+        """A reminder posted without offset must not break the aware heap."""
+        user_id = uuid4()
+        heap.set(user_id, "briefing", NOW + timedelta(hours=1))
+
+        heap.hint(user_id, "reminders", NOW.replace(tzinfo=None))
+
+        assert heap.next_due() == NOW
+        assert heap.pop_due(NOW) == [(user_id, "reminders", NOW)]
+
+    def test_inactive_heap_ignores_jobs(self):
+        heap = JobHeap()
+        heap.set(uuid4(), "streak", NOW)
+        assert len(heap) == 0
+
+    @pytest.mark.asyncio
+    async def test_earlier_job_wakes_waiter(self, heap):
+        heap.set(uuid4(), "briefing", NOW + timedelta(hours=1))
+        waiter = asyncio.create_task(heap.wait(10))
+        await asyncio.sleep(0)
+
+        heap.hint(uuid4(), "reminders", NOW)
+        await asyncio.wait_for(waiter, timeout=1)
+
+
+class TestJobHints:
+    """Tests for carrying job hints to the scheduler leader's process."""
+
+    @pytest.mark.asyncio
+    async def test_hint_job_notifies_on_commit(self):
+        """The hint is sent with pg_notify, which Postgres delivers on commit."""
+        db = AsyncMock()
+        user_id = uuid4()
+
+        await hint_job(db, user_id, "reminders", NOW)
+
+        upsert, notify = (call.args[0] for call in db.execute.await_args_list)
+        assert "ON CONFLICT" in str(upsert.compile(dialect=postgresql.dialect()))
+        sql = str(notify.compile(
+            dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True},
+        ))
+        assert f"pg_notify('{JOB_HINT_CHANNEL}', '{user_id} reminders {NOW.isoformat()}')" in sql
+
+    @pytest.mark.asyncio
+    async def test_naive_hint_job_is_sent_as_utc(self, heap):
+        db = AsyncMock()
+        user_id = uuid4()
+
+        with patch.object(job_schedule, "job_heap", heap):
+            await hint_job(db, user_id, "reminders", NOW.replace(tzinfo=None))
+
+        notify = db.execute.await_args.args[0]
+        sql = str(notify.compile(
+            dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True},
+        ))
+        assert f"{user_id} reminders {NOW.isoformat()}" in sql
+        assert heap.next_due() == NOW
+
+    def test_near_hint_wakes_leader_heap(self, heap):
+        user_id = uuid4()
+        at = datetime.now(UTC) + timedelta(minutes=1)
+        with patch.object(job_schedule, "job_heap", heap):
+            apply_job_hint(f"{user_id} reminders {at.isoformat()}")
+
+        assert heap.next_due() == at
+
+    def test_far_or_malformed_hints_are_ignored(self, heap):
+        far = datetime.now(UTC) + timedelta(days=1)
+        with patch.object(job_schedule, "job_heap", heap):
+            apply_job_hint(f"{uuid4()} reminders {far.isoformat()}")
+            apply_job_hint(f"{uuid4()} unknown {NOW.isoformat()}")
+            apply_job_hint("garbage")
+
+        assert len(heap) == 0
@@ -5,6 +5,7 @@ are overridden with no-op versions. Dependencies are fully mocked.
 """
 
 import asyncio
+from datetime import date, datetime, timedelta, timezone
 from typing import Generator
 from unittest.mock import AsyncMock, MagicMock
 from uuid import uuid4
@@ -53,6 +54,11 @@ def mock_db():
     db.commit = AsyncMock()
     db.execute = AsyncMock()
     db.delete = AsyncMock()
+
+    async def refresh(obj, attribute_names=None):
+        obj.created_at = datetime.now(timezone.utc)
+
+    db.refresh = AsyncMock(side_effect=refresh)
     return db
 
 
@@ -130,6 +136,30 @@ class TestProcessEpisode:
         service.nlp_analyzer.analyze.assert_called_once()
         mock_db.add.assert_called_once()
 
+    async def test_updates_daily_rollup(
+        self, mock_db, mock_graphiti, mock_analysis
+    ):
+        service = MemoryService(mock_db, mock_graphiti)
+        service.nlp_analyzer = AsyncMock()
+        service.nlp_analyzer.analyze = AsyncMock(return_value=mock_analysis)
+        service.pattern_analyzer.record_daily = AsyncMock()
+        user_id = str(uuid4())
+        # Stored just before UTC midnight, seen from a UTC+2 connection
+        stored_at = datetime(2026, 3, 3, 1, 30, tzinfo=timezone(timedelta(hours=2)))
+
+        async def refresh(obj, attribute_names=None):
+            obj.created_at = stored_at
+
+        mock_db.refresh = AsyncMock(side_effect=refresh)
+
+        await service.process_episode(
+            user_id, str(uuid4()), [{"role": "user", "content": "test"}],
+        )
+
+        service.pattern_analyzer.record_daily.assert_awaited_once_with(
+            user_id, 0.3, 0.6, 0.4, day=date(2026, 3, 2)
+        )
+
     async def test_stores_pattern_log_with_correct_fields(
         self, mock_db, mock_graphiti, mock_analysis
     ):
@@ -0,0 +1,186 @@
+"""Tests for batched Expo push delivery and receipt handling.
+
+These tests do NOT require a database -- all DB fixtures from conftest.py
+are overridden with no-op versions and the Expo client is mocked.
+"""
+
+import asyncio
+from collections.abc import Generator
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.services import notification
+from app.services.notification import (
+    EXPO_BATCH_LIMIT,
+    NotificationService,
+    PushNotification,
+    PushOutbox,
+    PushReceiptTracker,
+)
+
+# ---------------------------------------------------------------------------
+# Override DB fixtures from conftest.py
+# ---------------------------------------------------------------------------
+
+
+@pytest.fixture(scope="session")
+def event_loop() -> Generator:
+    """Override session-scoped event loop for this test module."""
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+@pytest.fixture(autouse=True)
+def clean_tables():
+    """No-op override: notification tests don't need database cleanup."""
+    yield
+
+
+@pytest.fixture(scope="session")
+def setup_db():
+    """No-op override: notification tests don't need database setup."""
+    yield
+
+
+@pytest.fixture
+def tracker() -> Generator[PushReceiptTracker, None, None]:
+    """Fresh receipt tracker patched into the notification module."""
+    fresh = PushReceiptTracker()
+    with patch.object(notification, "receipt_tracker", fresh):
+        yield fresh
+
+
+def _expo_client(*responses: dict) -> MagicMock:
+    """Pooled client mock returning the given JSON bodies in order."""
+    client = MagicMock()
+    replies = []
+    for body in responses:
+        reply = MagicMock()
+        reply.json.return_value = body
+        replies.append(reply)
+    client.post = AsyncMock(side_effect=replies)
+    return client
+
+
+def _push(i: int) -> PushNotification:
+    return PushNotification(to=f"ExponentPushToken[{i}]", title="Hi", body="Body")
+
+
+class TestSendBatched:
+    """Tests for sending many pushes in EXPO_BATCH_LIMIT-sized requests."""
+
+    @pytest.mark.asyncio
+    async def test_one_request_per_batch(self, tracker):
+        pushes = [_push(i) for i in range(EXPO_BATCH_LIMIT + 1)]
+        client = _expo_client(
+            {"data": [{"status": "ok", "id": f"t{i}"} for i in range(EXPO_BATCH_LIMIT)]},
+            {"data": [{"status": "ok", "id": "last"}]},
+        )
+        with patch.object(notification, "get_http_client", return_value=client):
+            result = await NotificationService.send_batched(pushes)
+
+        assert client.post.await_count == 2
+        assert len(client.post.await_args_list[0].kwargs["json"]) == EXPO_BATCH_LIMIT
+        assert result.sent == EXPO_BATCH_LIMIT + 1
+        assert result.tickets["last"] == f"ExponentPushToken[{EXPO_BATCH_LIMIT}]"
+        assert len(tracker) == EXPO_BATCH_LIMIT + 1
+
+    @pytest.mark.asyncio
+    async def test_device_not_registered_ticket(self, tracker):
+        client = _expo_client({
+            "data": [
+                {"status": "ok", "id": "t0"},
+                {"status": "error", "details": {"error": "DeviceNotRegistered"}},
+            ]
+        })
+        with patch.object(notification, "get_http_client", return_value=client):
+            result = await NotificationService.send_batched([_push(0), _push(1)])
+
+        assert result.sent == 1
+        assert result.dead_tokens == {"ExponentPushToken[1]"}
+
+    @pytest.mark.asyncio
+    async def test_outbox_flush_empties_queue(self, tracker):
+        outbox = PushOutbox()
+        outbox.add(_push(0))
+        outbox.add(_push(1))
+        client = _expo_client({"data": [{"status": "ok"}, {"status": "ok"}]})
+        with patch.object(notification, "get_http_client", return_value=client):
+            result = await outbox.flush()
+
+        assert result.sent == 2
+        assert len(outbox) == 0
+        client.post.assert_awaited_once()
+
+
+class TestReceiptTracker:
+    """Tests for polling delivery receipts."""
+
+    @pytest.mark.asyncio
+    async def test_recent_tickets_are_not_polled(self, tracker):
+        tracker.track("t0", "ExponentPushToken[0]")
+        client = _expo_client()
+        with patch.object(notification, "get_http_client", return_value=client):
+            assert await tracker.poll() == set()
+
+        client.post.assert_not_awaited()
+        assert len(tracker) == 1
+
+    @pytest.mark.asyncio
+    async def test_poll_reports_unregistered_devices(self, tracker):
+        with patch("app.services.notification.time.time", return_value=1000.0):
+            tracker.track("ok", "ExponentPushToken[0]")
+            tracker.track("dead", "ExponentPushToken[1]")
+            tracker.track("later", "ExponentPushToken[2]")
+        client = _expo_client({
+            "data": {
+                "ok": {"status": "ok"},
+                "dead": {"status": "error", "details": {"error": "DeviceNotRegistered"}},
+            }
+        })
+        with patch.object(notification, "get_http_client", return_value=client), \
+             patch("app.services.notification.time.time", return_value=3000.0):
+            dead = await tracker.poll()
+
+        assert dead == {"ExponentPushToken[1]"}
+        assert client.post.await_args.kwargs["json"] == {"ids": ["ok", "dead", "later"]}
+        # No receipt yet: retried on the next poll
+        assert len(tracker) == 1
+
+    def test_pending_tickets_are_bounded(self, tracker):
+        with patch.object(notification.settings, "push_receipt_max_pending", 2):
+            for i in range(3):
+                tracker.track(f"t{i}", f"ExponentPushToken[{i}]")
+
+        assert len(tracker) == 2
+
+    @pytest.mark.asyncio
+    async def test_ticket_evicted_during_request_is_skipped(self, tracker):
+        """track() evicting a polled ticket mid-request doesn't abort the poll."""
+        with patch("app.services.notification.time.time", return_value=1000.0):
+            tracker.track("evicted", "ExponentPushToken[0]")
+            tracker.track("dead", "ExponentPushToken[1]")
+        reply = MagicMock()
+        reply.json.return_value = {
+            "data": {
+                "evicted": {"status": "ok"},
+                "dead": {"status": "error", "details": {"error": "DeviceNotRegistered"}},
+            }
+        }
+
+        async def post(*args, **kwargs):
+            # A push sent while the receipts are fetched overflows the tracker
+            with patch.object(notification.settings, "push_receipt_max_pending", 2):
+                tracker.track("new", "ExponentPushToken[2]")
+            return reply
+
+        client = MagicMock()
+        client.post = AsyncMock(side_effect=post)
+        with patch.object(notification, "get_http_client", return_value=client), \
+             patch("app.services.notification.time.time", return_value=3000.0):
+            dead = await tracker.poll()
+
+        assert dead == {"ExponentPushToken[1]"}
+        assert len(tracker) == 1
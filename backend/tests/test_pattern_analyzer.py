@@ -2,7 +2,10 @@
 
 import pytest
 from unittest.mock import AsyncMock, MagicMock
-from datetime import datetime, timezone
+from datetime import date, datetime, timezone
+from uuid import uuid4
+
+from sqlalchemy.dialects import postgresql
 
 from app.services.pattern_analyzer import PatternAnalyzer
 
@@ -154,3 +157,126 @@ class TestPatternAnalyzerFormatting:
         }
         text = analyzer.format_for_prompt(trends)
         assert "unbekannt" in text
+
+
+class TestWindowedTrends:
+    """Tests for the single-statement trend aggregation (DB mocked)."""
+
+    @staticmethod
+    def _analyzer(row: dict) -> tuple[PatternAnalyzer, AsyncMock]:
+        result = MagicMock()
+        result.one.return_value._mapping = row
+        db = AsyncMock()
+        db.execute = AsyncMock(return_value=result)
+        return PatternAnalyzer(db=db), db
+
+    @staticmethod
+    def _row(days: int, total: int, first: float | None, second: float | None) -> dict:
+        row = {f"total_{days}": total}
+        for metric in ("mood", "energy", "focus"):
+            row.update({
+                f"avg_{metric}_{days}": 0.456,
+                f"min_{metric}_{days}": 0.1,
+                f"max_{metric}_{days}": 0.9,
+                f"first_{metric}_{days}": first,
+                f"second_{metric}_{days}": second,
+            })
+        return row
+
+    @pytest.mark.asyncio
+    async def test_all_windows_in_one_query(self):
+        """7- and 30-day trends for all metrics come from one statement."""
+        analyzer, db = self._analyzer({**self._row(7, 4, 0.8, 0.4), **self._row(30, 9, 0.2, 0.5)})
+
+        trends = await analyzer.get_windowed_trends("user-1", (7, 30))
+
+        assert db.execute.await_count == 1
+        sql = str(db.execute.await_args.args[0])
+        assert "FILTER (WHERE" in sql
+        assert "FROM pattern_log_daily" in sql
+        assert trends[7]["total_conversations"] == 4
+        assert trends[7]["avg_energy"] == 0.46
+        assert trends[7]["energy_trend"] == "declining"
+        assert trends[30]["focus_trend"] == "rising"
+        assert trends[30]["max_mood"] == 0.9
+
+    @pytest.mark.asyncio
+    async def test_empty_window_defaults(self):
+        """Windows without logs yield zeros and stable trends."""
+        row = {key: None for key in self._row(7, 0, None, None)}
+        row["total_7"] = 0
+        analyzer, _ = self._analyzer(row)
+
+        trends = await analyzer.get_multi_metric_trends("user-1", days=7)
+
+        assert trends["total_conversations"] == 0
+        assert trends["avg_mood"] == 0
+        assert trends["mood_trend"] == "stable"
+
+    @pytest.mark.asyncio
+    async def test_recent_trends_is_mood_subset(self):
+        """get_recent_trends keeps its original keys."""
+        analyzer, _ = self._analyzer(self._row(7, 3, 0.0, 0.5))
+
+        trends = await analyzer.get_recent_trends("user-1")
+
+        assert set(trends) == {
+            "avg_mood", "avg_energy", "avg_focus", "total_conversations",
+            "min_mood", "max_mood", "mood_trend",
+        }
+        assert trends["mood_trend"] == "rising"
+
+    def test_trend_direction_threshold(self):
+        """Changes within ±0.1 count as stable; missing halves count as 0."""
+        assert PatternAnalyzer._trend_direction(0.5, 0.55) == "stable"
+        assert PatternAnalyzer._trend_direction(0.5, 0.65) == "rising"
+        assert PatternAnalyzer._trend_direction(None, -0.2) == "declining"
+
+
+class TestDailyRollup:
+    """Tests for maintaining the pattern_log_daily rollup (DB mocked)."""
+
+    @pytest.mark.asyncio
+    async def test_record_daily_upserts_user_day(self):
+        """A log adds to its day's sums/counts and widens min/max."""
+        db = AsyncMock()
+        analyzer = PatternAnalyzer(db=db)
+        user_id = uuid4()
+
+        await analyzer.record_daily(user_id, 0.4, None, 0.7, day=date(2026, 3, 2))
+
+        stmt = db.execute.await_args.args[0]
+        sql = str(stmt.compile(dialect=postgresql.dialect()))
+        params = stmt.compile(dialect=postgresql.dialect()).params
+        assert "ON CONFLICT ON CONSTRAINT uq_pattern_log_daily_user_day DO UPDATE" in sql
+        assert "mood_sum = (pattern_log_daily.mood_sum + excluded.mood_sum)" in sql
+        assert "mood_min = least(pattern_log_daily.mood_min, excluded.mood_min)" in sql
+        assert params["day"] == date(2026, 3, 2)
+        assert (params["mood_sum"], params["mood_count"]) == (0.4, 1)
+        # Unmeasured scores do not count towards the mean
+        assert (params["energy_sum"], params["energy_count"], params["energy_min"]) == (0.0, 0, None)
+
+    @pytest.mark.asyncio
+    async def test_record_daily_defaults_to_transaction_day(self):
+        """Without a day, the UTC day of now() (the log's created_at) is used."""
+        db = AsyncMock()
+
+        await PatternAnalyzer(db=db).record_daily(uuid4(), 0.4, 0.5, 0.7)
+
+        sql = str(db.execute.await_args.args[0].compile(dialect=postgresql.dialect()))
+        assert "CAST(timezone('UTC', now()) AS DATE)" in sql
+
+    @pytest.mark.asyncio
+    async def test_rebuild_daily_regroups_raw_logs(self):
+        """Rebuild replaces the user's rollup with a grouped INSERT ... SELECT."""
+        db = AsyncMock()
+
+        await PatternAnalyzer(db=db).rebuild_daily(uuid4())
+
+        delete_sql, insert_sql = (
+            str(c.args[0].compile(dialect=postgresql.dialect())) for c in db.execute.await_args_list
+        )
+        assert delete_sql.startswith("DELETE FROM pattern_log_daily")
+        assert insert_sql.startswith("INSERT INTO pattern_log_daily")
+        assert "FROM pattern_logs" in insert_sql
+        assert "GROUP BY pattern_logs.user_id, CAST(timezone('UTC', pattern_logs.created_at) AS DATE)" in insert_sql
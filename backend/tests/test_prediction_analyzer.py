@@ -35,6 +35,8 @@ class TestMultiMetricTrends:
             await test_db.flush()
 
         analyzer = PatternAnalyzer(test_db)
+        # Logs were inserted directly, so build their daily rollup
+        await analyzer.rebuild_daily(user.id)
         trends = await analyzer.get_multi_metric_trends(str(user.id), days=7)
 
         assert "energy_trend" in trends
@@ -56,6 +58,8 @@ class TestMultiMetricTrends:
         await test_db.flush()
 
         analyzer = PatternAnalyzer(test_db)
+        # Logs were inserted directly, so build their daily rollup
+        await analyzer.rebuild_daily(user.id)
         trends = await analyzer.get_multi_metric_trends(str(user.id), days=7)
 
         assert trends["total_conversations"] == 0
@@ -89,5 +93,7 @@ class TestMultiMetricTrends:
             await test_db.flush()
 
         analyzer = PatternAnalyzer(test_db)
+        # Logs were inserted directly, so build their daily rollup
+        await analyzer.rebuild_daily(user.id)
         trends = await analyzer.get_multi_metric_trends(str(user.id), days=30)
         assert trends["total_conversations"] == 10
@@ -0,0 +1,249 @@
+"""Tests for the vectorized batch prediction engine.
+
+These tests do NOT require a database -- all DB fixtures from conftest.py
+are overridden with no-op versions and the session is mocked.
+"""
+
+import asyncio
+import random
+from collections.abc import Generator
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import numpy as np
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.models.predicted_pattern import PredictionStatus
+from app.services import prediction_engine
+from app.services.prediction_batch import (
+    DECLINING,
+    RISING,
+    STABLE,
+    FeatureMatrix,
+    evaluate_rules,
+    load_feature_matrix,
+)
+from app.services.prediction_engine import CONFIDENCE_THRESHOLD, PredictionEngine
+from app.services.user_features import UserFeatureSnapshot
+
+# ---------------------------------------------------------------------------
+# Override DB fixtures from conftest.py
+# ---------------------------------------------------------------------------
+
+
+@pytest.fixture(scope="session")
+def event_loop() -> Generator:
+    """Override session-scoped event loop for this test module."""
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+@pytest.fixture(autouse=True)
+def clean_tables():
+    """No-op override: batch prediction tests don't need database cleanup."""
+    yield
+
+
+@pytest.fixture(scope="session")
+def setup_db():
+    """No-op override: batch prediction tests don't need database setup."""
+    yield
+
+
+TRENDS = ("declining", "stable", "rising")
+
+
+def _random_snapshot(rng: random.Random) -> UserFeatureSnapshot:
+    def trends() -> dict:
+        return {
+            "total_conversations": rng.randint(1, 20),
+            "avg_mood": round(rng.uniform(-1, 1), 2),
+            "avg_energy": round(rng.random(), 2),
+            "avg_focus": round(rng.random(), 2),
+            "mood_trend": rng.choice(TRENDS),
+            "energy_trend": rng.choice(TRENDS),
+            "focus_trend": rng.choice(TRENDS),
+        }
+
+    return UserFeatureSnapshot(
+        user_id=str(uuid4()),
+        trends_7d=trends(),
+        trends_30d=trends(),
+        tasks_completed=rng.randint(0, 15),
+        open_tasks=rng.randint(0, 12),
+    )
+
+
+def _comparable(candidate: dict) -> tuple:
+    return (
+        candidate["pattern_type"],
+        candidate["confidence"],
+        candidate["time_horizon"],
+        candidate["trigger_factors"],
+    )
+
+
+class TestEvaluateRules:
+    """Tests for evaluating the rules over a feature matrix."""
+
+    def test_rows_are_independent(self):
+        """A stacked matrix yields each user's one-row (per-user) candidates."""
+        rng = random.Random(42)
+        snapshots = [_random_snapshot(rng) for _ in range(2000)]
+        engine = PredictionEngine(AsyncMock())
+
+        batch = evaluate_rules(FeatureMatrix.from_snapshots(snapshots), CONFIDENCE_THRESHOLD)
+
+        expected = [
+            (snapshot.user_id, _comparable(candidate))
+            for snapshot in snapshots
+            for candidate in engine.candidates(snapshot)
+        ]
+        assert expected, "random data should trigger some rules"
+        assert [(str(c["user_id"]), _comparable(c)) for c in batch] == expected
+
+    def test_empty_matrix(self):
+        assert evaluate_rules(FeatureMatrix.from_snapshots([]), CONFIDENCE_THRESHOLD) == []
+
+
+class TestLoadFeatureMatrix:
+    """Tests for loading the features of many users."""
+
+    @pytest.mark.asyncio
+    async def test_rows_become_columns(self):
+        """Averages are rounded, NULLs become 0 and halves become trend codes."""
+        first, second = uuid4(), uuid4()
+        result = MagicMock()
+        result.all.return_value = [
+            # user, avg mood/energy/focus 7d and 30d, first/second half 7d per metric, stats
+            (first, 0.123, 0.456, None, 0.2, 0.5, 0.6, 0.5, 0.1, 0.3, 0.5, 0.4, 0.45, 9, 2),
+            (second, -0.5, 0.2, 0.9, -0.1, 0.3, 0.8, None, None, 0.4, 0.2, None, 0.3, 0, 0),
+        ]
+        db = AsyncMock()
+        db.execute = AsyncMock(return_value=result)
+
+        features = await load_feature_matrix(db, [first, second])
+
+        assert features.user_ids == [first, second]
+        columns = features.columns
+        np.testing.assert_array_equal(columns["avg_mood_7"], [0.12, -0.5])
+        np.testing.assert_array_equal(columns["avg_focus_7"], [0.0, 0.9])
+        np.testing.assert_array_equal(columns["mood_trend_7"], [DECLINING, STABLE])
+        np.testing.assert_array_equal(columns["energy_trend_7"], [RISING, DECLINING])
+        np.testing.assert_array_equal(columns["focus_trend_7"], [STABLE, RISING])
+        np.testing.assert_array_equal(columns["tasks_completed"], [9, 0])
+        np.testing.assert_array_equal(columns["open_tasks"], [2, 0])
+
+        sql = str(db.execute.await_args.args[0].compile(dialect=postgresql.dialect()))
+        assert "GROUP BY pattern_log_daily.user_id" in sql
+        assert "LEFT OUTER JOIN user_stats" in sql
+        assert "WHERE trends.total_7 >" in sql
+
+    @pytest.mark.asyncio
+    async def test_averages_round_like_the_per_user_trends(self):
+        """Averages use Python's round, which differs from np.round at some .xx5 values."""
+        raw = 0.165
+        assert float(np.round(raw, 2)) != round(raw, 2)
+        result = MagicMock()
+        result.all.return_value = [(uuid4(), *([raw] * 6), *([0.5] * 6), 0, 0)]
+        db = AsyncMock()
+        db.execute = AsyncMock(return_value=result)
+
+        features = await load_feature_matrix(db, [result.all.return_value[0][0]])
+
+        np.testing.assert_array_equal(features.columns["avg_energy_7"], [round(raw, 2)])
+
+    @pytest.mark.asyncio
+    async def test_all_wellness_users_by_default(self):
+        result = MagicMock()
+        result.all.return_value = []
+        db = AsyncMock()
+        db.execute = AsyncMock(return_value=result)
+
+        features = await load_feature_matrix(db)
+
+        assert len(features) == 0
+        sql = str(db.execute.await_args.args[0].compile(dialect=postgresql.dialect()))
+        assert "FROM user_settings" in sql
+
+
+class TestPredictBatch:
+    """Tests for the set-based cooldown check and bulk insert."""
+
+    @pytest.mark.asyncio
+    async def test_anti_join_then_bulk_insert(self):
+        snapshot = UserFeatureSnapshot(
+            user_id=str(uuid4()),
+            trends_7d={
+                "avg_mood": -0.4, "avg_energy": 0.2, "avg_focus": 0.2,
+                "mood_trend": "declining", "energy_trend": "declining", "focus_trend": "declining",
+            },
+            trends_30d={
+                "avg_mood": 0.3, "avg_energy": 0.6, "avg_focus": 0.5,
+                "mood_trend": "stable", "energy_trend": "stable", "focus_trend": "stable",
+            },
+            open_tasks=9,
+        )
+        features = FeatureMatrix.from_snapshots([snapshot])
+        user_id = features.user_ids[0]
+        candidates = evaluate_rules(features, CONFIDENCE_THRESHOLD)
+        cooled_down = candidates[0]["pattern_type"]
+
+        fresh = MagicMock()
+        fresh.all.return_value = [
+            (user_id, c["pattern_type"]) for c in candidates if c["pattern_type"] != cooled_down
+        ]
+        inserted = MagicMock()
+        inserted.all.return_value = [
+            MagicMock(id=uuid4(), graphiti_context={}, status=PredictionStatus.ACTIVE, **c)
+            for c in candidates[1:]
+        ]
+        db = AsyncMock()
+        db.execute = AsyncMock(side_effect=[fresh, inserted])
+
+        with patch.object(prediction_engine, "load_feature_matrix", AsyncMock(return_value=features)):
+            created = await PredictionEngine(db).predict_batch([user_id])
+
+        anti_join, insert = (call.args[0] for call in db.execute.await_args_list)
+        anti_join_sql = str(anti_join.compile(dialect=postgresql.dialect()))
+        assert "FROM unnest(" in anti_join_sql
+        assert "NOT (EXISTS" in anti_join_sql
+
+        insert_sql = insert.compile(dialect=postgresql.dialect())
+        assert str(insert_sql).startswith("INSERT INTO predicted_patterns")
+        assert "RETURNING" in str(insert_sql)
+        inserted_types = [
+            value for key, value in insert_sql.params.items() if key.startswith("pattern_type")
+        ]
+        assert inserted_types == [c["pattern_type"] for c in candidates[1:]]
+        statuses = {v for k, v in insert_sql.params.items() if k.startswith("status")}
+        assert statuses == {PredictionStatus.ACTIVE}
+        assert [(c["user_id"], c["pattern_type"]) for c in created] == [
+            (user_id, c["pattern_type"]) for c in candidates[1:]
+        ]
+        db.commit.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_no_candidates_skips_writes(self):
+        db = AsyncMock()
+        empty = FeatureMatrix.from_snapshots([])
+
+        with patch.object(prediction_engine, "load_feature_matrix", AsyncMock(return_value=empty)):
+            created = await PredictionEngine(db).predict_batch()
+
+        assert created == []
+        db.execute.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_expire_is_one_update(self):
+        result = MagicMock(rowcount=3)
+        db = AsyncMock()
+        db.execute = AsyncMock(return_value=result)
+
+        expired = await PredictionEngine(db).expire_old_predictions_batch([uuid4(), uuid4()])
+
+        assert expired == 3
+        sql = str(db.execute.await_args.args[0].compile(dialect=postgresql.dialect()))
+        assert sql.startswith("UPDATE predicted_patterns SET status=")
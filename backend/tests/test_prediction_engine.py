@@ -9,6 +9,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.models.pattern_log import PatternLog
 from app.models.predicted_pattern import PredictedPattern, PredictionStatus
 from app.models.user import User
+from app.services.pattern_analyzer import PatternAnalyzer
 from app.services.prediction_engine import PredictionEngine
 
 
@@ -88,6 +89,8 @@ class TestPredictionEngine:
 
         await db_session.commit()
 
+        # Logs were inserted directly, so build their daily rollup
+        await PatternAnalyzer(db_session).rebuild_daily(test_user.id)
         engine = PredictionEngine(db_session)
         results = await engine.predict(str(test_user.id))
 
@@ -114,6 +117,8 @@ class TestPredictionEngine:
 
         await db_session.commit()
 
+        # Logs were inserted directly, so build their daily rollup
+        await PatternAnalyzer(db_session).rebuild_daily(test_user.id)
         engine = PredictionEngine(db_session)
         results = await engine.predict(str(test_user.id))
 
@@ -165,6 +170,8 @@ class TestPredictionEngine:
 
         await db_session.commit()
 
+        # Logs were inserted directly, so build their daily rollup
+        await PatternAnalyzer(db_session).rebuild_daily(test_user.id)
         engine = PredictionEngine(db_session)
         results = await engine.predict(str(test_user.id))
 
@@ -6,40 +6,38 @@ from uuid import uuid4
 
 class TestPredictionScheduler:
     @pytest.mark.asyncio
-    async def test_process_predictions_skipped_without_module(self):
+    async def test_process_predictions_skipped_without_users(self):
         from app.services.scheduler import _process_predictions
-        settings = {"active_modules": ["core", "adhs"]}
-        await _process_predictions(uuid4(), settings)
-        # Should return without error — wellness module not active
+        with patch("app.services.scheduler.PredictionEngine") as MockEngine:
+            await _process_predictions({})
+            MockEngine.assert_not_called()
 
     @pytest.mark.asyncio
     async def test_process_predictions_runs_with_wellness(self):
         from app.services.scheduler import _process_predictions
-        settings = {"active_modules": ["core", "adhs", "wellness"]}
+        tokens = {uuid4(): "ExponentPushToken[a]", uuid4(): "ExponentPushToken[b]"}
 
         with patch("app.services.scheduler.PredictionEngine") as MockEngine:
             mock_instance = MagicMock()
-            mock_instance.expire_old_predictions = AsyncMock(return_value=0)
-            mock_instance.predict = AsyncMock(return_value=[])
+            mock_instance.expire_old_predictions_batch = AsyncMock(return_value=0)
+            mock_instance.predict_batch = AsyncMock(return_value=[])
             MockEngine.return_value = mock_instance
 
-            await _process_predictions(uuid4(), settings)
-            mock_instance.predict.assert_called_once()
+            await _process_predictions(tokens)
+            mock_instance.predict_batch.assert_called_once_with(list(tokens))
 
     @pytest.mark.asyncio
     async def test_process_predictions_sends_push_for_high_confidence(self):
         from app.services.scheduler import _process_predictions
-        settings = {
-            "active_modules": ["core", "adhs", "wellness"],
-            "expo_push_token": "ExponentPushToken[test]",
-        }
+        user_id = uuid4()
 
         with patch("app.services.scheduler.PredictionEngine") as MockEngine, \
              patch("app.services.scheduler.NotificationService") as MockNotif:
             mock_instance = MagicMock()
-            mock_instance.expire_old_predictions = AsyncMock(return_value=0)
-            mock_instance.predict = AsyncMock(return_value=[{
+            mock_instance.expire_old_predictions_batch = AsyncMock(return_value=0)
+            mock_instance.predict_batch = AsyncMock(return_value=[{
                 "id": str(uuid4()),
+                "user_id": user_id,
                 "pattern_type": "energy_crash",
                 "confidence": 0.85,
                 "predicted_for": "2026-02-15T10:00:00Z",
@@ -51,5 +49,5 @@ class TestPredictionScheduler:
             MockEngine.return_value = mock_instance
             MockNotif.send_notification = AsyncMock()
 
-            await _process_predictions(uuid4(), settings)
+            await _process_predictions({user_id: "ExponentPushToken[test]"})
             MockNotif.send_notification.assert_called_once()
@@ -0,0 +1,88 @@
+"""Tests for the authenticated principal cache.
+
+These tests do NOT require a database -- all DB fixtures from conftest.py
+are overridden with no-op versions.
+"""
+
+import asyncio
+from collections.abc import Generator
+from unittest.mock import patch
+from uuid import uuid4
+
+import pytest
+
+from app.core.principal import Principal, PrincipalCache
+
+# ---------------------------------------------------------------------------
+# Override DB fixtures from conftest.py
+# ---------------------------------------------------------------------------
+
+
+@pytest.fixture(scope="session")
+def event_loop() -> Generator:
+    """Override session-scoped event loop for this test module."""
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+@pytest.fixture(autouse=True)
+def clean_tables():
+    """No-op override: principal cache tests don't need database cleanup."""
+    yield
+
+
+@pytest.fixture(scope="session")
+def setup_db():
+    """No-op override: principal cache tests don't need database setup."""
+    yield
+
+
+def _principal(is_active: bool = True) -> Principal:
+    return Principal(id=uuid4(), is_active=is_active, display_name="Anna")
+
+
+class TestPrincipalCache:
+    """Tests for PrincipalCache."""
+
+    def test_returns_cached_principal(self):
+        cache = PrincipalCache(ttl_seconds=30, max_entries=10)
+        principal = _principal()
+        cache.set(principal)
+
+        assert cache.get(principal.id) == principal
+
+    def test_entry_expires_after_ttl(self):
+        cache = PrincipalCache(ttl_seconds=30, max_entries=10)
+        principal = _principal()
+
+        with patch("app.core.principal.time.monotonic", return_value=100.0):
+            cache.set(principal)
+        with patch("app.core.principal.time.monotonic", return_value=131.0):
+            assert cache.get(principal.id) is None
+
+    def test_invalidate_drops_entry(self):
+        cache = PrincipalCache(ttl_seconds=30, max_entries=10)
+        principal = _principal()
+        cache.set(principal)
+
+        cache.invalidate(principal.id)
+
+        assert cache.get(principal.id) is None
+
+    def test_oldest_entry_is_evicted(self):
+        cache = PrincipalCache(ttl_seconds=30, max_entries=2)
+        first, second, third = _principal(), _principal(), _principal()
+        for principal in (first, second, third):
+            cache.set(principal)
+
+        assert cache.get(first.id) is None
+        assert cache.get(second.id) == second
+        assert cache.get(third.id) == third
+
+    def test_zero_ttl_disables_cache(self):
+        cache = PrincipalCache(ttl_seconds=0, max_entries=10)
+        principal = _principal()
+        cache.set(principal)
+
+        assert cache.get(principal.id) is None
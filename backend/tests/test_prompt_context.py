@@ -0,0 +1,237 @@
+"""Tests for the cached, concurrent system prompt assembly.
+
+These tests do NOT require a database -- all DB fixtures from conftest.py
+are overridden with no-op versions and the section loaders are mocked.
+"""
+
+import asyncio
+from collections.abc import Generator
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import Session
+
+from app.services import prompt_context
+from app.services.chat import PROMPT_CONTEXT_SESSIONS, ChatService
+from app.services.prompt_context import (
+    PromptContext,
+    PromptContextCache,
+    invalidate_prompt_context,
+)
+
+# ---------------------------------------------------------------------------
+# Override DB fixtures from conftest.py
+# ---------------------------------------------------------------------------
+
+
+@pytest.fixture(scope="session")
+def event_loop() -> Generator:
+    """Override session-scoped event loop for this test module."""
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+@pytest.fixture(autouse=True)
+def clean_tables():
+    """No-op override: prompt context tests don't need database cleanup."""
+    yield
+
+
+@pytest.fixture(scope="session")
+def setup_db():
+    """No-op override: prompt context tests don't need database setup."""
+    yield
+
+
+@pytest.fixture
+def cache() -> Generator[PromptContextCache, None, None]:
+    """Fresh cache patched into the chat service."""
+    fresh = PromptContextCache(ttl_seconds=60, max_entries=10)
+    with patch("app.services.chat.prompt_context_cache", fresh):
+        yield fresh
+
+
+CONTEXT = PromptContext(
+    personality="Du bist ALICE.",
+    sections=("## User-Profil\nName: Lena", "## Heutige Tasks\n- [high] Steuer"),
+)
+
+
+# ===========================================================================
+# Cache
+# ===========================================================================
+
+
+class TestPromptContextCache:
+    """Tests for the per-user snapshot cache."""
+
+    def test_set_and_get(self):
+        cache = PromptContextCache(ttl_seconds=60, max_entries=10)
+        user_id = uuid4()
+        cache.set(user_id, CONTEXT)
+        assert cache.get(user_id) == CONTEXT
+
+    def test_invalidate(self):
+        cache = PromptContextCache(ttl_seconds=60, max_entries=10)
+        user_id = uuid4()
+        cache.set(user_id, CONTEXT)
+        cache.invalidate(user_id)
+        assert cache.get(user_id) is None
+
+    def test_expired_entry_is_dropped(self):
+        cache = PromptContextCache(ttl_seconds=60, max_entries=10)
+        user_id = uuid4()
+        with patch("app.services.prompt_context.time.monotonic", return_value=1000.0):
+            cache.set(user_id, CONTEXT)
+        with patch("app.services.prompt_context.time.monotonic", return_value=1061.0):
+            assert cache.get(user_id) is None
+
+    def test_zero_ttl_disables_cache(self):
+        cache = PromptContextCache(ttl_seconds=0, max_entries=10)
+        user_id = uuid4()
+        cache.set(user_id, CONTEXT)
+        assert cache.get(user_id) is None
+
+    def test_evicts_oldest_entry(self):
+        cache = PromptContextCache(ttl_seconds=60, max_entries=2)
+        first, second, third = uuid4(), uuid4(), uuid4()
+        for user_id in (first, second, third):
+            cache.set(user_id, CONTEXT)
+        assert cache.get(first) is None
+        assert cache.get(third) == CONTEXT
+
+
+class TestInvalidatePromptContext:
+    """Tests for invalidating after a write."""
+
+    def test_uncommitted_write_invalidates_on_commit(self):
+        """A concurrent rebuild before the commit doesn't survive the commit."""
+        cache = PromptContextCache(ttl_seconds=60, max_entries=10)
+        user_id = uuid4()
+        session = Session(create_engine("sqlite://"))
+        with patch.object(prompt_context, "prompt_context_cache", cache):
+            session.execute(text("SELECT 1"))
+            invalidate_prompt_context(user_id, session)
+            # Another request caches the old committed rows in the meantime
+            cache.set(user_id, CONTEXT)
+            assert cache.get(user_id) == CONTEXT
+
+            session.commit()
+
+        assert cache.get(user_id) is None
+        session.close()
+
+    def test_without_session_invalidates_immediately(self):
+        cache = PromptContextCache(ttl_seconds=60, max_entries=10)
+        user_id = uuid4()
+        cache.set(user_id, CONTEXT)
+        with patch.object(prompt_context, "prompt_context_cache", cache):
+            invalidate_prompt_context(user_id)
+        assert cache.get(user_id) is None
+
+
+# ===========================================================================
+# _build_system_prompt
+# ===========================================================================
+
+
+class TestBuildSystemPrompt:
+    """Tests for assembling the prompt from cached sections and memory."""
+
+    @pytest.mark.asyncio
+    async def test_sections_loaded_once_then_cached(self, cache):
+        """A second turn reuses the snapshot instead of querying again."""
+        service = ChatService(MagicMock())
+        user_id = uuid4()
+        with patch.object(
+            ChatService, "_load_prompt_context", AsyncMock(return_value=CONTEXT)
+        ) as load:
+            first = await service._build_system_prompt(user_id)
+            second = await service._build_system_prompt(user_id)
+
+        load.assert_awaited_once_with(user_id)
+        assert first[1]["text"] == second[1]["text"]
+        dynamic = first[1]["text"]
+        assert dynamic.startswith("Du bist ALICE.\n\n## Aktuelles Datum & Uhrzeit")
+        assert "Name: Lena" in dynamic
+        assert first[0]["cache_control"] == {"type": "ephemeral"}
+
+    @pytest.mark.asyncio
+    async def test_memory_block_appended(self, cache):
+        """Memory context is added after the DB sections."""
+        service = ChatService(MagicMock())
+        with patch.object(
+            ChatService, "_load_prompt_context", AsyncMock(return_value=CONTEXT)
+        ), patch.object(
+            ChatService,
+            "_memory_prompt_section",
+            AsyncMock(return_value="## Was du ueber den User weisst\n- Designer"),
+        ):
+            blocks = await service._build_system_prompt(uuid4(), user_message="Hallo")
+
+        assert blocks[1]["text"].endswith("## Was du ueber den User weisst\n- Designer")
+
+    @pytest.mark.asyncio
+    async def test_slow_memory_is_dropped(self, cache):
+        """Memory enrichment that exceeds the latency budget is skipped."""
+
+        async def slow_memory(user_id, user_message):
+            await asyncio.sleep(1)
+            return "## Memory"
+
+        service = ChatService(MagicMock())
+        with patch.object(
+            ChatService, "_load_prompt_context", AsyncMock(return_value=CONTEXT)
+        ), patch.object(
+            ChatService, "_memory_prompt_section", side_effect=slow_memory
+        ), patch("app.services.chat.app_settings.prompt_memory_budget_seconds", 0.01):
+            blocks = await service._build_system_prompt(uuid4(), user_message="Hallo")
+
+        assert "## Memory" not in blocks[1]["text"]
+        assert "Name: Lena" in blocks[1]["text"]
+
+
+class TestLoadPromptContext:
+    """Tests for loading the DB-backed sections on a cache miss."""
+
+    @pytest.mark.asyncio
+    async def test_sessions_capped(self):
+        """At most PROMPT_CONTEXT_SESSIONS sections hold a session at once."""
+        running = 0
+        peak = 0
+
+        def section(result):
+            async def load(user_id):
+                nonlocal running, peak
+                running += 1
+                peak = max(peak, running)
+                await asyncio.sleep(0.01)
+                running -= 1
+                return result
+            return load
+
+        loaders = {
+            "_personality_prompt_section": section("Du bist ALICE."),
+            "_settings_prompt_sections": section(["## User-Profil"]),
+            "_progress_prompt_section": section("## User-Fortschritt"),
+            "_tasks_prompt_section": section(""),
+            "_observations_prompt_section": section("## Beobachtungen"),
+            "_nudges_prompt_section": section(""),
+        }
+        patches = [patch.object(ChatService, name, side_effect=fake) for name, fake in loaders.items()]
+        for p in patches:
+            p.start()
+        try:
+            context = await ChatService._load_prompt_context(uuid4())
+        finally:
+            for p in patches:
+                p.stop()
+
+        assert peak == PROMPT_CONTEXT_SESSIONS
+        assert context == PromptContext(
+            personality="Du bist ALICE.",
+            sections=("## User-Profil", "## User-Fortschritt", "## Beobachtungen"),
+        )
@@ -0,0 +1,214 @@
+"""Tests for the sliding-window rate limiter.
+
+These tests do NOT require a database or Redis -- all DB fixtures from
+conftest.py are overridden with no-op versions and Redis is mocked.
+"""
+
+import asyncio
+from collections.abc import Generator
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import pytest
+from fastapi import Depends, FastAPI
+from httpx import ASGITransport, AsyncClient
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from app.core import rate_limit
+from app.core.exceptions import RateLimitExceededError
+from app.core.rate_limit import (
+    RateLimiter,
+    RateLimitHeadersMiddleware,
+    RateLimitResult,
+    _RedisBackend,
+)
+from app.core.security import create_access_token
+
+# ---------------------------------------------------------------------------
+# Override DB fixtures from conftest.py
+# ---------------------------------------------------------------------------
+
+
+@pytest.fixture(scope="session")
+def event_loop() -> Generator:
+    """Override session-scoped event loop for this test module."""
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+@pytest.fixture(autouse=True)
+def clean_tables():
+    """No-op override: rate limit tests don't need database cleanup."""
+    yield
+
+
+@pytest.fixture(scope="session")
+def setup_db():
+    """No-op override: rate limit tests don't need database setup."""
+    yield
+
+
+@pytest.fixture
+def backend() -> Generator[_RedisBackend, None, None]:
+    """Fresh Redis backend patched into the limiter module."""
+    fresh = _RedisBackend()
+    with patch.object(rate_limit, "redis_backend", fresh):
+        yield fresh
+
+
+def _request(host: str = "10.0.0.1", authorization: str | None = None) -> MagicMock:
+    request = MagicMock()
+    request.client.host = host
+    request.headers = {"authorization": authorization} if authorization else {}
+    return request
+
+
+# ===========================================================================
+# In-process fallback
+# ===========================================================================
+
+
+class TestLocalWindow:
+    """Tests for the bounded in-process fallback."""
+
+    @pytest.mark.asyncio
+    async def test_blocks_after_limit(self, backend):
+        limiter = RateLimiter(times=2, seconds=60, name="test")
+        with patch.object(rate_limit.settings, "rate_limit_redis_enabled", False):
+            await limiter(_request())
+            await limiter(_request())
+            with pytest.raises(RateLimitExceededError) as exc_info:
+                await limiter(_request())
+
+        headers = exc_info.value.headers
+        assert headers["X-RateLimit-Limit"] == "2"
+        assert headers["X-RateLimit-Remaining"] == "0"
+        assert int(headers["Retry-After"]) > 0
+
+    @pytest.mark.asyncio
+    async def test_window_slides(self, backend):
+        limiter = RateLimiter(times=1, seconds=60, name="test")
+        with patch.object(rate_limit.settings, "rate_limit_redis_enabled", False):
+            with patch("app.core.rate_limit.time.time", return_value=1000.0):
+                await limiter(_request())
+            with patch("app.core.rate_limit.time.time", return_value=1061.0):
+                await limiter(_request())
+
+    @pytest.mark.asyncio
+    async def test_evicts_least_recently_used_clients(self, backend):
+        limiter = RateLimiter(times=5, seconds=60, name="test")
+        with patch.object(rate_limit.settings, "rate_limit_redis_enabled", False), patch.object(
+            rate_limit.settings, "rate_limit_local_max_keys", 2
+        ):
+            for host in ("10.0.0.1", "10.0.0.2", "10.0.0.3"):
+                await limiter(_request(host))
+
+        assert list(limiter.requests) == ["ip:10.0.0.2", "ip:10.0.0.3"]
+
+    @pytest.mark.asyncio
+    async def test_keyed_by_user_id_from_token(self, backend):
+        """Users behind the same IP get separate windows."""
+        limiter = RateLimiter(times=1, seconds=60, name="test")
+        first = create_access_token({"sub": str(uuid4())})
+        second = create_access_token({"sub": str(uuid4())})
+        with patch.object(rate_limit.settings, "rate_limit_redis_enabled", False):
+            await limiter(_request(authorization=f"Bearer {first}"))
+            await limiter(_request(authorization=f"Bearer {second}"))
+            with pytest.raises(RateLimitExceededError):
+                await limiter(_request(authorization=f"Bearer {first}"))
+
+    @pytest.mark.asyncio
+    async def test_invalid_token_falls_back_to_ip(self, backend):
+        limiter = RateLimiter(times=5, seconds=60, name="test")
+        with patch.object(rate_limit.settings, "rate_limit_redis_enabled", False):
+            await limiter(_request(authorization="Bearer not-a-jwt"))
+
+        assert list(limiter.requests) == ["ip:10.0.0.1"]
+
+
+# ===========================================================================
+# Redis backend
+# ===========================================================================
+
+
+class TestRedisBackend:
+    """Tests for the Redis sliding-window path."""
+
+    @pytest.mark.asyncio
+    async def test_uses_redis_script(self, backend):
+        limiter = RateLimiter(times=3, seconds=60, name="chat")
+        backend._client = MagicMock()
+        backend._script = AsyncMock(return_value=[1, 2, 59000])
+        with patch.object(rate_limit.settings, "rate_limit_redis_enabled", True):
+            request = _request()
+            await limiter(request)
+
+        call = backend._script.await_args
+        assert call.kwargs["keys"] == ["ratelimit:chat:ip:10.0.0.1"]
+        assert call.kwargs["args"][1:3] == [60000, 3]
+        assert request.state.rate_limit == RateLimitResult(
+            allowed=True, limit=3, remaining=2, reset_seconds=59.0
+        )
+        # Redis handled the request: nothing tracked in process
+        assert not limiter.requests
+
+    @pytest.mark.asyncio
+    async def test_redis_rejection_raises(self, backend):
+        limiter = RateLimiter(times=3, seconds=60, name="chat")
+        backend._client = MagicMock()
+        backend._script = AsyncMock(return_value=[0, 0, 12500])
+        with patch.object(rate_limit.settings, "rate_limit_redis_enabled", True):
+            with pytest.raises(RateLimitExceededError) as exc_info:
+                await limiter(_request())
+
+        assert exc_info.value.headers["Retry-After"] == "13"
+
+    @pytest.mark.asyncio
+    async def test_falls_back_when_redis_down(self, backend):
+        limiter = RateLimiter(times=3, seconds=60, name="chat")
+        backend._client = MagicMock()
+        backend._script = AsyncMock(side_effect=RedisConnectionError("refused"))
+        with patch.object(rate_limit.settings, "rate_limit_redis_enabled", True):
+            await limiter(_request())
+            await limiter(_request())
+
+        # Redis is skipped during the cool-down after the first failure
+        assert backend._script.await_count == 1
+        assert len(limiter.requests["ip:10.0.0.1"]) == 2
+
+
+# ===========================================================================
+# Headers middleware
+# ===========================================================================
+
+
+class TestRateLimitHeaders:
+    """Tests for X-RateLimit-* response headers."""
+
+    @pytest.mark.asyncio
+    async def test_headers_on_success_and_429(self, backend):
+        limiter = RateLimiter(times=1, seconds=60, name="test")
+        app = FastAPI()
+        app.add_middleware(RateLimitHeadersMiddleware)
+
+        @app.get("/limited", dependencies=[Depends(limiter)])
+        async def limited():
+            return {"ok": True}
+
+        @app.get("/open")
+        async def open_route():
+            return {"ok": True}
+
+        with patch.object(rate_limit.settings, "rate_limit_redis_enabled", False):
+            async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+                first = await ac.get("/limited")
+                second = await ac.get("/limited")
+                unlimited = await ac.get("/open")
+
+        assert first.status_code == 200
+        assert first.headers["X-RateLimit-Limit"] == "1"
+        assert first.headers["X-RateLimit-Remaining"] == "0"
+        assert second.status_code == 429
+        assert "Retry-After" in second.headers
+        assert "X-RateLimit-Limit" not in unlimited.headers
@@ -0,0 +1,649 @@
+"""Tests for the background scheduler's tick orchestration.
+
+These tests do NOT require a database -- all DB fixtures from conftest.py
+are overridden with no-op versions and the DB session is mocked.
+"""
+
+import asyncio
+from collections.abc import Generator
+from datetime import UTC, datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import pytest
+
+from app.services import scheduler
+from app.services.job_schedule import JOB_HINT_CHANNEL, JOB_TYPES, apply_job_hint
+from app.services.notification import BulkPushResult, PushNotification
+from app.services.scheduler import SchedulerMetrics
+from app.services.scheduler_leadership import SCHEDULER_LOCK_BASE, SchedulerLeadership
+
+# ---------------------------------------------------------------------------
+# Override DB fixtures from conftest.py
+# ---------------------------------------------------------------------------
+
+
+@pytest.fixture(scope="session")
+def event_loop() -> Generator:
+    """Override session-scoped event loop for this test module."""
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+@pytest.fixture(autouse=True)
+def clean_tables():
+    """No-op override: scheduler tests don't need database cleanup."""
+    yield
+
+
+@pytest.fixture(scope="session")
+def setup_db():
+    """No-op override: scheduler tests don't need database setup."""
+    yield
+
+
+@pytest.fixture(autouse=True)
+def fresh_metrics() -> Generator[SchedulerMetrics, None, None]:
+    """Give each test its own scheduler metrics."""
+    with patch.object(scheduler, "scheduler_metrics", SchedulerMetrics()) as metrics:
+        yield metrics
+
+
+@pytest.fixture(autouse=True)
+def mock_reschedule() -> Generator[AsyncMock, None, None]:
+    """Don't persist next due times."""
+    with patch.object(scheduler, "reschedule", AsyncMock()) as mock:
+        yield mock
+
+
+def _due(session: MagicMock, job_types=JOB_TYPES) -> list:
+    """Due jobs for every user of a ``_mock_settings_session``."""
+    rows = session.return_value.__aenter__.return_value.execute.return_value \
+        .scalars.return_value.all.return_value
+    now = datetime.now(UTC)
+    return [(row.user_id, job_type, now) for row in rows for job_type in job_types]
+
+
+def _mock_settings_session(user_count: int) -> MagicMock:
+    """AsyncSessionLocal mock returning ``user_count`` users with push tokens."""
+    rows = []
+    for i in range(user_count):
+        row = MagicMock()
+        row.user_id = uuid4()
+        row.settings = {"expo_push_token": f"ExponentPushToken[{i}]"}
+        rows.append(row)
+
+    db = AsyncMock()
+    result = MagicMock()
+    result.scalars.return_value.all.return_value = rows
+    db.execute = AsyncMock(return_value=result)
+
+    session = MagicMock()
+    session.return_value.__aenter__ = AsyncMock(return_value=db)
+    session.return_value.__aexit__ = AsyncMock(return_value=False)
+    return session
+
+
+class TestRunDueJobs:
+    """Tests for running a batch of due jobs concurrently per user."""
+
+    @pytest.mark.asyncio
+    async def test_users_processed_concurrently_up_to_limit(self):
+        running = 0
+        peak = 0
+
+        async def process_user(user_id, token, settings, job_types):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            return set()
+
+        session = _mock_settings_session(7)
+        with patch.object(scheduler, "AsyncSessionLocal", session), \
+             patch.object(scheduler, "_process_user", side_effect=process_user) as mock_process, \
+             patch.object(scheduler.app_settings, "scheduler_concurrency", 3):
+            users = await scheduler._run_due_jobs(_due(session))
+
+        assert users == 7
+        assert mock_process.await_count == 7
+        assert peak == 3
+
+    @pytest.mark.asyncio
+    async def test_failing_user_does_not_stop_tick(self):
+        calls = []
+
+        async def process_user(user_id, token, settings, job_types):
+            calls.append(user_id)
+            if len(calls) == 1:
+                raise RuntimeError("boom")
+            return set()
+
+        session = _mock_settings_session(3)
+        with patch.object(scheduler, "AsyncSessionLocal", session), \
+             patch.object(scheduler, "_process_user", side_effect=process_user):
+            users = await scheduler._run_due_jobs(_due(session))
+
+        assert users == 3
+        assert len(calls) == 3
+
+    @pytest.mark.asyncio
+    async def test_failed_stages_are_rescheduled_with_backoff(self, mock_reschedule):
+        session = _mock_settings_session(2)
+        due = _due(session, ["reminders", "task_nudges"])
+        failing = due[0][0]
+
+        async def process_user(user_id, token, settings, job_types):
+            return {"reminders"} if user_id == failing else set()
+
+        with patch.object(scheduler, "AsyncSessionLocal", session), \
+             patch.object(scheduler, "_process_user", side_effect=process_user), \
+             patch.object(scheduler, "_process_task_nudges", AsyncMock(side_effect=RuntimeError("db"))):
+            await scheduler._run_due_jobs(due)
+
+        others = {user_id for user_id, _, _ in due} - {failing}
+        assert mock_reschedule.await_args.kwargs["failed"] == {
+            (failing, "reminders"),
+            (failing, "task_nudges"),
+            *((user_id, "task_nudges") for user_id in others),
+        }
+
+    @pytest.mark.asyncio
+    async def test_only_due_stages_run_and_are_rescheduled(self, mock_reschedule):
+        session = _mock_settings_session(1)
+        with patch.object(scheduler, "AsyncSessionLocal", session), \
+             patch.object(scheduler, "_process_user", AsyncMock()) as mock_process, \
+             patch.object(scheduler, "_process_task_nudges", AsyncMock()) as mock_nudges:
+            await scheduler._run_due_jobs(_due(session, ["reminders"]))
+
+        mock_nudges.assert_not_awaited()
+        assert mock_process.await_args.args[3] == {"reminders"}
+        jobs = mock_reschedule.await_args.args[1]
+        assert [types for _, types in jobs.values()] == [("reminders",)]
+        assert mock_reschedule.await_args.kwargs["ran"] is True
+
+    @pytest.mark.asyncio
+    async def test_task_nudges_run_once_for_all_users(self):
+        session = _mock_settings_session(4)
+        with patch.object(scheduler, "AsyncSessionLocal", session), \
+             patch.object(scheduler, "_process_user", AsyncMock()), \
+             patch.object(scheduler, "_process_task_nudges", AsyncMock()) as mock_nudges:
+            await scheduler._run_due_jobs(_due(session))
+
+        mock_nudges.assert_awaited_once()
+        assert len(mock_nudges.await_args.args[0]) == 4
+
+    @pytest.mark.asyncio
+    async def test_predictions_run_once_for_wellness_users(self):
+        session = _mock_settings_session(3)
+        rows = session.return_value.__aenter__.return_value.execute.return_value \
+            .scalars.return_value.all.return_value
+        for row in rows[:2]:
+            row.settings = {**row.settings, "active_modules": ["core", "wellness"]}
+        with patch.object(scheduler, "AsyncSessionLocal", session), \
+             patch.object(scheduler, "_process_user", AsyncMock()), \
+             patch.object(scheduler, "_process_task_nudges", AsyncMock()), \
+             patch.object(scheduler, "_process_predictions", AsyncMock()) as mock_predictions:
+            await scheduler._run_due_jobs(_due(session))
+
+        mock_predictions.assert_awaited_once()
+        assert set(mock_predictions.await_args.args[0]) == {row.user_id for row in rows[:2]}
+
+    @pytest.mark.asyncio
+    async def test_quiet_hours_users_skipped(self):
+        session = _mock_settings_session(2)
+        quiet = session.return_value.__aenter__.return_value.execute.return_value \
+            .scalars.return_value.all.return_value[0]
+        quiet.settings = {
+            **quiet.settings, "quiet_hours_start": "00:00", "quiet_hours_end": "23:59",
+        }
+        with patch.object(scheduler, "AsyncSessionLocal", session), \
+             patch.object(scheduler, "_process_user", AsyncMock()) as mock_process, \
+             patch.object(scheduler, "_process_task_nudges", AsyncMock()) as mock_nudges:
+            users = await scheduler._run_due_jobs(_due(session))
+
+        assert users == 1
+        assert mock_process.await_count == 1
+        assert quiet.user_id not in mock_nudges.await_args.args[0]
+
+
+class TestPushOutbox:
+    """Tests for collecting a batch's pushes and sending them together."""
+
+    @pytest.mark.asyncio
+    async def test_tick_pushes_are_flushed_together(self):
+        async def process_user(user_id, token, settings, job_types):
+            await scheduler._push(PushNotification(to=token, title="Hi", body="Body"))
+            return set()
+
+        session = _mock_settings_session(3)
+        with patch.object(scheduler, "AsyncSessionLocal", session), \
+             patch.object(scheduler, "_process_user", side_effect=process_user), \
+             patch.object(scheduler, "_process_task_nudges", AsyncMock()), \
+             patch.object(scheduler, "NotificationService") as mock_notify, \
+             patch.object(scheduler.PushOutbox, "flush", autospec=True) as mock_flush:
+            mock_flush.return_value = BulkPushResult(sent=3)
+            mock_notify.send_notification = AsyncMock()
+            await scheduler._run_due_jobs(_due(session))
+
+        mock_notify.send_notification.assert_not_awaited()
+        mock_flush.assert_awaited_once()
+        outbox = mock_flush.await_args.args[0]
+        assert len(outbox) == 3
+
+    @pytest.mark.asyncio
+    async def test_dead_tokens_are_pruned(self):
+        outbox = scheduler.PushOutbox()
+        outbox.add(PushNotification(to="ExponentPushToken[x]", title="Hi", body="Body"))
+        dead = BulkPushResult(dead_tokens={"ExponentPushToken[x]"})
+        with patch.object(scheduler.PushOutbox, "flush", AsyncMock(return_value=dead)), \
+             patch.object(scheduler, "_prune_push_tokens", AsyncMock()) as mock_prune:
+            await scheduler._flush_outbox(outbox)
+
+        mock_prune.assert_awaited_once_with({"ExponentPushToken[x]"})
+
+
+def _mock_task_nudge_session(rows: list) -> tuple[MagicMock, AsyncMock]:
+    """AsyncSessionLocal mock: first execute returns due tasks, then RETURNING rows."""
+    db = AsyncMock()
+    due = MagicMock()
+    due.all.return_value = rows
+    inserted = MagicMock()
+    inserted.all.return_value = [
+        MagicMock(user_id=user_id, task_id=task_id, nudge_type=kind)
+        for user_id, task_id, _, _, kind in rows
+    ]
+    db.execute = AsyncMock(side_effect=[due, inserted])
+
+    session = MagicMock()
+    session.return_value.__aenter__ = AsyncMock(return_value=db)
+    session.return_value.__aexit__ = AsyncMock(return_value=False)
+    return session, db
+
+
+class TestTaskNudges:
+    """Tests for the set-based deadline/overdue pass."""
+
+    @pytest.mark.asyncio
+    async def test_single_query_and_bulk_insert(self):
+        from sqlalchemy.dialects import postgresql
+
+        from app.models.nudge_history import NudgeType
+
+        now = datetime.now(UTC)
+        first, second = uuid4(), uuid4()
+        rows = [
+            (first, uuid4(), "Steuer", now + timedelta(minutes=20), NudgeType.DEADLINE),
+            (second, uuid4(), "Einkauf", now - timedelta(hours=2), NudgeType.MOTIVATIONAL),
+        ]
+        session, db = _mock_task_nudge_session(rows)
+        tokens = {first: "ExponentPushToken[a]", second: "ExponentPushToken[b]"}
+
+        with patch.object(scheduler, "AsyncSessionLocal", session), \
+             patch.object(scheduler, "NotificationService") as mock_notify, \
+             patch.object(scheduler, "invalidate_prompt_context") as mock_invalidate:
+            mock_notify.send_notification = AsyncMock()
+            await scheduler._process_task_nudges(tokens)
+
+        # One detection query plus one multi-row insert, whatever the user count
+        assert db.execute.await_count == 2
+        query = str(db.execute.await_args_list[0].args[0].compile(dialect=postgresql.dialect()))
+        assert "NOT (EXISTS" in query
+        insert = db.execute.await_args_list[1].args[0].compile(dialect=postgresql.dialect())
+        assert "RETURNING" in str(insert)
+        db.commit.assert_awaited_once()
+
+        pushes = [call.args[0] for call in mock_notify.send_notification.await_args_list]
+        assert [(p.to, p.data["type"]) for p in pushes] == [
+            ("ExponentPushToken[a]", "deadline"),
+            ("ExponentPushToken[b]", "overdue"),
+        ]
+        assert pushes[0].body.startswith("⏰ 'Steuer' ist in ")
+        assert mock_invalidate.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_nothing_due_skips_insert(self):
+        session, db = _mock_task_nudge_session([])
+        with patch.object(scheduler, "AsyncSessionLocal", session), \
+             patch.object(scheduler, "NotificationService") as mock_notify:
+            mock_notify.send_notification = AsyncMock()
+            await scheduler._process_task_nudges({uuid4(): "ExponentPushToken[a]"})
+
+        assert db.execute.await_count == 1
+        db.commit.assert_not_awaited()
+        mock_notify.send_notification.assert_not_awaited()
+
+
+class TestPredictions:
+    """Tests for the batch prediction stage."""
+
+    @pytest.mark.asyncio
+    async def test_batch_predictions_pushed_when_confident(self):
+        confident, unsure = uuid4(), uuid4()
+        session = MagicMock()
+        session.return_value.__aenter__ = AsyncMock(return_value=AsyncMock())
+        session.return_value.__aexit__ = AsyncMock(return_value=False)
+        tokens = {confident: "ExponentPushToken[a]", unsure: "ExponentPushToken[b]"}
+
+        with patch.object(scheduler, "AsyncSessionLocal", session), \
+             patch.object(scheduler, "PredictionEngine") as engine, \
+             patch.object(scheduler, "NotificationService") as mock_notify, \
+             patch("app.services.graphiti_client.get_graphiti_client"):
+            engine.return_value.expire_old_predictions_batch = AsyncMock(return_value=0)
+            engine.return_value.predict_batch = AsyncMock(return_value=[
+                {"id": "p1", "user_id": confident, "pattern_type": "energy_crash",
+                 "confidence": 0.85, "time_horizon": "24h"},
+                {"id": "p2", "user_id": unsure, "pattern_type": "hyperfocus",
+                 "confidence": 0.6, "time_horizon": "24h"},
+            ])
+            mock_notify.send_notification = AsyncMock()
+            await scheduler._process_predictions(tokens)
+
+        assert set(engine.return_value.predict_batch.await_args.args[0]) == set(tokens)
+        engine.return_value.expire_old_predictions_batch.assert_awaited_once()
+        pushes = [call.args[0] for call in mock_notify.send_notification.await_args_list]
+        assert [(p.to, p.data["id"]) for p in pushes] == [("ExponentPushToken[a]", "p1")]
+        assert "Energie-Einbruch" in pushes[0].body
+
+
+def _leadership(shard: int | None = 0, alive: bool = True) -> MagicMock:
+    """SchedulerLeadership mock owning ``shard`` (None = standby)."""
+    leadership = MagicMock()
+    leadership.shards = 1
+    leadership.owned = {shard} if shard is not None else set()
+    leadership.acquire = AsyncMock(return_value=shard)
+    leadership.check = AsyncMock(return_value=alive)
+    leadership.listen = AsyncMock()
+    leadership.close = AsyncMock()
+    return leadership
+
+
+class TestRunScheduler:
+    """Tests for the leader-elected, next-due scheduler loop."""
+
+    @pytest.mark.asyncio
+    async def test_leader_claims_and_runs_due_jobs(self):
+        user_id = uuid4()
+        ran = asyncio.Event()
+        now = datetime.now(UTC)
+
+        async def rehydrate(shard):
+            scheduler.job_heap.set(user_id, "reminders", now)
+
+        async def run_due_jobs(due):
+            ran.set()
+            return 1
+
+        with patch.object(scheduler, "SchedulerLeadership", return_value=_leadership()), \
+             patch.object(scheduler, "_rehydrate", side_effect=rehydrate), \
+             patch.object(scheduler, "_check_push_receipts", AsyncMock()), \
+             patch.object(scheduler, "_claim_due", AsyncMock(
+                 return_value=[(user_id, "reminders", now)]
+             )) as mock_claim, \
+             patch.object(scheduler, "_run_due_jobs", side_effect=run_due_jobs) as mock_run:
+            task = asyncio.create_task(scheduler.run_scheduler())
+            await asyncio.wait_for(ran.wait(), timeout=2)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+
+        mock_claim.assert_awaited()
+        assert mock_run.await_args.args[0] == [(user_id, "reminders", now)]
+        assert not scheduler.job_heap.active
+
+    @pytest.mark.asyncio
+    async def test_leader_listens_for_job_hints(self):
+        leadership = _leadership(alive=False)
+        with patch.object(scheduler, "_rehydrate", AsyncMock()):
+            await asyncio.wait_for(scheduler._lead(leadership), timeout=1)
+
+        leadership.listen.assert_awaited_once_with(JOB_HINT_CHANNEL, apply_job_hint)
+
+    @pytest.mark.asyncio
+    async def test_standby_does_not_run_jobs(self):
+        leadership = _leadership(shard=None)
+        with patch.object(scheduler, "SchedulerLeadership", return_value=leadership), \
+             patch.object(scheduler.app_settings, "scheduler_leader_retry_seconds", 0.01), \
+             patch.object(scheduler, "_rehydrate", AsyncMock()) as mock_rehydrate:
+            task = asyncio.create_task(scheduler.run_scheduler())
+            await asyncio.sleep(0.05)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+
+        assert leadership.acquire.await_count > 1
+        mock_rehydrate.assert_not_awaited()
+        leadership.close.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_bad_heap_entry_does_not_end_leading(self):
+        """An error computing the next wake-up is logged and the heap rebuilt."""
+        leadership = _leadership()
+        leadership.check = AsyncMock(side_effect=[True, False])
+        with patch.object(scheduler, "_rehydrate", AsyncMock()) as mock_rehydrate, \
+             patch.object(scheduler, "_check_push_receipts", AsyncMock()), \
+             patch.object(scheduler.app_settings, "scheduler_leader_retry_seconds", 0.01), \
+             patch.object(scheduler.job_heap, "next_due", side_effect=TypeError("naive")):
+            await asyncio.wait_for(scheduler._lead(leadership), timeout=1)
+
+        assert leadership.check.await_count == 2
+        mock_rehydrate.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_leader_adopts_free_shards_after_first_rehydrate(self, fresh_metrics):
+        """Later rehydrates take over unled shards and load their users too."""
+        leadership = _leadership()
+        leadership.shards = 3
+        leadership.owned = {0}
+
+        async def adopt():
+            leadership.owned.add(2)
+            return [2]
+
+        leadership.adopt_free_shards = AsyncMock(side_effect=adopt)
+        leadership.check = AsyncMock(side_effect=[True, True, False])
+        with patch.object(scheduler, "_rehydrate", AsyncMock()) as mock_rehydrate, \
+             patch.object(scheduler, "_check_push_receipts", AsyncMock()), \
+             patch.object(scheduler.app_settings, "scheduler_rehydrate_seconds", 0.01):
+            await asyncio.wait_for(scheduler._lead(leadership), timeout=1)
+
+        leadership.adopt_free_shards.assert_awaited_once()
+        assert mock_rehydrate.await_args.args[0] == {0, 2}
+        assert fresh_metrics.snapshot()["leader_shards"] == [0, 2]
+
+    @pytest.mark.asyncio
+    async def test_lost_leadership_stops_leading(self):
+        with patch.object(scheduler, "_rehydrate", AsyncMock()) as mock_rehydrate:
+            await asyncio.wait_for(scheduler._lead(_leadership(alive=False)), timeout=1)
+
+        mock_rehydrate.assert_not_awaited()
+        assert not scheduler.job_heap.active
+
+
+class TestSchedulerLeadership:
+    """Tests for advisory-lock leader election."""
+
+    @staticmethod
+    def _engine(lock_results: list[bool]) -> tuple[MagicMock, AsyncMock]:
+        conn = AsyncMock()
+        conn.execution_options = AsyncMock(return_value=conn)
+        results = []
+        for locked in lock_results:
+            result = MagicMock()
+            result.scalar.return_value = locked
+            results.append(result)
+        conn.execute = AsyncMock(side_effect=results)
+        engine = MagicMock()
+        engine.connect = AsyncMock(return_value=conn)
+        engine.dispose = AsyncMock()
+        return engine, conn
+
+    @pytest.mark.asyncio
+    async def test_takes_first_free_shard(self):
+        engine, conn = self._engine([False, True])
+        leadership = SchedulerLeadership(shards=3)
+        with patch("app.services.scheduler_leadership.create_async_engine", return_value=engine), \
+             patch("app.services.scheduler_leadership.random.randrange", return_value=1):
+            shard = await leadership.acquire()
+
+        assert shard == 2
+        keys = [call.args[1]["key"] for call in conn.execute.await_args_list]
+        assert keys == [SCHEDULER_LOCK_BASE + 1, SCHEDULER_LOCK_BASE + 2]
+        conn.close.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_all_shards_taken(self):
+        engine, conn = self._engine([False, False])
+        leadership = SchedulerLeadership(shards=2)
+        with patch("app.services.scheduler_leadership.create_async_engine", return_value=engine):
+            assert await leadership.acquire() is None
+
+        assert not leadership.is_leader
+        conn.close.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_connection_closed_when_lock_query_fails(self):
+        engine, conn = self._engine([])
+        conn.execute = AsyncMock(side_effect=ConnectionError("reset"))
+        leadership = SchedulerLeadership(shards=2)
+        with patch("app.services.scheduler_leadership.create_async_engine", return_value=engine), \
+             pytest.raises(ConnectionError):
+            await leadership.acquire()
+
+        conn.close.assert_awaited_once()
+        assert not leadership.is_leader
+
+    @pytest.mark.asyncio
+    async def test_leader_adopts_free_shards(self):
+        """Shards without a leader are taken over on the lock connection."""
+        engine, conn = self._engine([True, False, True])
+        leadership = SchedulerLeadership(shards=3)
+        with patch("app.services.scheduler_leadership.create_async_engine", return_value=engine), \
+             patch("app.services.scheduler_leadership.random.randrange", return_value=0):
+            await leadership.acquire()
+            adopted = await leadership.adopt_free_shards()
+
+        assert adopted == [2]
+        assert leadership.owned == {0, 2}
+        keys = [call.args[1]["key"] for call in conn.execute.await_args_list]
+        assert keys == [SCHEDULER_LOCK_BASE + 0, SCHEDULER_LOCK_BASE + 1, SCHEDULER_LOCK_BASE + 2]
+        engine.connect.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_listen_delivers_payloads(self):
+        engine, conn = self._engine([True])
+        driver = MagicMock()
+        driver.add_listener = AsyncMock()
+        conn.get_raw_connection = AsyncMock(return_value=MagicMock(driver_connection=driver))
+        leadership = SchedulerLeadership()
+        payloads: list[str] = []
+        with patch("app.services.scheduler_leadership.create_async_engine", return_value=engine):
+            await leadership.acquire()
+            await leadership.listen("alice_job_hints", payloads.append)
+
+        channel, listener = driver.add_listener.await_args.args
+        listener(driver, 4242, channel, "payload")
+        assert channel == "alice_job_hints"
+        assert payloads == ["payload"]
+
+
+class TestRunStage:
+    """Tests for per-stage timeouts and timing."""
+
+    @pytest.mark.asyncio
+    async def test_records_successful_stage(self, fresh_metrics):
+        await scheduler._run_stage("nudges", asyncio.sleep(0), uuid4())
+
+        stage = fresh_metrics.snapshot()["stages"]["nudges"]
+        assert stage["runs"] == 1
+        assert stage["errors"] == 0
+        assert stage["timeouts"] == 0
+
+    @pytest.mark.asyncio
+    async def test_slow_stage_times_out(self, fresh_metrics):
+        with patch.object(scheduler.app_settings, "scheduler_stage_timeout_seconds", 0.01):
+            await scheduler._run_stage("briefing", asyncio.sleep(1), uuid4())
+
+        assert fresh_metrics.snapshot()["stages"]["briefing"]["timeouts"] == 1
+
+    @pytest.mark.asyncio
+    async def test_failing_stage_is_isolated(self, fresh_metrics):
+        async def fail():
+            raise RuntimeError("boom")
+
+        await scheduler._run_stage("predictions", fail(), uuid4())
+
+        assert fresh_metrics.snapshot()["stages"]["predictions"]["errors"] == 1
+
+    @pytest.mark.asyncio
+    async def test_process_user_runs_all_stages(self, fresh_metrics):
+        stage_names = [
+            "_process_streak_reminder",
+            "_process_wellbeing_check",
+            "_process_morning_briefing",
+            "_process_calendar_sync",
+            "_process_reminders",
+        ]
+        patches = [patch.object(scheduler, name, AsyncMock()) for name in stage_names]
+        for p in patches:
+            p.start()
+        try:
+            failed = await scheduler._process_user(uuid4(), "ExponentPushToken[x]", {})
+        finally:
+            for p in patches:
+                p.stop()
+
+        assert set(fresh_metrics.snapshot()["stages"]) == {
+            "streak", "wellbeing", "briefing", "calendar", "reminders",
+        }
+        assert failed == set()
+
+    @pytest.mark.asyncio
+    async def test_process_user_reports_failed_stages(self, fresh_metrics):
+        with patch.object(scheduler, "_process_reminders", AsyncMock(side_effect=RuntimeError("db"))), \
+             patch.object(scheduler, "_process_streak_reminder", AsyncMock()):
+            failed = await scheduler._process_user(
+                uuid4(), "ExponentPushToken[x]", {}, ("streak", "reminders"),
+            )
+
+        assert failed == {"reminders"}
+
+    @pytest.mark.asyncio
+    async def test_wellbeing_and_interventions_share_feature_snapshot(self):
+        """The wellbeing score and the interventions read one snapshot."""
+        snapshot = MagicMock()
+        session = MagicMock()
+        session.return_value.__aenter__ = AsyncMock(return_value=AsyncMock())
+        session.return_value.__aexit__ = AsyncMock(return_value=False)
+        settings = {"active_modules": ["core", "wellness"]}
+
+        with patch.object(scheduler, "AsyncSessionLocal", session), \
+             patch.object(scheduler, "build_feature_snapshot", AsyncMock(return_value=snapshot)) as build, \
+             patch.object(scheduler, "WellbeingService") as wellbeing, \
+             patch.object(scheduler, "InterventionEngine") as interventions:
+            wellbeing.return_value.calculate_and_store = AsyncMock(return_value={"score": 70, "zone": "green"})
+            interventions.return_value.evaluate = AsyncMock(return_value=[])
+
+            await scheduler._process_user(uuid4(), "ExponentPushToken[x]", settings, ("wellbeing",))
+
+        build.assert_awaited_once()
+        assert wellbeing.return_value.calculate_and_store.await_args.args[1] is snapshot
+        assert interventions.return_value.evaluate.await_args.args[1] is snapshot
+
+
+class TestSchedulerMetrics:
+    """Tests for tick metrics."""
+
+    def test_record_tick(self):
+        metrics = SchedulerMetrics()
+        metrics.record_tick(duration=2.0, lag=0.5, users=40)
+        metrics.record_tick(duration=1.0, lag=0.0, users=41)
+
+        snapshot = metrics.snapshot()
+        assert snapshot["ticks"] == 2
+        assert snapshot["last_tick_users"] == 41
+        assert snapshot["last_tick_duration_ms"] == 1000.0
+        assert snapshot["max_tick_duration_ms"] == 2000.0
+        assert snapshot["max_tick_lag_ms"] == 500.0
@@ -1,12 +1,17 @@
 """Security utilities unit tests."""
 
+import asyncio
+import threading
 from datetime import datetime, timedelta
 import pytest
 import jwt
 
 from app.core.security import (
+    PasswordHashExecutor,
     hash_password,
+    hash_password_async,
     verify_password,
+    verify_password_async,
     create_access_token,
     create_refresh_token,
     verify_token,
@@ -63,6 +68,51 @@ class TestPasswordHashing:
         assert verify_password("", hashed) is False
 
 
+class TestPasswordHashExecutor:
+    """Tests for running bcrypt off the event loop."""
+
+    async def test_hash_and_verify_async(self):
+        """Async helpers produce and verify regular bcrypt hashes."""
+        hashed = await hash_password_async("AsyncPassword123")
+
+        assert hashed.startswith("$2b$")
+        assert await verify_password_async("AsyncPassword123", hashed) is True
+        assert await verify_password_async("WrongPassword123", hashed) is False
+
+    async def test_runs_off_event_loop_thread(self):
+        """Hashing functions run on the pool's threads, not the loop's."""
+        executor = PasswordHashExecutor(max_workers=1)
+        thread_name = await executor.run(lambda: threading.current_thread().name)
+        executor.shutdown()
+
+        assert thread_name.startswith("bcrypt")
+
+    async def test_concurrency_cap_and_metrics(self):
+        """At most max_workers calls run at once; queue wait is recorded."""
+        executor = PasswordHashExecutor(max_workers=2)
+        lock = threading.Lock()
+        running = 0
+        peak = 0
+
+        def work():
+            nonlocal running, peak
+            with lock:
+                running += 1
+                peak = max(peak, running)
+            threading.Event().wait(0.05)
+            with lock:
+                running -= 1
+
+        await asyncio.gather(*(executor.run(work) for _ in range(6)))
+        snapshot = executor.snapshot()
+        executor.shutdown()
+
+        assert peak == 2
+        assert snapshot["completed"] == 6
+        assert snapshot["in_flight"] == 0
+        assert snapshot["max_wait_ms"] > 0
+
+
 class TestJWTTokens:
     """Tests for JWT token creation and verification."""
 
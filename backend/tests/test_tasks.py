@@ -5,6 +5,9 @@ from uuid import uuid4
 
 import pytest
 from httpx import AsyncClient
+from sqlalchemy import event
+
+from app.core.database import engine
 
 
 class TestCreateTask:
@@ -117,6 +120,33 @@ class TestListTasks:
         assert len(data["items"]) == 3
         assert data["total_count"] == 3
 
+    async def test_list_tasks_statement_count(self, authenticated_client: AsyncClient, test_user):
+        """Listing tasks must not cascade into relationship loads.
+
+        Expected statements: task page and total count. The principal is
+        already cached by the preceding POSTs, so auth issues no query.
+        """
+        for i in range(3):
+            await authenticated_client.post(
+                "/api/v1/tasks/",
+                json={"title": f"Task {i+1}"},
+            )
+
+        statements: list[str] = []
+
+        def count_statement(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(engine.sync_engine, "before_cursor_execute", count_statement)
+        try:
+            response = await authenticated_client.get("/api/v1/tasks/")
+        finally:
+            event.remove(engine.sync_engine, "before_cursor_execute", count_statement)
+
+        assert response.status_code == 200
+        assert len(response.json()["items"]) == 3
+        assert len(statements) == 2, statements
+
     async def test_list_tasks_filter_status(self, authenticated_client: AsyncClient, test_user):
         """Test filtering tasks by status."""
         # Create tasks
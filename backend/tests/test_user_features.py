@@ -0,0 +1,166 @@
+"""Tests for the shared user feature snapshot and the engines evaluated over it.
+
+These tests do NOT require a database -- all DB fixtures from conftest.py
+are overridden with no-op versions and the session is mocked.
+"""
+
+import asyncio
+from collections.abc import Generator
+from unittest.mock import AsyncMock, MagicMock
+from uuid import uuid4
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.services.intervention_engine import InterventionEngine
+from app.services.prediction_engine import PredictionEngine
+from app.services.user_features import (
+    TREND_WINDOWS,
+    UserFeatureSnapshot,
+    build_feature_snapshot,
+)
+from app.services.wellbeing import WellbeingService
+
+# ---------------------------------------------------------------------------
+# Override DB fixtures from conftest.py
+# ---------------------------------------------------------------------------
+
+
+@pytest.fixture(scope="session")
+def event_loop() -> Generator:
+    """Override session-scoped event loop for this test module."""
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+@pytest.fixture(autouse=True)
+def clean_tables():
+    """No-op override: feature tests don't need database cleanup."""
+    yield
+
+
+@pytest.fixture(scope="session")
+def setup_db():
+    """No-op override: feature tests don't need database setup."""
+    yield
+
+
+def _trends(**values) -> dict:
+    trends = {
+        "total_conversations": 5,
+        "avg_mood": 0.0, "avg_energy": 0.5, "avg_focus": 0.5,
+        "mood_trend": "stable", "energy_trend": "stable", "focus_trend": "stable",
+    }
+    trends.update(values)
+    return trends
+
+
+def _snapshot(trends_7d: dict, trends_30d: dict | None = None, **features) -> UserFeatureSnapshot:
+    return UserFeatureSnapshot(
+        user_id=str(uuid4()),
+        trends_7d=trends_7d,
+        trends_30d=trends_30d or trends_7d,
+        **features,
+    )
+
+
+def _row(**values) -> dict:
+    """A result row of the snapshot query with all trend columns empty."""
+    row = {}
+    for days in TREND_WINDOWS:
+        row[f"total_{days}"] = None
+        for metric in ("mood", "energy", "focus"):
+            for prefix in ("avg", "min", "max", "first", "second"):
+                row[f"{prefix}_{metric}_{days}"] = None
+    row.update({"tasks_completed": None, "current_streak": None, "open_tasks": 0, "recent_logs": None})
+    row.update(values)
+    return row
+
+
+class TestBuildFeatureSnapshot:
+    """Tests for loading the snapshot."""
+
+    @pytest.mark.asyncio
+    async def test_one_statement_loads_all_features(self):
+        """Trends, stats, open tasks and recent logs come from a single query."""
+        logs = [{"mood_score": 0.1, "energy_level": 0.4, "focus_score": 0.5}]
+        result = MagicMock()
+        result.one.return_value._mapping = _row(
+            total_7=4, avg_energy_7=0.35, total_30=12, avg_energy_30=0.6,
+            first_mood_7=0.5, second_mood_7=0.1,
+            tasks_completed=9, current_streak=3, open_tasks=6, recent_logs=logs,
+        )
+        db = AsyncMock()
+        db.execute = AsyncMock(return_value=result)
+        user_id = uuid4()
+
+        snapshot = await build_feature_snapshot(db, user_id)
+
+        assert db.execute.await_count == 1
+        assert snapshot.user_id == str(user_id)
+        assert snapshot.trends_7d["total_conversations"] == 4
+        assert snapshot.trends_7d["avg_energy"] == 0.35
+        assert snapshot.trends_7d["mood_trend"] == "declining"
+        assert snapshot.trends_30d["avg_energy"] == 0.6
+        assert snapshot.stats == {"tasks_completed": 9, "current_streak": 3, "open_tasks": 6}
+        assert snapshot.recent_logs == logs
+
+        sql = str(db.execute.await_args.args[0].compile(dialect=postgresql.dialect()))
+        assert "FROM pattern_log_daily" in sql
+        assert "FROM user_stats" in sql
+        assert "FROM tasks" in sql
+        assert "json_agg(json_build_object(" in sql
+        assert "ORDER BY pattern_logs.created_at ASC" in sql
+
+    @pytest.mark.asyncio
+    async def test_new_user_has_empty_features(self):
+        """Missing stats and logs default to zero and an empty list."""
+        result = MagicMock()
+        result.one.return_value._mapping = _row()
+        db = AsyncMock()
+        db.execute = AsyncMock(return_value=result)
+
+        snapshot = await build_feature_snapshot(db, uuid4())
+
+        assert not snapshot.has_conversations
+        assert snapshot.stats == {"tasks_completed": 0, "current_streak": 0, "open_tasks": 0}
+        assert snapshot.recent_logs == []
+
+
+class TestEnginesOverSnapshot:
+    """The engines' rules are pure functions of the snapshot."""
+
+    def test_wellbeing_score(self):
+        snapshot = _snapshot(
+            _trends(total_conversations=14, avg_mood=1.0, avg_energy=1.0, avg_focus=1.0),
+            tasks_completed=20, current_streak=14,
+        )
+
+        score, zone, components = WellbeingService(AsyncMock()).score(snapshot)
+
+        assert (score, zone) == (100.0, "green")
+        assert components["consistency"] == 1.0
+
+    def test_intervention_detection(self):
+        snapshot = _snapshot(_trends(avg_focus=0.2), open_tasks=6)
+
+        detected = InterventionEngine(AsyncMock()).detect(snapshot)
+
+        assert [p["type"] for p in detected] == ["decision_fatigue"]
+
+    def test_prediction_candidates(self):
+        snapshot = _snapshot(
+            _trends(avg_energy=0.3, energy_trend="declining"),
+            _trends(avg_energy=0.6),
+        )
+
+        candidates = PredictionEngine(AsyncMock()).candidates(snapshot)
+
+        assert "energy_crash" in [c["pattern_type"] for c in candidates]
+
+    def test_no_conversations_yields_nothing(self):
+        snapshot = _snapshot(_trends(total_conversations=0, avg_focus=0.95), open_tasks=9)
+
+        assert InterventionEngine(AsyncMock()).detect(snapshot) == []
+        assert PredictionEngine(AsyncMock()).candidates(snapshot) == []
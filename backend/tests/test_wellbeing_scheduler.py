@@ -17,6 +17,7 @@ class TestWellbeingSchedulerFunction:
         settings = {"active_modules": ["core", "wellness"]}
         with patch("app.services.scheduler.WellbeingService") as MockWS, \
              patch("app.services.scheduler.InterventionEngine") as MockIE, \
+             patch("app.services.scheduler.build_feature_snapshot", AsyncMock()), \
              patch("app.services.scheduler.AsyncSessionLocal") as MockSession:
             mock_db = AsyncMock()
             MockSession.return_value.__aenter__ = AsyncMock(return_value=mock_db)